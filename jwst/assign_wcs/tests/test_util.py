@@ -2,12 +2,15 @@
 Test the utility functions
 """
 
-from astropy.modeling.models import Identity, Shift
+import numpy as np
+import pytest
+from astropy.modeling.models import Identity, Mapping, Polynomial2D, Shift, Tabular2D
 from astropy.table import QTable
 from astropy.utils.data import get_pkg_data_filename
 from stdatamodels.jwst import datamodels
 
 from jwst.assign_wcs.util import (
+    GridApproximation,
     bounding_box_from_subarray,
     get_object_info,
     subarray_transform,
@@ -98,3 +101,47 @@ def test_bounding_box_from_subarray():
     im.meta.subarray.xsize = 400
     im.meta.subarray.ysize = 600
     assert bounding_box_from_subarray(im) == ((-0.5, 599.5), (-0.5, 399.5))
+
+
+@pytest.mark.parametrize("tolerance", [None, 1e-3])
+def test_grid_approximation(tolerance):
+    transform = Mapping((0, 1, 0, 1)) | (
+        Polynomial2D(2, c1_0=1.0, c2_0=1e-3, c0_2=5e-4) & Polynomial2D(1, c0_0=2.0, c0_1=0.5)
+    )
+    bbox = ((-0.5, 99.5), (-0.5, 39.5))
+    approx = GridApproximation(transform, bbox, step=8, tolerance=tolerance)
+
+    x, y = np.meshgrid(np.arange(100.0), np.arange(40.0))
+    error = [np.max(np.abs(a - e)) for a, e in zip(approx(x, y), transform(x, y), strict=True)]
+
+    # the measured error bound holds everywhere, and the linear output is exact
+    assert np.all(np.array(error) <= np.array(approx.max_error) + 1e-12)
+    assert approx.max_error[1] < 1e-12
+    if tolerance is None:
+        assert approx.step == 8
+    else:
+        assert approx.step < 8
+        assert np.all(np.array(error) <= tolerance)
+
+    # points outside the grid are evaluated exactly
+    assert np.allclose(approx(200.0, 50.0), transform(200.0, 50.0))
+
+
+def test_grid_approximation_invalid_edges():
+    # the transform is only valid for x <= 50
+    xtab, ytab = np.arange(51.0), np.arange(10.0)
+    transform = Tabular2D(
+        points=(xtab, ytab),
+        lookup_table=1e-2 * xtab[:, np.newaxis] ** 2 + ytab,
+        bounds_error=False,
+        fill_value=np.nan,
+    )
+    approx = GridApproximation(transform, ((-0.5, 99.5), (-0.5, 9.5)), step=8)
+
+    x, y = np.meshgrid(np.arange(100.0), np.arange(10.0))
+    expected = transform(x, y)
+    result = approx(x, y)
+
+    assert np.array_equal(np.isnan(result), np.isnan(expected))
+    valid = ~np.isnan(expected)
+    assert np.max(np.abs(result[valid] - expected[valid])) <= approx.max_error[0] + 1e-12
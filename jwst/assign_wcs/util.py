@@ -32,6 +32,7 @@ __all__ = [
     "calc_rotation_matrix",
     "wrap_ra",
     "update_fits_wcsinfo",
+    "GridApproximation",
 ]
 
 
@@ -1019,6 +1020,167 @@ def in_ifu_slice(slice_wcs, ra, dec, lam):
     return onslice_ind
 
 
+class GridApproximation:
+    """
+    Bilinear lookup-grid approximation of a 2D detector transform.
+
+    The exact transform is evaluated once on a coarse grid of nodes spanning
+    the bounding box, every ``step`` pixels, and interpolated bilinearly
+    from these nodes afterwards. The approximation error is measured against
+    the exact transform at the center of every grid cell, where bilinear
+    interpolation of a smooth function deviates most from it, and is
+    reported in `max_error`. If a tolerance is given, the grid is refined
+    until the measured error is within the tolerance.
+
+    Grid cells with an invalid (NaN) node, e.g. at the edges of a slit,
+    or with an invalid exact value at the cell center, are never
+    interpolated: points falling in them, or outside the grid, are
+    evaluated with the exact transform.
+
+    Attributes
+    ----------
+    step : int
+        The spacing of the grid nodes, in pixels.
+    max_error : tuple of float
+        The maximum absolute error of the approximation for each output
+        of the transform, measured at the grid cell centers.
+    """
+
+    def __init__(self, transform, bounding_box, step=8, tolerance=None):
+        """
+        Build the lookup grid.
+
+        Parameters
+        ----------
+        transform : `~astropy.modeling.Model`
+            The transform to approximate, with two inputs (x, y in pixels).
+        bounding_box : tuple or `~astropy.modeling.bounding_box.ModelBoundingBox`
+            The bounding box, in pixels, over which the transform is evaluated.
+        step : int, optional
+            The initial spacing of the grid nodes, in pixels.
+        tolerance : float or sequence of float, optional
+            The maximum absolute error allowed for each output of the
+            transform. If the measured error exceeds it, the grid spacing
+            is halved until it does not, down to a spacing of 1 pixel,
+            which reproduces the exact transform at pixel centers.
+        """
+        if transform.n_inputs != 2:
+            raise ValueError("Only transforms with two inputs can be approximated.")
+        self.transform = transform
+
+        x, y = grid_from_bounding_box(bounding_box)
+        self._xrange = (x[0, 0], x[0, -1])
+        self._yrange = (y[0, 0], y[-1, 0])
+
+        if tolerance is not None:
+            tolerance = np.broadcast_to(tolerance, (transform.n_outputs,))
+        step = max(int(step), 1)
+        while True:
+            self._build(step)
+            if tolerance is None or step == 1 or np.all(np.array(self.max_error) <= tolerance):
+                break
+            step = max(step // 2, 1)
+        self.step = step
+
+    def _build(self, step):
+        """Evaluate the exact transform at the grid nodes and cell centers."""
+        self._xnodes = _grid_nodes(*self._xrange, step)
+        self._ynodes = _grid_nodes(*self._yrange, step)
+        xn, yn = np.meshgrid(self._xnodes, self._ynodes)
+        self._values = np.array(self.transform(xn, yn), dtype=float, ndmin=3)
+
+        # cells with any invalid node are evaluated exactly
+        invalid = np.any(np.isnan(self._values), axis=0)
+        self._exact_cells = (
+            invalid[:-1, :-1] | invalid[1:, :-1] | invalid[:-1, 1:] | invalid[1:, 1:]
+        )
+
+        # measure the error at the cell centers
+        xc, yc = np.meshgrid(
+            0.5 * (self._xnodes[:-1] + self._xnodes[1:]),
+            0.5 * (self._ynodes[:-1] + self._ynodes[1:]),
+        )
+        exact = np.array(self.transform(xc, yc), dtype=float, ndmin=3)
+        self._exact_cells |= np.any(np.isnan(exact), axis=0)
+        approx = self._interpolate(xc, yc)
+
+        valid = ~self._exact_cells
+        if np.any(valid):
+            self.max_error = tuple(
+                float(np.max(np.abs(a[valid] - e[valid])))
+                for a, e in zip(approx, exact, strict=True)
+            )
+        else:
+            self.max_error = (0.0,) * len(exact)
+
+    def _cell_index(self, x, y):
+        """Return the indices of the grid cells containing the input points."""
+        ix = np.clip(np.searchsorted(self._xnodes, x, side="right") - 1, 0, len(self._xnodes) - 2)
+        iy = np.clip(np.searchsorted(self._ynodes, y, side="right") - 1, 0, len(self._ynodes) - 2)
+        return ix, iy
+
+    def _interpolate(self, x, y):
+        """Bilinearly interpolate the transform values at the grid nodes."""
+        ix, iy = self._cell_index(x, y)
+        tx = (x - self._xnodes[ix]) / (self._xnodes[ix + 1] - self._xnodes[ix])
+        ty = (y - self._ynodes[iy]) / (self._ynodes[iy + 1] - self._ynodes[iy])
+        v = self._values
+        lower = (1 - tx) * v[:, iy, ix] + tx * v[:, iy, ix + 1]
+        upper = (1 - tx) * v[:, iy + 1, ix] + tx * v[:, iy + 1, ix + 1]
+        return (1 - ty) * lower + ty * upper
+
+    def __call__(self, x, y):
+        """
+        Evaluate the approximated transform.
+
+        Parameters
+        ----------
+        x, y : float or ndarray
+            Input pixel coordinates.
+
+        Returns
+        -------
+        tuple of ndarray
+            The approximated outputs of the transform.
+        """
+        x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+        shape = x.shape
+        x = x.ravel()
+        y = y.ravel()
+        result = self._interpolate(x, y)
+
+        ix, iy = self._cell_index(x, y)
+        exact = (
+            self._exact_cells[iy, ix]
+            | (x < self._xnodes[0])
+            | (x > self._xnodes[-1])
+            | (y < self._ynodes[0])
+            | (y > self._ynodes[-1])
+        )
+        if np.any(exact):
+            exact_values = self.transform(x[exact], y[exact])
+            if self.transform.n_outputs == 1:
+                exact_values = (exact_values,)
+            for output, value in zip(result, exact_values, strict=True):
+                output[exact] = value
+
+        result = result.reshape((len(result), *shape))
+        if self.transform.n_outputs == 1:
+            return result[0]
+        return tuple(result)
+
+
+def _grid_nodes(start, stop, step):
+    """Return nodes spaced by ``step`` from ``start``, always including ``stop``."""
+    nodes = np.arange(start, stop, step, dtype=float)
+    if len(nodes) == 0 or nodes[-1] < stop:
+        nodes = np.append(nodes, float(stop))
+    if len(nodes) == 1:
+        # a single row or column: add a node so that cells are defined
+        nodes = np.append(nodes, nodes[0] + 1.0)
+    return nodes
+
+
 def update_fits_wcsinfo(
     datamodel,
     max_pix_error=0.01,
@@ -1,12 +1,16 @@
 """Calculate bar shadow correction for science data sets."""
 
 import logging
+from functools import partial
 
 import numpy as np
 from gwcs import wcstools
 from scipy import ndimage
 from stdatamodels.jwst import datamodels
 
+from jwst.assign_wcs.util import GridApproximation
+from jwst.lib.pipe_utils import map_slits
+
 log = logging.getLogger(__name__)
 
 # Fallback value for ratio of slit spacing to slit height
@@ -30,6 +34,8 @@ def do_correction(
     inverse=False,
     source_type=None,
     correction_pars=None,
+    wcs_tolerance=None,
+    maximum_cores="1",
 ):
     """
     Correct MSA data for bar shadows.
@@ -46,6 +52,13 @@ def do_correction(
         Force processing using the specified source type.
     correction_pars : dict or None
         Correction parameters to use instead of recalculation.
+    wcs_tolerance : float or None
+        If set, the slit WCS is approximated by a bilinear lookup grid
+        instead of being evaluated exactly at every pixel, with a maximum
+        error of this many pixels of the bar shadow reference array.
+    maximum_cores : str
+        Number of threads to use for computing the slitlet corrections
+        in parallel. Can be an integer, 'none', 'quarter', 'half', or 'all'.
 
     Returns
     -------
@@ -71,16 +84,28 @@ def do_correction(
     # Create output as a copy of the input science data model
     output_model = input_model.copy()
 
+    # Compute the corrections for all the slits in the input model
+    if correction_pars:
+        slit_corrections = correction_pars.slits
+    else:
+        slit_corrections = map_slits(
+            partial(
+                _calc_correction,
+                barshadow_model=barshadow_model,
+                source_type=source_type,
+                wcs_tolerance=wcs_tolerance,
+            ),
+            output_model.slits,
+            maximum_cores=maximum_cores,
+        )
+
     # Loop over all the slits in the input model
     corrections = datamodels.MultiSlitModel()
     for slit_idx, slitlet in enumerate(output_model.slits):
         slitlet_number = slitlet.slitlet_id
         log.info(f"Working on slitlet {slitlet_number}")
 
-        if correction_pars:
-            correction = correction_pars.slits[slit_idx]
-        else:
-            correction = _calc_correction(slitlet, barshadow_model, source_type)
+        correction = slit_corrections[slit_idx]
         corrections.slits.append(correction)
 
         if correction is None:
@@ -119,7 +144,7 @@ def do_correction(
     return output_model, corrections
 
 
-def _calc_correction(slitlet, barshadow_model, source_type):
+def _calc_correction(slitlet, barshadow_model, source_type, wcs_tolerance=None):
     """
     Calculate the barshadow correction for a slitlet.
 
@@ -134,6 +159,10 @@ def _calc_correction(slitlet, barshadow_model, source_type):
     source_type : str or None
         Force processing using the specified source type.
 
+    wcs_tolerance : float or None
+        If set, approximate the slit WCS with a lookup grid, with a maximum
+        error of this many pixels of the bar shadow reference array.
+
     Returns
     -------
     correction : `~jwst.datamodels.SlitModel`
@@ -168,6 +197,16 @@ def _calc_correction(slitlet, barshadow_model, source_type):
 
     # Create the transformation from slit_frame to detector
     det2slit = slitlet.meta.wcs.get_transform("detector", "slit_frame")
+    if wcs_tolerance is not None:
+        # convert the tolerance from reference array pixels to slit_frame units;
+        # the x position in the slit is not used
+        yscale = SLITRATIO if slitlet.slit_yscale is None else slitlet.slit_yscale
+        tolerance = (np.inf, wcs_tolerance * y_increment * yscale, wcs_tolerance * wave_increment)
+        det2slit = GridApproximation(det2slit, slitlet.meta.wcs.bounding_box, tolerance=tolerance)
+        log.debug(
+            f"Approximating the slit WCS with a {det2slit.step} pixel grid, "
+            f"maximum error {det2slit.max_error}"
+        )
 
     # Use this transformation to calculate x, y, and wavelength
     xslit, yslit, wavelength = det2slit(x, y)
@@ -26,6 +26,8 @@ class BarShadowStep(Step):
     spec = """
         inverse = boolean(default=False)    # Invert the operation
         source_type = string(default=None)  # Process as specified source type.
+        wcs_tolerance = float(default=None, min=0)  # If set, approximate the slit WCS to this accuracy
+        maximum_cores = string(default='1')  # threads for slitlets. Can be an integer, 'half', 'quarter', or 'all'
     """  # noqa: E501
 
     reference_file_types = ["barshadow"]
@@ -78,6 +80,8 @@ class BarShadowStep(Step):
                     inverse=self.inverse,
                     source_type=self.source_type,
                     correction_pars=correction_pars,
+                    wcs_tolerance=self.wcs_tolerance,
+                    maximum_cores=self.maximum_cores,
                 )
 
                 if barshadow_model:
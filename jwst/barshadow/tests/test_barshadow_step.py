@@ -88,6 +88,33 @@ def test_barshadow_step(nirspec_mos_model):
     result.close()
 
 
+def test_barshadow_step_wcs_tolerance(nirspec_mos_model):
+    expected = BarShadowStep.call(nirspec_mos_model.copy())
+    result = BarShadowStep.call(nirspec_mos_model.copy(), wcs_tolerance=0.01)
+
+    for slit, expected_slit in zip(result.slits, expected.slits, strict=True):
+        assert slit.barshadow_corrected is True
+        np.testing.assert_array_equal(np.isnan(slit.barshadow), np.isnan(expected_slit.barshadow))
+        np.testing.assert_allclose(slit.barshadow, expected_slit.barshadow, atol=1e-3)
+
+    result.close()
+    expected.close()
+
+
+def test_barshadow_step_parallel(nirspec_mos_model):
+    expected = BarShadowStep.call(nirspec_mos_model.copy())
+    result = BarShadowStep.call(nirspec_mos_model.copy(), maximum_cores="2")
+
+    assert len(result.slits) == len(expected.slits)
+    for slit, expected_slit in zip(result.slits, expected.slits, strict=True):
+        assert slit.name == expected_slit.name
+        np.testing.assert_array_equal(slit.barshadow, expected_slit.barshadow)
+        np.testing.assert_array_equal(slit.data, expected_slit.data)
+
+    result.close()
+    expected.close()
+
+
 def test_barshadow_step_zero_length(nirspec_mos_model, log_watcher):
     model = nirspec_mos_model.copy()
     model.slits[0].shutter_state = ""
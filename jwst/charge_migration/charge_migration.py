@@ -5,6 +5,8 @@ import logging
 import numpy as np
 from stdatamodels.jwst.datamodels import dqflags
 
+from jwst.lib import pipe_utils
+
 log = logging.getLogger(__name__)
 
 GOOD = dqflags.group["GOOD"]
@@ -16,7 +18,7 @@ CHLO_DNU = CHLO + DNU
 __all__ = ["charge_migration", "flag_pixels"]
 
 
-def charge_migration(output_model, signal_threshold):
+def charge_migration(output_model, signal_threshold, maximum_cores="1"):
     """
     Correct for charge migration.
 
@@ -26,6 +28,9 @@ def charge_migration(output_model, signal_threshold):
         The input science data to be corrected.
     signal_threshold : float
         Science value above which a group will be flagged as CHARGELOSS.
+    maximum_cores : str, optional
+        Number of processes used to flag the integrations. Can be an
+        integer, 'none', 'quarter', 'half', or 'all'.
 
     Returns
     -------
@@ -38,7 +43,9 @@ def charge_migration(output_model, signal_threshold):
 
     log.info("Using signal_threshold: %.2f", signal_threshold)
 
-    gdq_new = flag_pixels(data, gdq, signal_threshold)
+    gdq_new = pipe_utils.map_integrations(
+        flag_pixels, data, gdq, maximum_cores=maximum_cores, signal_threshold=signal_threshold
+    )
 
     # Save the flags in the output GROUPDQ array
     output_model.groupdq = gdq_new
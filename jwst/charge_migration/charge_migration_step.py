@@ -19,6 +19,7 @@ class ChargeMigrationStep(Step):
     spec = """
         signal_threshold = float(default=25000)
         skip = boolean(default=True)
+        maximum_cores = string(default='1') # cores for multiprocessing. Can be an integer, 'half', 'quarter', or 'all'
     """  # noqa: E501
 
     def process(self, step_input):
@@ -49,7 +50,9 @@ class ChargeMigrationStep(Step):
             # Retrieve the parameter value(s)
             signal_threshold = self.signal_threshold
 
-            result = charge_migration.charge_migration(result, signal_threshold)
+            result = charge_migration.charge_migration(
+                result, signal_threshold, maximum_cores=self.maximum_cores
+            )
             result.meta.cal_step.charge_migration = "COMPLETE"
 
         return result
@@ -256,6 +256,21 @@ def test_too_few_groups():
     assert ramp_model.meta.cal_step.charge_migration is None
 
 
+def test_maximum_cores():
+    """Flagging the integrations in parallel processes gives the same flags."""
+    ngroups, nints, nrows, ncols = 5, 4, 6, 7
+    ramp_model, pixdq, groupdq, err = create_mod_arrays(ngroups, nints, nrows, ncols)
+    rng = np.random.default_rng(42)
+    ramp_model.data[:] = rng.uniform(0, 35000, ramp_model.data.shape)
+    ramp_model.groupdq[rng.random(ramp_model.groupdq.shape) < 0.1] = DNU
+
+    serial = charge_migration(ramp_model.copy(), 30000.0)
+    parallel = charge_migration(ramp_model.copy(), 30000.0, maximum_cores="2")
+
+    npt.assert_array_equal(parallel.groupdq, serial.groupdq)
+    assert np.any(serial.groupdq & CHLO)
+
+
 def create_mod_arrays(ngroups, nints, nrows, ncols):
     """
     For an input datacube (NIRISS), create arrays having
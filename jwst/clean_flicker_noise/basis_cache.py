@@ -0,0 +1,194 @@
+"""Cache of the Fourier fitting operators used to clean flicker noise."""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+__all__ = ["BasisCache", "get_basis_cache"]
+
+# Cache of the fitting operators shared by all the cleaners of this process
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+class BasisCache:
+    """
+    Cache of the Fourier fitting operators of the NSClean cleaners.
+
+    The Fourier basis, weights and matrix inverses used to fit the
+    background depend only on the image shape, the fitting parameters
+    and the mask of background pixels, and the mask rarely changes
+    between the groups of an integration.  Operators are keyed by a
+    digest of the mask and the parameters, and the least recently used
+    operators are evicted once ``max_bytes`` is exceeded.
+    """
+
+    def __init__(self, max_bytes=2**28):
+        """
+        Initialize the cache.
+
+        Parameters
+        ----------
+        max_bytes : int, optional
+            Maximum total size of the operators kept in memory.
+        """
+        self.max_bytes = max_bytes
+        self._operators = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._operators)
+
+    @staticmethod
+    def make_key(mask, *params):
+        """
+        Compute the cache key for the operators built from a mask.
+
+        Parameters
+        ----------
+        mask : ndarray of bool or None
+            The mask of background pixels, or None for operators that
+            depend only on the parameters.
+        *params : tuple
+            Any other values the operators depend on, e.g. the image
+            shape and the filter definition.
+
+        Returns
+        -------
+        str
+            A hexadecimal digest identifying the operators.
+        """
+        digest = hashlib.sha256()
+        digest.update(repr(params).encode())
+        if mask is not None:
+            mask = np.ascontiguousarray(mask, dtype=np.bool_)
+            digest.update(repr(mask.shape).encode())
+            digest.update(mask.tobytes())
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        Retrieve cached operators.
+
+        Parameters
+        ----------
+        key : str or tuple
+            The key returned by `make_key`, possibly combined with other
+            hashable values.
+
+        Returns
+        -------
+        tuple or None
+            The read-only operator arrays, or None if they are not in
+            the cache.
+        """
+        with self._lock:
+            operators = self._operators.get(key)
+            if operators is not None:
+                self._operators.move_to_end(key)
+            return operators
+
+    def put(self, key, operators):
+        """
+        Store operators.
+
+        The arrays are stored as they are and made read-only, so they
+        must not be modified afterwards.
+
+        Parameters
+        ----------
+        key : str or tuple
+            The key returned by `make_key`, possibly combined with other
+            hashable values.
+        operators : tuple
+            The operator arrays and values.
+        """
+        nbytes = _operators_nbytes(operators)
+        if nbytes > self.max_bytes:
+            return
+        for value in operators:
+            if isinstance(value, np.ndarray):
+                value.flags.writeable = False
+        with self._lock:
+            if key in self._operators:
+                self._nbytes -= _operators_nbytes(self._operators.pop(key))
+            self._operators[key] = operators
+            self._nbytes += nbytes
+            while self._nbytes > self.max_bytes:
+                _, evicted = self._operators.popitem(last=False)
+                self._nbytes -= _operators_nbytes(evicted)
+
+    def cached(self, key, compute):
+        """
+        Retrieve cached operators, computing and storing them if needed.
+
+        Parameters
+        ----------
+        key : str or tuple
+            The key returned by `make_key`, possibly combined with other
+            hashable values.
+        compute : callable
+            Function called without arguments to compute the operators
+            if they are not in the cache.
+
+        Returns
+        -------
+        tuple
+            The operators.
+        """
+        operators = self.get(key)
+        if operators is None:
+            operators = compute()
+            self.put(key, operators)
+        return operators
+
+    def clear(self):
+        """Remove all the operators from the cache."""
+        with self._lock:
+            self._operators.clear()
+            self._nbytes = 0
+
+
+def get_basis_cache():
+    """
+    Return the basis cache shared by the cleaners of this process.
+
+    Returns
+    -------
+    BasisCache
+        The shared cache.
+    """
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = BasisCache()
+        return _shared_cache
+
+
+def _operators_nbytes(operators):
+    """
+    Compute the total size of the arrays of cached operators.
+
+    Parameters
+    ----------
+    operators : tuple
+        The operators.
+
+    Returns
+    -------
+    int
+        The number of bytes.
+    """
+    return sum(value.nbytes for value in operators if isinstance(value, np.ndarray))
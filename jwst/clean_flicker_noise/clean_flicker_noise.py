@@ -1,5 +1,8 @@
 import logging
+import multiprocessing as mp
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 
 import gwcs
 import numpy as np
@@ -8,6 +11,7 @@ from astropy.utils.exceptions import AstropyUserWarning
 from gwcs.utils import _toindex
 from photutils.background import Background2D, MedianBackground
 from scipy.optimize import curve_fit
+from stcal.multiprocessing import compute_num_cores
 from stdatamodels.jwst.datamodels import dqflags
 
 from jwst import datamodels
@@ -371,6 +375,21 @@ def clip_to_background(
         If set, DEBUG level messages are issued with details on the
         computed statistics.
     """
+    with _ignore_stats_warnings():
+        _clip_to_background(
+            image, mask, sigma_lower, sigma_upper, fit_histogram, lower_half_only, verbose
+        )
+
+
+def _clip_to_background(
+    image, mask, sigma_lower, sigma_upper, fit_histogram, lower_half_only, verbose
+):
+    """
+    Flag signal and bad pixels in the image mask, without suppressing warnings.
+
+    See `clip_to_background` for a description of the parameters. Warnings
+    from the statistics computations must be handled by the caller.
+    """
     # Use float64 for stats computations
     image = image.astype(np.float64)
 
@@ -382,10 +401,7 @@ def clip_to_background(
         return
 
     # Initial iterative sigma clip
-    with warnings.catch_warnings():
-        warnings.filterwarnings(action="ignore", category=AstropyUserWarning)
-        warnings.filterwarnings("ignore", category=RuntimeWarning, message=".* slice")
-        mean, median, sigma = sigma_clipped_stats(image, mask=~mask, sigma=sigma_limit)
+    mean, median, sigma = sigma_clipped_stats(image, mask=~mask, sigma=sigma_limit)
     if fit_histogram:
         center = mean
     else:
@@ -404,9 +420,7 @@ def clip_to_background(
         )
 
         # Redo stats on lower half of distribution
-        with warnings.catch_warnings():
-            warnings.filterwarnings(action="ignore", category=AstropyUserWarning)
-            mean, median, sigma = sigma_clipped_stats(data_for_stats, sigma=sigma_limit)
+        mean, median, sigma = sigma_clipped_stats(data_for_stats, sigma=sigma_limit)
         if fit_histogram:
             center = mean
         else:
@@ -630,6 +644,22 @@ def background_level(image, mask, background_method="median", background_box_siz
         is 'median' or None, or an array matching the input image size
         if `background_method` is 'model'.
     """
+    with _ignore_stats_warnings():
+        return _background_level(image, mask, background_method, background_box_size)
+
+
+def _background_level(image, mask, background_method, background_box_size):
+    """
+    Fit a low-resolution background level, without suppressing warnings.
+
+    See `background_level` for a description of the parameters. Warnings
+    from the background fit must be handled by the caller.
+
+    Returns
+    -------
+    background : float or array-like of float
+        The background level.
+    """
     if background_method is None:
         background = 0.0
 
@@ -639,8 +669,14 @@ def background_level(image, mask, background_method="median", background_box_siz
 
         # Flag more signal in the background subtracted image,
         # with sigma set by the lower half of the distribution only
-        clip_to_background(
-            image, mask, sigma_lower=sigma_limit, sigma_upper=sigma_limit, lower_half_only=True
+        _clip_to_background(
+            image,
+            mask,
+            sigma_lower=sigma_limit,
+            sigma_upper=sigma_limit,
+            fit_histogram=False,
+            lower_half_only=True,
+            verbose=False,
         )
 
         if background_method == "model":
@@ -669,16 +705,14 @@ def background_level(image, mask, background_method="median", background_box_siz
                 )
 
             try:
-                with warnings.catch_warnings():
-                    warnings.filterwarnings(action="ignore", category=AstropyUserWarning)
-                    bkg = Background2D(
-                        image,
-                        box_size=background_box_size,
-                        filter_size=(5, 5),
-                        mask=~mask,
-                        sigma_clip=sigma_clip_for_bkg,
-                        bkg_estimator=bkg_estimator,
-                    )
+                bkg = Background2D(
+                    image,
+                    box_size=background_box_size,
+                    filter_size=(5, 5),
+                    mask=~mask,
+                    sigma_clip=sigma_clip_for_bkg,
+                    bkg_estimator=bkg_estimator,
+                )
                 background = bkg.background
             except ValueError:
                 log.error("Background fit failed, using median value.")
@@ -975,6 +1009,22 @@ def median_clean(image, mask, axis_to_correct, fit_by_channel=False):
     return corrected_image
 
 
+@contextmanager
+def _ignore_stats_warnings():
+    """
+    Ignore expected warnings from statistics on masked and clipped data.
+
+    Yields
+    ------
+    None
+        Warnings are ignored while the context is active.
+    """
+    with warnings.catch_warnings():
+        warnings.filterwarnings(action="ignore", category=AstropyUserWarning)
+        warnings.filterwarnings("ignore", category=RuntimeWarning, message=".* slice")
+        yield
+
+
 def _check_input(exp_type, fit_method):
     """
     Check for valid input data and options.
@@ -1380,7 +1430,7 @@ def _clean_one_image(
         background = 0.0
         bkg_sub = image
     else:
-        background = background_level(
+        background = _background_level(
             image,
             mask,
             background_method=background_method,
@@ -1391,8 +1441,14 @@ def _clean_one_image(
 
         # Flag more signal in the background subtracted image,
         # with sigma set by the lower half of the distribution only
-        clip_to_background(
-            bkg_sub, mask, sigma_lower=n_sigma, sigma_upper=n_sigma, lower_half_only=True
+        _clip_to_background(
+            bkg_sub,
+            mask,
+            sigma_lower=n_sigma,
+            sigma_upper=n_sigma,
+            fit_histogram=False,
+            lower_half_only=True,
+            verbose=False,
         )
 
     # Clean the noise
@@ -1457,6 +1513,7 @@ def do_correction(
     save_mask=False,
     save_background=False,
     save_noise=False,
+    maximum_cores="1",
 ):
     """
     Apply the 1/f noise correction.
@@ -1524,6 +1581,10 @@ def do_correction(
     save_noise : bool, optional
         Switch to indicate whether the fit noise should be saved.
 
+    maximum_cores : str, optional
+        Number of threads used to clean the integrations and groups.
+        Can be an integer, 'none', 'quarter', 'half', or 'all'.
+
     Returns
     -------
     output_model : `~jwst.datamodels.JwstDataModel`
@@ -1598,81 +1659,99 @@ def do_correction(
     else:
         background_to_save = None
 
-    # Loop over integrations and groups (even if there's only 1)
-    for i in range(nints):
-        log.debug(f"Working on integration {i + 1}")
-        for j in range(ngroups):
-            log.debug(f"Working on group {j + 1}")
+    def clean_image(i, j):
+        log.debug(f"Working on integration {i + 1}, group {j + 1}")
 
-            # Copy the scene mask, for further flagging
-            if background_mask.ndim == 3:
-                mask = background_mask[i].copy()
-            else:
-                mask = background_mask.copy()
+        # Copy the scene mask, for further flagging
+        if background_mask.ndim == 3:
+            mask = background_mask[i].copy()
+        else:
+            mask = background_mask.copy()
 
-            # Get the relevant image data
-            if ndim == 2:
-                image = input_model.data
-            elif ndim == 3:
-                image = input_model.data[i]
-            else:
-                # Ramp data input:
-                # subtract the current group from the next one
-                image = input_model.data[i, j + 1] - input_model.data[i, j]
-                dq = input_model.groupdq[i, j + 1]
-
-                # Mask any DNU and JUMP pixels
-                _mask_unusable(mask, dq)
-
-            # Clean the image
-            cleaned_image, background, success = _clean_one_image(
-                image,
-                mask,
-                background_method,
-                background_box_size,
-                n_sigma,
-                fit_method,
-                detector,
-                fc,
-                axis_to_correct,
-                fit_by_channel,
-                flat,
-            )
+        # Get the relevant image data
+        if ndim == 2:
+            image = input_model.data
+        elif ndim == 3:
+            image = input_model.data[i]
+        else:
+            # Ramp data input:
+            # subtract the current group from the next one
+            image = input_model.data[i, j + 1] - input_model.data[i, j]
+            dq = input_model.groupdq[i, j + 1]
 
-            if not success:
-                # Cleaning failed for internal reasons - probably the
-                # mask is not a good match to the data.
-                log.error(f"Cleaning failed for integration {i + 1}, group {j + 1}")
+            # Mask any DNU and JUMP pixels
+            _mask_unusable(mask, dq)
 
-                # Restore input data to make sure any partial changes
-                # are thrown away
-                output_model.data = input_model.data.copy()
-                return output_model, None, None, None, status
+        # Clean the image
+        return _clean_one_image(
+            image,
+            mask,
+            background_method,
+            background_box_size,
+            n_sigma,
+            fit_method,
+            detector,
+            fc,
+            axis_to_correct,
+            fit_by_channel,
+            flat,
+        )
 
-            if cleaned_image is None:
-                # Cleaning did not proceed because the image is bad:
-                # leave it as is but continue correcting the rest
-                log.warning(
-                    f"No usable data in integration {i + 1}, group {j + 1}. "
-                    f"Skipping correction for this image."
-                )
-                continue
-
-            # Store the cleaned image in the output model
-            if ndim == 2:
-                output_model.data = cleaned_image
-                if save_background:
-                    background_to_save[:] = background
-            elif ndim == 3:
-                output_model.data[i] = cleaned_image
-                if save_background:
-                    background_to_save[i] = background
-            else:
-                # Add the cleaned data diff to the previously cleaned group,
-                # rather than the noisy input group
-                output_model.data[i, j + 1] = output_model.data[i, j] + cleaned_image
-                if save_background:
-                    background_to_save[i, j + 1] = background
+    # Loop over integrations and groups (even if there's only 1).
+    # The images are cleaned independently, so they can be cleaned in
+    # parallel threads, but they are stored in order, since each cleaned
+    # group is added to the previously cleaned one.
+    images = [(i, j) for i in range(nints) for j in range(ngroups)]
+    nthreads = compute_num_cores(str(maximum_cores), len(images), mp.cpu_count())
+    if nthreads > 1:
+        log.info(f"Cleaning {len(images)} images using {nthreads} threads")
+
+    # Warning filters are process-wide and not thread-safe to modify,
+    # so they are set once around all the image cleaning
+    with _ignore_stats_warnings(), ThreadPoolExecutor(nthreads) as executor:
+        map_images = executor.map if nthreads > 1 else map
+
+        # Submit a limited number of images at a time, so that only a few
+        # cleaned images are held in memory
+        batch_size = 2 * nthreads
+        for start in range(0, len(images), batch_size):
+            batch = images[start : start + batch_size]
+            results = map_images(clean_image, *zip(*batch, strict=True))
+            for (i, j), (cleaned_image, background, success) in zip(batch, results, strict=True):
+                if not success:
+                    # Cleaning failed for internal reasons - probably the
+                    # mask is not a good match to the data.
+                    log.error(f"Cleaning failed for integration {i + 1}, group {j + 1}")
+
+                    # Restore input data to make sure any partial changes
+                    # are thrown away
+                    output_model.data = input_model.data.copy()
+                    return output_model, None, None, None, status
+
+                if cleaned_image is None:
+                    # Cleaning did not proceed because the image is bad:
+                    # leave it as is but continue correcting the rest
+                    log.warning(
+                        f"No usable data in integration {i + 1}, group {j + 1}. "
+                        f"Skipping correction for this image."
+                    )
+                    continue
+
+                # Store the cleaned image in the output model
+                if ndim == 2:
+                    output_model.data = cleaned_image
+                    if save_background:
+                        background_to_save[:] = background
+                elif ndim == 3:
+                    output_model.data[i] = cleaned_image
+                    if save_background:
+                        background_to_save[i] = background
+                else:
+                    # Add the cleaned data diff to the previously cleaned group,
+                    # rather than the noisy input group
+                    output_model.data[i, j + 1] = output_model.data[i, j] + cleaned_image
+                    if save_background:
+                        background_to_save[i, j + 1] = background
 
     # Store the background image in a model, if requested
     if save_background:
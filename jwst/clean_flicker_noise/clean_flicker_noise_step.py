@@ -30,6 +30,7 @@ class CleanFlickerNoiseStep(Step):
         save_mask = boolean(default=False)  # Save the created mask
         save_background = boolean(default=False)  # Save the fit background
         save_noise = boolean(default=False)  # Save the fit noise
+        maximum_cores = string(default='1')  # cores for multithreading. Can be an integer, 'half', 'quarter', or 'all'
         skip = boolean(default=True)  # By default, skip the step.
     """  # noqa: E501
 
@@ -136,6 +137,7 @@ class CleanFlickerNoiseStep(Step):
                 save_mask=self.save_mask,
                 save_background=self.save_background,
                 save_noise=self.save_noise,
+                maximum_cores=self.maximum_cores,
             )
             output_model, mask_model, background_model, noise_model, status = result
 
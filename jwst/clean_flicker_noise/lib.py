@@ -1,5 +1,7 @@
 import numpy as np
 
+from jwst.clean_flicker_noise.basis_cache import BasisCache, get_basis_cache
+
 __all__ = ["NSClean", "make_lowpass_filter", "med_abs_deviation", "NSCleanSubarray"]
 
 
@@ -26,6 +28,7 @@ class NSClean:
         buffer_sigma=1.5,
         sigrej=3.0,
         weights_kernel_sigma=32,
+        basis_cache=None,
     ):
         """
         JWST NIRSpec background modeling and subtraction -AKA "clean" (NSClean).
@@ -60,6 +63,12 @@ class NSClean:
 
         weights_kernel_sigma : int
             Used to assign weights for MASK mode fitting.
+
+        basis_cache : BasisCache or None, optional
+            Cache of the filters, weights and fitting operators, which depend
+            only on the mask, the image shape and the parameters above.
+            If None, the cache shared by all the cleaners of this process
+            is used.
         """
         self.detector = detector
         self.mask = mask
@@ -68,6 +77,9 @@ class NSClean:
         self.buffer_sigma = buffer_sigma
         self.sigrej = sigrej
         self.weights_kernel_sigma = weights_kernel_sigma
+        if basis_cache is None:
+            basis_cache = get_basis_cache()
+        self.basis_cache = basis_cache
 
         # Transpose and flip mask to detector coordinates with the IRS2
         # zipper running along the bottom as displayed in ds9.
@@ -84,17 +96,53 @@ class NSClean:
         # FFT frequencies
         self.rfftfreq = np.fft.rfftfreq(self.ny)
 
+        # The filters and kernels depend only on the image shape and the
+        # parameters, the weights also depend on the mask.
+        kernels_key = BasisCache.make_key(
+            None,
+            "NSClean",
+            self.ny,
+            self.nx,
+            self.fc,
+            self.kill_width,
+            self.buffer_sigma,
+            self.weights_kernel_sigma,
+        )
+        self._mask_key = BasisCache.make_key(
+            self.mask, "NSClean", self.nx, self.weights_kernel_sigma
+        )
+        self.apodizer, weight_fft, self.fgkern = self.basis_cache.cached(
+            kernels_key, self._make_kernels
+        )
+        (self.p_matrix,) = self.basis_cache.cached(
+            (self._mask_key, "weights"), lambda: self._make_weights(weight_fft)
+        )
+        self.nvec = np.sum(self.apodizer > 0)  # Project out this many frequencies
+
+    def _make_kernels(self):
+        """
+        Build the low pass filter and the weighting and buffing kernels.
+
+        Returns
+        -------
+        apodizer : ndarray
+            The low pass filter.
+        weight_fft : ndarray
+            The Fourier transform of the kernel used to approximate the
+            local background sample density.
+        fgkern : ndarray
+            The Fourier transform of the buffing kernel.
+        """
         # Extract other necessary information from model_parameters and build the
         # low pass filter. This also sets the number of Fourier vectors that
         # we need to project out.
-        self.apodizer = np.array(make_lowpass_filter(self.fc, self.kill_width, self.nx))
-        self.nvec = np.sum(self.apodizer > 0)  # Project out this many frequencies
+        apodizer = np.array(make_lowpass_filter(self.fc, self.kill_width, self.nx))
 
-        # Only MASK mode uses a weighted fit. Compute the weights here. The aim is
-        # to weight by the reciprocal of the local background sample density along
-        # each line. Roughly approximate the local density, P, using the reciprocal of
-        # convolution by a Gaussian kernel for now. For now, hard code the kernel. We
-        # will optimize this later.
+        # Only MASK mode uses a weighted fit. Build the kernel for the weights here.
+        # The aim is to weight by the reciprocal of the local background sample
+        # density along each line. Roughly approximate the local density, P, using
+        # the reciprocal of convolution by a Gaussian kernel for now. For now, hard
+        # code the kernel. We will optimize this later.
         _weight = np.zeros((self.ny, self.nx), dtype=np.float32)  # Build the kernel here
         _x = np.arange(self.nx)
         _mu = self.nx // 2 + 1
@@ -102,17 +150,7 @@ class NSClean:
         _weight[self.ny // 2 + 1] = (
             np.exp(-((_x - _mu) ** 2) / _sigma**2 / 2) / _sigma / np.sqrt(2 * np.pi)
         )
-        _weight_fft = np.fft.rfft2(np.fft.ifftshift(_weight))
-        with np.errstate(divide="ignore"):
-            self.p_matrix = 1 / np.fft.irfft2(
-                np.fft.rfft2(np.array(self.mask, dtype=np.float32)) * _weight_fft,
-                (self.ny, self.nx),
-            )
-        # Illuminated areas carry no weight
-        self.p_matrix = np.where(self.mask, self.p_matrix, 0.0)
-
-        # Set bad weights to zero
-        self.p_matrix[~np.isfinite(self.p_matrix)] = 0.0
+        weight_fft = np.fft.rfft2(np.fft.ifftshift(_weight))
 
         # Build a 1-dimensional Gaussian kernel for "buffing". Buffing is in the
         # dispersion direction only. In detector coordinates, this is axis zero.
@@ -130,7 +168,75 @@ class NSClean:
         gkern = np.fft.ifftshift(gkern)  # Shift for Numpy
 
         # FFT for fast convolution
-        self.fgkern = np.array(np.fft.rfft2(gkern), dtype=np.complex64)
+        fgkern = np.array(np.fft.rfft2(gkern), dtype=np.complex64)
+
+        return apodizer, weight_fft, fgkern
+
+    def _make_weights(self, weight_fft):
+        """
+        Compute the weights of the background pixels.
+
+        Parameters
+        ----------
+        weight_fft : ndarray
+            The Fourier transform of the kernel used to approximate the
+            local background sample density.
+
+        Returns
+        -------
+        tuple of ndarray
+            The weights, zero for pixels not used in the fit.
+        """
+        with np.errstate(divide="ignore"):
+            p_matrix = 1 / np.fft.irfft2(
+                np.fft.rfft2(np.array(self.mask, dtype=np.float32)) * weight_fft,
+                (self.ny, self.nx),
+            )
+        # Illuminated areas carry no weight
+        p_matrix = np.where(self.mask, p_matrix, 0.0)
+
+        # Set bad weights to zero
+        p_matrix[~np.isfinite(p_matrix)] = 0.0
+
+        return (p_matrix,)
+
+    def _make_line_operators(self):
+        """
+        Compute the matrices solving for the Fourier transform of each line.
+
+        The background of each line is fitted with the weighted least
+        squares solution for the first ``nvec`` Fourier vectors,
+        ``(B^H P^2 B)^{-1} B^H P^2 d``, where B is the Fourier basis
+        evaluated at the background pixels of the line and P the diagonal
+        matrix of their weights.  ``B^H P^2 d`` is the FFT of the weighted
+        line, and ``B^H P^2 B`` is the Hermitian Toeplitz matrix built
+        from the FFT of the squared weights, so only its inverse needs to
+        be kept for each line.
+
+        Returns
+        -------
+        lines : ndarray of int
+            The fitted lines: all lines but the four at each edge, skipping
+            lines with no background pixels.
+        line_inverse : ndarray of complex
+            The inverse of ``B^H P^2 B`` for each fitted line, with shape
+            (len(lines), nvec, nvec).
+        """
+        lines = np.arange(self.ny)[4:-4]
+        lines = lines[np.any(self.mask[lines], axis=1)]
+
+        weights_fft = np.fft.rfft(self.p_matrix[lines] ** 2, axis=1)[:, : self.nvec]
+
+        # (B^H P^2 B)[k, l] = sum_m p_m^2 exp(2 pi i m (l - k) / nx)
+        offset = np.arange(self.nvec)[np.newaxis, :] - np.arange(self.nvec)[:, np.newaxis]
+        normal_matrix = np.where(
+            offset >= 0,
+            np.conjugate(weights_fft[:, np.abs(offset)]),
+            weights_fft[:, np.abs(offset)],
+        )
+        line_inverse = np.linalg.inv(normal_matrix)
+
+        return lines, line_inverse
 
     def fit(self, data):
         """
@@ -139,84 +245,59 @@ class NSClean:
         Parameters
         ----------
         data : float array
-            A NIRSpec image. The image must be in the detector-space
+            A NIRSpec image, or a stack of images sharing the mask, with
+            shape (..., ny, nx). The images must be in the detector-space
             orientation with the IRS2 zipper running along the bottom as
             displayed in SAOImage DS9.
 
         Returns
         -------
         bkg : float array
-            The fitted background model.
+            The fitted background model, with the same shape as the data.
 
         Notes
         -----
         Fitting is done line by line because the matrices get very big if one
         tries to project out Fourier vectors from the entire 2K x 2K image area.
+        The lines of all the images are solved together, with the matrices for
+        each line computed once for the mask and reused for all the images.
         """
-        model = np.zeros((self.ny, self.nx), dtype=np.float32)  # Build the model here
-        for y in np.arange(self.ny)[4:-4]:
-            # Get data and weights for this line
-            d = data[y][self.mask[y]]  # unmasked (usable) data
-            # The line below uses a vector to represent a diagonal weight matrix.
-            # Multiplications by this vector later on may be viewed as
-            # equivalent formulations to multiplication by diag(p).
-            p = self.p_matrix[y][self.mask[y]]  # Weights
-
-            # If none of the pixels in this line is usable (all masked out),
-            # skip and move on to the next line.
-            if len(d) == 0:
-                continue
-
-            # Fill statistical outliers with line median. We know that the rolling
-            # median cleaning technique worked reasonably well, so this is a fast
-            # justifiable approximation.
-            _mu = np.median(d)  # Robust estimate of mean
-            _sigma = 1.4826 * np.median(np.abs(d - _mu))  # Robust estimate of standard deviation
-
-            # Fill outliers
-            d = np.where(
-                np.logical_and(_mu - self.sigrej * _sigma <= d, d <= _mu + self.sigrej * _sigma),
-                d,
-                _mu,
-            )
-
-            # Build the Fourier basis matrix for this line
-            # Must be a column vector to broadcast
-            m = np.arange(self.nx)[self.mask[y]].reshape((-1, 1))
-            # Must be a row vector to broadcast. We can optimize
-            # the code later by putting this into object instantiation
-            # since it is the same for every line. For now, leave it
-            # here since the cost is negligible and it may aid
-            # comprehension.
-            k = np.arange(self.nvec).reshape((1, -1))
-
-            # Build the basis matrix
-            basis = np.array(
-                np.exp(2 * np.pi * 1j * m * k / self.nx) / m.shape[0], dtype=np.complex64
-            )
-
-            # Compute the Moore-Penrose inverse of A = P*B.
-            #     $A^+ = (A^H A)^{-1} A^H$
-            _a = basis * p[:, np.newaxis]
-            _a_h = np.conjugate(_a.transpose())  # Hermitian transpose of A
-            pinv_pb = np.matmul(np.linalg.inv(np.matmul(_a_h, _a)), _a_h)
+        lines, line_inverse = self.basis_cache.cached(
+            (self._mask_key, "line operators", self.nvec), self._make_line_operators
+        )
+        mask = self.mask[lines]
+        d = data[..., lines, :]
+
+        # Fill statistical outliers with line median. We know that the rolling
+        # median cleaning technique worked reasonably well, so this is a fast
+        # justifiable approximation.
+        _mu = _masked_line_median(d, mask)  # Robust estimate of mean
+        _sigma = 1.4826 * _masked_line_median(np.abs(d - _mu), mask)  # Robust standard deviation
+
+        # Fill outliers; pixels not used in the fit carry no weight.
+        d = np.where(
+            np.logical_and(_mu - self.sigrej * _sigma <= d, d <= _mu + self.sigrej * _sigma),
+            d,
+            _mu,
+        )
+        d = np.where(mask, d, 0.0)
 
-            # Solve for the Fourier transform of this line's background samples.
-            # The way that we have done it, this multiplies the input data by the
-            # number of samples used for the fit.
-            rfft = np.zeros(self.nx // 2 + 1, dtype=np.complex64)
-            rfft[: k.shape[1]] = np.matmul(pinv_pb, p * d)
+        # Solve for the Fourier transform of each line's background samples.
+        rfft = np.zeros(d.shape[:-1] + (self.nx // 2 + 1,), dtype=np.complex128)
+        weighted_fft = np.fft.rfft(self.p_matrix[lines] ** 2 * d, axis=-1)[..., : self.nvec]
+        rfft[..., : self.nvec] = np.matmul(line_inverse, weighted_fft[..., np.newaxis])[..., 0]
 
-            # Numpy requires that the forward transform multiply
-            # the data by n. Correct normalization.
-            rfft *= self.nx / m.shape[0]
+        # Numpy requires that the forward transform multiply
+        # the data by n. Correct normalization.
+        rfft *= self.nx
 
-            # Apodize if necessary
-            if self.kill_width > 0:
-                rfft[: self.nvec] *= self.apodizer[: self.nvec]
+        # Apodize if necessary
+        if self.kill_width > 0:
+            rfft[..., : self.nvec] *= self.apodizer[: self.nvec]
 
-            # Invert the FFT to build the background model for this line
-            model[y] = np.fft.irfft(rfft, self.nx)
+        # Invert the FFT to build the background model for each line
+        model = np.zeros(data.shape, dtype=np.float32)  # Build the model here
+        model[..., lines, :] = np.fft.irfft(rfft, self.nx, axis=-1)
 
         # Done!
         return model
@@ -242,6 +323,8 @@ class NSClean:
         ----------
         data : array-like
             The input data. This should be the normal end result of Stage 1 processing.
+            A stack of images sharing the mask, e.g. the groups of an integration,
+            can be cleaned at once by stacking them along the first axes.
 
         buff : bool
             "Buff" the fitted spectrum by applying a slight Gaussian blur
@@ -255,31 +338,57 @@ class NSClean:
         # Transform the data to detector space with the IRS2 zipper running along the bottom.
         if self.detector == "NRS2":
             # Transpose and flip for NRS2
-            data = data.transpose()[::-1]
+            data = np.swapaxes(data, -1, -2)[..., ::-1, :]
         else:
             # Transpose (no flip) for NRS1
-            data = data.transpose()
+            data = np.swapaxes(data, -1, -2)
 
         # Fit the background model
         bkg = self.fit(data)  # Background model
 
         # Buff, if requested
         if buff:
-            bkg = np.fft.irfft2(np.fft.rfft2(bkg) * self.fgkern, s=bkg.shape)
+            bkg = np.fft.irfft2(np.fft.rfft2(bkg) * self.fgkern, s=bkg.shape[-2:])
 
         # Subtract the background model from the data
         data -= bkg
 
         # Transform back to DMS space
         if self.detector == "NRS2":
-            data = data[::-1].transpose()
+            data = np.swapaxes(data[..., ::-1, :], -1, -2)
         else:
-            data = data.transpose()
+            data = np.swapaxes(data, -1, -2)
 
         # Done
         return data
 
 
+def _masked_line_median(data, mask):
+    """
+    Compute the median of the masked pixels of each line.
+
+    Parameters
+    ----------
+    data : ndarray
+        The data, with shape (..., ny, nx).
+    mask : ndarray of bool
+        The pixels to use, with shape (ny, nx).  Each line must have
+        at least one pixel set.
+
+    Returns
+    -------
+    ndarray
+        The median of each line, with shape (..., ny, 1), matching
+        `numpy.median` of the masked pixels.
+    """
+    # Unused pixels are sorted to the end of each line
+    data = np.sort(np.where(mask, data, np.nan), axis=-1)
+    count = np.broadcast_to(np.sum(mask, axis=-1, keepdims=True), data.shape[:-1] + (1,))
+    low = np.take_along_axis(data, (count - 1) // 2, axis=-1)
+    high = np.take_along_axis(data, count // 2, axis=-1)
+    return (low + high) / 2
+
+
 def make_lowpass_filter(f_half_power, w_cutoff, n, d=1.0):
     """
     Make a lowpass Fourier filter.
@@ -372,6 +481,7 @@ class NSCleanSubarray:
         fc=(1061, 1211, 49943, 49957),
         exclude_outliers=True,
         weights_kernel_sigma=None,
+        basis_cache=None,
     ):
         """
         Background modeling and subtraction for generic JWST near-IR subarrays.
@@ -379,7 +489,8 @@ class NSCleanSubarray:
         Parameters
         ----------
         data : float array
-            The 2D input image data array to be operated on.
+            The 2D input image data array to be operated on, or a stack of
+            images sharing the mask, with shape (..., ny, nx).
 
         mask : bool array
             The background model is fitted to pixels set to True.
@@ -404,18 +515,25 @@ class NSCleanSubarray:
             default for subarrays results in nearly equal weighting of all background
             samples.
 
+        basis_cache : BasisCache or None, optional
+            Cache of the fitting operators, which depend only on the mask,
+            the image shape and the parameters above.  If None, the cache
+            shared by all the cleaners of this process is used.
+
         Notes
         -----
         1) NSCleanSubarray works in detector coordinates. Both the data and mask
            need to be transposed and flipped so that slow-scan runs from bottom
            to top as displayed in SAOImage DS9. The fast scan direction is
            required to run from left to right.
+        2) For a stack of images, pixels are excluded from the mask if they are
+           NaN or outliers in any of the images.
         """
         # Definitions
         self.data = np.array(data, dtype=np.float32)
         self.mask = np.array(mask, dtype=np.bool_)
-        self.ny = np.int32(data.shape[0])  # Number of pixels in slow scan direction
-        self.nx = np.int32(data.shape[1])  # Number of pixels in fast scan direction
+        self.ny = np.int32(data.shape[-2])  # Number of pixels in slow scan direction
+        self.nx = np.int32(data.shape[-1])  # Number of pixels in fast scan direction
         self.fc = np.array(fc, dtype=np.float32)
         self.n = np.int32(self.ny * (self.nx + self.nloh))  # Number of ticks in clocking pattern
         self.rfftfreq = np.array(
@@ -429,15 +547,21 @@ class NSCleanSubarray:
             self.weights_kernel_sigma = 1 / ((fc[0] + fc[1]) / 2) / self.tpix / 2 / 4
         else:
             self.weights_kernel_sigma = weights_kernel_sigma
+        if basis_cache is None:
+            basis_cache = get_basis_cache()
+        self.basis_cache = basis_cache
+
+        # Axes of the image stack, if any
+        stack_axes = tuple(range(self.data.ndim - 2))
 
         # The mask potentially contains NaNs. Exclude them.
-        self.mask[np.isnan(self.data)] = False
+        self.mask[np.any(np.isnan(self.data), axis=stack_axes)] = False
 
         # The mask potentially contains statistical outliers.
         # Optionally exclude them.
         if exclude_outliers is True:
             m, s = med_abs_deviation(
-                self.data[self.mask]
+                self.data[..., self.mask]
             )  # Compute median and median absolute deviation
             s *= 1.4826  # Convert MAD to std
             vmin = m - self.sigrej * s  # Minimum value to keep
@@ -448,7 +572,8 @@ class NSCleanSubarray:
 
             # Flag statistical outliers
             bdpx = np.array(
-                np.where(np.logical_or(self.data < vmin, self.data > vmax), 1, 0), dtype=np.float32
+                np.any(np.logical_or(self.data < vmin, self.data > vmax), axis=stack_axes),
+                dtype=np.float32,
             )
             self.data[np.isinf(self.data)] = np.nan  # Restore NaNs
 
@@ -487,23 +612,22 @@ class NSCleanSubarray:
         # Unity gain between f[3] and end
         self.apodizer[self.rfftfreq >= self.fc[3]] = 1.0
 
-    def fit(self, return_fit=False, weight_fit=False):
+    def _make_operator(self, weight_fit):
         """
-        Fit a background model to the data.
+        Compute the matrix solving for the Fourier transform of the background.
 
         Parameters
         ----------
-        return_fit : bool
-            Return the Fourier transform.
-
         weight_fit : bool
             Use weighted least squares as described in the NSClean paper.
-            Turn off by default. For subarrays it is TBD if this is necessary.
 
         Returns
         -------
-        rfft : numpy array
-            The computed Fourier transform.
+        operator : ndarray of complex
+            The matrix mapping the background samples to the fitted
+            Fourier coefficients.
+        nm : int
+            The number of background samples.
         """
         # To build the incomplete Fourier matrix, we require the index of each
         # clock tick of each valid pixel in the background samples. For consistency with
@@ -551,26 +675,59 @@ class NSCleanSubarray:
             # Hermitian transpose of A
             _a_h = np.conjugate(_a.transpose())
             pinv_pb = np.matmul(np.linalg.inv(np.matmul(_a_h, _a)), _a_h)
+            operator = pinv_pb * p_matrix.reshape((1, -1))
 
         else:
             # Unweighted fit
-            pinv_b = np.linalg.pinv(basis)
+            operator = np.linalg.pinv(basis)
+
+        return operator, m.shape[0]
+
+    def fit(self, return_fit=False, weight_fit=False):
+        """
+        Fit a background model to the data.
+
+        The fitting operator is computed once for the mask and reused
+        for all the images of a stack.
+
+        Parameters
+        ----------
+        return_fit : bool
+            Return the Fourier transform.
+
+        weight_fit : bool
+            Use weighted least squares as described in the NSClean paper.
+            Turn off by default. For subarrays it is TBD if this is necessary.
+
+        Returns
+        -------
+        rfft : numpy array
+            The computed Fourier transform.
+        """
+        # The fitting operator depends only on the mask and the parameters
+        fitted = self.apodizer > 0.0
+        key = BasisCache.make_key(
+            self.mask,
+            "NSCleanSubarray",
+            self.nloh,
+            self.tpix,
+            tuple(self.fc.tolist()),
+            self.weights_kernel_sigma,
+            weight_fit,
+        )
+        operator, nm = self.basis_cache.cached(key, lambda: self._make_operator(weight_fit))
 
         # Solve for the (approximate) Fourier transform of the background samples.
-        rfft = np.zeros(len(self.rfftfreq), dtype=np.complex64)
-        if weight_fit is True:
-            rfft[self.apodizer > 0.0] = np.matmul(
-                pinv_pb * p_matrix.reshape((1, -1)), self.data[self.mask]
-            )
-        else:
-            rfft[self.apodizer > 0.0] = np.matmul(pinv_b, self.data[self.mask])
+        rfft = np.zeros(self.data.shape[:-2] + (len(self.rfftfreq),), dtype=np.complex64)
+        rfft[..., fitted] = np.matmul(self.data[..., self.mask], operator.T)
 
         # Numpy requires that the forward transform multiply
         # the data by n. Correct normalization.
-        rfft *= self.n / m.shape[0]
+        rfft *= self.n / nm
 
         # Invert the apodized Fourier transform to build the background model for this integration
-        self.model = np.fft.irfft(rfft * self.apodizer, self.n).reshape((self.ny, -1))[:, : self.nx]
+        self.model = np.fft.irfft(rfft * self.apodizer, self.n)
+        self.model = self.model.reshape(self.data.shape[:-2] + (self.ny, -1))[..., : self.nx]
 
         # Done
         if return_fit:
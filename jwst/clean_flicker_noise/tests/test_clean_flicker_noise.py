@@ -755,6 +755,31 @@ def test_do_correction_clean_fails(monkeypatch, log_watcher):
     cleaned.close()
 
 
+@pytest.mark.parametrize("fit_method", ["median", "fft"])
+def test_do_correction_maximum_cores(fit_method):
+    ramp_model = helpers.make_small_ramp_model()
+    ramp_model.meta.exposure.type = "NRS_FIXEDSLIT"
+    ramp_model.meta.subarray.slowaxis = 1
+
+    rng = np.random.default_rng(seed=123)
+    ramp_model.data += rng.normal(0, 0.1, size=ramp_model.data.shape)
+    serial = cfn.do_correction(ramp_model, fit_method=fit_method, save_background=True)
+    parallel = cfn.do_correction(
+        ramp_model, fit_method=fit_method, save_background=True, maximum_cores="2"
+    )
+
+    # Images are cleaned independently, so the result does not
+    # depend on the number of threads
+    assert parallel[-1] == serial[-1] == "COMPLETE"
+    np.testing.assert_array_equal(parallel[0].data, serial[0].data)
+    np.testing.assert_array_equal(parallel[2].data, serial[2].data)
+
+    ramp_model.close()
+    for model in serial[:3] + parallel[:3]:
+        if model is not None:
+            model.close()
+
+
 @pytest.mark.parametrize("save_type", ["noise", "background"])
 @pytest.mark.parametrize("input_type", ["rate", "rateints", "ramp"])
 def test_do_correction_save_intermediate(save_type, input_type):
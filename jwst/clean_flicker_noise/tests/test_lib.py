@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+
+from jwst.clean_flicker_noise.basis_cache import BasisCache
+from jwst.clean_flicker_noise.lib import NSClean, NSCleanSubarray
+
+
+def make_images(shape, nimages=3):
+    rng = np.random.default_rng(42)
+    x = np.arange(shape[-1])
+    images = rng.normal(0, 1, (nimages, *shape)) + np.sin(x / 20.0)
+    mask = rng.random(shape) > 0.3
+    return images.astype(np.float32), mask
+
+
+@pytest.mark.parametrize("detector", ["NRS1", "NRS2"])
+def test_nsclean_stack(detector):
+    images, mask = make_images((128, 128))
+    cleaner = NSClean(detector, mask, basis_cache=BasisCache())
+
+    cleaned = cleaner.clean(images.copy())
+    for image, cleaned_image in zip(images, cleaned, strict=True):
+        expected = cleaner.clean(image.copy())
+        assert_allclose(cleaned_image, expected, rtol=1e-6, atol=1e-6)
+    assert not np.allclose(cleaned, images)
+
+
+def test_nsclean_cache():
+    images, mask = make_images((128, 128), nimages=1)
+    cache = BasisCache()
+
+    cleaned = NSClean("NRS1", mask, basis_cache=cache).clean(images[0].copy())
+    nentries = len(cache)
+    assert nentries > 0
+
+    # The operators are reused for the same mask and computed for a new one
+    cleaner = NSClean("NRS1", mask.copy(), basis_cache=cache)
+    assert_allclose(cleaner.clean(images[0].copy()), cleaned)
+    assert len(cache) == nentries
+    NSClean("NRS1", ~mask, basis_cache=cache).clean(images[0].copy())
+    assert len(cache) > nentries
+
+    # Nothing is stored in a cache too small for the operators
+    uncached = NSClean("NRS1", mask, basis_cache=BasisCache(max_bytes=0))
+    assert_allclose(uncached.clean(images[0].copy()), cleaned)
+    assert len(uncached.basis_cache) == 0
+
+
+@pytest.mark.parametrize("weight_fit", [True, False])
+def test_nsclean_subarray_stack(weight_fit):
+    images, mask = make_images((64, 32))
+    cache = BasisCache()
+
+    cleaner = NSCleanSubarray(images, mask, exclude_outliers=False, basis_cache=cache)
+    models = cleaner.clean(weight_fit=weight_fit, return_model=True)
+    assert models.shape == images.shape
+    assert len(cache) == 1
+    for image, model in zip(images, models, strict=True):
+        cleaner = NSCleanSubarray(image, mask, exclude_outliers=False, basis_cache=cache)
+        expected = cleaner.clean(weight_fit=weight_fit, return_model=True)
+        assert_allclose(model, expected, rtol=1e-5, atol=1e-6)
+    assert len(cache) == 1
+
+
+def test_basis_cache_eviction():
+    cache = BasisCache(max_bytes=200)
+    mask = np.ones((2, 3), dtype=bool)
+    keys = [BasisCache.make_key(mask, i) for i in range(3)]
+    assert BasisCache.make_key(mask, 0) == keys[0]
+    assert BasisCache.make_key(~mask, 0) != keys[0]
+    assert BasisCache.make_key(None, 0) != keys[0]
+
+    for key in keys[:2]:
+        cache.put(key, (np.zeros(10), 1))
+    assert cache.get(keys[0]) is not None
+    assert not cache.get(keys[0])[0].flags.writeable
+
+    # The least recently used operators are evicted
+    cache.put(keys[2], (np.zeros(10),))
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+    assert cache.cached(keys[2], lambda: None) is not None
+
+    cache.clear()
+    assert len(cache) == 0
@@ -1,7 +1,10 @@
 import logging
+import multiprocessing as mp
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 from gwcs import wcstools
+from stcal.multiprocessing import compute_num_cores
 
 from jwst.assign_wcs import nirspec
 from jwst.assign_wcs.util import in_ifu_slice
@@ -17,7 +20,7 @@ __all__ = ["CubeBlot"]
 class CubeBlot:
     """Main module for blotting a sky cube back to detector space."""
 
-    def __init__(self, median_model, input_models):
+    def __init__(self, median_model, input_models, maximum_cores="1"):
         """
         Initialize main variables for blotting a sky cube to detector space.
 
@@ -35,10 +38,14 @@ class CubeBlot:
            sky.
         input_models : ModelContainer
            The input models used to create the median sky cube.
+        maximum_cores : str, optional
+           The number of threads used to blot the NIRSpec slices and exposures:
+           an integer, 'quarter', 'half' or 'all'. The default is '1' (no threading).
         """
         # Pull out the needed information from the Median IFUCube
         self.median_skycube = median_model
         self.instrument = median_model.meta.instrument.name
+        self.maximum_cores = maximum_cores
 
         # basic information about the type of data
         self.grating = None
@@ -266,119 +273,144 @@ class CubeBlot:
             Container of blotted IFUImage models
         """
         blot_models = ModelContainer()
+        nslices = 30
+        nthreads = compute_num_cores(
+            str(self.maximum_cores), len(self.input_models) * nslices, mp.cpu_count()
+        )
+        log.info("Blotting 30 slices on NIRSPEC detector")
+
+        # The slices of each exposure are inverted to the detector in parallel threads;
+        # each exposure is blotted as soon as all of its slices are done, while the
+        # slices of the next exposure are inverted.
+        with ThreadPoolExecutor(max_workers=max(nthreads, 1)) as executor:
+            blot_futures = []
+            for model in self.input_models:
+                slice_points = list(
+                    executor.map(self.nirspec_slice_points, [model] * nslices, range(nslices))
+                )
+                blot_futures.append(executor.submit(self.blot_model_nirspec, model, slice_points))
+            for future in blot_futures:
+                blot_models.append(future.result())
+        return blot_models
 
-        for model in self.input_models:
-            blot_ysize, blot_xsize = model.shape
-            ntotal = blot_ysize * blot_xsize
-            blot_flux = np.zeros(ntotal, dtype=np.float32)
-            blot_weight = np.zeros(ntotal, dtype=np.float32)
-            blot = model.copy()
-            blot.err = None
-            blot.dq = None
+    # ************************************************************************
 
-            # ___________________________________________________________________
-            ycenter = np.arange(blot_ysize)
-            xcenter = np.arange(blot_xsize)
+    def nirspec_slice_points(self, model, slice_id):
+        """
+        Invert the median sky cube values falling on a NIRSpec slice to the detector.
 
-            # for NIRSPEC wcs information accessed separately for each slice
-            nslices = 30
-            log.info("Blotting 30 slices on NIRSPEC detector")
-            roi_det = 1.0  # Just large enough that we don't get holes
+        Parameters
+        ----------
+        model : IFUImageModel
+            Input model to blot.
+        slice_id : int
+            The slice number.
 
-            for ii in range(nslices):
-                # for each slice pull out the blotted values that actually fall on the slice region
-                # use the bounding box of each slice to determine the slice limits
-                slice_wcs = nirspec.nrs_wcs_set_input(model, ii)
-                slicer2world = slice_wcs.get_transform("slicer", "world")
-                detector2slicer = slice_wcs.get_transform("detector", "slicer")
-
-                # find some rough limits on ra,dec, lambda using the x,y -> ra,dec,lambda
-                x, y = wcstools.grid_from_bounding_box(slice_wcs.bounding_box)
-                ra, dec, lam = slice_wcs(x, y)
-
-                # Add a padding to make slice a little bigger on sky.
-                # The slice is very small and the median cube is coarse grid on the sky in ra,dec
-                # So we need to expand the slice min and max or we will find not values
-                # falling in min and max limits.
-
-                ramin = np.nanmin(ra) - self.median_skycube.meta.wcsinfo.cdelt1 * 4
-                ramax = np.nanmax(ra) + self.median_skycube.meta.wcsinfo.cdelt1 * 4
-                decmin = np.nanmin(dec) - self.median_skycube.meta.wcsinfo.cdelt2 * 4
-                decmax = np.nanmax(dec) + self.median_skycube.meta.wcsinfo.cdelt2 * 4
-                lam_min = np.nanmin(lam)
-                lam_max = np.nanmax(lam)
-                if ramin < 0:
-                    ramin = 0
-                if ramax > 360:
-                    ramax = 360
-
-                use1 = np.logical_and(self.cube_ra >= ramin, self.cube_ra <= ramax)
-                use2 = np.logical_and(self.cube_dec >= decmin, self.cube_dec <= decmax)
-                use3 = np.logical_and(self.cube_wave >= lam_min, self.cube_wave <= lam_max)
-                use = np.logical_and(np.logical_and(use1, use2), use3)
-
-                ra_use = self.cube_ra[use]
-                dec_use = self.cube_dec[use]
-                wave_use = self.cube_wave[use]
-                flux_use = self.cube_flux[use]
-
-                # get the indices of elements on the slice
-                onslice_ind = in_ifu_slice(slice_wcs, ra_use, dec_use, wave_use)
-                slx, sly, sllam = slicer2world.inverse(ra_use, dec_use, wave_use)
-                xslice, yslice = detector2slicer.inverse(
-                    slx[onslice_ind], sly[onslice_ind], sllam[onslice_ind]
-                )
-                # pull out region for slice
-                fluxslice = flux_use[onslice_ind]
-
-                # one more limit on the x,y bounding box
-                # only use values what fall in bounding box of the slice
-                xlimit, ylimit = slice_wcs.bounding_box
-                xuse = np.logical_and(xslice >= xlimit[0], xslice <= xlimit[1])
-                yuse = np.logical_and(yslice >= ylimit[0], yslice <= ylimit[1])
-                use = np.logical_and(xuse, yuse)
-                xuse = xslice[use]
-                yuse = yslice[use]
-                flux_use = fluxslice[use]
-
-                if ii == 0:
-                    x_total = xuse
-                    y_total = yuse
-                    flux_total = flux_use
-                else:
-                    x_total = np.concatenate((x_total, xuse))
-                    y_total = np.concatenate((y_total, yuse))
-                    flux_total = np.concatenate((flux_total, flux_use))
-
-            # end looping over the 30 slices
-            # set up c wrapper for blotting
-            xstart = 0
-            xsize2 = blot_xsize
+        Returns
+        -------
+        xuse, yuse, flux_use : ndarray
+            Detector x, y values and flux of the median cube spaxels on the slice.
+        """
+        # for each slice pull out the blotted values that actually fall on the slice region
+        # use the bounding box of each slice to determine the slice limits
+        slice_wcs = nirspec.nrs_wcs_set_input(model, slice_id)
+        slicer2world = slice_wcs.get_transform("slicer", "world")
+        detector2slicer = slice_wcs.get_transform("detector", "slicer")
+
+        # find some rough limits on ra,dec, lambda using the x,y -> ra,dec,lambda
+        x, y = wcstools.grid_from_bounding_box(slice_wcs.bounding_box)
+        ra, dec, lam = slice_wcs(x, y)
+
+        # Add a padding to make slice a little bigger on sky.
+        # The slice is very small and the median cube is coarse grid on the sky in ra,dec
+        # So we need to expand the slice min and max or we will find not values
+        # falling in min and max limits.
+        ra_pad = self.median_skycube.meta.wcsinfo.cdelt1 * 4
+        dec_pad = self.median_skycube.meta.wcsinfo.cdelt2 * 4
+
+        ramin = max(np.nanmin(ra) - ra_pad, 0)
+        ramax = min(np.nanmax(ra) + ra_pad, 360)
+        decmin = np.nanmin(dec) - dec_pad
+        decmax = np.nanmax(dec) + dec_pad
+        lam_min = np.nanmin(lam)
+        lam_max = np.nanmax(lam)
+
+        use = (self.cube_ra >= ramin) & (self.cube_ra <= ramax)
+        use &= (self.cube_dec >= decmin) & (self.cube_dec <= decmax)
+        use &= (self.cube_wave >= lam_min) & (self.cube_wave <= lam_max)
+        use = np.flatnonzero(use)
+
+        ra_use = self.cube_ra[use]
+        dec_use = self.cube_dec[use]
+        wave_use = self.cube_wave[use]
+        flux_use = self.cube_flux[use]
+
+        # get the indices of elements on the slice
+        onslice_ind = in_ifu_slice(slice_wcs, ra_use, dec_use, wave_use)
+        slx, sly, sllam = slicer2world.inverse(
+            ra_use[onslice_ind], dec_use[onslice_ind], wave_use[onslice_ind]
+        )
+        xslice, yslice = detector2slicer.inverse(slx, sly, sllam)
+        # pull out region for slice
+        fluxslice = flux_use[onslice_ind]
 
-            result = blot_wrapper(
-                roi_det,
-                blot_xsize,
-                blot_ysize,
-                xstart,
-                xsize2,
-                xcenter,
-                ycenter,
-                x_total,
-                y_total,
-                flux_total,
-            )
-            blot_flux_slice, blot_weight_slice = result
-            blot_flux = blot_flux + blot_flux_slice
-            blot_weight = blot_weight + blot_weight_slice
+        # one more limit on the x,y bounding box
+        # only use values what fall in bounding box of the slice
+        xlimit, ylimit = slice_wcs.bounding_box
+        use = (xslice >= xlimit[0]) & (xslice <= xlimit[1])
+        use &= (yslice >= ylimit[0]) & (yslice <= ylimit[1])
+        return xslice[use], yslice[use], fluxslice[use]
 
-            result = None
-            blot_weight_slice = None
-            blot_flux_slice = None
-            # done mapping median cube  to this input model
+    # ************************************************************************
 
-            igood = np.where(blot_weight > 0)
-            blot_flux[igood] = blot_flux[igood] / blot_weight[igood]
-            blot_flux = blot_flux.reshape((blot_ysize, blot_xsize))
-            blot.data = blot_flux
-            blot_models.append(blot)
-        return blot_models
+    def blot_model_nirspec(self, model, slice_points):
+        """
+        Blot the median sky cube values inverted to the detector of a NIRSpec model.
+
+        Parameters
+        ----------
+        model : IFUImageModel
+            Input model to blot.
+        slice_points : list of tuple
+            The detector x, y values and flux of the median cube spaxels on each
+            slice, as returned by `nirspec_slice_points`, in slice order.
+
+        Returns
+        -------
+        blot : IFUImageModel
+            The blotted model.
+        """
+        blot_ysize, blot_xsize = model.shape
+        blot = model.copy()
+        blot.err = None
+        blot.dq = None
+
+        ycenter = np.arange(blot_ysize)
+        xcenter = np.arange(blot_xsize)
+        roi_det = 1.0  # Just large enough that we don't get holes
+
+        x_total, y_total, flux_total = (
+            np.concatenate(values) for values in zip(*slice_points, strict=True)
+        )
+
+        # set up c wrapper for blotting
+        xstart = 0
+        xsize2 = blot_xsize
+        log.info("Blotting back to %s", model.meta.filename)
+        blot_flux, blot_weight = blot_wrapper(
+            roi_det,
+            blot_xsize,
+            blot_ysize,
+            xstart,
+            xsize2,
+            xcenter,
+            ycenter,
+            x_total,
+            y_total,
+            flux_total,
+        )
+        # done mapping median cube  to this input model
+        igood = np.where(blot_weight > 0)
+        blot_flux[igood] = blot_flux[igood] / blot_weight[igood]
+        blot.data = blot_flux.reshape((blot_ysize, blot_xsize))
+        return blot
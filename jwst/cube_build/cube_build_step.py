@@ -6,7 +6,7 @@ import asdf
 from astropy import units
 
 from jwst.assign_wcs.util import update_s_region_keyword
-from jwst.cube_build import cube_build, data_types, ifu_cube
+from jwst.cube_build import cube_build, data_types, ifu_cube, sky_map_cache
 from jwst.datamodels import ModelContainer
 from jwst.lib.pipe_utils import match_nans_and_flags
 from jwst.stpipe import Step, record_step_status
@@ -50,6 +50,8 @@ class CubeBuildStep(Step):
          suffix = string(default='s3d')
          offset_file = string(default=None) # Filename containing a list of Ra and Dec offsets to apply to files.
          debug_spaxel = string(default='-1 -1 -1') # Default not used
+         maximum_cores = string(default='1') # Number of threads used to match pixels to the cube: an integer, 'quarter', 'half' or 'all'
+         sky_map_cache_size = float(default=1024, min=0) # Memory in MB for reusing detector to sky mappings across the cubes of a run; 0 disables
        """  # noqa: E501
 
     reference_file_types = ["cubepar"]
@@ -290,6 +292,11 @@ class CubeBuildStep(Step):
             "output_type": self.pars_input["output_type"],
         }
 
+        # detector to sky mappings are shared by all the cubes built in this step
+        sky_cache = None
+        if self.sky_map_cache_size > 0:
+            sky_cache = sky_map_cache.SkyMapCache(max_bytes=int(self.sky_map_cache_size * 2**20))
+
         # shove the input parameters in to pars_cube to pull out ifu_cube.py
         # these parameters are related to the building a single ifucube_model
 
@@ -313,6 +320,8 @@ class CubeBuildStep(Step):
             "skip_dqflagging": self.skip_dqflagging,
             "suffix": self.suffix,
             "debug_spaxel": self.debug_spaxel,
+            "maximum_cores": self.maximum_cores,
+            "sky_map_cache": sky_cache,
         }
 
         # ________________________________________________________________________________
@@ -441,6 +450,10 @@ class CubeBuildStep(Step):
         else:
             record_step_status(cube_container, "cube_build", success=True)
 
+        # release the detector to sky mappings
+        if sky_cache is not None:
+            sky_cache.clear()
+
         t1 = time.time()
         log.debug(f"Time to build all cubes {t1 - t0}")
 
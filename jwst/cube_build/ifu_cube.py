@@ -2,13 +2,16 @@
 
 import logging
 import math
+import multiprocessing as mp
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 from astropy import units as u
 from astropy.coordinates import SkyCoord
 from astropy.stats import circmean
 from gwcs import wcstools
+from stcal.multiprocessing import compute_num_cores
 from stdatamodels.jwst import datamodels
 from stdatamodels.jwst.datamodels import dqflags
 from stdatamodels.jwst.transforms.models import _toindex
@@ -19,7 +22,7 @@ from jwst.cube_build import coord, cube_build_wcs_util, cube_internal_cal
 from jwst.cube_build.cube_match_sky_driz import cube_wrapper_driz  # c extension
 from jwst.cube_build.cube_match_sky_pointcloud import cube_wrapper  # c extension
 from jwst.datamodels import ModelContainer
-from jwst.model_blender import blendmeta
+from jwst.model_blender.blender import ModelBlender
 
 log = logging.getLogger(__name__)
 
@@ -80,7 +83,10 @@ class IFUCubeData:
         **pars_cube : dict
             Dictionary of parameters controlling how the cube is built.
         """
-        self.input_models_this_cube = []  # list of files use to make cube working on
+        # metadata of the files used to make the cube, blended as the files are mapped
+        self.blender = None
+        self.mt_avra = None
+        self.mt_avdec = None
 
         self.pipeline = pipeline
 
@@ -121,6 +127,8 @@ class IFUCubeData:
         self.weighting = pars_cube.get("weighting")
         self.weight_power = pars_cube.get("weight_power")
         self.skip_dqflagging = pars_cube.get("skip_dqflagging")
+        self.maximum_cores = pars_cube.get("maximum_cores", "1")
+        self.sky_map_cache = pars_cube.get("sky_map_cache")
         self.suffix = pars_cube.get("suffix")
         self.num_bands = 0
         self.output_name = ""
@@ -683,7 +691,7 @@ class IFUCubeData:
             for input_model in self.master_table.FileMap[self.instrument][this_par1][this_par2]:
                 # loop over the files that cover the spectral range the cube is for
 
-                self.input_models_this_cube.append(input_model.copy())
+                self.accumulate_metadata(input_model)
                 # set up input_model to be first file used to copy in basic header info
                 # to ifucube meta data
                 if ib == 0 and k == 0:
@@ -693,24 +701,7 @@ class IFUCubeData:
 
                 if self.interpolation in ["pointcloud", "drizzle"]:
                     pixelresult = self.map_detector_to_outputframe(this_par1, input_model)
-
-                    (
-                        coord1,
-                        coord2,
-                        corner_coord,
-                        wave,
-                        dwave,
-                        flux,
-                        err,
-                        slice_no,
-                        rois_pixel,
-                        roiw_pixel,
-                        weight_pixel,
-                        softrad_pixel,
-                        scalerad_pixel,
-                        x_det,
-                        y_det,
-                    ) = pixelresult
+                    wave = pixelresult[3]
 
                     # by default flag the dq plane based on the FOV of the detector projected to sky
                     flag_dq_plane = 1
@@ -738,38 +729,9 @@ class IFUCubeData:
                         instrument = 1
 
                     result = None
-                    weight_type = 0  # default to emsm instead of msm
-                    if self.weighting == "msm":
-                        weight_type = 1
-
                     if self.interpolation == "pointcloud" and build_cube:
-                        roiw_ave = np.mean(roiw_pixel)
-                        result = cube_wrapper(
-                            instrument,
-                            flag_dq_plane,
-                            weight_type,
-                            start_region,
-                            end_region,
-                            self.overlap_partial,
-                            self.overlap_full,
-                            self.xcoord,
-                            self.ycoord,
-                            self.zcoord,
-                            coord1,
-                            coord2,
-                            wave,
-                            flux,
-                            err,
-                            slice_no,
-                            rois_pixel,
-                            roiw_pixel,
-                            scalerad_pixel,
-                            weight_pixel,
-                            softrad_pixel,
-                            self.cdelt3_normal,
-                            roiw_ave,
-                            self.cdelt1,
-                            self.cdelt2,
+                        result = self.match_point_cloud(
+                            pixelresult, instrument, flag_dq_plane, start_region, end_region
                         )
 
                         spaxel_flux, spaxel_weight, spaxel_var, spaxel_iflux, spaxel_dq = result
@@ -785,46 +747,15 @@ class IFUCubeData:
                         del result
                         del spaxel_flux, spaxel_weight, spaxel_var, spaxel_iflux, spaxel_dq
                     if self.weighting == "drizzle" and build_cube:
-                        cdelt3_mean = np.nanmean(self.cdelt3_normal)
-                        xi1, eta1, xi2, eta2, xi3, eta3, xi4, eta4 = corner_coord
-                        linear = 0
-                        if self.linear_wavelength:
-                            linear = 1
                         if debug_cube_index >= 0:
                             log.info(f"Input filename: {input_model.meta.filename}")
-                        result = cube_wrapper_driz(
+                        result = self.match_point_cloud(
+                            pixelresult,
                             instrument,
                             flag_dq_plane,
                             start_region,
                             end_region,
-                            self.overlap_partial,
-                            self.overlap_full,
-                            self.xcoord,
-                            self.ycoord,
-                            self.zcoord,
-                            coord1,
-                            coord2,
-                            wave,
-                            flux,
-                            err,
-                            slice_no,
-                            xi1,
-                            eta1,
-                            xi2,
-                            eta2,
-                            xi3,
-                            eta3,
-                            xi4,
-                            eta4,
-                            dwave,
-                            self.cdelt3_normal,
-                            self.cdelt1,
-                            self.cdelt2,
-                            cdelt3_mean,
-                            linear,
-                            x_det,
-                            y_det,
-                            debug_cube_index,
+                            debug_cube_index=debug_cube_index,
                         )
 
                         spaxel_flux, spaxel_weight, spaxel_var, spaxel_iflux, spaxel_dq = result
@@ -962,9 +893,6 @@ class IFUCubeData:
         # loop over input models
         single_ifucube_container = ModelContainer()
 
-        weight_type = 0  # default to emsm instead of msm
-        if self.weighting == "msm":
-            weight_type = 1
         number_bands = len(self.list_par1)
         this_par1 = self.list_par1[0]  # single IFUcube only have a single channel
         j = 0
@@ -975,7 +903,7 @@ class IFUCubeData:
             # loop over the files that cover the spectral range the cube is for
             for k in range(nfiles):
                 input_model = self.master_table.FileMap[self.instrument][this_par1][this_par2][k]
-                self.input_models_this_cube.append(input_model)
+                self.accumulate_metadata(input_model)
                 log.debug(f"Working on next Single IFU Cube = {j + 1}")
 
                 # for each new data model create a new spaxel
@@ -987,24 +915,7 @@ class IFUCubeData:
                 self.spaxel_var = np.zeros(total_num, dtype=np.float64)
 
                 pixelresult = self.map_detector_to_outputframe(this_par1, input_model)
-
-                (
-                    coord1,
-                    coord2,
-                    corner_coord,
-                    wave,
-                    dwave,
-                    flux,
-                    err,
-                    slice_no,
-                    rois_pixel,
-                    roiw_pixel,
-                    weight_pixel,
-                    softrad_pixel,
-                    scalerad_pixel,
-                    _,
-                    _,
-                ) = pixelresult
+                wave = pixelresult[3]
 
                 build_cube = True
                 # there is no valid data on the detector. Pixels are flagged as DO_NOT_USE.
@@ -1015,7 +926,6 @@ class IFUCubeData:
                 flag_dq_plane = 0
                 start_region = 0
                 end_region = 0
-                roiw_ave = 0
 
                 if self.instrument == "MIRI":
                     instrument = 0
@@ -1025,33 +935,8 @@ class IFUCubeData:
                 result = None
 
                 if self.interpolation == "pointcloud" and build_cube:
-                    roiw_ave = np.mean(roiw_pixel)
-                    result = cube_wrapper(
-                        instrument,
-                        flag_dq_plane,
-                        weight_type,
-                        start_region,
-                        end_region,
-                        self.overlap_partial,
-                        self.overlap_full,
-                        self.xcoord,
-                        self.ycoord,
-                        self.zcoord,
-                        coord1,
-                        coord2,
-                        wave,
-                        flux,
-                        err,
-                        slice_no,
-                        rois_pixel,
-                        roiw_pixel,
-                        scalerad_pixel,
-                        weight_pixel,
-                        softrad_pixel,
-                        self.cdelt3_normal,
-                        roiw_ave,
-                        self.cdelt1,
-                        self.cdelt2,
+                    result = self.match_point_cloud(
+                        pixelresult, instrument, flag_dq_plane, start_region, end_region
                     )
                     spaxel_flux, spaxel_weight, spaxel_var, spaxel_iflux, _ = result
 
@@ -1063,47 +948,8 @@ class IFUCubeData:
                     del result, spaxel_flux, spaxel_var, spaxel_iflux
 
                 if self.weighting == "drizzle" and build_cube:
-                    cdelt3_mean = np.nanmean(self.cdelt3_normal)
-                    xi1, eta1, xi2, eta2, xi3, eta3, xi4, eta4 = corner_coord
-                    linear = 0
-                    if self.linear_wavelength:
-                        linear = 1
-                        x_det = None
-                        y_det = None
-                        debug_cube = -1
-                    result = cube_wrapper_driz(
-                        instrument,
-                        flag_dq_plane,
-                        start_region,
-                        end_region,
-                        self.overlap_partial,
-                        self.overlap_full,
-                        self.xcoord,
-                        self.ycoord,
-                        self.zcoord,
-                        coord1,
-                        coord2,
-                        wave,
-                        flux,
-                        err,
-                        slice_no,
-                        xi1,
-                        eta1,
-                        xi2,
-                        eta2,
-                        xi3,
-                        eta3,
-                        xi4,
-                        eta4,
-                        dwave,
-                        self.cdelt3_normal,
-                        self.cdelt1,
-                        self.cdelt2,
-                        cdelt3_mean,
-                        linear,
-                        x_det,
-                        y_det,
-                        debug_cube,
+                    result = self.match_point_cloud(
+                        pixelresult, instrument, flag_dq_plane, start_region, end_region
                     )
 
                     spaxel_flux, spaxel_weight, spaxel_var, spaxel_iflux, _ = result
@@ -1128,6 +974,250 @@ class IFUCubeData:
                 j = j + 1
         return single_ifucube_container
 
+    # ________________________________________________________________________________
+    def match_point_cloud(
+        self,
+        pixelresult,
+        instrument,
+        flag_dq_plane,
+        start_region,
+        end_region,
+        debug_cube_index=-1,
+    ):
+        """
+        Match the mapped detector pixels to the cube spaxels with the C extensions.
+
+        The wavelength planes of the cube are split into contiguous chunks that
+        are matched in separate threads (the C extensions release the GIL).
+        Each spaxel is filled by a single thread from the detector pixels in
+        their original order, so the result does not depend on the number of
+        threads used.
+
+        Parameters
+        ----------
+        pixelresult : tuple
+            Detector pixel values returned by `map_detector_to_outputframe`.
+        instrument : int
+            0 = MIRI, 1 = NIRSpec.
+        flag_dq_plane : int
+            If 1, fill in the DQ plane based on the FOV of the detector.
+        start_region : int
+            Starting slice number of the MIRI channel, used for the DQ plane.
+        end_region : int
+            Ending slice number of the MIRI channel, used for the DQ plane.
+        debug_cube_index : int, optional
+            Cube index of the spaxel to print debug information on
+            (drizzle weighting only). Set to -1 for no debugging.
+
+        Returns
+        -------
+        spaxel_flux, spaxel_weight, spaxel_var, spaxel_iflux, spaxel_dq : ndarray
+            Flattened spaxel arrays for the full cube.
+        """
+        wave = pixelresult[3]
+        dwave = pixelresult[4]
+        roiw_pixel = pixelresult[9]
+        # Values that depend on all the pixels and planes, not just on a chunk
+        roiw_ave = np.mean(roiw_pixel)
+        cdelt3_mean = np.nanmean(self.cdelt3_normal)
+
+        # Wavelength distance beyond which a pixel cannot contribute to a plane
+        if self.weighting == "drizzle":
+            reach = np.abs(dwave) + np.nanmax(np.abs(self.cdelt3_normal))
+            reach = np.maximum(reach, cdelt3_mean)
+        else:
+            reach = np.maximum(roiw_pixel, roiw_ave)
+
+        nthreads = compute_num_cores(str(self.maximum_cores), self.naxis3, mp.cpu_count())
+        if nthreads <= 1:
+            return self._match_planes(
+                slice(None),
+                slice(None),
+                pixelresult,
+                instrument,
+                flag_dq_plane,
+                start_region,
+                end_region,
+                roiw_ave,
+                cdelt3_mean,
+                debug_cube_index,
+            )
+
+        # Use a few chunks per thread to balance the load
+        nchunks = min(self.naxis3, 4 * nthreads)
+        bounds = np.linspace(0, self.naxis3, nchunks + 1).astype(int)
+        chunks = []
+        for zstart, zend in zip(bounds[:-1], bounds[1:], strict=True):
+            planes = slice(zstart, zend)
+            # Include a margin for rounding: extra pixels are rejected in the C code
+            zmin = self.zcoord[zstart] - self.cdelt3_normal[zstart]
+            zmax = self.zcoord[zend - 1] + self.cdelt3_normal[zend - 1]
+            points = np.flatnonzero((wave + 2 * reach >= zmin) & (wave - 2 * reach <= zmax))
+            chunks.append((planes, points))
+
+        def match_chunk(chunk):
+            return self._match_planes(
+                *chunk,
+                pixelresult,
+                instrument,
+                flag_dq_plane,
+                start_region,
+                end_region,
+                roiw_ave,
+                cdelt3_mean,
+                debug_cube_index,
+            )
+
+        with ThreadPoolExecutor(max_workers=nthreads) as executor:
+            results = list(executor.map(match_chunk, chunks))
+
+        return tuple(np.concatenate(arrays) for arrays in zip(*results, strict=True))
+
+    # ________________________________________________________________________________
+    def _match_planes(
+        self,
+        planes,
+        points,
+        pixelresult,
+        instrument,
+        flag_dq_plane,
+        start_region,
+        end_region,
+        roiw_ave,
+        cdelt3_mean,
+        debug_cube_index,
+    ):
+        """
+        Match a subset of the detector pixels to a range of cube wavelength planes.
+
+        Parameters
+        ----------
+        planes : slice
+            Wavelength planes of the cube to fill in.
+        points : slice or ndarray
+            Detector pixels that may contribute to the planes.
+        pixelresult : tuple
+            Detector pixel values returned by `map_detector_to_outputframe`.
+        instrument : int
+            0 = MIRI, 1 = NIRSpec.
+        flag_dq_plane : int
+            If 1, fill in the DQ plane based on the FOV of the detector.
+        start_region : int
+            Starting slice number of the MIRI channel, used for the DQ plane.
+        end_region : int
+            Ending slice number of the MIRI channel, used for the DQ plane.
+        roiw_ave : float
+            Mean spectral region of interest of all the detector pixels.
+        cdelt3_mean : float
+            Mean wavelength plane width of the full cube.
+        debug_cube_index : int
+            Cube index of the spaxel to print debug information on, -1 for none.
+
+        Returns
+        -------
+        spaxel_flux, spaxel_weight, spaxel_var, spaxel_iflux, spaxel_dq : ndarray
+            Flattened spaxel arrays for the wavelength planes.
+        """
+        (
+            coord1,
+            coord2,
+            corner_coord,
+            wave,
+            dwave,
+            flux,
+            err,
+            slice_no,
+            rois_pixel,
+            roiw_pixel,
+            weight_pixel,
+            softrad_pixel,
+            scalerad_pixel,
+            x_det,
+            y_det,
+        ) = pixelresult
+        zcoord = self.zcoord[planes]
+        cdelt3 = self.cdelt3_normal[planes]
+
+        if self.weighting == "drizzle":
+            xi1, eta1, xi2, eta2, xi3, eta3, xi4, eta4 = (c[points] for c in corner_coord)
+            linear = 0
+            if self.linear_wavelength:
+                linear = 1
+
+            # The debug spaxel index is relative to the first plane of the chunk
+            nxy = self.naxis1 * self.naxis2
+            first = 0 if planes.start is None else planes.start * nxy
+            debug_index = debug_cube_index - first
+            if debug_cube_index < 0 or not 0 <= debug_index < len(zcoord) * nxy:
+                debug_index = -1
+
+            return cube_wrapper_driz(
+                instrument,
+                flag_dq_plane,
+                start_region,
+                end_region,
+                self.overlap_partial,
+                self.overlap_full,
+                self.xcoord,
+                self.ycoord,
+                zcoord,
+                coord1[points],
+                coord2[points],
+                wave[points],
+                flux[points],
+                err[points],
+                slice_no[points],
+                xi1,
+                eta1,
+                xi2,
+                eta2,
+                xi3,
+                eta3,
+                xi4,
+                eta4,
+                dwave[points],
+                cdelt3,
+                self.cdelt1,
+                self.cdelt2,
+                cdelt3_mean,
+                linear,
+                x_det[points],
+                y_det[points],
+                debug_index,
+            )
+
+        weight_type = 0  # default to emsm instead of msm
+        if self.weighting == "msm":
+            weight_type = 1
+
+        return cube_wrapper(
+            instrument,
+            flag_dq_plane,
+            weight_type,
+            start_region,
+            end_region,
+            self.overlap_partial,
+            self.overlap_full,
+            self.xcoord,
+            self.ycoord,
+            zcoord,
+            coord1[points],
+            coord2[points],
+            wave[points],
+            flux[points],
+            err[points],
+            slice_no[points],
+            rois_pixel[points],
+            roiw_pixel[points],
+            scalerad_pixel[points],
+            weight_pixel[points],
+            softrad_pixel[points],
+            cdelt3,
+            roiw_ave,
+            self.cdelt1,
+            self.cdelt2,
+        )
+
     # ________________________________________________________________________________
     def determine_cube_parameters_internal(self):
         """Determine the spatial and spectral IFU size for coord_system = internal_cal."""
@@ -1761,13 +1851,8 @@ class IFUCubeData:
         y_det = None
         offsets = self.offsets
 
-        if self.instrument == "MIRI":
-            sky_result = self.map_miri_pixel_to_sky(input_model, this_par1, offsets)
-            (x, y, ra, dec, wave_all, slice_no_all, dwave_all, corner_coord_all) = sky_result
-
-        elif self.instrument == "NIRSPEC":
-            sky_result = self.map_nirspec_pixel_to_sky(input_model, offsets)
-            (x, y, ra, dec, wave_all, slice_no_all, dwave_all, corner_coord_all) = sky_result
+        sky_result = self.map_pixel_to_sky(input_model, this_par1, offsets)
+        (x, y, ra, dec, wave_all, slice_no_all, dwave_all, corner_coord_all) = sky_result
 
         # ______________________________________________________________________________
         # The following is for both MIRI and NIRSPEC
@@ -1953,6 +2038,92 @@ class IFUCubeData:
             y_det,
         )
 
+    # ______________________________________________________________________
+    def map_pixel_to_sky(self, input_model, this_par1, offsets):
+        """
+        Map the detector pixels of a model to the sky, reusing a cached mapping if possible.
+
+        Parameters
+        ----------
+        input_model : IFUImageModel
+           Input IFU image model to combine
+        this_par1 : str
+           For MIRI this is the channel # for NIRSPEC this is the grating name
+           only need for MIRI to distinguish which channel on the detector we have
+        offsets : dict
+           Optional dictionary of ra and dec offsets to apply
+
+        Returns
+        -------
+        sky_result : tuple
+            The mapping returned by `map_miri_pixel_to_sky` or
+            `map_nirspec_pixel_to_sky`. The arrays of a cached mapping are read-only.
+        """
+        key = None
+        if self.sky_map_cache is not None:
+            key = self.sky_map_key(input_model, this_par1, offsets)
+            sky_result = self.sky_map_cache.get(key) if key is not None else None
+            if sky_result is not None:
+                log.info(
+                    "Reusing the detector to sky mapping for input file: %s",
+                    input_model.meta.filename,
+                )
+                return sky_result
+
+        if self.instrument == "MIRI":
+            sky_result = self.map_miri_pixel_to_sky(input_model, this_par1, offsets)
+        else:  # NIRSPEC
+            sky_result = self.map_nirspec_pixel_to_sky(input_model, offsets)
+
+        if key is not None:
+            self.sky_map_cache.put(key, sky_result)
+        return sky_result
+
+    # ______________________________________________________________________
+    def sky_map_key(self, input_model, this_par1, offsets):
+        """
+        Compute the key identifying the detector to sky mapping of a model.
+
+        The WCS is identified by its values at a sparse grid of detector pixels,
+        so a model whose WCS has changed since it was mapped is mapped again.
+
+        Parameters
+        ----------
+        input_model : IFUImageModel
+           Input IFU image model to combine
+        this_par1 : str
+           For MIRI this is the channel # for NIRSPEC this is the grating name
+        offsets : dict
+           Optional dictionary of ra and dec offsets to apply
+
+        Returns
+        -------
+        str or None
+            The cache key, or None if the mapping should not be cached.
+        """
+        drizzle = self.interpolation == "drizzle"
+        if self.instrument == "MIRI":
+            xstart, xend = self.instrument_info.get_miri_slice_endpts(this_par1)
+            xlim = (xstart, xend - 1)
+            ylim = (0, input_model.data.shape[0] - 1)
+            wcs = input_model.meta.wcs
+            params = (self.instrument, this_par1, drizzle, xstart, xend)
+        else:  # NIRSPEC
+            # the WCS of all the slices is derived from the same model WCS
+            wcs = nirspec.nrs_wcs_set_input(input_model, 0)
+            xlim, ylim = wcs.bounding_box[0], wcs.bounding_box[1]
+            params = (self.instrument, drizzle)
+
+        x, y = np.meshgrid(np.linspace(*xlim, 7), np.linspace(*ylim, 7))
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", "invalid value", RuntimeWarning)
+            wcs_sample = np.array(wcs(x, y), dtype=np.float64)
+
+        if offsets is not None:
+            raoffset, decoffset = self.find_ra_dec_offset(input_model.meta.filename)
+            params += (raoffset.value, decoffset.value)
+        return self.sky_map_cache.make_key(input_model, wcs_sample, *params)
+
     # ______________________________________________________________________
     def map_miri_pixel_to_sky(self, input_model, this_par1, offsets):
         """
@@ -2742,21 +2913,37 @@ class IFUCubeData:
         ifu_cube : IFUCubeModel
             IFU cube data model
         """
-        blendmeta.blendmodels(
-            ifu_cube,
-            self.input_models_this_cube,
-            ignore=[
-                "meta.filename",
-            ],
-        )
+        if self.blender is None:
+            return
+        self.blender.finalize_model(ifu_cube)
         # For moving targets, set RA, Dec equal to the average
-        mt_avra = getattr(self.input_models_this_cube[0].meta.wcsinfo, "mt_avra", None)
-        mt_avdec = getattr(self.input_models_this_cube[0].meta.wcsinfo, "mt_avdec", None)
-        if mt_avra is not None:
-            ifu_cube.meta.wcsinfo.mt_ra = mt_avra
-            ifu_cube.meta.wcsinfo.mt_dec = mt_avdec
-            ifu_cube.meta.target.ra = mt_avra
-            ifu_cube.meta.target.dec = mt_avdec
+        if self.mt_avra is not None:
+            ifu_cube.meta.wcsinfo.mt_ra = self.mt_avra
+            ifu_cube.meta.wcsinfo.mt_dec = self.mt_avdec
+            ifu_cube.meta.target.ra = self.mt_avra
+            ifu_cube.meta.target.dec = self.mt_avdec
+
+    # ________________________________________________________________________________
+    def accumulate_metadata(self, input_model):
+        """
+        Add the metadata of an input model used to make the cube to the blended metadata.
+
+        The metadata is blended as each file is mapped to the cube, so that
+        no copy of the input models needs to be kept until the cube is done.
+
+        Parameters
+        ----------
+        input_model : IFUImageModel
+            Input IFU image model used to make the cube
+        """
+        # metadata is only blended if there are multiple inputs
+        if len(self.input_models) <= 1:
+            return
+        if self.blender is None:
+            self.blender = ModelBlender(blend_ignore_attrs=["meta.filename"])
+            self.mt_avra = getattr(input_model.meta.wcsinfo, "mt_avra", None)
+            self.mt_avdec = getattr(input_model.meta.wcsinfo, "mt_avdec", None)
+        self.blender.accumulate(input_model)
 
     # ________________________________________________________________________________
     def find_ra_dec_offset(self, filename):
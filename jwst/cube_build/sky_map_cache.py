@@ -0,0 +1,173 @@
+"""Cache of the detector to sky mapping of IFU exposures used in building cubes."""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+__all__ = ["SkyMapCache"]
+
+
+class SkyMapCache:
+    """
+    Cache of the detector pixels of IFU exposures mapped to the sky.
+
+    Mapping the detector pixels to the sky evaluates the full IFU WCS on
+    every pixel of an exposure, but the result does not depend on the cube
+    being built.  It is reused for every cube built from the same exposure:
+    band cubes, combined cubes and single cubes.  Mappings are keyed by the
+    file name, the mapping parameters and the WCS evaluated at a sample of
+    detector pixels, and the least recently used mappings are evicted once
+    ``max_bytes`` is exceeded.
+    """
+
+    def __init__(self, max_bytes=2**30):
+        """
+        Initialize the cache.
+
+        Parameters
+        ----------
+        max_bytes : int, optional
+            Maximum total size of the mappings kept in memory.
+        """
+        self.max_bytes = max_bytes
+        self._maps = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._maps)
+
+    @staticmethod
+    def make_key(input_model, wcs_sample, *params):
+        """
+        Compute the cache key for the sky mapping of an exposure.
+
+        Parameters
+        ----------
+        input_model : IFUImageModel
+            The exposure being mapped.
+        wcs_sample : ndarray
+            The WCS of the exposure evaluated at a sample of detector pixels.
+        *params : tuple
+            Any other values the mapping depends on, e.g. the MIRI channel
+            and the RA and Dec offsets applied.
+
+        Returns
+        -------
+        str or None
+            A hexadecimal digest identifying the mapping, or None if the
+            model has no file name, in which case the mapping should not
+            be cached.
+        """
+        filename = input_model.meta.filename
+        if not filename:
+            return None
+        digest = hashlib.sha256()
+        digest.update(repr((filename, input_model.data.shape, *params)).encode())
+        digest.update(np.ascontiguousarray(wcs_sample, dtype=np.float64).tobytes())
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        Retrieve the sky mapping of an exposure.
+
+        Parameters
+        ----------
+        key : str
+            The key returned by `make_key`.
+
+        Returns
+        -------
+        tuple or None
+            The read-only mapping arrays, or None if the mapping is not in
+            the cache.
+        """
+        with self._lock:
+            sky_result = self._maps.get(key)
+            if sky_result is not None:
+                self._maps.move_to_end(key)
+            return sky_result
+
+    def put(self, key, sky_result):
+        """
+        Store the sky mapping of an exposure.
+
+        The arrays are stored as they are and made read-only, so they
+        must not be modified afterwards.
+
+        Parameters
+        ----------
+        key : str
+            The key returned by `make_key`.
+        sky_result : tuple
+            The mapping returned by ``IFUCubeData.map_miri_pixel_to_sky`` or
+            ``IFUCubeData.map_nirspec_pixel_to_sky``.
+        """
+        nbytes = _sky_result_nbytes(sky_result)
+        if nbytes > self.max_bytes:
+            return
+        for array in _sky_result_arrays(sky_result):
+            array.flags.writeable = False
+        with self._lock:
+            if key in self._maps:
+                self._nbytes -= _sky_result_nbytes(self._maps.pop(key))
+            self._maps[key] = sky_result
+            self._nbytes += nbytes
+            while self._nbytes > self.max_bytes:
+                _, evicted = self._maps.popitem(last=False)
+                self._nbytes -= _sky_result_nbytes(evicted)
+
+    def clear(self):
+        """Remove all the mappings from the cache."""
+        with self._lock:
+            self._maps.clear()
+            self._nbytes = 0
+
+
+def _sky_result_arrays(sky_result):
+    """
+    Iterate over the arrays of a sky mapping.
+
+    Parameters
+    ----------
+    sky_result : tuple
+        The mapping; the corner coordinates may be a list of arrays or None.
+
+    Yields
+    ------
+    ndarray
+        The arrays of the mapping.
+    """
+    for value in sky_result:
+        if isinstance(value, np.ndarray):
+            yield value
+        elif isinstance(value, list | tuple):
+            yield from (array for array in value if isinstance(array, np.ndarray))
+
+
+def _sky_result_nbytes(sky_result):
+    """
+    Compute the total size of the arrays of a sky mapping.
+
+    Parameters
+    ----------
+    sky_result : tuple
+        The mapping.
+
+    Returns
+    -------
+    int
+        The number of bytes.
+    """
+    return sum(array.nbytes for array in _sky_result_arrays(sky_result))
@@ -84,17 +84,57 @@ int alloc_blot_arrays(int nelem, double **fluxv, double **weightv) {
     //weight
     if (!(*weightv  = (double*)calloc(nelem, sizeof(double)))) {
       PyErr_SetString(PyExc_MemoryError, msg);
+      free(*fluxv);
+      *fluxv = NULL;
       goto failed_mem_alloc;
     }
     return 0;
 
  failed_mem_alloc:
-    free(*fluxv);
-    free(*weightv);
+    return 1;
 
 }
 
 
+//_______________________________________________________________________
+// Find the range [istart, iend) of detector pixel centers within roi of value.
+// The centers are sorted, so both ends are found by bisection.
+//_______________________________________________________________________
+
+static void roi_range(const double *centers, int n, double value, double roi,
+		      int *istart, int *iend) {
+  int lo = 0, hi = n, mid;
+  while (lo < hi) {
+    mid = lo + (hi - lo) / 2;
+    if (centers[mid] - value >= -roi) {
+      hi = mid;
+    } else {
+      lo = mid + 1;
+    }
+  }
+  *istart = lo;
+  hi = n;
+  while (lo < hi) {
+    mid = lo + (hi - lo) / 2;
+    if (centers[mid] - value > roi) {
+      hi = mid;
+    } else {
+      lo = mid + 1;
+    }
+  }
+  *iend = lo;
+}
+
+
+static int centers_sorted(const double *centers, int n) {
+  int i;
+  for (i = 0; i < n - 1; i++) {
+    if (!(centers[i] <= centers[i + 1])) return 0;
+  }
+  return 1;
+}
+
+
 // Match the median cube mapped to detector space with detector pixels
 // Match occurs when x distance or y distance < roi size (set to 1 pixel)
 // The combined flux for the blotted image is determined using a modified
@@ -109,7 +149,7 @@ int blot_overlap(double roi, int xsize_det, int ysize_det,
 		 double **blot_flux, double **blot_weight) {
 
   double *fluxv, *weightv;  // vector for blot values
-  int k, ix, iy;
+  int k, ix, iy, ixstart, ixend, iystart, iyend, sorted;
   long index2d;
   double dx, dy, dxy, weight_distance, weighted_flux;
   int npt = xsize_det * ysize_det;
@@ -117,11 +157,25 @@ int blot_overlap(double roi, int xsize_det, int ysize_det,
   // allocate memory to hold output
   if (alloc_blot_arrays(npt, &fluxv, &weightv)) return 1;
 
+  // exposures may be blotted in parallel threads
+  Py_BEGIN_ALLOW_THREADS
+
+  // only search the detector pixels within roi of the median cube value
+  sorted = centers_sorted(xcenter, xsize2) && centers_sorted(ycenter, ysize_det);
+  ixstart = 0;
+  ixend = xsize2;
+  iystart = 0;
+  iyend = ysize_det;
+
   for (k = 0; k < ncube; k++) {
-    for (ix = 0; ix< xsize2; ix ++){
+    if (sorted) {
+      roi_range(xcenter, xsize2, x_cube[k], roi, &ixstart, &ixend);
+      roi_range(ycenter, ysize_det, y_cube[k], roi, &iystart, &iyend);
+    }
+    for (ix = ixstart; ix< ixend; ix ++){
       dx = fabs(x_cube[k] - xcenter[ix]);
       if( dx <= roi){
-	for ( iy = 0; iy < ysize_det; iy ++){
+	for ( iy = iystart; iy < iyend; iy ++){
 	  dy = fabs(y_cube[k] - ycenter[iy]);
 	  if (dy <= roi){
 	    dxy = sqrt(dx*dx + dy*dy);
@@ -136,6 +190,8 @@ int blot_overlap(double roi, int xsize_det, int ysize_det,
     } // end loop over ix
   } // end loop over ncube
 
+  Py_END_ALLOW_THREADS
+
   // assign output values:
 
   *blot_flux = fluxv;
@@ -16,10 +16,14 @@
 
 // routines used from cube_utils.c
 
+extern void set_memory_error(const char *msg);
+
 extern double sh_find_overlap(const double xcenter, const double ycenter, 
 			      const double xlength, const double ylength,
 			      double xPixelCorner[], double yPixelCorner[]);
 
+extern int is_sorted(const double *centers, int n);
+
 
 int mem_alloc_dq(int nelem, int **idqv) {
   /*
@@ -41,7 +45,7 @@ int mem_alloc_dq(int nelem, int **idqv) {
     const char *msg = "Couldn't allocate memory for output arrays.";
 
     if (!(*idqv = (int*)calloc(nelem, sizeof(int)))) {
-      PyErr_SetString(PyExc_MemoryError, msg);
+      set_memory_error(msg);
       return 1;
     }
 
@@ -49,13 +53,111 @@ int mem_alloc_dq(int nelem, int **idqv) {
 }
 
 
+static void planes_near_wave(const double *zc, int nz, double value, double roiw_ave,
+			     int *wstart, int *wend) {
+  /*
+    Find the wavelength planes [wstart, wend) with |zc[w] - value| < roiw_ave.
+
+    The wavelength planes must be in increasing order, so that zc[w] - value
+    is non-decreasing and both bounds are found by bisection.
+  */
+  int lo = 0, hi = nz, mid;
+  while (lo < hi) {
+    mid = lo + (hi - lo) / 2;
+    if (zc[mid] - value > -roiw_ave) {
+      hi = mid;
+    } else {
+      lo = mid + 1;
+    }
+  }
+  *wstart = lo;
+  hi = nz;
+  while (lo < hi) {
+    mid = lo + (hi - lo) / 2;
+    if (zc[mid] - value >= roiw_ave) {
+      hi = mid;
+    } else {
+      lo = mid + 1;
+    }
+  }
+  *wend = lo;
+}
+
+
+int index_points_by_plane(int nz, double *zc, double roiw_ave,
+			  double *wave, long npt,
+			  long **plane_start, long **plane_points) {
+  /*
+    Index the point cloud members falling within roiw_ave of each wavelength plane.
+
+    The members of wavelength plane w are plane_points[plane_start[w]:plane_start[w + 1]],
+    in increasing order, so looping over them gives the same results as looping
+    over the full point cloud and skipping the members outside roiw_ave.
+
+    Parameters
+    ----------
+    nz : int
+        Number of wavelength planes
+    zc : ndarray
+        Array of wavelength
+    roiw_ave : double
+        Average roiw for all wavelengths
+    wave : ndarray
+        Wavelength values for the center of pixel
+    npt: long
+        Number of detector pixels
+    plane_start, plane_points : pointer
+        Pointers to the index, set by this routine.
+
+    Returns
+    -------
+    status : int
+        1 = index built
+        0 = no index (wavelength planes not sorted or not enough memory),
+            the full point cloud has to be searched for each plane.
+  */
+  long ipt, total, *start, *points, *fill;
+  int w, wstart, wend;
+
+  *plane_start = NULL;
+  *plane_points = NULL;
+  if (!is_sorted(zc, nz)) return 0;
+
+  if (!(start = (long*)calloc(nz + 1, sizeof(long)))) return 0;
+  for (ipt = 0; ipt < npt; ipt++) {
+    planes_near_wave(zc, nz, wave[ipt], roiw_ave, &wstart, &wend);
+    for (w = wstart; w < wend; w++) start[w + 1]++;
+  }
+  for (w = 0; w < nz; w++) start[w + 1] += start[w];
+  total = start[nz];
+
+  points = (long*)malloc((total > 0 ? total : 1) * sizeof(long));
+  fill = (long*)malloc(nz * sizeof(long));
+  if (!points || !fill) {
+    free(start);
+    free(points);
+    free(fill);
+    return 0;
+  }
+  for (w = 0; w < nz; w++) fill[w] = start[w];
+  for (ipt = 0; ipt < npt; ipt++) {
+    planes_near_wave(zc, nz, wave[ipt], roiw_ave, &wstart, &wend);
+    for (w = wstart; w < wend; w++) points[fill[w]++] = ipt;
+  }
+  free(fill);
+
+  *plane_start = start;
+  *plane_points = points;
+  return 1;
+}
+
 
 int corner_wave_plane_miri(int w, int start_region, int end_region,
 			   double roiw_ave,
 			   double *zc,
 			   double *coord1, double *coord2, double *wave,
 			   double *sliceno,
-			   long ncube, long npt,
+			   long ncube, long npt, long *ipts,
 			   double *corner1, double *corner2, double *corner3, double *corner4) {
   /* 
 
@@ -90,6 +192,8 @@ int corner_wave_plane_miri(int w, int start_region, int end_region,
          Number of cube elements
      npt: int
          Number of detector pxiels 
+     ipts : ndarray or NULL
+         If not NULL, only these npt detector pixels are searched
      corner1 : ndarray
          xi, eta of corner 1
      corner2 : ndarray
@@ -101,7 +205,7 @@ int corner_wave_plane_miri(int w, int start_region, int end_region,
    */
 
   int slice, c1_use;
-  long ipt;
+  long ipt, j;
   double wave_distance;
   float c11, c21, c12, c22, length_c1_start, length_c2_start;
   int status = 0; 
@@ -132,7 +236,8 @@ int corner_wave_plane_miri(int w, int start_region, int end_region,
   // and 
   // 2. Are for either of the 2 extreme slices
   
-  for (ipt =0; ipt< npt ; ipt++){
+  for (j =0; j< npt ; j++){
+    ipt = ipts ? ipts[j] : j;
     slice = (int)sliceno[ipt];
     wave_distance = fabs(zc[w] - wave[ipt]);
 
@@ -360,7 +465,7 @@ long match_wave_plane_nirspec(double wave_plane,
 			      double coord2[],
 			      double wave[],
 			      double sliceno[], 
-			      long npt,
+			      long npt, long *ipts,
 			      double *c1_min, double* c2_min,
 			      double *c1_max, double *c2_max,
 			      int *match_slice){
@@ -388,6 +493,8 @@ long match_wave_plane_nirspec(double wave_plane,
          Slice no of the pixels
      npt: int
          Number of detector pxiels 
+     ipts : ndarray or NULL
+         If not NULL, only these npt detector pixels are searched
 
      Sets:
      c1_min, c2_min, c1_max, c2_max : array of size 30
@@ -403,7 +510,7 @@ long match_wave_plane_nirspec(double wave_plane,
         Number of pixels with DQ set. 
    */
 
-  long ipt =0;
+  long ipt =0, j;
   double wave_distance;
   double slice;
   long ii = 0;
@@ -422,7 +529,8 @@ long match_wave_plane_nirspec(double wave_plane,
     match_slice[i] = 0;
   }
 
-  for (ipt =0; ipt< npt ; ipt++){
+  for (j =0; j< npt ; j++){
+    ipt = ipts ? ipts[j] : j;
     slice = sliceno[ipt];
 
     wave_distance = fabs(wave_plane - wave[ipt]);
@@ -648,6 +756,8 @@ int dq_miri(int start_region, int end_region, int overlap_partial, int overlap_f
   */
   int status, status_wave, w, nxy, i, istart, iend, in, ii;
   double xi_corner[4], eta_corner[4];
+  long *plane_start, *plane_points;
+  int indexed;
   
   int *idqv ;  // int vector for spaxel
 
@@ -674,6 +784,9 @@ int dq_miri(int start_region, int end_region, int overlap_partial, int overlap_f
       return 1;
   }
 
+  // only search the point cloud members near each wavelength plane
+  indexed = index_points_by_plane(nz, zc, roiw_ave, wave, npt, &plane_start, &plane_points);
+
   // Loop over the wavelength planes and set DQ plane 
   for (w = 0; w  < nz; w++) {
     
@@ -682,7 +795,9 @@ int dq_miri(int start_region, int end_region, int overlap_partial, int overlap_f
     }
     status_wave = 0;   
     status_wave =  corner_wave_plane_miri( w, start_region, end_region, roiw_ave, zc,
-					  coord1, coord2, wave, sliceno, ncube, npt,
+					  coord1, coord2, wave, sliceno, ncube,
+					  indexed ? plane_start[w + 1] - plane_start[w] : npt,
+					  indexed ? plane_points + plane_start[w] : NULL,
 					  corner1, corner2, corner3, corner4);
     if( status_wave == 0){ // found min and max slice on wavelength plane
 
@@ -719,6 +834,8 @@ int dq_miri(int start_region, int end_region, int overlap_partial, int overlap_f
   *spaxel_dq = idqv;
 
   free (wave_slice_dq);
+  free(plane_start);
+  free(plane_points);
   return 0;
 }
 
@@ -774,6 +891,8 @@ int dq_nirspec(int overlap_partial,
   long istart, in, iend, ii, i;
   double c1_min, c2_min, c1_max, c2_max;
   int *idqv ;  // int vector for spaxel
+  long *plane_start, *plane_points;
+  int indexed;
 
   idqv = (int*)calloc(ncube, sizeof(int));
   if (NULL==idqv)
@@ -787,6 +906,9 @@ int dq_nirspec(int overlap_partial,
   
   nxy = nx * ny;
 
+  // only search the point cloud members near each wavelength plane
+  indexed = index_points_by_plane(nz, zc, roiw_ave, wave, npt, &plane_start, &plane_points);
+
   for (w = 0; w  < nz; w++) {
     long imatch = 0;
     double c1_min[30];
@@ -799,7 +921,9 @@ int dq_nirspec(int overlap_partial,
     // tangent plane coordinates for each slice
     imatch =  match_wave_plane_nirspec(zc[w], roiw_ave,
 				       coord1, coord2, wave,
-				       sliceno, npt,
+				       sliceno,
+				       indexed ? plane_start[w + 1] - plane_start[w] : npt,
+				       indexed ? plane_points + plane_start[w] : NULL,
 				       c1_min, c2_min,
 				       c1_max, c2_max,
 				       match_slice);
@@ -810,6 +934,8 @@ int dq_nirspec(int overlap_partial,
     {
         free(idqv);
         idqv = NULL;
+        free(plane_start);
+        free(plane_points);
         return 1;
     }
 
@@ -858,6 +984,8 @@ int dq_nirspec(int overlap_partial,
     free(wave_slice_dq);
   } // end of wavelength
   *spaxel_dq = idqv;
+  free(plane_start);
+  free(plane_points);
   
   return 0;
 }
@@ -494,6 +494,10 @@ static PyObject *cube_wrapper_driz(PyObject *module, PyObject *args) {
   
   int status1 = 0;
 
+  // The matching only uses the C arrays, so release the GIL to allow
+  // several wavelength ranges of the cube to be matched in parallel threads.
+  Py_BEGIN_ALLOW_THREADS
+
   if(flag_dq_plane){
     if (instrument == 0){
       status1 = dq_miri(start_region, end_region,overlap_partial, overlap_full,
@@ -552,6 +556,8 @@ static PyObject *cube_wrapper_driz(PyObject *module, PyObject *args) {
 			nxx, nyy, nwave, ncube, npt,linear, debug_cube_index,
 			&spaxel_flux, &spaxel_weight, &spaxel_var, &spaxel_iflux);
 
+  Py_END_ALLOW_THREADS
+
 
   if (status || status1) {
     goto fail;
@@ -125,6 +125,11 @@ extern int dq_nirspec(int overlap_partial,
 
 extern int set_dqplane_to_zero(int ncube, int **spaxel_dq);
 
+extern int is_sorted(const double *centers, int n);
+
+extern int find_roi_range(const double *centers, int n, int sorted, double value, double roi,
+			  int *istart, int *iend);
+
 // Match point cloud to sky and determine the weighting to assign to each point cloud  member
 // to matched spaxel based on ROI - weighting type is emsm.
 
@@ -146,9 +151,10 @@ int match_point_emsm(double *xc, double *yc, double *zc,
   double *fluxv=NULL, *weightv=NULL, *varv=NULL, *ifluxv=NULL;  // vector for spaxel
 
   int k, iwstart, iwend, ixstart,  ixend, iystart, iyend;
-  int ii, nxy, ix, iy, iw, index_xy, index_cube;
+  int nxy, ix, iy, iw, index_xy, index_cube;
   int done_search_w, done_search_y, done_search_x;
-  double wdiff, ydiff, xdiff, ydist, xdist, radius;
+  int sorted_w, sorted_x, sorted_y;
+  double ydist, xdist, radius;
   double d1, d2, dxy, d3, d32, w, wn, ww, weighted_flux, weighted_var;
 
   // allocate memory to hold output
@@ -157,83 +163,16 @@ int match_point_emsm(double *xc, double *yc, double *zc,
 
     // loop over each point cloud member and find which roi spaxels it is found
 
-  for (k = 0; k < npt; k++) {
-    // Search wave and find match
-    iwstart = -1;
-    iwend = -1;
-    ii = 0;
-    done_search_w = 0;
-
-    while (ii < nwave && done_search_w == 0) {
-      wdiff = fabs(zc[ii] - wave[k]);
-      if(wdiff <= roiw_pixel[k]){
-	if (iwstart == -1){
-	  iwstart = ii;
-	}
-      } else{
-	if(iwstart != -1 && iwend ==-1){
-	  iwend = ii;
-	  done_search_w = 1;
-	}
-      }
-      ii = ii + 1;
-    }
-    // catch the case of iwstart near nwave and becomes = nwave before iwend can be set.
-    if(iwstart !=-1 && iwend == -1){
-      iwend = nwave;
-      done_search_w = 1;
-    }
-    // Search xcenters and find match
-    ixstart = -1;
-    ixend = -1;
-    ii = 0;
-    done_search_x = 0;
-
-    while (ii < nx && done_search_x == 0) {
-      xdiff = fabs(xc[ii] - coord1[k]);
-      if(xdiff <= rois_pixel[k]){
-	if (ixstart == -1){
-	  ixstart = ii;
-	}
-      } else{
-	if(ixstart != -1 && ixend ==-1){
-	  ixend = ii;
-	  done_search_x = 1;
-	}
-      }
-      ii = ii + 1;
-    }
-
-    // catch the case of ixstart near nx and becomes = nx before ixend can be set.
-    if(ixstart !=-1 && ixend == -1){
-      ixend = nx;
-      done_search_x = 1;
-    }
+  // the cube axes are the spatial index of the point cloud
+  sorted_x = is_sorted(xc, nx);
+  sorted_y = is_sorted(yc, ny);
+  sorted_w = is_sorted(zc, nwave);
 
-    // Search ycenters and find match
-    iystart = -1;
-    iyend = -1;
-    ii = 0;
-    done_search_y = 0;
-    while (ii < ny && done_search_y == 0) {
-      ydiff = fabs(yc[ii] - coord2[k]);
-      if(ydiff <= rois_pixel[k]){
-	if (iystart == -1){
-	  iystart = ii;
-	}
-      } else{
-	if(iystart != -1 && iyend ==-1){
-	  iyend = ii;
-	  done_search_y = 1;
-	}
-      }
-      ii = ii + 1;
-    }
-    // catch the case of iystart near ny and becomes = ny before iyend can be set.
-    if(iystart !=-1 && iyend == -1){
-      iyend = ny;
-      done_search_y = 1;
-    }
+  for (k = 0; k < npt; k++) {
+    // Find the wavelength planes and x, y centers in the roi of the point cloud member
+    done_search_w = find_roi_range(zc, nwave, sorted_w, wave[k], roiw_pixel[k], &iwstart, &iwend);
+    done_search_x = find_roi_range(xc, nx, sorted_x, coord1[k], rois_pixel[k], &ixstart, &ixend);
+    done_search_y = find_roi_range(yc, ny, sorted_y, coord2[k], rois_pixel[k], &iystart, &iyend);
 
     // set up the values for fluxv, weightv, ifluxv, varv
     nxy = nx * ny;
@@ -308,9 +247,10 @@ int match_point_msm(double *xc, double *yc, double *zc,
 
   int k;
   int iwstart, iwend, ixstart, ixend, iystart, iyend;
-  int ii, nxy, iw, ix, iy, index_xy, index_cube;
+  int nxy, iw, ix, iy, index_xy, index_cube;
   int done_search_w, done_search_x, done_search_y;
-  double wdiff, xdiff, ydiff, radius, ydist, xdist;
+  int sorted_w, sorted_x, sorted_y;
+  double radius, ydist, xdist;
   double d1, d2, dxy, d3, d32, w, wn, ww;
   double weighted_flux, weighted_var;
 
@@ -319,82 +259,16 @@ int match_point_msm(double *xc, double *yc, double *zc,
 
   // loop over each point cloud member and find which roi spaxels it is found
 
+  // the cube axes are the spatial index of the point cloud
+  sorted_x = is_sorted(xc, nx);
+  sorted_y = is_sorted(yc, ny);
+  sorted_w = is_sorted(zc, nwave);
+
   for ( k = 0; k < npt; k++) {
-    // Search wave and find match
-    iwstart = -1;
-    iwend = -1;
-    ii = 0;
-    done_search_w = 0;
-
-    while (ii < nwave && done_search_w == 0) {
-	wdiff = fabs(zc[ii] - wave[k]);
-	if(wdiff <= roiw_pixel[k]){
-	  if (iwstart == -1){
-	    iwstart = ii;
-	  }
-	} else{
-	  if(iwstart != -1 && iwend ==-1){
-	    iwend = ii;
-	    done_search_w = 1;
-	  }
-	}
-	ii = ii + 1;
-      }
-      // catch the case of iwstart near nwave and becomes = nwave before iwend can be set.
-      if(iwstart !=-1 && iwend == -1){
-      	iwend = nwave;
-      	done_search_w = 1;
-      }
-
-      // Search xcenters and find match
-      ixstart = -1;
-      ixend = -1;
-      ii = 0;
-      done_search_x = 0;
-      while (ii < nx && done_search_x == 0) {
-	xdiff = fabs(xc[ii] - coord1[k]);
-	if(xdiff <= rois_pixel[k]){
-	  if (ixstart == -1){
-	    ixstart = ii;
-	  }
-	} else{
-	  if(ixstart != -1 && ixend ==-1){
-	    ixend = ii;
-	    done_search_x = 1;
-	  }
-	}
-	ii = ii + 1;
-      }
-      // catch the case of ixstart near nx and becomes = nx before ixend can be set.
-      if(ixstart !=-1 && ixend == -1){
-	ixend = nx;
-	done_search_x = 1;
-      }
-
-       // Search ycenters and find match
-      iystart = -1;
-      iyend = -1;
-      ii = 0;
-      done_search_y = 0;
-      while (ii < ny && done_search_y == 0) {
-	ydiff = fabs(yc[ii] - coord2[k]);
-	if(ydiff <= rois_pixel[k]){
-	  if (iystart == -1){
-	    iystart = ii;
-	  }
-	} else{
-	  if(iystart != -1 && iyend ==-1){
-	    iyend = ii;
-	    done_search_y = 1;
-	  }
-	}
-	ii = ii + 1;
-      }
-      // catch the case of iystart near ny and becomes = ny before iyend can be set.
-      if(iystart !=-1 && iyend == -1){
-	iyend = ny;
-	done_search_y = 1;
-      }
+      // Find the wavelength planes and x, y centers in the roi of the point cloud member
+      done_search_w = find_roi_range(zc, nwave, sorted_w, wave[k], roiw_pixel[k], &iwstart, &iwend);
+      done_search_x = find_roi_range(xc, nx, sorted_x, coord1[k], rois_pixel[k], &ixstart, &ixend);
+      done_search_y = find_roi_range(yc, ny, sorted_y, coord2[k], rois_pixel[k], &iystart, &iyend);
 
       // set up the values for fluxv, weightv, ifluxv, varv
       nxy = nx * ny;
@@ -576,6 +450,10 @@ static PyObject *cube_wrapper(PyObject *module, PyObject *args) {
   // if flag_dq_plane = 1, Set up the dq plane
   //______________________________________________________________________
   int status1 = 0;
+  // The matching only uses the C arrays, so release the GIL to allow
+  // several wavelength ranges of the cube to be matched in parallel threads.
+  Py_BEGIN_ALLOW_THREADS
+
   if(flag_dq_plane){
     if (instrument == 0){
       status1 = dq_miri(start_region, end_region,overlap_partial, overlap_full,
@@ -646,6 +524,8 @@ static PyObject *cube_wrapper(PyObject *module, PyObject *args) {
 			     &spaxel_flux, &spaxel_weight, &spaxel_var, &spaxel_iflux);
   }
 
+  Py_END_ALLOW_THREADS
+
 
   if (status || status1) {
     goto fail;
@@ -18,6 +18,24 @@ a spaxel.  We are only dealing with the spatial dimensions in this routine.
 #define CP_TOP 3
 
 
+void set_memory_error(const char *msg) {
+
+  /*
+    Set a Python MemoryError.
+
+    The cube matching routines may run with the GIL released, so
+    acquire it before setting the error.
+
+   msg : char array
+       Error message
+  */
+
+  PyGILState_STATE gstate = PyGILState_Ensure();
+  PyErr_SetString(PyExc_MemoryError, msg);
+  PyGILState_Release(gstate);
+}
+
+
 int alloc_flux_arrays(int nelem, double **fluxv, double **weightv, double **varv,  double **ifluxv) {
 
   /*
@@ -39,25 +57,25 @@ int alloc_flux_arrays(int nelem, double **fluxv, double **weightv, double **varv
 
     // flux:
     if (!(*fluxv  = (double*)calloc(nelem, sizeof(double)))) {
-        PyErr_SetString(PyExc_MemoryError, msg);
+        set_memory_error(msg);
         goto failed_mem_alloc1;
     }
 
     //weight
     if (!(*weightv  = (double*)calloc(nelem, sizeof(double)))) {
-      PyErr_SetString(PyExc_MemoryError, msg);
+      set_memory_error(msg);
       goto failed_mem_alloc2;
     }
 
     //variance
     if (!(*varv  = (double*)calloc(nelem, sizeof(double)))) {
-      PyErr_SetString(PyExc_MemoryError, msg);
+      set_memory_error(msg);
       goto failed_mem_alloc3;
     }
 
     //iflux
     if (!(*ifluxv  = (double*)calloc(nelem, sizeof(double)))) {
-      PyErr_SetString(PyExc_MemoryError, msg);
+      set_memory_error(msg);
       goto failed_mem_alloc4;
     }
 
@@ -74,6 +92,104 @@ int alloc_flux_arrays(int nelem, double **fluxv, double **weightv, double **varv
     return 1;
 }
 
+
+int is_sorted(const double *centers, int n) {
+
+  /*
+    Check if the spaxel centers along an axis of the cube are in increasing order.
+
+   centers : double array
+       Spaxel centers along the axis
+   n : int
+       Number of spaxels along the axis
+
+   Returns 1 if the centers are in increasing order (NaN values are not), 0 otherwise.
+  */
+
+  int i;
+  for (i = 0; i < n - 1; i++) {
+    if (!(centers[i] <= centers[i + 1])) return 0;
+  }
+  return 1;
+}
+
+
+int find_roi_range(const double *centers, int n, int sorted, double value, double roi,
+		   int *istart, int *iend) {
+
+  /*
+    Find the range of spaxels along an axis of the cube within the region of
+    interest of a point cloud member.
+
+    The spaxels with |centers[i] - value| <= roi are [istart, iend).  If the
+    centers are sorted, the cube axis acts as the spatial index of the point
+    cloud and the range is found by bisection. Otherwise the axis is scanned
+    and the first contiguous range is used.
+
+   centers : double array
+       Spaxel centers along the axis
+   n : int
+       Number of spaxels along the axis
+   sorted : int
+       1 if the centers are in increasing order (see is_sorted)
+   value : double
+       Coordinate of the point cloud member along the axis
+   roi : double
+       Region of interest of the point cloud member along the axis
+   istart, iend : int
+       Range of spaxels found
+
+   Returns 1 if spaxels were found, 0 otherwise.
+  */
+
+  int lo, hi, mid, ii;
+
+  if (sorted) {
+    // For increasing centers, centers[i] - value is non-decreasing, so both
+    // bounds of |centers[i] - value| <= roi are monotonic in i.
+    lo = 0;
+    hi = n;
+    while (lo < hi) {
+      mid = lo + (hi - lo) / 2;
+      if (centers[mid] - value >= -roi) {
+	hi = mid;
+      } else {
+	lo = mid + 1;
+      }
+    }
+    *istart = lo;
+
+    hi = n;
+    while (lo < hi) {
+      mid = lo + (hi - lo) / 2;
+      if (centers[mid] - value > roi) {
+	hi = mid;
+      } else {
+	lo = mid + 1;
+      }
+    }
+    *iend = lo;
+    return *iend > *istart;
+  }
+
+  *istart = -1;
+  *iend = -1;
+  for (ii = 0; ii < n; ii++) {
+    if (fabs(centers[ii] - value) <= roi) {
+      if (*istart == -1) *istart = ii;
+    } else if (*istart != -1) {
+      *iend = ii;
+      return 1;
+    }
+  }
+  // catch the case of istart near n and the end of the axis reached before iend is set
+  if (*istart != -1) {
+    *iend = n;
+    return 1;
+  }
+  return 0;
+}
+
 void addpoint (double x, double y, double xnew[], double ynew[], int *nVertices2){
 
   /*
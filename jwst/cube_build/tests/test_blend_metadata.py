@@ -0,0 +1,42 @@
+"""
+Unit test for Cube Build blending the metadata of the input files
+"""
+
+import numpy as np
+from stdatamodels.jwst import datamodels
+
+from jwst.cube_build import ifu_cube
+from jwst.model_blender import blendmeta
+
+
+def test_blend_output_metadata():
+    """Test the metadata blended file by file matches blending all the files at once."""
+    input_models = []
+    for i in range(3):
+        model = datamodels.IFUImageModel(data=np.zeros((4, 4)))
+        model.meta.filename = f"test{i}.fits"
+        model.meta.instrument.name = "MIRI"
+        model.meta.exposure.start_time = 60000.0 + i
+        model.meta.exposure.end_time = 60000.5 + i
+        model.meta.wcsinfo.mt_avra = 10.0
+        model.meta.wcsinfo.mt_avdec = 20.0
+        input_models.append(model)
+
+    pars_cube = {"debug_spaxel": "-1 -1 -1"}
+    cube = ifu_cube.IFUCubeData(
+        3, input_models, None, None, "MIRI", None, None, None, None, **pars_cube
+    )
+    for model in input_models:
+        cube.accumulate_metadata(model)
+
+    result = datamodels.IFUCubeModel()
+    cube.blend_output_metadata(result)
+
+    expected = datamodels.IFUCubeModel()
+    blendmeta.blendmodels(expected, input_models, ignore=["meta.filename"])
+
+    assert result.meta.exposure.start_time == expected.meta.exposure.start_time
+    assert result.meta.exposure.end_time == expected.meta.exposure.end_time
+    assert len(result.hdrtab) == len(expected.hdrtab) == 3
+    assert result.meta.target.ra == 10.0
+    assert result.meta.target.dec == 20.0
@@ -0,0 +1,115 @@
+"""
+Unit test for Cube Build matching the point cloud to the cube in threads
+"""
+
+import numpy as np
+import pytest
+
+from jwst.cube_build import ifu_cube
+
+
+def make_cube(weighting, maximum_cores):
+    """Set up a small NIRSpec cube with a non-linear wavelength axis."""
+    pars_cube = {
+        "interpolation": "drizzle" if weighting == "drizzle" else "pointcloud",
+        "weighting": weighting,
+        "weight_power": 2,
+        "coord_system": "skyalign",
+        "skip_dqflagging": False,
+        "debug_spaxel": "-1 -1 -1",
+        "maximum_cores": maximum_cores,
+    }
+    cube = ifu_cube.IFUCubeData(3, None, None, None, "NIRSPEC", None, None, None, None, **pars_cube)
+
+    cube.naxis1, cube.naxis2, cube.naxis3 = 9, 11, 37
+    cube.cdelt1 = cube.cdelt2 = 0.13
+    cube.xcoord = (np.arange(cube.naxis1) - 4) * cube.cdelt1
+    cube.ycoord = (np.arange(cube.naxis2) - 5) * cube.cdelt2
+    cube.linear_wavelength = False
+    cube.cdelt3_normal = 0.002 + 0.001 * np.arange(cube.naxis3) / cube.naxis3
+    cube.zcoord = 5.0 + np.cumsum(cube.cdelt3_normal) - cube.cdelt3_normal / 2
+    cube.overlap_partial = 4
+    cube.overlap_full = 2
+    return cube
+
+
+def make_pixels(cube, npt=4000):
+    """Make random detector pixel values falling on the cube."""
+    rng = np.random.default_rng(42)
+    wave = rng.uniform(cube.zcoord[0] - 0.01, cube.zcoord[-1] + 0.01, npt)
+    coord1 = rng.uniform(-0.45, 0.45, npt)
+    coord2 = rng.uniform(-0.6, 0.6, npt)
+    d = 0.06
+    corner_coord = (
+        coord1 - d,
+        coord2 - d,
+        coord1 + d,
+        coord2 - d,
+        coord1 + d,
+        coord2 + d,
+        coord1 - d,
+        coord2 + d,
+    )
+    return (
+        coord1,
+        coord2,
+        corner_coord,
+        wave,
+        np.full(npt, 0.0025),
+        rng.normal(size=npt),
+        np.abs(rng.normal(size=npt)),
+        rng.integers(1, 30, npt).astype(np.int32),
+        np.full(npt, 0.2),
+        rng.uniform(0.002, 0.005, npt),
+        np.full(npt, 2.0),
+        np.full(npt, 0.01),
+        np.full(npt, 0.2),
+        rng.uniform(0, 2048, npt),
+        rng.uniform(0, 2048, npt),
+    )
+
+
+@pytest.mark.parametrize("weighting", ["drizzle", "emsm", "msm"])
+@pytest.mark.parametrize("flag_dq_plane", [0, 1])
+def test_match_point_cloud_threads(weighting, flag_dq_plane):
+    """Test the threaded matching gives the same cube as the serial one."""
+    cube = make_cube(weighting, "1")
+    pixelresult = make_pixels(cube)
+    expected = cube.match_point_cloud(pixelresult, 1, flag_dq_plane, 0, 0)
+    assert np.count_nonzero(expected[3]) > 0
+
+    cube = make_cube(weighting, "3")
+    result = cube.match_point_cloud(pixelresult, 1, flag_dq_plane, 0, 0)
+    for value, expected_value in zip(result, expected, strict=True):
+        np.testing.assert_array_equal(value, expected_value)
+
+
+def test_match_point_cloud_emsm_brute_force():
+    """Test the spaxels found from the region of interest search against a direct search."""
+    cube = make_cube("emsm", "1")
+    pixelresult = make_pixels(cube, npt=500)
+    flux, weight, _, iflux, _ = cube.match_point_cloud(pixelresult, 1, 0, 0, 0)
+
+    coord1, coord2, _, wave, _, pixel_flux, _, _, rois, roiw, _, _, scalerad = pixelresult[:13]
+    zz, yy, xx = np.meshgrid(cube.zcoord, cube.ycoord, cube.xcoord, indexing="ij")
+    cdelt3 = np.broadcast_to(cube.cdelt3_normal[:, None, None], zz.shape)
+    expected_flux = np.zeros(zz.size)
+    expected_weight = np.zeros(zz.size)
+    expected_iflux = np.zeros(zz.size)
+    for k in range(len(wave)):
+        xdist = np.abs(xx - coord1[k]).ravel()
+        ydist = np.abs(yy - coord2[k]).ravel()
+        wdist = np.abs(zz - wave[k]).ravel()
+        match = (np.hypot(xdist, ydist) <= rois[k]) & (wdist <= roiw[k])
+        match &= (xdist <= rois[k]) & (ydist <= rois[k])
+        dist = (xdist / cube.cdelt1) ** 2 + (ydist / cube.cdelt2) ** 2
+        dist += (wdist / cdelt3.ravel()) ** 2
+        ww = np.exp(-dist / (scalerad[k] / cube.cdelt1))
+        expected_flux[match] += pixel_flux[k] * ww[match]
+        expected_weight[match] += ww[match]
+        expected_iflux[match] += 1
+
+    assert np.count_nonzero(expected_iflux) > 0
+    np.testing.assert_array_equal(iflux, expected_iflux)
+    np.testing.assert_allclose(weight, expected_weight, rtol=1e-12)
+    np.testing.assert_allclose(flux, expected_flux, rtol=1e-10, atol=1e-12)
@@ -0,0 +1,96 @@
+"""
+Unit test for Cube Build reusing the detector to sky mapping
+"""
+
+import numpy as np
+from stdatamodels.jwst import datamodels
+
+from jwst.cube_build import ifu_cube, instrument_defaults
+from jwst.cube_build.sky_map_cache import SkyMapCache
+
+shape = (20, 30)
+
+
+def dummy_wcs(x, y):
+    """Simple WCS for testing"""
+    return 45.0 + x * 0.001, 45.0 + y * 0.001, 7.5 + y * 0.01
+
+
+def make_model(filename):
+    model = datamodels.IFUImageModel(data=np.zeros(shape))
+    model.meta.filename = filename
+    model.meta.instrument.name = "MIRI"
+    model.meta.wcs = dummy_wcs
+    return model
+
+
+def make_cube(cache):
+    pars_cube = {
+        "interpolation": "pointcloud",
+        "weighting": "emsm",
+        "coord_system": "skyalign",
+        "debug_spaxel": "-1 -1 -1",
+        "sky_map_cache": cache,
+    }
+    instrument_info = instrument_defaults.InstrumentInfo()
+    instrument_info.set_xslice_limits(0, 15, "1")
+    instrument_info.set_xslice_limits(15, 30, "2")
+    return ifu_cube.IFUCubeData(
+        3, None, None, None, "MIRI", None, None, instrument_info, None, **pars_cube
+    )
+
+
+def test_map_pixel_to_sky_cached(monkeypatch):
+    """Test the sky mapping is computed once per exposure, channel and WCS."""
+    calls = []
+
+    def map_miri_pixel_to_sky(self, input_model, this_par1, offsets):
+        calls.append((input_model.meta.filename, this_par1))
+        x = np.arange(3)
+        return (x, x, x * 1.0, x * 1.0, x * 1.0, x, None, None)
+
+    monkeypatch.setattr(ifu_cube.IFUCubeData, "map_miri_pixel_to_sky", map_miri_pixel_to_sky)
+
+    cache = SkyMapCache()
+    model = make_model("test1.fits")
+    first = make_cube(cache).map_pixel_to_sky(model, "1", None)
+    second = make_cube(cache).map_pixel_to_sky(model, "1", None)
+    assert second is first
+    assert not first[2].flags.writeable
+
+    # a different channel, file or WCS is mapped again
+    make_cube(cache).map_pixel_to_sky(model, "2", None)
+    make_cube(cache).map_pixel_to_sky(make_model("test2.fits"), "1", None)
+    model.meta.wcs = lambda x, y: (dummy_wcs(x, y)[0] + 1e-6, *dummy_wcs(x, y)[1:])
+    make_cube(cache).map_pixel_to_sky(model, "1", None)
+    assert calls == [
+        ("test1.fits", "1"),
+        ("test1.fits", "2"),
+        ("test2.fits", "1"),
+        ("test1.fits", "1"),
+    ]
+
+    # no caching for models without a file name
+    make_cube(cache).map_pixel_to_sky(make_model(None), "1", None)
+    make_cube(cache).map_pixel_to_sky(make_model(None), "1", None)
+    assert len(calls) == 6
+
+
+def test_sky_map_cache_eviction():
+    """Test the least recently used mappings are evicted."""
+    x = np.zeros(50)  # 400 bytes
+    cache = SkyMapCache(max_bytes=1500)
+    cache.put("a", (x.copy(), None, [x.copy()]))
+    cache.put("b", (x.copy(),))
+    assert cache.get("a") is not None
+    cache.put("c", (x.copy(),))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+    # mappings larger than the cache are not stored
+    cache.put("d", (np.zeros(1000),))
+    assert cache.get("d") is None
+
+    cache.clear()
+    assert len(cache) == 0
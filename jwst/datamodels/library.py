@@ -1,5 +1,7 @@
 import warnings
+import weakref
 from datetime import datetime
+from multiprocessing import shared_memory
 from pathlib import Path
 
 import numpy as np
@@ -7,6 +9,7 @@ from asdf.tags.core import NDArrayType
 from astropy.time import Time
 from stdatamodels.jwst.datamodels import read_metadata
 from stdatamodels.jwst.datamodels.util import open as datamodels_open
+from stdatamodels.schema import walk_schema
 from stpipe.library import AbstractModelLibrary, BorrowError, NoGroupID
 
 from jwst.associations import AssociationNotValidError, load_asn
@@ -23,8 +26,49 @@ class ModelLibrary(AbstractModelLibrary):
     efficient processing of datamodel instances created from an association.
     See the `stpipe library documentation <https://stpipe.readthedocs.io/en/latest/model_library.html>`_
     for more information.
+
+    In addition to the in-memory and on-disk modes provided by stpipe, models
+    can be kept in memory with their arrays stored in POSIX shared memory by
+    setting ``shared_memory=True``. When such a library is pickled, for example
+    to send it to the worker processes of a `multiprocessing.Pool`, only the
+    model metadata and the names of the shared memory blocks are serialized;
+    the unpickled library borrows models whose arrays are views of the same
+    shared memory. In-place changes to these arrays are therefore visible to
+    all processes, whereas metadata changes and array reassignments made by
+    a worker are not. The shared memory is released when the library that
+    created it is garbage collected, or when `release_shared_memory` is called.
     """
 
+    def __init__(self, init, *args, shared_memory=False, **kwargs):
+        """
+        Initialize the library.
+
+        Parameters
+        ----------
+        init : str, dict, list, or ModelLibrary
+            Any input supported by `stpipe.library.AbstractModelLibrary`.
+        *args : tuple
+            Additional positional arguments passed to
+            `stpipe.library.AbstractModelLibrary`.
+        shared_memory : bool, optional
+            If True, store the arrays of the in-memory models in shared
+            memory. Cannot be combined with ``on_disk=True``.
+        **kwargs : dict
+            Additional keyword arguments passed to
+            `stpipe.library.AbstractModelLibrary`.
+        """
+        if shared_memory and kwargs.get("on_disk", False):
+            raise ValueError("A ModelLibrary cannot use both shared_memory and on_disk")
+        super().__init__(init, *args, **kwargs)
+        self._shared_memory = shared_memory
+        # index -> {array name: (SharedMemory, view)} for arrays in shared memory
+        self._shared_arrays = {}
+        # only the library that created the shared memory blocks unlinks them
+        self._shared_owner = True
+        self._shared_finalizer = weakref.finalize(
+            self, _release_shared_arrays, self._shared_arrays, True
+        )
+
     @property
     def crds_observatory(self):
         """
@@ -76,6 +120,220 @@ class ModelLibrary(AbstractModelLibrary):
         """
         return self._on_disk
 
+    @property
+    def shared_memory(self):
+        """
+        Return the library's shared_memory attribute.
+
+        If True, the arrays of the in-memory models are stored in shared memory.
+
+        Returns
+        -------
+        bool
+            Whether the library uses shared memory.
+        """
+        return self._shared_memory
+
+    def borrow(self, index):
+        """
+        Borrow a model from the library.
+
+        Parameters
+        ----------
+        index : int
+            The index of the model to borrow.
+
+        Returns
+        -------
+        DataModel
+            The borrowed model. For a library using shared memory, the
+            arrays of the model are views of shared memory blocks.
+        """
+        model = super().borrow(index)
+        if self._shared_memory:
+            self._share_model_arrays(index, model)
+        return model
+
+    def shelve(self, model, index=None, modify=True):
+        """
+        Return a borrowed model to the library.
+
+        Parameters
+        ----------
+        model : DataModel
+            The borrowed model.
+        index : int, optional
+            The index of the model. If not provided, it is looked up from
+            the models currently borrowed.
+        modify : bool, optional
+            Whether the model was modified.
+        """
+        if self._shared_memory and modify:
+            if index is None:
+                index = self._ledger[model]
+            # copy any array replaced while borrowed back into shared memory
+            self._share_model_arrays(index, model)
+        super().shelve(model, index, modify=modify)
+
+    def release_shared_memory(self):
+        """
+        Close and unlink all shared memory blocks created by this library.
+
+        Models borrowed afterwards get new shared memory blocks. Has no
+        effect for libraries that do not use shared memory, or for libraries
+        unpickled in another process, which do not own their blocks.
+        """
+        _release_shared_arrays(self._shared_arrays, self._shared_owner)
+
+    def _share_model_arrays(self, index, model):
+        """
+        Move the arrays of a model into shared memory.
+
+        Arrays that are already views of this model's shared memory blocks
+        are left untouched; arrays with a matching shape and dtype are copied
+        into the existing block; all others get a new block. Libraries
+        unpickled in another process never create new blocks, so arrays that
+        cannot be copied into an existing block stay private to that process.
+        The library that owns the blocks therefore also creates the arrays
+        that the model schema would otherwise fill in with default values on
+        first access, so that a worker writing to one of them, e.g. ``dq``,
+        writes to shared memory.
+
+        Parameters
+        ----------
+        index : int
+            The index of the model in the library.
+        model : DataModel
+            The model whose arrays are moved into shared memory.
+        """
+        shared = self._shared_arrays.setdefault(index, {})
+        if self._shared_owner:
+            for name in _schema_default_arrays(model):
+                # accessing the attribute creates the default array
+                getattr(model, name)
+        for name, value in list(model._instance.items()):  # noqa: SLF001
+            if not isinstance(value, (np.ndarray, NDArrayType)):
+                continue
+            array = getattr(model, name)
+            if name in shared:
+                shm, view = shared[name]
+                if array is view:
+                    continue
+                if array.shape == view.shape and array.dtype == view.dtype:
+                    view[...] = array
+                    setattr(model, name, view)
+                    continue
+                if not self._shared_owner:
+                    continue
+                _release_shared_arrays({index: {name: shared.pop(name)}}, True)
+            elif not self._shared_owner:
+                continue
+            shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            view = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+            # new blocks are zero-filled; skip the copy to leave untouched pages unallocated
+            if array.dtype.names is not None or array.any():
+                view[...] = array
+            setattr(model, name, view)
+            shared[name] = (shm, view)
+
+    def __getstate__(self):
+        """
+        Return the state of the library for pickling.
+
+        For a library using shared memory, the in-memory models are replaced
+        by their metadata and the names of their shared memory blocks.
+
+        Returns
+        -------
+        dict
+            The library state.
+        """
+        state = dict(super().__getstate__())
+        state.pop("_shared_finalizer")
+        if not self._shared_memory:
+            return state
+        if len(self._ledger):
+            raise BorrowError("Attempt to pickle a library with borrowed models")
+        for index, model in self._loaded_models.items():
+            self._share_model_arrays(index, model)
+        state["_loaded_models"] = {
+            index: _SharedModel(model, self._shared_arrays[index])
+            for index, model in self._loaded_models.items()
+        }
+        state["_shared_arrays"] = {}
+        return state
+
+    def __setstate__(self, state):
+        """
+        Restore the state of a pickled library.
+
+        Parameters
+        ----------
+        state : dict
+            The library state returned by `__getstate__`.
+        """
+        self.__dict__.update(state)
+        self._shared_owner = False
+        if self._shared_memory:
+            for index, shared_model in self._loaded_models.items():
+                model, shared = shared_model.attach()
+                self._loaded_models[index] = model
+                self._shared_arrays[index] = shared
+        # blocks attached from another process are closed but never unlinked here
+        self._shared_finalizer = weakref.finalize(
+            self, _release_shared_arrays, self._shared_arrays, False
+        )
+
+    def subset(self, indices):
+        """
+        Build a library holding only some of the models of this library.
+
+        The new library is cheap to pickle, e.g. to send a group of models to
+        a worker process. For an on-disk library, it is built from an
+        association that references the files of the selected models by
+        absolute path, including the temporary files of modified models.
+        Otherwise, it holds shallow copies of the selected models with their
+        arrays in shared memory, which should be released with
+        `release_shared_memory` once the library is no longer needed. In both
+        cases, the association-level metadata of this library are kept.
+
+        Parameters
+        ----------
+        indices : list of int
+            Indices of the models to include, in order.
+
+        Returns
+        -------
+        ModelLibrary
+            The new library.
+        """
+        asn = {key: value for key, value in self._asn.items() if key != "products"}
+        product = {
+            key: value for key, value in self._asn["products"][0].items() if key != "members"
+        }
+
+        if self._on_disk:
+            members = []
+            for index in indices:
+                member = dict(self._members[index])
+                if index in self._temp_filenames:
+                    member["expname"] = str(Path(self._temp_filenames[index]).absolute())
+                else:
+                    member["expname"] = str((Path(self._asn_dir) / member["expname"]).absolute())
+                members.append(member)
+            asn["products"] = [{**product, "members": members}]
+            return ModelLibrary(asn, **self._datamodels_open_kwargs)
+
+        models = []
+        with self:
+            for index in indices:
+                model = self.borrow(index)
+                models.append(_shallow_copy(model))
+                self.shelve(model, index, modify=False)
+        library = ModelLibrary(models, shared_memory=True, **self._datamodels_open_kwargs)
+        library._asn.update(asn)
+        return library
+
     def indices_for_exptype(self, exptype):
         """
         Determine the indices of models corresponding to ``exptype``.
@@ -308,6 +566,131 @@ class ModelLibrary(AbstractModelLibrary):
         return meta
 
 
+class _SharedModel:
+    """Picklable handle to a model whose arrays are stored in shared memory."""
+
+    def __init__(self, model, shared):
+        """
+        Build the handle.
+
+        Parameters
+        ----------
+        model : DataModel
+            The model to reference.
+        shared : dict
+            Mapping of array names to (SharedMemory, view) pairs
+            for the arrays of ``model``.
+        """
+        self.model_type = type(model)
+        self.tree = {
+            key: val
+            for key, val in model._instance.items()  # noqa: SLF001
+            if key not in shared
+        }
+        self.arrays = {
+            name: (shm.name, view.shape, view.dtype.str) for name, (shm, view) in shared.items()
+        }
+
+    def attach(self):
+        """
+        Rebuild the model from the handle, attaching to its shared memory.
+
+        Returns
+        -------
+        model : DataModel
+            The rebuilt model, with arrays viewing the shared memory blocks.
+        shared : dict
+            Mapping of array names to (SharedMemory, view) pairs.
+        """
+        model = self.model_type()
+        model._instance.update(self.tree)  # noqa: SLF001
+        shared = {}
+        for name, (shm_name, shape, dtype) in self.arrays.items():
+            shm = shared_memory.SharedMemory(name=shm_name)
+            view = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+            setattr(model, name, view)
+            shared[name] = (shm, view)
+        return model, shared
+
+
+def _shallow_copy(model):
+    """
+    Copy a model, sharing its arrays and metadata with the original.
+
+    Arrays set on the copy replace those of the copy only.
+
+    Parameters
+    ----------
+    model : DataModel
+        The model to copy.
+
+    Returns
+    -------
+    DataModel
+        The copied model.
+    """
+    copied = type(model)()
+    copied._instance.update(model._instance)  # noqa: SLF001
+    return copied
+
+
+def _schema_default_arrays(model):
+    """
+    List the top-level arrays of a model that the schema creates on access.
+
+    Parameters
+    ----------
+    model : DataModel
+        The model whose schema is searched.
+
+    Returns
+    -------
+    list of str
+        Names of the top-level schema arrays that have a default value
+        and are not yet set on ``model``.
+    """
+    names = []
+
+    def callback(subschema, path, _combiner, _ctx, _recurse):
+        if len(path) != 1:
+            return False
+        if "datatype" in subschema and "default" in subschema:
+            names.append(path[0])
+        return True
+
+    walk_schema(model.schema, callback)
+    return [name for name in names if name not in model._instance]  # noqa: SLF001
+
+
+def _release_shared_arrays(shared_arrays, unlink):
+    """
+    Close, and optionally unlink, shared memory blocks.
+
+    Parameters
+    ----------
+    shared_arrays : dict
+        Mapping of model indices to mappings of array names to
+        (SharedMemory, view) pairs. Emptied on return.
+    unlink : bool
+        If True, the blocks are also unlinked so that the memory is freed
+        once all processes have closed them.
+    """
+    for shared in shared_arrays.values():
+        for shm, _view in shared.values():
+            try:
+                shm.close()
+            except BufferError:
+                # arrays viewing the block are still in use; the mapping is
+                # released when they are garbage collected
+                pass
+            if unlink:
+                try:
+                    shm.unlink()
+                except FileNotFoundError:
+                    pass
+    shared_arrays.clear()
+
+
 def _read_meta_from_open_model(model, flatten):
     """
     Read metadata from an open model.
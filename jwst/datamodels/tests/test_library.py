@@ -1,4 +1,5 @@
 import json
+import pickle
 from datetime import datetime
 
 import gwcs
@@ -349,3 +350,94 @@ def test_model_to_group_id(example_library):
             example_library._model_to_group_id(model)
 
         example_library.shelve(model, 0, modify=False)
+
+
+def test_shared_memory_on_disk_fails(example_asn_path):
+    """
+    Test that shared memory cannot be combined with on_disk
+    """
+    with pytest.raises(ValueError, match="shared_memory"):
+        ModelLibrary(example_asn_path, on_disk=True, shared_memory=True)
+
+
+def test_shared_memory_borrow(example_asn_path):
+    """
+    Test that arrays of borrowed models are views of shared memory blocks
+    that survive shelving and array reassignment
+    """
+    library = ModelLibrary(example_asn_path, shared_memory=True)
+    assert library.shared_memory
+    with library:
+        model = library.borrow(0)
+        _shm, view = library._shared_arrays[0]["data"]
+        assert model.data is view
+
+        # replaced arrays are copied back into the same block on shelve
+        model.data = np.full(model.data.shape, 3.0, dtype=model.data.dtype)
+        library.shelve(model, 0)
+        model = library.borrow(0)
+        assert model.data is view
+        np.testing.assert_array_equal(view, 3.0)
+        library.shelve(model, 0, modify=False)
+
+    library.release_shared_memory()
+    assert not library._shared_arrays
+
+
+def test_shared_memory_pickle(example_asn_path):
+    """
+    Test that an unpickled shared memory library borrows models
+    whose arrays share memory with the original library
+    """
+    library = ModelLibrary(example_asn_path, shared_memory=True)
+    with library:
+        for i, model in enumerate(library):
+            library.shelve(model, i, modify=False)
+
+    copied = pickle.loads(pickle.dumps(library))
+    assert copied.shared_memory
+    with copied:
+        model = copied.borrow(1)
+        assert model.meta.filename == "1.fits"
+        model.dq[0, 0] = 4
+        copied.shelve(model, 1)
+
+    with library:
+        model = library.borrow(1)
+        assert model.dq[0, 0] == 4
+        library.shelve(model, 1, modify=False)
+
+    del copied
+    library.release_shared_memory()
+
+
+@pytest.mark.parametrize("on_disk", [True, False])
+def test_subset(example_asn_path, on_disk):
+    """
+    Test that a subset library holds the selected models and
+    survives pickling
+    """
+    library = ModelLibrary(example_asn_path, on_disk=on_disk)
+    with library:
+        model = library.borrow(0)
+        model.data[0, 0] = 1
+        library.shelve(model, 0)
+
+    subset = library.subset([2, 0])
+    assert len(subset) == 2
+    assert subset.asn["asn_pool"] == _POOL_NAME
+    assert subset.shared_memory is not on_disk
+
+    copied = pickle.loads(pickle.dumps(subset))
+    with copied:
+        model = copied.borrow(0)
+        assert model.meta.filename == "2.fits"
+        assert model.meta.asn.pool_name == _POOL_NAME
+        copied.shelve(model, 0, modify=False)
+        model = copied.borrow(1)
+        assert model.data[0, 0] == 1
+        copied.shelve(model, 1, modify=False)
+    assert list(copied.group_indices.values()) == [[0], [1]]
+
+    del copied
+    subset.release_shared_memory()
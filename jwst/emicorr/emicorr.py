@@ -7,6 +7,8 @@ from astropy.stats import sigma_clipped_stats as scs
 from scipy import interpolate
 from stdatamodels.jwst import datamodels
 
+from jwst.lib import pipe_utils
+
 log = logging.getLogger(__name__)
 
 subarray_clocks = {
@@ -49,6 +51,7 @@ def apply_emicorr(
     onthefly_corr_freq=None,
     use_n_cycles=3,
     fit_ints_separately=False,
+    maximum_cores="1",
 ):
     """
     Apply an EMI correction to MIRI ramps.
@@ -115,6 +118,9 @@ def apply_emicorr(
         when `algorithm` is 'sequential'.
     fit_ints_separately : bool, optional
         If True, fit each integration separately, when `algorithm` is 'joint'.
+    maximum_cores : str, optional
+        Number of processes used to prepare the integrations for the fit.
+        Can be an integer, 'none', 'quarter', 'half', or 'all'.
 
     Returns
     -------
@@ -204,6 +210,7 @@ def apply_emicorr(
             rowclocks,
             frameclocks,
             fit_ints_separately=fit_ints_separately,
+            maximum_cores=maximum_cores,
         )
     else:
         output_model = _run_sequential_algorithm(
@@ -219,6 +226,7 @@ def apply_emicorr(
             nbins=nbins,
             scale_reference=scale_reference,
             use_n_cycles=use_n_cycles,
+            maximum_cores=maximum_cores,
         )
 
     return output_model
@@ -232,6 +240,7 @@ def _run_joint_algorithm(
     rowclocks,
     frameclocks,
     fit_ints_separately=False,
+    maximum_cores="1",
 ):
     """
     Remove EMI noise with a joint fit to ramps and EMI signal.
@@ -255,6 +264,9 @@ def _run_joint_algorithm(
         Fit the integrations separately? If True, fit amplitude and phase
         for refwave independently for each integration.  If False, fit
         for a single amplitude and phase across all integrations.
+    maximum_cores : str, optional
+        Number of processes used to sum the integrations by phase.
+        Can be an integer, 'none', 'quarter', 'half', or 'all'.
 
     Returns
     -------
@@ -281,6 +293,7 @@ def _run_joint_algorithm(
             _frameclocks,
             period_in_pixels,
             fit_ints_separately=fit_ints_separately,
+            maximum_cores=maximum_cores,
         )
 
         # Data is updated in place, so it is corrected iteratively
@@ -303,6 +316,7 @@ def _run_sequential_algorithm(
     nbins=None,
     scale_reference=True,
     use_n_cycles=3,
+    maximum_cores="1",
 ):
     """
     Remove EMI noise with a sequential fit to ramps and EMI signal.
@@ -336,6 +350,9 @@ def _run_sequential_algorithm(
     use_n_cycles : int, optional
         Only use N cycles to calculate the phase to reduce code running time,
         when `algorithm` is 'sequential'.
+    maximum_cores : str, optional
+        Number of processes used to clean the integrations before phasing.
+        Can be an integer, 'none', 'quarter', 'half', or 'all'.
 
     Returns
     -------
@@ -377,23 +394,12 @@ def _run_sequential_algorithm(
         # sz[2] = ny
         # sz[3] = ngroups
         # sz[4] = nints
-        nx4 = int(nx / 4)
 
-        dd_all = np.zeros((nints, ngroups, ny, nx4))
+        # Quad-averaged, cleaned, input image data for the exposure
         log.info("Subtracting self-superbias from each group of each integration")
-
-        # Calculate times of all pixels in the input integration, then use that to calculate
-        # phase of all pixels. Times here is in integer numbers of 10us pixels starting from
-        # the first data pixel in the input image. Times can be a very large integer, so use
-        # a big datatype. Phaseall (below) is just 0-1.0.
-
-        # A safer option is to calculate times_per_integration and calculate the phase at each
-        # int separately. That way times array will have a smaller number of elements at each
-        # int, with less risk of datatype overflow. Still, use the largest datatype available
-        # for the time_this_int array.
-
-        times_this_int = np.zeros((ngroups, ny, nx4), dtype="ulonglong")
-        phaseall = np.zeros((nints, ngroups, ny, nx4))
+        dd_all = pipe_utils.map_integrations(
+            _detrend_integrations, input_model.data, maximum_cores=maximum_cores
+        )
 
         # non-roi rowclocks between subarray frames (this will be 0 for fullframe)
         extra_rowclocks = (1024.0 - ny) * (4 + 3.0)
@@ -416,88 +422,28 @@ def _run_sequential_algorithm(
             if nints_to_phase > nints:
                 nints_to_phase = nints
 
-        start_time, ref_pix_sample = 0, 3
-
         # Need colstop for phase calculation in case of last refpixel in a row. Technically,
         # this number comes from the subarray definition (see subarray_cases dict above), but
         # calculate it from the input image header here just in case the subarray definitions
         # are not available to this routine.
         colstop = int(xsize / 4 + xstart - 1)
-        log.info("Doing phase calculation per integration")
-
-        for ninti in range(nints):
-            log.debug(f"  Working on integration: {ninti + 1}")
-            # Read in this integration
-            data = input_model.data[ninti].copy()
-
-            # Remove source signal and fixed bias from each integration ramp
-            # (linear is good enough for phase finding)
-
-            # do linear fit for source + sky
-            s0, mm0 = sloper(data[1 : ngroups - 1, :, :])
-
-            # subtract source+sky from each frame of this ramp
-            for ngroupi in range(ngroups):
-                data[ngroupi, ...] = input_model.data[ninti, ngroupi, ...] - (s0 * ngroupi)
-
-            # make a self-superbias
-            m0 = minmed(data[1 : ngroups - 1, :, :])
-
-            # subtract self-superbias from each frame of this ramp
-            for ngroupi in range(ngroups):
-                data[ngroupi, ...] = data[ngroupi, ...] - m0
-
-                # de-interleave each frame into the 4 separate output channels and
-                # average (or median) them together for S/N
-                d0 = data[ngroupi, :, 0:nx:4]
-                d1 = data[ngroupi, :, 1:nx:4]
-                d2 = data[ngroupi, :, 2:nx:4]
-                d3 = data[ngroupi, :, 3:nx:4]
-                dd = (d0 + d1 + d2 + d3) / 4.0
-
-                # fix a bad ref col
-                dd[:, 1] = (dd[:, 0] + dd[:, 3]) / 2
-                dd[:, 2] = (dd[:, 0] + dd[:, 3]) / 2
-                # This is the quad-averaged, cleaned, input image data for the exposure
-                dd_all[ninti, ngroupi, ...] = dd - np.median(dd)
-
-            for k in range(ngroups):  # frames
-                for j in range(ny):  # rows
-                    # nsamples= 1 for fast, 9 for slow (from metadata)
-                    times_this_int[k, j, :] = (
-                        np.arange(nx4, dtype="ulonglong") * nsamples + start_time
-                    )
-
-                    # If the last pixel in a row is a reference pixel, need to push it out
-                    # by ref_pix_sample sample times. The same thing happens for the first
-                    # ref pix in each row, but that gets absorbed into the inter-row pad and
-                    # can be ignored here. Since none of the current subarrays hit the
-                    # right-hand reference pixel, this correction is not in play, but for
-                    # fast and slow fullframe (e.g. 10Hz) it should be applied. And even
-                    # then, leaving this out adds just a *tiny* phase error on the last ref
-                    # pix in a row (only) - it does not affect the phase of the other pixels.
-
-                    if colstop == 258:
-                        ulonglong_ref_pix_sample = ref_pix_sample + 2**32
-                        times_this_int[k, j, nx4 - 1] = (
-                            times_this_int[k, j, nx4 - 1] + ulonglong_ref_pix_sample
-                        )
-
-                    # point to the first pixel of the next row (add "end-of-row" pad)
-                    start_time += rowclocks
-
-                # point to the first pixel of the next frame (add "end-of-frame" pad)
-                start_time += extra_rowclocks
-
-            # Convert "times" to phase each integration. Note that times has units of
-            # number of 10us from the first data pixel in this integration, so to
-            # convert to phase, divide by the waveform *period* in float pixels
-            phase_this_int = times_this_int / period_in_pixels
-            phaseall[ninti, ...] = phase_this_int - phase_this_int.astype("ulonglong")
-
-            # add a frame time to account for the extra frame reset between MIRI integrations
-            if readpatt.upper() == "FASTR1" or readpatt.upper() == "SLOWR1":
-                start_time += frameclocks
+
+        # add a frame time to account for the extra frame reset between MIRI integrations
+        if readpatt.upper() == "FASTR1" or readpatt.upper() == "SLOWR1":
+            reset_clocks = frameclocks
+        else:
+            reset_clocks = 0
+
+        log.info("Doing phase calculation for all integrations")
+        phaseall = _pixel_phases(
+            dd_all.shape,
+            nsamples,
+            rowclocks,
+            extra_rowclocks,
+            reset_clocks,
+            period_in_pixels,
+            colstop,
+        )
 
         # use phaseall vs dd_all
 
@@ -520,21 +466,10 @@ def _run_sequential_algorithm(
         # bin the whole set
         log.info(f"Calculating the phase amplitude for {nbins} bins")
         # Define the binned waveform amplitude (pa = phase amplitude)
-        pa = np.arange(nbins, dtype=float)
-        # keep track of n per bin to check for low n
-        nb_over_nbins = [nb / nbins for nb in range(nbins)]
-        nbp1_over_nbins = [(nb + 1) / nbins for nb in range(nbins)]
-        # Construct a phase map and dd map for only the nints_to_phase
-        phase_temp = phaseall[0:nints_to_phase, :, :, :]
-        dd_temp = dd_all[0:nints_to_phase, :, :, :]
-        for nb in range(nbins):
-            u = (phase_temp > nb_over_nbins[nb]) & (phase_temp <= nbp1_over_nbins[nb])
-            # calculate the sigma-clipped mean
-            with warnings.catch_warnings():
-                warnings.simplefilter("ignore", RuntimeWarning)
-                dmean, _, _ = scs(dd_temp[u])
-            pa[nb] = dmean  # amplitude in this bin
-
+        # for only the nints_to_phase
+        pa = _bin_phased_data(
+            phaseall[0:nints_to_phase, :, :, :], dd_all[0:nints_to_phase, :, :, :], nbins
+        )
         pa -= np.median(pa)
 
         # pa_phase is the phase corresponding to each bin in pa. The +0.5 here is to center in
@@ -609,7 +544,6 @@ def _run_sequential_algorithm(
 
         # clean up
         del dd_all
-        del times_this_int
         del phaseall
         del dd_noise
 
@@ -630,6 +564,167 @@ def _run_sequential_algorithm(
     return input_model
 
 
+def _detrend_integrations(data):
+    """
+    Remove the source signal and a self-superbias from integration ramps.
+
+    The cleaned groups are then quad-averaged over the four output channels.
+
+    Parameters
+    ----------
+    data : ndarray
+        4D data, shape (nints, ngroups, ny, nx).
+
+    Returns
+    -------
+    dd_all : ndarray
+        4D quad-averaged, cleaned data, shape (nints, ngroups, ny, nx // 4).
+    """
+    nints, ngroups, ny, nx = data.shape
+    grouptimes = np.arange(ngroups)[:, np.newaxis, np.newaxis]
+    dd_all = np.zeros((nints, ngroups, ny, nx // 4))
+
+    # Process blocks of integrations, to vectorize the many small integrations
+    # of subarray data without copying all of a large exposure at once
+    block = max(1, 2**22 // data[0].size)
+    for start in range(0, nints, block):
+        log.debug(f"  Working on integrations: {start + 1} to {min(start + block, nints)}")
+        ints = data[start : start + block]
+
+        # Remove source signal and fixed bias from each integration ramp
+        # (linear is good enough for phase finding)
+
+        # do linear fit for source + sky
+        s0, _ = sloper(ints[:, 1 : ngroups - 1])
+
+        # subtract source+sky from each frame of the ramps
+        cleaned = (ints - s0[:, np.newaxis] * grouptimes).astype(data.dtype)
+
+        # make a self-superbias and subtract it from each frame of the ramps
+        cleaned -= minmed(cleaned[:, 1 : ngroups - 1])[:, np.newaxis]
+
+        # de-interleave each frame into the 4 separate output channels and
+        # average (or median) them together for S/N
+        dd = (
+            cleaned[..., 0:nx:4]
+            + cleaned[..., 1:nx:4]
+            + cleaned[..., 2:nx:4]
+            + cleaned[..., 3:nx:4]
+        ) / 4.0
+
+        # fix a bad ref col
+        dd[..., 1] = (dd[..., 0] + dd[..., 3]) / 2
+        dd[..., 2] = (dd[..., 0] + dd[..., 3]) / 2
+        dd_all[start : start + block] = dd - np.median(dd, axis=(-2, -1), keepdims=True)
+
+    return dd_all
+
+
+def _pixel_phases(
+    shape, nsamples, rowclocks, extra_rowclocks, reset_clocks, period_in_pixels, colstop
+):
+    """
+    Calculate the EMI phase of all pixels in all integrations.
+
+    Parameters
+    ----------
+    shape : tuple of int
+        Shape of the quad-averaged data, (nints, ngroups, ny, nx4).
+    nsamples : int
+        Number of samples of each pixel in each group:
+        1 for fast, 9 for slow
+    rowclocks : int
+        Extra pixel times in each row before reading out the following row
+    extra_rowclocks : float
+        Non-roi rowclocks between subarray frames
+    reset_clocks : int
+        Pixel clock cycles in the extra reset frame between integrations
+    period_in_pixels : float
+        Period of the EMI waveform in pixel clock times
+    colstop : int
+        Last column of the subarray, in 4-column units
+
+    Returns
+    -------
+    phaseall : ndarray
+        Phase, between 0 and 1, of all pixels, with the input shape.
+    """
+    nints, ngroups, ny, nx4 = shape
+
+    # Times of all pixels are in integer numbers of 10us pixels starting from the first
+    # data pixel in the input image. Times can be very large, but they stay far below
+    # 2**53, so they are exact in float64 and the phases do not depend on whether they
+    # are computed per integration or all at once.
+    frame_clocks = ny * rowclocks + extra_rowclocks
+    int_clocks = ngroups * frame_clocks + reset_clocks
+    row_times = (
+        np.arange(nints)[:, np.newaxis, np.newaxis] * int_clocks
+        + np.arange(ngroups)[:, np.newaxis] * frame_clocks
+        + np.arange(ny) * rowclocks
+    )
+    # nsamples= 1 for fast, 9 for slow (from metadata)
+    times = row_times[..., np.newaxis] + np.arange(nx4) * nsamples
+
+    # If the last pixel in a row is a reference pixel, need to push it out
+    # by ref_pix_sample sample times. The same thing happens for the first
+    # ref pix in each row, but that gets absorbed into the inter-row pad and
+    # can be ignored here. Since none of the current subarrays hit the
+    # right-hand reference pixel, this correction is not in play, but for
+    # fast and slow fullframe (e.g. 10Hz) it should be applied. And even
+    # then, leaving this out adds just a *tiny* phase error on the last ref
+    # pix in a row (only) - it does not affect the phase of the other pixels.
+    if colstop == 258:
+        ref_pix_sample = 3
+        times[..., nx4 - 1] += ref_pix_sample + 2**32
+
+    # Convert "times" to phase. Note that times has units of number of 10us
+    # from the first data pixel, so to convert to phase, divide by the
+    # waveform *period* in float pixels
+    phaseall = np.divide(times, period_in_pixels, out=times)
+    phaseall -= np.floor(phaseall)
+    return phaseall
+
+
+def _bin_phased_data(phases, data, nbins):
+    """
+    Calculate the sigma-clipped mean of phased data in equal phase bins.
+
+    Parameters
+    ----------
+    phases : ndarray
+        Phase, between 0 and 1, of each data value.
+    data : ndarray
+        Data values, with the same shape as `phases`.
+    nbins : int
+        Number of bins in one phased wave.
+
+    Returns
+    -------
+    pa : ndarray
+        1D phase amplitude, the mean data value in each bin.
+    """
+    # Bin nb holds the phases in (nb / nbins, (nb + 1) / nbins], so
+    # phases equal to 0 are not in any bin
+    edges = np.array([nb / nbins for nb in range(nbins + 1)])
+    bin_index = np.searchsorted(edges, phases.ravel()) - 1
+    in_bin = (bin_index >= 0) & (bin_index < nbins)
+    bin_index = bin_index[in_bin]
+
+    # A stable sort keeps the values of each bin in their original order
+    order = np.argsort(bin_index, kind="stable")
+    counts = np.bincount(bin_index, minlength=nbins)
+    binned = np.split(data.ravel()[in_bin][order], np.cumsum(counts)[:-1])
+
+    pa = np.arange(nbins, dtype=float)
+    for nb, values in enumerate(binned):
+        # calculate the sigma-clipped mean
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            dmean, _, _ = scs(values)
+        pa[nb] = dmean  # amplitude in this bin
+    return pa
+
+
 def sloper(data):
     """
     Fit slopes to all pix of a ramp.
@@ -637,29 +732,30 @@ def sloper(data):
     Parameters
     ----------
     data : ndarray
-        3-D integration data array
+        3-D integration data array, or 4-D array of integrations
 
     Returns
     -------
     outarray : ndarray
-        3-D integration data array
+        2-D slope array, or 3-D for 4-D input
     intercept: ndarray
         Slope intercept values
     """
-    ngroups, ny, nx = np.shape(data)
+    ngroups, ny, nx = np.shape(data)[-3:]
     frametime = 1.0  # use 1.0 for per-frame slopes, otherwise put a real time here
     grouptimes = np.arange(ngroups) * frametime
 
-    sxy = np.zeros((ny, nx))
-    sx = np.zeros((ny, nx))
-    sy = np.zeros((ny, nx))
-    sxx = np.zeros((ny, nx))
+    shape = np.shape(data)[:-3] + (ny, nx)
+    sxy = np.zeros(shape)
+    sx = np.zeros(shape)
+    sy = np.zeros(shape)
+    sxx = np.zeros(shape)
 
     for groupcount in range(ngroups):
         # do the incremental slope calculation operations
-        sxy = sxy + grouptimes[groupcount] * data[groupcount, ...]
+        sxy = sxy + grouptimes[groupcount] * data[..., groupcount, :, :]
         sx = sx + grouptimes[groupcount]
-        sy = sy + data[groupcount, ...]
+        sy = sy + data[..., groupcount, :, :]
         sxx = sxx + grouptimes[groupcount] ** 2
 
     # calculate the final per-pixel slope values
@@ -681,17 +777,18 @@ def minmed(data):
     Parameters
     ----------
     data : ndarray
-        3D data array, to be stacked along the first axis.
+        3D data array, to be stacked along the first axis, or 4D
+        array of integrations, each stacked along its first axis.
 
     Returns
     -------
     medimg : ndarray
-        2D median or minimum image.
+        2D median or minimum image, or 3D for 4D input.
     """
-    if data.shape[0] <= 2:
-        medimg = np.nanmin(data, axis=0)
+    if data.shape[-3] <= 2:
+        medimg = np.nanmin(data, axis=-3)
     else:
-        medimg = np.nanmedian(data, axis=0)
+        medimg = np.nanmedian(data, axis=-3)
     return medimg
 
 
@@ -871,6 +968,7 @@ def emicorr_refwave(
     period_in_pixels,
     fit_ints_separately=False,
     nphases_opt=500,
+    maximum_cores="1",
 ):
     """
     Derive the best amplitude and phase for the EMI waveform, subtract it off.
@@ -905,6 +1003,9 @@ def emicorr_refwave(
         for a single amplitude and phase across all integrations.
     nphases_opt : int, optional
         Number of phases to sample chi squared as a function of phase
+    maximum_cores : str, optional
+        Number of processes used to sum the integrations by phase.
+        Can be an integer, 'none', 'quarter', 'half', or 'all'.
 
     Returns
     -------
@@ -924,8 +1025,7 @@ def emicorr_refwave(
 
     # Times of the individual reads in pixel clock times
     t0_arr = np.zeros((ny, nx4))
-    for i in range(ny):
-        t0_arr[i] = i * rowclocks + np.arange(nx4) * nsamples
+    t0_arr[:] = np.arange(ny)[:, np.newaxis] * rowclocks + np.arange(nx4) * nsamples
     phase = (t0_arr / period_in_pixels) % 1
 
     # Phase gap between groups
@@ -947,14 +1047,6 @@ def emicorr_refwave(
     phases_template = (phase_extended[1:-1, np.newaxis] + grouptimes * dphase) % 1
     nphases = phases_template.shape[0]
 
-    # These arrays hold the sum of the values of good pixels at a
-    # given phase and the total number of good pixels at a given
-    # phase, respectively.  The phase refers to the first group; other
-    # groups will have the appropriate phase delay added.
-
-    all_y = np.zeros((nints, nphases, ngroups))
-    all_n = np.zeros((nints, nphases))
-
     # "Good" pixel here has no more than twice the median standard
     # deviation among group values and is not flagged in the pdq
     # array.  This should discard most bad and high-flux pixels.
@@ -962,22 +1054,25 @@ def emicorr_refwave(
     pixel_std = np.std(data, axis=1)
     pixel_ok = (pixel_std < 2 * np.median(pixel_std)) & (pdq == 0)
 
-    for j in range(ny):
-        for k in range(nx4):
-            # Bad reference column
-            if k == 1 or k == 2:
-                continue
+    # Choose the index corresponding to the phase of each pixel.
+    # phases_template has the midpoints of the intervals,
+    # so rounding down here is appropriate.
+
+    phase_index = (phase * nphases).astype(int)
 
-            # Choose the index corresponding to our phase.
-            # phases_template has the midpoints of the intervals,
-            # so rounding down here is appropriate.
+    # These arrays hold the sum of the values of good pixels at a
+    # given phase and the total number of good pixels at a given
+    # phase, respectively.  The phase refers to the first group; other
+    # groups will have the appropriate phase delay added.
 
-            indx = int(phase[j, k] * nphases)
-            # All four output channels.
-            for l in range(4):
-                pixok = pixel_ok[:, j, k * 4 + l]
-                all_y[:, indx] += data[:, :, j, k * 4 + l] * pixok[:, np.newaxis]
-                all_n[:, indx] += pixok
+    all_y, all_n = pipe_utils.map_integrations(
+        _sum_by_phase,
+        data,
+        pixel_ok,
+        maximum_cores=maximum_cores,
+        phase_index=phase_index,
+        nphases=nphases,
+    )
 
     # We'll compute chi2 at nphases_opt evenly spaced phases.
     phaselist = np.arange(nphases_opt) * 1.0 / nphases_opt
@@ -1017,18 +1112,65 @@ def emicorr_refwave(
 
         amplitudes_to_correct = c * nints
 
+    group_phase = phase + dphase * grouptimes[:, np.newaxis, np.newaxis]
     for i in range(nints):
-        for j in range(ngroups):
-            # Place the reference waveform at the appropriate phase,
-            # scale, and subtract from each output channel.
+        # Place the reference waveform at the appropriate phase,
+        # scale, and subtract from each output channel.
 
-            phased_emi = phasefunc((phase + dphase * j + phases_to_correct[i]) % 1)
-            for k in range(4):
-                data[i, j, :, k::4] -= amplitudes_to_correct[i] * phased_emi
+        phased_emi = phasefunc((group_phase + phases_to_correct[i]) % 1)
+        for k in range(4):
+            data[i, :, :, k::4] -= amplitudes_to_correct[i] * phased_emi
 
     return data
 
 
+def _sum_by_phase(data, pixel_ok, phase_index, nphases):
+    """
+    Sum the values of good pixels sharing the same EMI phase.
+
+    The two bad reference columns of each output channel are skipped.
+
+    Parameters
+    ----------
+    data : ndarray
+        4D data, shape (nints, ngroups, nrows, ncols).
+    pixel_ok : ndarray
+        3D boolean array of good pixels, shape (nints, nrows, ncols).
+    phase_index : ndarray
+        2D phase index of the first group of each pixel in one output
+        channel, shape (nrows, ncols // 4).
+    nphases : int
+        Number of phase indices.
+
+    Returns
+    -------
+    all_y : ndarray
+        3D array of summed values, shape (nints, nphases, ngroups).
+    all_n : ndarray
+        2D array of the number of pixels summed, shape (nints, nphases).
+    """
+    nints, ngroups = data.shape[:2]
+
+    # Good pixels are summed in row order, column by column
+    use = np.ones(phase_index.shape[1], dtype=bool)
+    use[1:3] = False
+    columns = np.flatnonzero(np.repeat(use, 4))
+    pixel_index = np.repeat(phase_index[:, use], 4, axis=1).ravel()
+    group_index = (pixel_index[:, np.newaxis] * ngroups + np.arange(ngroups)).ravel()
+
+    all_y = np.zeros((nints, nphases, ngroups))
+    all_n = np.zeros((nints, nphases))
+    for i in range(nints):
+        pixok = pixel_ok[i][:, columns]
+        values = data[i][:, :, columns] * pixok
+        all_y[i] = np.bincount(
+            group_index, weights=np.moveaxis(values, 0, -1).ravel(), minlength=nphases * ngroups
+        ).reshape(nphases, ngroups)
+        all_n[i] = np.bincount(pixel_index, weights=pixok.ravel(), minlength=nphases)
+
+    return all_y, all_n
+
+
 def get_best_phase(phases, chisq):
     """
     Fit a parabola to get the phase corresponding to the best chi squared.
@@ -1120,69 +1262,45 @@ def calc_chisq_amplitudes(emifitter, ints=None, phases=None):
 
     if ints is None:
         ints = np.arange(ef.nints)
+    ints = np.asarray(ints)
 
     # By default, calculate chi squared and the best-fit amplitude
     # for every phase in the input EMIfitter's phaselist.
 
     if phases is None:
         phases = ef.phaselist
+    phases = np.asarray(phases)
+
+    # Phase difference between the start of each integration
+    # and the start of the first integration
+
+    phase_diff = ef.dphase_frame * ints
 
     chisq = []
     amplitudes = []
 
-    # Compute the best chi squared and the best amplitude at every
-    # requested phase using the math in the writeup.
-
-    for phase in phases:
-        a_ = 0
-        b_ = 0
-
-        for i in ints:
-            y = ef.all_y[i]
-            n_ = ef.all_n[i]
-            s_y = ef.all_sy[i]
-            s_ty = ef.all_sty[i]
-
-            # Phase difference between the start of this integration
-            # and the start of the first integration
-
-            phase_diff = ef.dphase_frame * i
-
-            # Choose the closest phase in emifitter's phaselist
-
-            k = np.argmin(np.abs((ef.phaselist - phase - phase_diff) % 1))
-
-            z = ef.zlist[k]
-            s_tz = ef.stzlist[k]
-            s_z = ef.szlist[k]
-            s_zz = ef.szzlist[k]
-            s_yz = np.sum(z * y, axis=1)
-
-            a_ += np.sum(
-                n_
-                / ef.delta
-                * (
-                    -ef.s_tt * s_z**2
-                    + 2 * ef.s_t * s_z * s_tz
-                    - ef.ngroups * s_tz**2
-                    + s_zz * ef.delta
-                )
-            )
-            b_ += (2 / ef.delta) * np.sum(
-                ef.s_tt * s_z * s_y
-                - ef.s_t * s_tz * s_y
-                - ef.s_t * s_z * s_ty
-                + ef.ngroups * s_tz * s_ty
-            )
-            b_ -= 2 * np.sum(s_yz)
-
-        if np.isclose(a_, 0, atol=1e-8) or ~np.isfinite(a_) or ~np.isfinite(b_):
-            chisq.append(np.nan)
-            amplitudes.append(0.0)
-        else:
-            c = -b_ / (2 * a_)
-            chisq.append(a_ * c**2 + b_ * c)
-            amplitudes.append(c)
+    # Compute the best chi squared and the best amplitude at blocks of
+    # requested phases, summing the terms of all integrations at once.
+
+    block = max(1, 2**22 // len(ints))
+    for start in range(0, len(phases), block):
+        phase = phases[start : start + block, np.newaxis]
+
+        # Choose the closest phase in emifitter's phaselist
+
+        k = ef.closest_phase_index(phase, phase_diff)
+
+        a_block = np.sum(ef.a_table[ints, k], axis=1)
+        b_block = np.sum(ef.b_table[ints, k], axis=1)
+
+        for a_, b_ in zip(a_block, b_block, strict=True):
+            if np.isclose(a_, 0, atol=1e-8) or ~np.isfinite(a_) or ~np.isfinite(b_):
+                chisq.append(np.nan)
+                amplitudes.append(0.0)
+            else:
+                c = -b_ / (2 * a_)
+                chisq.append(a_ * c**2 + b_ * c)
+                amplitudes.append(c)
 
     return chisq, amplitudes
 
@@ -1243,20 +1361,62 @@ class EMIfitter:
         self.phasefunc = phasefunc
         self.dphase_frame = dphase_frame
 
-        self.zlist = []
-        self.szlist = []
-        self.stzlist = []
-        self.szzlist = []
-
-        # Waveform for each pixel when the first one is at dphaseval.
-        for dphaseval in phaselist:
-            # The transposes help ensure that similar phases are evaluated
-            # consecutively, which significantly improves runtime when
-            # there is a very large number of groups.
-
-            z = self.phasefunc((self.phases_template.T + dphaseval) % 1).T
+        # Waveform for each pixel when the first one is at each phase
+        # in phaselist.  The transpose helps ensure that similar phases are
+        # evaluated consecutively, which significantly improves runtime when
+        # there is a very large number of groups.
+
+        z = self.phasefunc((self.phases_template.T + phaselist[:, np.newaxis, np.newaxis]) % 1)
+
+        self.zlist = z.transpose(0, 2, 1)
+        self.stzlist = np.sum(self.grouptimes * self.zlist, axis=2)
+        self.szlist = np.sum(self.zlist, axis=2)
+        self.szzlist = np.sum(self.zlist**2, axis=2)
+
+        # Terms of the chi squared of each integration for the waveform
+        # at each phase in phaselist, using the math in the writeup.  All
+        # of them are sums over the phases of the pixels, so a phase scan
+        # only needs to look up and add values for each integration.
+
+        self.a_table = (self.all_n / self.delta) @ (
+            -self.s_tt * self.szlist**2
+            + 2 * self.s_t * self.szlist * self.stzlist
+            - self.ngroups * self.stzlist**2
+            + self.szzlist * self.delta
+        ).T
+        s_yz = self.all_y.reshape(self.nints, -1) @ self.zlist.reshape(len(phaselist), -1).T
+        self.b_table = (2 / self.delta) * (
+            self.all_sy @ (self.s_tt * self.szlist - self.s_t * self.stzlist).T
+            + self.all_sty @ (self.ngroups * self.stzlist - self.s_t * self.szlist).T
+        ) - 2 * s_yz
+
+    def closest_phase_index(self, phase, phase_diff):
+        """
+        Find the closest phases in phaselist, at or after shifted phases.
 
-            self.zlist += [z]
-            self.stzlist += [np.sum(self.grouptimes * z, axis=1)]
-            self.szlist += [np.sum(z, axis=1)]
-            self.szzlist += [np.sum(z**2, axis=1)]
+        Parameters
+        ----------
+        phase : ndarray
+            Phases, broadcastable with `phase_diff`.
+        phase_diff : ndarray
+            Phase differences added to `phase`.
+
+        Returns
+        -------
+        ndarray of int
+            Index in phaselist of the phase closest to ``phase + phase_diff``,
+            modulo 1, from above.
+        """
+        nlist = len(self.phaselist)
+        phase = phase[..., np.newaxis]
+        phase_diff = phase_diff[..., np.newaxis]
+        if np.all(np.diff(self.phaselist) > 0):
+            # Only the neighbors of the position in the sorted phaselist
+            # can be the closest phases, up to rounding
+            position = np.searchsorted(self.phaselist, (phase + phase_diff) % 1)
+            candidates = (position + np.arange(-1, 2)) % nlist
+        else:
+            candidates = np.arange(nlist)
+        distance = np.abs((self.phaselist[candidates] - phase - phase_diff) % 1)
+        best = np.argmin(distance, axis=-1)[..., np.newaxis]
+        return np.take_along_axis(np.broadcast_to(candidates, distance.shape), best, -1)[..., 0]
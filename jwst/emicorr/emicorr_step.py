@@ -25,6 +25,7 @@ class EmiCorrStep(Step):
         fit_ints_separately = boolean(default=False)  # If True and algorithm is 'joint', each integration is separately fit.
         user_supplied_reffile = string(default=None)  # ASDF user-supplied reference file
         save_intermediate_results = boolean(default=False)  # If True and a reference file is created on the fly, save it to disk
+        maximum_cores = string(default='1')  # cores for multiprocessing. Can be an integer, 'half', 'quarter', or 'all'
         skip = boolean(default=True)  # Skip the step
     """  # noqa: E501
 
@@ -72,6 +73,7 @@ class EmiCorrStep(Step):
                 "onthefly_corr_freq": self.onthefly_corr_freq,
                 "use_n_cycles": self.use_n_cycles,
                 "fit_ints_separately": self.fit_ints_separately,
+                "maximum_cores": self.maximum_cores,
             }
 
             # Get the reference file
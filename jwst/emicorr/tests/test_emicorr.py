@@ -400,6 +400,20 @@ def test_apply_emicorr(data_without_emi, data_with_emi, model_with_emi, algorith
     assert np.allclose(outmdl.data, expected_model.data, rtol=accuracy)
 
 
+@pytest.mark.parametrize("algorithm", ["sequential", "joint"])
+def test_apply_emicorr_maximum_cores(data_with_emi_3int, model_with_emi, algorithm):
+    input_model = mk_data_mdl(data_with_emi_3int, "FULL", "FAST", "MIRIMAGE")
+
+    serial = emicorr.apply_emicorr(input_model.copy(), model_with_emi, algorithm=algorithm)
+    parallel = emicorr.apply_emicorr(
+        input_model.copy(), model_with_emi, algorithm=algorithm, maximum_cores="2"
+    )
+
+    # The integrations are prepared independently, so the result does not
+    # depend on the number of processes
+    np.testing.assert_array_equal(parallel.data, serial.data)
+
+
 def test_apply_emicorr_separate_ints(data_without_emi_3int, data_with_emi_3int, model_with_emi):
     input_model = mk_data_mdl(data_with_emi_3int, "FULL", "FAST", "MIRIMAGE")
     expected_model = mk_data_mdl(data_without_emi_3int, "FULL", "FAST", "MIRIMAGE")
@@ -541,6 +555,18 @@ def test_sloper():
     assert np.all(compare_intercept == intercept)
 
 
+def test_sloper_integrations():
+    rng = np.random.default_rng(42)
+    data = rng.normal(size=(3, 6, 4, 5))
+    outarray, intercept = emicorr.sloper(data)
+
+    # integrations are fit independently
+    for i in range(3):
+        compare_arr, compare_intercept = emicorr.sloper(data[i])
+        np.testing.assert_array_equal(outarray[i], compare_arr)
+        np.testing.assert_array_equal(intercept[i], compare_intercept)
+
+
 def test_minmed_ones():
     data = np.ones((5, 5, 5))
     compare_arr = data.copy()
@@ -582,6 +608,42 @@ def test_minmed_ignore_nans():
     assert np.all(medimg.flat[3:] == 0.3)
 
 
+@pytest.mark.parametrize("nframes", [2, 5])
+def test_minmed_integrations(nframes):
+    rng = np.random.default_rng(42)
+    data = rng.normal(size=(3, nframes, 4, 5))
+    data[1, 0, 2, 2] = np.nan
+    medimg = emicorr.minmed(data)
+
+    # integrations are stacked independently
+    for i in range(3):
+        np.testing.assert_array_equal(medimg[i], emicorr.minmed(data[i]))
+
+
+def test_closest_phase_index():
+    nphases_opt = 500
+    phaselist = np.arange(nphases_opt) * 1.0 / nphases_opt
+    ngroups, nphases = 4, 10
+    emifitter = emicorr.EMIfitter(
+        np.ones((3, nphases, ngroups)),
+        np.ones((3, nphases)),
+        np.sin,
+        np.zeros((nphases, ngroups)),
+        phaselist,
+        0.3,
+    )
+
+    rng = np.random.default_rng(42)
+    phases = np.concatenate([phaselist, rng.random(20), [0.0, 0.5]])
+    phase_diff = 0.37 * np.arange(50)
+    index = emifitter.closest_phase_index(phases[:, np.newaxis], phase_diff)
+
+    # same as a search through all the phases
+    for phase, phase_index in zip(phases, index, strict=True):
+        expected = np.argmin(np.abs((phaselist - phase - phase_diff[:, np.newaxis]) % 1), axis=1)
+        np.testing.assert_array_equal(phase_index, expected)
+
+
 def test_rebin_shrink():
     data = np.ones(10)
     data[1] = 0.55
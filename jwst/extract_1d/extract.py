@@ -1302,10 +1302,13 @@ def extract_one_slit(data_model, integration, profile, bg_profile, nod_profile,
         The input science model. May be a single slit from a MultiSlitModel
         (or similar), or a single data type, like an ImageModel, SlitModel,
         or CubeModel.
-    integration : int
+    integration : int or slice
         For the case that data_model is a SlitModel or a CubeModel,
         ``integration`` is the integration number.  If the integration number is
         not relevant (i.e. the data array is 2-D), ``integration`` should be -1.
+        A slice of integration numbers may be given to extract several
+        integrations at once; all returned arrays then have an additional
+        leading dimension for the integrations.
     profile : ndarray of float
         Spatial profile indicating the aperture location. Must be a
         2D image matching the input, with floating point values between 0
@@ -1369,7 +1372,13 @@ def extract_one_slit(data_model, integration, profile, bg_profile, nod_profile,
         Residual image from the input minus the scene model.
     """
     # Get the data and variance arrays
-    if integration > -1:
+    if isinstance(integration, slice):
+        log.debug(f"Extracting integrations {integration.start + 1} to {integration.stop}")
+        data = data_model.data[integration]
+        var_rnoise = data_model.var_rnoise[integration]
+        var_poisson = data_model.var_poisson[integration]
+        var_flat = data_model.var_flat[integration]
+    elif integration > -1:
         log.debug(f"Extracting integration {integration + 1}")
         data = data_model.data[integration]
         var_rnoise = data_model.var_rnoise[integration]
@@ -1397,10 +1406,10 @@ def extract_one_slit(data_model, integration, profile, bg_profile, nod_profile,
         else:
             profiles = [profile]
     else:
-        data = data.T
-        var_rnoise = var_rnoise.T
-        var_poisson = var_poisson.T
-        var_flat = var_flat.T
+        data = np.swapaxes(data, -1, -2)
+        var_rnoise = np.swapaxes(var_rnoise, -1, -2)
+        var_poisson = np.swapaxes(var_poisson, -1, -2)
+        var_flat = np.swapaxes(var_flat, -1, -2)
         if bg_profile is not None:
             bg_profile_view = bg_profile.T
         else:
@@ -1429,7 +1438,7 @@ def extract_one_slit(data_model, integration, profile, bg_profile, nod_profile,
     # here, we just want the first result
     first_result = []
     for r in result[:-1]:
-        first_result.append(r[0])
+        first_result.append(r[..., 0, :])
 
     # The last return value is the 2D model - there is only one, regardless
     # of the number of input profiles. It may need to be transposed to match
@@ -1440,11 +1449,66 @@ def extract_one_slit(data_model, integration, profile, bg_profile, nod_profile,
         first_result.append(scene_model)
         first_result.append(residual)
     else:
-        first_result.append(scene_model.T)
-        first_result.append(residual.T)
+        first_result.append(np.swapaxes(scene_model, -1, -2))
+        first_result.append(np.swapaxes(residual, -1, -2))
     return first_result
 
 
+def _extract_integrations(
+    data_model, integrations, profile, bg_profile, nod_profile, extract_params
+):
+    """
+    Extract a sequence of integrations, in batches.
+
+    The integrations of a batch are extracted together, so that the
+    fitting matrices are computed only once for all integrations with
+    the same valid pixels.  The batch size is limited to bound the
+    memory used by the intermediate arrays.
+
+    Parameters
+    ----------
+    data_model : JWSTDataModel
+        The input science model, as for `extract_one_slit`.
+    integrations : list or range of int
+        The integrations to extract.  [-1] indicates a 2-D data array.
+    profile, bg_profile, nod_profile : ndarray or None
+        Extraction profiles, as for `extract_one_slit`.
+    extract_params : dict
+        Extraction parameters, as for `extract_one_slit`.
+
+    Yields
+    ------
+    integ : int
+        The integration number.
+    result : list of ndarray
+        The extraction results for the integration, as returned by
+        `extract_one_slit`.
+    """
+    npix = profile.size
+    batch_size = max(1, 2**21 // npix)
+    for start in range(0, len(integrations), batch_size):
+        batch = integrations[start : start + batch_size]
+        if len(batch) == 1:
+            yield (
+                batch[0],
+                extract_one_slit(
+                    data_model, batch[0], profile, bg_profile, nod_profile, extract_params
+                ),
+            )
+            continue
+
+        result = extract_one_slit(
+            data_model,
+            slice(batch[0], batch[-1] + 1),
+            profile,
+            bg_profile,
+            nod_profile,
+            extract_params,
+        )
+        for i, integ in enumerate(batch):
+            yield integ, [r[i] for r in result]
+
+
 def create_extraction(
     input_model,
     slit,
@@ -1717,7 +1781,9 @@ def create_extraction(
 
     # Extract each integration
     spec_list = []
-    for integ in integrations:
+    for integ, result in _extract_integrations(
+        data_model, integrations, profile, bg_profile, nod_profile, extract_params
+    ):
         (
             sum_flux,
             f_var_rnoise,
@@ -1730,7 +1796,7 @@ def create_extraction(
             npixels,
             scene_model_2d,
             residual_2d,
-        ) = extract_one_slit(data_model, integ, profile, bg_profile, nod_profile, extract_params)
+        ) = result
 
         # Save the scene model and residual
         if save_scene_model:
@@ -14,7 +14,8 @@ def build_coef_matrix(image, profiles_2d=None, profile_bg=None, weights=None, or
     ----------
     image : ndarray
         2D array, transposed if necessary so that the dispersion direction
-        is the second index.
+        is the last index.  A 3D stack of such images may be passed to
+        fit all of them at once.
     profiles_2d : list of ndarray or None, optional
         These 2D arrays contain the weights for the extraction.  These arrays
         should be the same shape as image, with one array for each object
@@ -25,9 +26,9 @@ def build_coef_matrix(image, profiles_2d=None, profile_bg=None, weights=None, or
         background is to be estimated.  If not specified, no additional
         pixels are included for background calculations.
     weights : ndarray or None, optional
-        2D array of (float) weights for the extraction.  If using inverse
-        variance weighting, these should be the square root of the inverse
-        variance.  If not supplied, unit weights will be used.
+        Array of (float) weights for the extraction, the same shape as image.
+        If using inverse variance weighting, these should be the square root
+        of the inverse variance.  If not supplied, unit weights will be used.
     order : int, optional
         Polynomial order for fitting to each column of background.
         Default 0 (uniform background).
@@ -41,17 +42,30 @@ def build_coef_matrix(image, profiles_2d=None, profile_bg=None, weights=None, or
     coefmatrix : ndarray, 3-D, float64
         Matrix of coefficients for each parameter for each pixel,
         used to reconstruct the model fit.  Shape (npixels, npixels_y, npar)
+    coefmatrix_masked : ndarray, 3-D, float64
+        The coefficient matrix with unused pixels set to zero and the
+        weights applied.  Shape (npixels, npixels_y, npar)
+
+    Notes
+    -----
+    For a stack of images, ``matrix``, ``vec`` and ``coefmatrix_masked``
+    have the leading (stack) dimension of ``image`` prepended to their
+    shapes.  If all images of the stack have the same valid pixels and
+    weights, ``matrix`` and ``coefmatrix_masked`` are computed only once
+    and their leading dimension has length one, so that a single set of
+    fits is solved for all the target vectors in ``vec``.  ``coefmatrix``
+    does not depend on the image values and is always shared.
     """
     if profiles_2d is None:
         profiles_2d = []
 
     # Independent variable values for the polynomial fit.
-    y = np.linspace(-1, 1, image.shape[0])
+    y = np.linspace(-1, 1, image.shape[-2])
 
     # Build the matrix of terms that multiply the coefficients.
     # Polynomial terms first, then source terms if those arrays
     # are supplied.
-    coefmatrix = np.ones((image.shape[1], image.shape[0], order + 1 + len(profiles_2d)))
+    coefmatrix = np.ones((image.shape[-1], image.shape[-2], order + 1 + len(profiles_2d)))
     for i in range(1, order + 1):
         coefmatrix[..., i] = coefmatrix[..., i - 1] * y[np.newaxis, :]
 
@@ -59,37 +73,78 @@ def build_coef_matrix(image, profiles_2d=None, profile_bg=None, weights=None, or
     for i in range(len(profiles_2d)):
         coefmatrix[..., i + order + 1] = profiles_2d[i].T
 
+    image_t = np.swapaxes(image, -1, -2)
+    finite = np.isfinite(image_t)
+    weights_t = None if weights is None else np.swapaxes(weights, -1, -2)
+
+    # The images of a stack with the same valid pixels and weights
+    # share their design matrices, so only compute those once.
+    if image.ndim > 2 and np.all(finite == finite[:1]):
+        if weights_t is None or weights_t.ndim == 2:
+            finite = finite[:1]
+        elif np.all(weights_t == weights_t[:1]):
+            finite = finite[:1]
+            weights_t = weights_t[:1]
+
     # Construct a boolean array for the pixels that are nonzero
     # in any of our profiles.
-    pixels_used = np.zeros(image.T.shape, dtype=bool)
+    pixels_used = np.zeros(finite.shape, dtype=bool)
     for profile_2d in profiles_2d:
         pixels_used = pixels_used | (profile_2d.T != 0)
     if profile_bg is not None:
         pixels_used = pixels_used | (profile_bg.T != 0)
-    pixels_used = pixels_used & np.isfinite(image.T)
+    pixels_used = pixels_used & finite
 
     # Target vector and coefficient vector for the least squares fit.
-    targetvector = image.T.copy()
-
     # We don't want to be ruined by NaNs in regions we are not fitting anyway.
-    targetvector[~pixels_used] = 0
-    coefmatrix_masked = coefmatrix * pixels_used[:, :, np.newaxis]
+    targetvector = np.where(pixels_used, image_t, 0)
+    coefmatrix_masked = coefmatrix * pixels_used[..., np.newaxis]
 
     # Weighting goes here.  If we are using inverse variance weighting,
     # weight here is the square root of the inverse variance.
-    if weights is not None:
-        coefmatrix_masked *= weights.T[:, :, np.newaxis]
-        targetvector *= weights.T
+    if weights_t is not None:
+        coefmatrix_masked *= weights_t[..., np.newaxis]
+        targetvector *= weights_t
 
     # Products of the coefficient matrices suitable for passing to
     # linalg.solve.  These are matrices of size (npixels, npar, npar)
     # and (npixels, npar).
-    matrix = np.einsum("lji,ljk->lik", coefmatrix_masked, coefmatrix_masked)  # codespell:ignore
-    vec = np.einsum("lji,lj->li", coefmatrix_masked, targetvector)
+    matrix = np.einsum(
+        "...lji,...ljk->...lik",  # codespell:ignore
+        coefmatrix_masked,
+        coefmatrix_masked,
+    )
+    vec = np.einsum("...lji,...lj->...li", coefmatrix_masked, targetvector)
 
     return matrix, vec, coefmatrix, coefmatrix_masked
 
 
+def _fit_weights(weights, matrix):
+    """
+    Transpose the pixel weights to match the design matrices.
+
+    Parameters
+    ----------
+    weights : ndarray
+        Weights for the extraction, the same shape as the image (or
+        image stack) passed to `build_coef_matrix`.
+    matrix : ndarray
+        Design matrices returned by `build_coef_matrix`.
+
+    Returns
+    -------
+    ndarray
+        Weights with the dispersion direction first, shape
+        (..., npixels, npixels_y, 1).  If the images of a stack share
+        their design matrices, only the weights of the first image are
+        returned; they are the same for all images.
+    """
+    weights_t = np.swapaxes(weights, -1, -2)
+    if weights_t.ndim > 2 and len(matrix) < len(weights_t):
+        weights_t = weights_t[:1]
+    return weights_t[..., np.newaxis]
+
+
 def _fit_background_for_box_extraction(
     image,
     profiles_2d,
@@ -119,15 +174,15 @@ def _fit_background_for_box_extraction(
     if bg_smooth_length > 1:
         if not bg_smooth_length % 2 == 1:
             raise ValueError("bg_smooth_length should be an odd integer >= 1.")
-        kernel = np.ones((1, bg_smooth_length)) / bg_smooth_length
+        kernel = np.ones((1,) * (image.ndim - 1) + (bg_smooth_length,)) / bg_smooth_length
         input_background = convolution.convolve(input_background, kernel, boundary="extend")
 
     if bkg_fit_type == "median":
-        input_background[profile_bg == 0] = np.nan
+        input_background[..., profile_bg == 0] = np.nan
         with warnings.catch_warnings():
             warnings.filterwarnings("ignore", category=RuntimeWarning, message="All-NaN")
-            bkg_1d = np.nanmedian(input_background, axis=0)
-        bkg_2d = bkg_1d[np.newaxis, :]
+            bkg_1d = np.nanmedian(input_background, axis=-2)
+        bkg_2d = bkg_1d[..., np.newaxis, :]
 
         # Putting an uncertainty on the median is a bit harder.
         # It is typically about 1.2 times the uncertainty on the mean.
@@ -140,14 +195,18 @@ def _fit_background_for_box_extraction(
         wgt = np.isfinite(image) * np.isfinite(variance) * (profile_bg != 0)
         with warnings.catch_warnings():
             warnings.filterwarnings("ignore", category=RuntimeWarning, message="invalid value")
-            pixwgt = wgt / np.sum(wgt, axis=0)[np.newaxis, :]
+            pixwgt = wgt / np.sum(wgt, axis=-2)[..., np.newaxis, :]
 
-        var_bkg_rn = 1.2**2 * bkg_npix**2 * np.array([np.nansum(variance_rn * pixwgt**2, axis=0)])
+        var_bkg_rn = (
+            1.2**2 * bkg_npix**2 * np.nansum(variance_rn * pixwgt**2, axis=-2)[..., np.newaxis, :]
+        )
         var_bkg_phnoise = (
-            1.2**2 * bkg_npix**2 * np.array([np.nansum(variance_phnoise * pixwgt**2, axis=0)])
+            1.2**2
+            * bkg_npix**2
+            * np.nansum(variance_phnoise * pixwgt**2, axis=-2)[..., np.newaxis, :]
         )
         var_bkg_flat = (
-            1.2**2 * bkg_npix**2 * np.array([np.nansum(variance_flat * pixwgt**2, axis=0)])
+            1.2**2 * bkg_npix**2 * np.nansum(variance_flat * pixwgt**2, axis=-2)[..., np.newaxis, :]
         )
 
     elif bkg_fit_type == "poly" and bkg_order >= 0:
@@ -168,8 +227,8 @@ def _fit_background_for_box_extraction(
 
         # These are the pixel-dependent weights to compute our coefficients.
         # We will use them to propagate errors.
-        pixwgt = weights.T[:, :, np.newaxis] * np.einsum(
-            "ijk,ilj->ilk", cov_bg_coefs, coefmatrix_masked
+        pixwgt = _fit_weights(weights, matrix) * np.einsum(
+            "...ijk,...ilj->...ilk", cov_bg_coefs, coefmatrix_masked
         )
         bkg_mat = np.sum(np.swapaxes(coefmatrix, 0, 1) * profiles_2d[0][:, :, np.newaxis], axis=0)
 
@@ -177,14 +236,15 @@ def _fit_background_for_box_extraction(
         # where we will do the extraction.  Used to propagate errors.
         pixwgt_tot = np.sum(bkg_mat[:, np.newaxis, :] * pixwgt, axis=-1)
 
-        var_bkg_rn = np.array([np.nansum(variance_rn.T * pixwgt_tot**2, axis=1)])
-        var_bkg_phnoise = np.array([np.nansum(variance_phnoise.T * pixwgt_tot**2, axis=1)])
-        var_bkg_flat = np.array([np.nansum(variance_flat.T * pixwgt_tot**2, axis=1)])
+        var_bkg_rn, var_bkg_phnoise, var_bkg_flat = (
+            np.nansum(np.swapaxes(variance, -1, -2) * pixwgt_tot**2, axis=-1)[..., np.newaxis, :]
+            for variance in (variance_rn, variance_phnoise, variance_flat)
+        )
 
-        coefs = np.einsum("ijk,ij->ik", cov_bg_coefs, vec)
+        coefs = np.einsum("...ijk,...ij->...ik", cov_bg_coefs, vec)
 
         # Reconstruct the 2D background.
-        bkg_2d = np.sum(coefs[:, np.newaxis, :] * coefmatrix, axis=-1).T
+        bkg_2d = np.swapaxes(np.sum(coefs[..., np.newaxis, :] * coefmatrix, axis=-1), -1, -2)
 
     else:
         raise ValueError(
@@ -218,7 +278,7 @@ def _box_extract(
     # This only makes sense with a single profile, i.e., pulling out
     # a single spectrum.
     nobjects = 1
-    profile_2d = profiles_2d[0].copy()
+    profile_2d = np.broadcast_to(profiles_2d[0], image.shape).copy()
     image_masked = image.copy()
 
     # Mask NaNs and infs for the extraction
@@ -226,15 +286,16 @@ def _box_extract(
     image_masked[profile_2d == 0] = 0
 
     # Return array of shape (1, npixels) for generality
-    fluxes = np.array([np.sum(image_masked * profile_2d, axis=0)])
+    fluxes = np.sum(image_masked * profile_2d, axis=-2)[..., np.newaxis, :]
 
     # Number of contributing pixels at each wavelength.
-    npixels = np.array([np.sum(profile_2d, axis=0)])
+    npixels = np.sum(profile_2d, axis=-2)[..., np.newaxis, :]
 
     # Add average flux over the aperture to the model, so that
     # a sum over the cross-dispersion direction reproduces the summed flux
-    valid = npixels[0] > 0
-    model[:, valid] += (fluxes[0][valid] / npixels[0][valid]) * profile_2d[:, valid]
+    valid = npixels > 0
+    mean_flux = np.divide(fluxes, npixels, out=np.zeros(fluxes.shape), where=valid)
+    model += np.where(valid, mean_flux * profile_2d, 0.0)
 
     # Compute the variance on the sum, same shape as f.
     # Need to decompose this into read noise, photon noise, and flat noise.
@@ -244,18 +305,19 @@ def _box_extract(
     with warnings.catch_warnings():
         warnings.filterwarnings("ignore", "overflow encountered", RuntimeWarning)
         warnings.filterwarnings("ignore", "invalid value", RuntimeWarning)
-        var_rn = np.array([np.nansum(variance_rn * profile_2d**2, axis=0)])
-        var_phnoise = np.array([np.nansum(variance_phnoise * profile_2d**2, axis=0)])
-        var_flat = np.array([np.nansum(variance_flat * profile_2d**2, axis=0)])
+        var_rn, var_phnoise, var_flat = (
+            np.nansum(variance * profile_2d**2, axis=-2)[..., np.newaxis, :]
+            for variance in (variance_rn, variance_phnoise, variance_flat)
+        )
 
     if bkg_2d is not None:
         var_rn += var_bkg_rn
         var_phnoise += var_bkg_phnoise
         var_flat += var_bkg_flat
-        bkg = np.array([np.sum(bkg_2d * profile_2d, axis=0)])
+        bkg = np.sum(bkg_2d * profile_2d, axis=-2)[..., np.newaxis, :]
         bkg[~np.isfinite(bkg)] = 0.0
     else:
-        bkg = np.zeros((nobjects, image.shape[1]))
+        bkg = np.zeros(image.shape[:-2] + (nobjects, image.shape[-1]))
 
     return (
         fluxes,
@@ -323,12 +385,14 @@ def _optimal_extract(
 
     # These are the pixel-dependent weights to compute our coefficients.
     # We will use them to propagate errors.
-    pixwgt = weights.T[:, :, np.newaxis] * np.einsum("ijk,ilj->ilk", covariances, coefmatrix_masked)
+    pixwgt = _fit_weights(weights, matrix) * np.einsum(
+        "...ijk,...ilj->...ilk", covariances, coefmatrix_masked
+    )
 
     # Don't use NaN pixels in the sum.  These will already be zero in
     # pixwgt.  coefs are the best-fit coefficients of the source and
     # background components.
-    coefs = np.nansum(pixwgt * image.T[:, :, np.newaxis], axis=1)
+    coefs = np.nansum(pixwgt * np.swapaxes(image, -1, -2)[..., np.newaxis], axis=-2)
 
     # Effective number of contributing pixels at each wavelength for each source.
     nobjects = len(profiles_2d)
@@ -338,17 +402,27 @@ def _optimal_extract(
             profiles_2d[i] * (weights > 0) / np.sum(profiles_2d[i] ** 2, axis=0)
             for i in range(nobjects)
         ]
-    npixels = np.sum(wgt_src_pix, axis=1)
+    npixels = np.sum(np.stack(wgt_src_pix, axis=-3), axis=-2)
 
     if order > -1:
-        bkg_2d = np.sum(coefs[:, np.newaxis, : order + 1] * coefmatrix[..., : order + 1], axis=-1).T
+        bkg_2d = np.swapaxes(
+            np.sum(coefs[..., np.newaxis, : order + 1] * coefmatrix[..., : order + 1], axis=-1),
+            -1,
+            -2,
+        )
 
     # Variances for each object (discard variances for background here)
-    var_rn = np.nansum(pixwgt[..., -nobjects:] ** 2 * variance_rn.T[:, :, np.newaxis], axis=1).T
-    var_phnoise = np.nansum(
-        pixwgt[..., -nobjects:] ** 2 * variance_phnoise.T[:, :, np.newaxis], axis=1
-    ).T
-    var_flat = np.nansum(pixwgt[..., -nobjects:] ** 2 * variance_flat.T[:, :, np.newaxis], axis=1).T
+    var_rn, var_phnoise, var_flat = (
+        np.swapaxes(
+            np.nansum(
+                pixwgt[..., -nobjects:] ** 2 * np.swapaxes(variance, -1, -2)[..., np.newaxis],
+                axis=-2,
+            ),
+            -1,
+            -2,
+        )
+        for variance in (variance_rn, variance_phnoise, variance_flat)
+    )
 
     # Computing a background contribution to the noise is harder in a joint fit.
     # Here, I am computing the weighting coefficients I would have without a background.
@@ -359,30 +433,39 @@ def _optimal_extract(
             warnings.filterwarnings("ignore", category=RuntimeWarning, message="divide by zero")
 
             wgt_nobkg = [
-                profiles_2d[i] * weights / np.sum(profiles_2d[i] ** 2 * weights, axis=0)
+                profiles_2d[i]
+                * weights
+                / np.sum(profiles_2d[i] ** 2 * weights, axis=-2)[..., np.newaxis, :]
                 for i in range(nobjects)
             ]
 
-            bkg = np.array([np.sum(wgt_nobkg[i] * bkg_2d, axis=0) for i in range(nobjects)])
+            bkg = np.stack(
+                [np.sum(wgt_nobkg[i] * bkg_2d, axis=-2) for i in range(nobjects)], axis=-2
+            )
 
             # Avoid overflow in squaring weights by multiplying by variance first
-            var_bkg_rn = np.array(
+            var_bkg_rn = np.stack(
                 [
-                    var_rn[i] - np.sum(variance_rn * wgt_nobkg[i] * wgt_nobkg[i], axis=0)
+                    var_rn[..., i, :] - np.sum(variance_rn * wgt_nobkg[i] * wgt_nobkg[i], axis=-2)
                     for i in range(nobjects)
-                ]
+                ],
+                axis=-2,
             )
-            var_bkg_phnoise = np.array(
+            var_bkg_phnoise = np.stack(
                 [
-                    var_phnoise[i] - np.sum(variance_phnoise * wgt_nobkg[i] * wgt_nobkg[i], axis=0)
+                    var_phnoise[..., i, :]
+                    - np.sum(variance_phnoise * wgt_nobkg[i] * wgt_nobkg[i], axis=-2)
                     for i in range(nobjects)
-                ]
+                ],
+                axis=-2,
             )
-            var_bkg_flat = np.array(
+            var_bkg_flat = np.stack(
                 [
-                    var_flat[i] - np.sum(variance_flat * wgt_nobkg[i] * wgt_nobkg[i], axis=0)
+                    var_flat[..., i, :]
+                    - np.sum(variance_flat * wgt_nobkg[i] * wgt_nobkg[i], axis=-2)
                     for i in range(nobjects)
-                ]
+                ],
+                axis=-2,
             )
 
         # Make sure background values are finite
@@ -394,11 +477,11 @@ def _optimal_extract(
         var_bkg_phnoise *= var_bkg_phnoise > 0
         var_bkg_flat *= var_bkg_flat > 0
     else:
-        bkg = np.zeros((nobjects, image.shape[1]))
+        bkg = np.zeros(image.shape[:-2] + (nobjects, image.shape[-1]))
 
     # Reshape to (nobjects, npixels)
-    fluxes = coefs[:, -nobjects:].T
-    model += np.sum(coefs[:, np.newaxis, :] * coefmatrix, axis=-1).T
+    fluxes = np.swapaxes(coefs[..., -nobjects:], -1, -2)
+    model += np.swapaxes(np.sum(coefs[..., np.newaxis, :] * coefmatrix, axis=-1), -1, -2)
 
     return (
         fluxes,
@@ -435,7 +518,9 @@ def extract1d(
     ----------
     image : ndarray
         2D array, transposed if necessary so that the dispersion direction
-        is the second index.
+        is the last index.  A 3D stack of such images, e.g. the integrations
+        of an exposure, may be passed to extract all of them at once; the
+        variance and weight arrays must then have the same shape as image.
     profiles_2d : list of ndarray
         These 2D arrays contain the weights for the extraction.  A box
         extraction will add up the flux multiplied by these weights; an
@@ -504,6 +589,11 @@ def extract1d(
     model : ndarray of float64
         The model of the scene, the same shape as the input image (and
         hopefully also similar in value).
+
+    Notes
+    -----
+    For a stack of images, all the returned arrays have the leading
+    (stack) dimension of ``image`` prepended to their shapes.
     """
     nobjects = len(profiles_2d)  # hopefully at least one!
     model = np.zeros(image.shape)
@@ -541,9 +631,9 @@ def extract1d(
         bkg_2d = None
 
         # Set background uncertainties to zero.
-        var_bkg_rn = np.zeros((nobjects, image.shape[1]))
-        var_bkg_phnoise = np.zeros((nobjects, image.shape[1]))
-        var_bkg_flat = np.zeros((nobjects, image.shape[1]))
+        var_bkg_rn = np.zeros(image.shape[:-2] + (nobjects, image.shape[-1]))
+        var_bkg_phnoise = np.zeros(image.shape[:-2] + (nobjects, image.shape[-1]))
+        var_bkg_flat = np.zeros(image.shape[:-2] + (nobjects, image.shape[-1]))
 
     # This is the case of box extraction.
     if extraction_type == "box" and len(profiles_2d) == 1:
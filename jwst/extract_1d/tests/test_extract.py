@@ -1353,6 +1353,40 @@ def test_extract_one_slit_multi_int(
     assert result[-1].shape == model.data.shape[-2:]
 
 
+@pytest.mark.parametrize("extraction_type", ["box", "optimal"])
+@pytest.mark.parametrize("bad_pixel_int", [None, 3])
+def test_extract_one_slit_int_slice(
+    mock_nirspec_bots,
+    extract_defaults,
+    simple_profile,
+    background_profile,
+    extraction_type,
+    bad_pixel_int,
+):
+    model = mock_nirspec_bots
+    extract_defaults["dispaxis"] = 1
+    extract_defaults["subtract_background"] = True
+    extract_defaults["bkg_fit"] = "poly"
+    extract_defaults["bkg_order"] = 1
+    extract_defaults["extraction_type"] = extraction_type
+
+    # All integrations share the fitting matrices unless one has a bad pixel
+    model.data[:, 25, 10] = np.nan
+    if bad_pixel_int is not None:
+        model.data[bad_pixel_int, 5, 20] = np.nan
+
+    result = ex.extract_one_slit(
+        model, slice(2, 7), simple_profile, background_profile, None, extract_defaults
+    )
+    for i, integ in enumerate(range(2, 7)):
+        expected = ex.extract_one_slit(
+            model, integ, simple_profile, background_profile, None, extract_defaults
+        )
+        for data, expected_data in zip(result, expected, strict=True):
+            assert data.shape == (5,) + expected_data.shape
+            np.testing.assert_array_equal(data[i], expected_data)
+
+
 def test_extract_one_slit_missing_var(mock_nirspec_fs_one_slit, extract_defaults, simple_profile):
     model = mock_nirspec_fs_one_slit
     extract_defaults["dispaxis"] = 1
@@ -26,6 +26,8 @@ def extract2d(
     extract_orders=None,
     mmag_extract=None,
     nbright=None,
+    maximum_cores="1",
+    wcs_tolerance=None,
 ):
     """
     Extract rectangular cutouts around each spectrum from a spectral dataset.
@@ -55,6 +57,13 @@ def extract2d(
         Minimum (faintest) abmag to extract for WFSS mode.
     nbright : float
         Number of brightest objects to extract, WFSS mode.
+    maximum_cores : str
+        Number of threads to use for extracting NIRSpec slits in parallel.
+        Can be an integer, 'none', 'quarter', 'half', or 'all'.
+    wcs_tolerance : float or None
+        If set, the NIRSpec slit wavelengths are approximated by a bilinear
+        lookup grid with a maximum error of this many microns, instead of
+        evaluating the WCS at every pixel.
 
     Returns
     -------
@@ -80,7 +89,13 @@ def extract2d(
             output_model = input_model.copy()
             output_model.meta.cal_step.extract_2d = "SKIPPED"
             return output_model
-        output_model = nrs_extract2d(input_model, slit_names=slit_names, source_ids=source_ids)
+        output_model = nrs_extract2d(
+            input_model,
+            slit_names=slit_names,
+            source_ids=source_ids,
+            maximum_cores=maximum_cores,
+            wcs_tolerance=wcs_tolerance,
+        )
     elif exp_type in slitless_modes:
         if exp_type == "NRC_TSGRISM":
             if tsgrism_extract_height is None:
@@ -21,6 +21,8 @@ class Extract2dStep(Step):
         wfss_extract_half_height =  integer(default=5)  # extraction half height in pixels, WFSS mode
         wfss_mmag_extract = float(default=None)  # minimum abmag to extract, WFSS mode
         wfss_nbright = integer(default=1000)  # number of brightest objects to extract, WFSS mode
+        maximum_cores = string(default='1')  # threads for extracting NIRSpec slits. Can be an integer, 'half', 'quarter', or 'all'
+        wcs_tolerance = float(default=None, min=0)  # If set, approximate NIRSpec slit wavelengths to this accuracy, in microns
     """  # noqa: E501
 
     reference_file_types = ["wavelengthrange"]
@@ -60,6 +62,8 @@ class Extract2dStep(Step):
                 extract_orders=self.extract_orders,
                 mmag_extract=self.wfss_mmag_extract,
                 nbright=self.wfss_nbright,
+                maximum_cores=self.maximum_cores,
+                wcs_tolerance=self.wcs_tolerance,
             )
 
         return output_model
@@ -2,6 +2,7 @@
 #  Module for 2d extraction of Nirspec fixed slits or MOS slitlets.
 #
 import logging
+from functools import partial
 
 import numpy as np
 from astropy.modeling.models import Shift
@@ -27,7 +28,9 @@ __all__ = [
 ]
 
 
-def nrs_extract2d(input_model, slit_names=None, source_ids=None):
+def nrs_extract2d(
+    input_model, slit_names=None, source_ids=None, maximum_cores="1", wcs_tolerance=None
+):
     """
     Perform extract_2d calibration for NIRSpec exposures.
 
@@ -39,6 +42,13 @@ def nrs_extract2d(input_model, slit_names=None, source_ids=None):
         Slit names.
     source_ids : list containing strings or ints
         Source ids.
+    maximum_cores : str, optional
+        Number of threads to use for extracting slits in parallel.
+        Can be an integer, 'none', 'quarter', 'half', or 'all'.
+    wcs_tolerance : float or None, optional
+        If set, the slit wavelengths are approximated by a bilinear lookup
+        grid with a maximum error of this many microns, instead of
+        evaluating the WCS at every pixel.
 
     Returns
     -------
@@ -73,7 +83,9 @@ def nrs_extract2d(input_model, slit_names=None, source_ids=None):
     if exp_type == "NRS_BRIGHTOBJ":
         # the output model is a single SlitModel
         slit = open_slits[0]
-        output_model, xlo, xhi, ylo, yhi = process_slit(input_model, slit)
+        output_model, xlo, xhi, ylo, yhi = process_slit(
+            input_model, slit, wcs_tolerance=wcs_tolerance
+        )
         set_slit_attributes(output_model, slit, xlo, xhi, ylo, yhi)
         try:
             get_source_xpos(output_model)
@@ -90,47 +102,73 @@ def nrs_extract2d(input_model, slit_names=None, source_ids=None):
     else:
         output_model = datamodels.MultiSlitModel()
         output_model.update(input_model)
-        slits = []
-
-        # Loop over all slit instances that are present
-        for slit in open_slits:
-            new_model, xlo, xhi, ylo, yhi = process_slit(input_model, slit)
-
-            slits.append(new_model)
-            orig_s_region = new_model.meta.wcsinfo.s_region.strip()
-            # set x/ystart values relative to the image (screen) frame.
-            # The overall subarray offset is recorded in model.meta.subarray.
-            set_slit_attributes(new_model, slit, xlo, xhi, ylo, yhi)
-
-            if new_model.meta.exposure.type.lower() == "nrs_fixedslit":
-                if slit.name == input_model.meta.instrument.fixed_slit:
-                    try:
-                        get_source_xpos(new_model)
-                    except DitherMetadataError as e:
-                        log.warning(str(e))
-                        log.warning("Setting source position in slit to 0.0, 0.0")
-                        new_model.source_ypos = 0.0
-                        new_model.source_xpos = 0.0
-                else:
-                    # ensure nonsense data never end up in non-primary slits
-                    new_model.source_ypos = 0.0
-                    new_model.source_xpos = 0.0
 
-            # Update the S_REGION keyword value for the extracted slit
-            if "world" in input_model.meta.wcs.available_frames:
-                util.update_s_region_nrs_slit(new_model)
-                if orig_s_region != new_model.meta.wcsinfo.s_region.strip():
-                    log.info(f"Updated S_REGION to {new_model.meta.wcsinfo.s_region}")
-
-            # Copy BUNIT values to output slit
-            new_model.meta.bunit_data = input_model.meta.bunit_data
-            new_model.meta.bunit_err = input_model.meta.bunit_err
+        # Process all slit instances that are present
+        slits = pipe_utils.map_slits(
+            partial(_extract_slit_model, input_model, wcs_tolerance=wcs_tolerance),
+            open_slits,
+            maximum_cores=maximum_cores,
+        )
 
         output_model.slits.extend(slits)
 
     return output_model
 
 
+def _extract_slit_model(input_model, slit, wcs_tolerance=None):
+    """
+    Extract a single NIRSpec fixed slit or MOS slitlet.
+
+    Parameters
+    ----------
+    input_model : `~jwst.datamodels.ImageModel` or `~jwst.datamodels.CubeModel`
+        Input data model.
+    slit : `~stdatamodels.jwst.transforms.models.Slit`
+        A slit object.
+    wcs_tolerance : float or None, optional
+        If set, the maximum error of the approximated slit wavelengths,
+        in microns.
+
+    Returns
+    -------
+    new_model : `~jwst.datamodels.SlitModel`
+        The extracted slit, with its attributes, source position and
+        S_REGION set.
+    """
+    new_model, xlo, xhi, ylo, yhi = process_slit(input_model, slit, wcs_tolerance=wcs_tolerance)
+
+    orig_s_region = new_model.meta.wcsinfo.s_region.strip()
+    # set x/ystart values relative to the image (screen) frame.
+    # The overall subarray offset is recorded in model.meta.subarray.
+    set_slit_attributes(new_model, slit, xlo, xhi, ylo, yhi)
+
+    if new_model.meta.exposure.type.lower() == "nrs_fixedslit":
+        if slit.name == input_model.meta.instrument.fixed_slit:
+            try:
+                get_source_xpos(new_model)
+            except DitherMetadataError as e:
+                log.warning(str(e))
+                log.warning("Setting source position in slit to 0.0, 0.0")
+                new_model.source_ypos = 0.0
+                new_model.source_xpos = 0.0
+        else:
+            # ensure nonsense data never end up in non-primary slits
+            new_model.source_ypos = 0.0
+            new_model.source_xpos = 0.0
+
+    # Update the S_REGION keyword value for the extracted slit
+    if "world" in input_model.meta.wcs.available_frames:
+        util.update_s_region_nrs_slit(new_model)
+        if orig_s_region != new_model.meta.wcsinfo.s_region.strip():
+            log.info(f"Updated S_REGION to {new_model.meta.wcsinfo.s_region}")
+
+    # Copy BUNIT values to output slit
+    new_model.meta.bunit_data = input_model.meta.bunit_data
+    new_model.meta.bunit_err = input_model.meta.bunit_err
+
+    return new_model
+
+
 def select_slits(open_slits, slit_names, source_ids):
     """
     Select the slits to process.
@@ -191,7 +229,7 @@ def select_slits(open_slits, slit_names, source_ids):
         raise util.NoDataOnDetectorError(log_message)
 
 
-def process_slit(input_model, slit):
+def process_slit(input_model, slit, wcs_tolerance=None):
     """
     Construct a data model for each slit.
 
@@ -205,6 +243,9 @@ def process_slit(input_model, slit):
         set to ``BRIGHTOBJ``.
     slit : `~stdatamodels.jwst.transforms.models.Slit`
         A slit object.
+    wcs_tolerance : float or None, optional
+        If set, the maximum error of the approximated slit wavelengths,
+        in microns.
 
     Returns
     -------
@@ -213,7 +254,7 @@ def process_slit(input_model, slit):
     xlo, xhi, ylo, yhi : float
         The corners of the extracted slit in pixel space.
     """
-    new_model, xlo, xhi, ylo, yhi = extract_slit(input_model, slit)
+    new_model, xlo, xhi, ylo, yhi = extract_slit(input_model, slit, wcs_tolerance=wcs_tolerance)
 
     # Copy the DISPAXIS keyword to the output slit.
     new_model.meta.wcsinfo.dispersion_direction = input_model.meta.wcsinfo.dispersion_direction
@@ -299,7 +340,7 @@ def offset_wcs(slit_wcs):
     return xlo, xhi, ylo, yhi
 
 
-def extract_slit(input_model, slit):
+def extract_slit(input_model, slit, wcs_tolerance=None):
     """
     Extract a slit from a full frame image.
 
@@ -309,6 +350,10 @@ def extract_slit(input_model, slit):
         The input model.
     slit : `~stdatamodels.jwst.transforms.models.Slit`
         A slit object.
+    wcs_tolerance : float or None, optional
+        If set, the wavelengths are computed with a bilinear lookup-grid
+        approximation of the slit WCS, with a maximum error of this many
+        microns. Pixels near the slit edges are always evaluated exactly.
 
     Returns
     -------
@@ -348,7 +393,20 @@ def extract_slit(input_model, slit):
 
     # compute wavelengths
     x, y = wcstools.grid_from_bounding_box(slit_wcs.bounding_box, step=(1, 1))
-    ra, dec, lam = slit_wcs(x, y)
+    if wcs_tolerance is None:
+        ra, dec, lam = slit_wcs(x, y)
+    else:
+        # only the wavelengths are kept, so the sky coordinates are not constrained
+        det2world = util.GridApproximation(
+            slit_wcs.forward_transform,
+            slit_wcs.bounding_box,
+            tolerance=(np.inf, np.inf, wcs_tolerance),
+        )
+        log.debug(
+            f"Approximating the slit WCS with a {det2world.step} pixel grid, "
+            f"maximum wavelength error {det2world.max_error[2]}"
+        )
+        ra, dec, lam = det2world(x, y)
     lam = lam.astype(np.float32)
     new_model = datamodels.SlitModel(
         data=ext_data,
@@ -222,7 +222,56 @@ def test_extract_2d_nirspec_msa_fs(nirspec_msa_rate, nirspec_msa_metfl):
     assert result.slits[1].slitlet_id == 0
     assert result.slits[1].data.shape == (45, 1254)
 
+    # each slit gets its own S_REGION and the input units
+    for slit in result.slits:
+        assert slit.meta.wcsinfo.s_region.startswith("POLYGON")
+        assert slit.meta.bunit_data == model.meta.bunit_data
+        assert slit.meta.bunit_err == model.meta.bunit_err
+
+    model.close()
+    result.close()
+
+
+def test_extract_2d_nirspec_msa_fs_parallel(nirspec_msa_rate, nirspec_msa_metfl):
+    model = ImageModel(nirspec_msa_rate)
+    model_wcs = AssignWcsStep.call(model)
+    expected = Extract2dStep.call(model_wcs)
+    result = Extract2dStep.call(model_wcs, maximum_cores="2")
+
+    # slits are extracted in the same order as in serial mode
+    assert [slit.name for slit in result.slits] == ["12", "S200A1"]
+    for slit, expected_slit in zip(result.slits, expected.slits, strict=True):
+        assert slit.xstart == expected_slit.xstart
+        assert slit.ystart == expected_slit.ystart
+        assert slit.source_id == expected_slit.source_id
+        assert slit.source_xpos == expected_slit.source_xpos
+        assert slit.source_ypos == expected_slit.source_ypos
+        assert slit.meta.wcsinfo.s_region == expected_slit.meta.wcsinfo.s_region
+        assert slit.meta.bunit_data == expected_slit.meta.bunit_data
+        np.testing.assert_array_equal(slit.data, expected_slit.data)
+        np.testing.assert_array_equal(slit.wavelength, expected_slit.wavelength)
+
+    model.close()
+    model_wcs.close()
+    expected.close()
+    result.close()
+
+
+def test_extract_2d_nirspec_wcs_tolerance(nirspec_msa_rate, nirspec_msa_metfl):
+    model = ImageModel(nirspec_msa_rate)
+    model_wcs = AssignWcsStep.call(model)
+    expected = Extract2dStep.call(model_wcs)
+    result = Extract2dStep.call(model_wcs, wcs_tolerance=1e-5)
+
+    # approximated wavelengths are within the tolerance, with the same invalid pixels
+    for slit, expected_slit in zip(result.slits, expected.slits, strict=True):
+        np.testing.assert_array_equal(np.isnan(slit.wavelength), np.isnan(expected_slit.wavelength))
+        np.testing.assert_allclose(slit.wavelength, expected_slit.wavelength, rtol=0, atol=2e-5)
+        np.testing.assert_array_equal(slit.data, expected_slit.data)
+
     model.close()
+    model_wcs.close()
+    expected.close()
     result.close()
 
 
@@ -1,8 +1,12 @@
 """Module for applying flat field corrections."""
 
+import hashlib
 import logging
 import math
+import threading
 import warnings
+from collections import OrderedDict
+from functools import partial
 
 import numpy as np
 from stdatamodels.jwst import datamodels
@@ -36,6 +40,7 @@ BADFLAT = (
 )
 
 __all__ = [
+    "FlatComponentCache",
     "do_correction",
     "do_flat_field",
     "apply_flat_field",
@@ -59,6 +64,157 @@ __all__ = [
 ]
 
 
+class FlatComponentCache:
+    """
+    Cache of the computed NIRSpec flat field components.
+
+    The fore optics, spectrograph and detector flats for a slit depend
+    only on the reference file, the slit and the wavelength at each pixel
+    of the slit, so they can be reused across exposures of the same visit
+    that share the same reference files and slit geometry.  Components are
+    keyed by the reference file name, the slit parameters and a hash of the
+    wavelength array, and the least recently used components are evicted
+    once ``max_bytes`` is exceeded.
+    """
+
+    def __init__(self, max_bytes=2**30):
+        """
+        Initialize the cache.
+
+        Parameters
+        ----------
+        max_bytes : int, optional
+            Maximum total size of the flat field components kept in memory.
+        """
+        self.max_bytes = max_bytes
+        self._components = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(component, flat_model, wl, *params):
+        """
+        Compute the cache key for a flat field component.
+
+        Parameters
+        ----------
+        component : str
+            The name of the flat field component.
+        flat_model : NirspecFlatModel or NirspecQuadFlatModel
+            The reference file model for the component.
+        wl : ndarray
+            Wavelength at each pixel of the 2-D slit array.
+        *params : tuple
+            Any other values the component depends on, e.g. the slit name
+            and its location on the detector.
+
+        Returns
+        -------
+        str or None
+            A hexadecimal digest identifying the component, or None if
+            the reference model has no file name, in which case the
+            component should not be cached.
+        """
+        filename = flat_model.meta.filename
+        if not filename:
+            return None
+        digest = hashlib.sha256()
+        digest.update(repr((component, filename, wl.shape, wl.dtype.str, *params)).encode())
+        digest.update(np.ascontiguousarray(wl).tobytes())
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        Retrieve a flat field component.
+
+        Parameters
+        ----------
+        key : str
+            The key returned by `make_key`.
+
+        Returns
+        -------
+        tuple or None
+            A copy of the flat, DQ and error arrays for the component, or
+            None if it is not in the cache.
+        """
+        with self._lock:
+            component = self._components.get(key)
+            if component is None:
+                return None
+            self._components.move_to_end(key)
+        return _copy_component(component)
+
+    def put(self, key, component):
+        """
+        Store a flat field component.
+
+        Parameters
+        ----------
+        key : str
+            The key returned by `make_key`.
+        component : tuple
+            The flat, DQ and error arrays for the component.  A copy is
+            stored, so the input arrays may be modified afterwards.
+        """
+        nbytes = _component_nbytes(component)
+        if nbytes > self.max_bytes:
+            return
+        component = _copy_component(component)
+        with self._lock:
+            if key in self._components:
+                self._nbytes -= _component_nbytes(self._components.pop(key))
+            self._components[key] = component
+            self._nbytes += nbytes
+            while self._nbytes > self.max_bytes:
+                _, evicted = self._components.popitem(last=False)
+                self._nbytes -= _component_nbytes(evicted)
+
+
+def _copy_component(component):
+    """
+    Copy the arrays of a flat field component.
+
+    Parameters
+    ----------
+    component : tuple
+        The flat, DQ and error arrays for the component; any of these
+        may be None or a scalar.
+
+    Returns
+    -------
+    tuple
+        The component, with any arrays copied.
+    """
+    return tuple(array.copy() if isinstance(array, np.ndarray) else array for array in component)
+
+
+def _component_nbytes(component):
+    """
+    Compute the total size of the arrays of a flat field component.
+
+    Parameters
+    ----------
+    component : tuple
+        The flat, DQ and error arrays for the component.
+
+    Returns
+    -------
+    int
+        The total number of bytes in the arrays.
+    """
+    return sum(array.nbytes for array in component if isinstance(array, np.ndarray))
+
+
 def do_correction(
     input_model,
     flat=None,
@@ -67,6 +223,8 @@ def do_correction(
     dflat=None,
     user_supplied_flat=None,
     inverse=False,
+    maximum_cores="1",
+    flat_cache=None,
 ):
     """
     Flat-field a JWST data model using a flat-field model.
@@ -89,6 +247,12 @@ def do_correction(
         ignored in favor of the specified flat.
     inverse : bool, optional
         Invert the math operations used to apply the flat field.
+    maximum_cores : str, optional
+        Number of threads to use for processing NIRSpec fixed slit and MSA
+        slits in parallel. Can be an integer, 'none', 'quarter', 'half', or 'all'.
+    flat_cache : FlatComponentCache or None, optional
+        Cache of the computed flat field components.  If None, the
+        components are always computed.
 
     Returns
     -------
@@ -114,6 +278,8 @@ def do_correction(
             dflat,
             user_supplied_flat=user_supplied_flat,
             inverse=inverse,
+            maximum_cores=maximum_cores,
+            flat_cache=flat_cache,
         )
     else:
         if user_supplied_flat is not None:
@@ -269,7 +435,14 @@ def apply_flat_field(science, flat, inverse=False):
 
 
 def do_nirspec_flat_field(
-    output_model, f_flat_model, s_flat_model, d_flat_model, user_supplied_flat=None, inverse=False
+    output_model,
+    f_flat_model,
+    s_flat_model,
+    d_flat_model,
+    user_supplied_flat=None,
+    inverse=False,
+    maximum_cores="1",
+    flat_cache=None,
 ):
     """
     Apply flat-fielding for NIRSpec spectroscopic data, updating in-place.
@@ -295,6 +468,12 @@ def do_nirspec_flat_field(
         flat information and use this data.
     inverse : bool, optional
         Invert the math operations used to apply the flat field.
+    maximum_cores : str, optional
+        Number of threads to use for processing fixed slit and MSA slits
+        in parallel. Can be an integer, 'none', 'quarter', 'half', or 'all'.
+    flat_cache : FlatComponentCache or None, optional
+        Cache of the computed flat field components.  If None, the
+        components are always computed.
 
     Returns
     -------
@@ -327,6 +506,7 @@ def do_nirspec_flat_field(
             dispaxis,
             user_supplied_flat=user_supplied_flat,
             inverse=inverse,
+            flat_cache=flat_cache,
         )
 
     # We expect NIRSpec IFU data to be an IFUImageModel, but it's conceivable
@@ -348,6 +528,7 @@ def do_nirspec_flat_field(
                 dispaxis,
                 user_supplied_flat=user_supplied_flat,
                 inverse=inverse,
+                flat_cache=flat_cache,
             )
         else:
             raise TypeError(f"No flat field algorithm exists for handling data {output_model}")
@@ -362,6 +543,8 @@ def do_nirspec_flat_field(
             dispaxis,
             user_supplied_flat=user_supplied_flat,
             inverse=inverse,
+            maximum_cores=maximum_cores,
+            flat_cache=flat_cache,
         )
 
 
@@ -373,6 +556,8 @@ def nirspec_fs_msa(
     dispaxis,
     user_supplied_flat=None,
     inverse=False,
+    maximum_cores="1",
+    flat_cache=None,
 ):
     """
     Apply flat-fielding for NIRSpec fixed slit and MSA data, in-place.
@@ -394,6 +579,12 @@ def nirspec_fs_msa(
         flat information and use this data.
     inverse : bool, optional
         Invert the math operations used to apply the flat field.
+    maximum_cores : str, optional
+        Number of threads to use for processing slits in parallel.
+        Can be an integer, 'none', 'quarter', 'half', or 'all'.
+    flat_cache : FlatComponentCache or None, optional
+        Cache of the computed flat field components.  If None, the
+        components are always computed.
 
     Returns
     -------
@@ -402,113 +593,33 @@ def nirspec_fs_msa(
     """
     exposure_type = output_model.meta.exposure.type
 
-    # Create a list to hold the list of slits.  This will eventually be used
+    if user_supplied_flat is not None:
+        user_flats = user_supplied_flat.slits
+    else:
+        user_flats = [None] * len(output_model.slits)
+
+    # Collect the flats in a list.  This will eventually be used
     # to extend the MultiSlitModel.slits attribute.  We do it this way to
     # postpone validation until the end, which is faster.
-    flat_slits = []
-
+    slit_flats = pipe_utils.map_slits(
+        partial(
+            _flat_field_slit,
+            f_flat_model=f_flat_model,
+            s_flat_model=s_flat_model,
+            d_flat_model=d_flat_model,
+            dispaxis=dispaxis,
+            exposure_type=exposure_type,
+            subarray=output_model.meta.subarray,
+            inverse=inverse,
+            flat_cache=flat_cache,
+        ),
+        output_model.slits,
+        user_flats,
+        maximum_cores=maximum_cores,
+    )
     # A flag to make sure at least one slit was flat fielded, so we can set
     # "COMPLETE", otherwise we set "SKIP"
-    any_updated = False
-
-    for slit_idx, slit in enumerate(output_model.slits):
-        log.info("Working on slit %s", slit.name)
-        if exposure_type == "NRS_MSASPEC":
-            slit_nt = slit  # includes quadrant info
-        else:
-            slit_nt = None
-
-        if user_supplied_flat is not None:
-            slit_flat = user_supplied_flat.slits[slit_idx]
-        else:
-            if exposure_type == "NRS_FIXEDSLIT" and slit.source_type.upper() == "POINT":
-                # For fixed-slit exposures, if this contains a point source,
-                # compute the flat-field corrections for both uniform
-                # (without wavecorr) and point
-                # source (with wavecorr) modes, applying only the point
-                # source version to the data.
-
-                # First compute a flat appropriate for a uniform source,
-                # which means NOT using corrected wavelengths
-                slit_flat = flat_for_nirspec_slit(
-                    slit,
-                    f_flat_model,
-                    s_flat_model,
-                    d_flat_model,
-                    dispaxis,
-                    exposure_type,
-                    slit_nt,
-                    output_model.meta.subarray,
-                    use_wavecorr=False,
-                )
-
-                # Store the result for uniform source
-                slit.flatfield_uniform = slit_flat.data
-
-                # Now compute a flat appropriate for a point source,
-                # which means using corrected wavelengths
-                slit_flat = flat_for_nirspec_slit(
-                    slit,
-                    f_flat_model,
-                    s_flat_model,
-                    d_flat_model,
-                    dispaxis,
-                    exposure_type,
-                    slit_nt,
-                    output_model.meta.subarray,
-                    use_wavecorr=True,
-                )
-
-                # Store the result for point source; this will be
-                # the version actually applied to the data below.
-                slit.flatfield_point = slit_flat.data
-
-            else:
-                # Build the flat for this slit the normal way, without any
-                # specification for whether we want to use corrected wavelengths
-                slit_flat = flat_for_nirspec_slit(
-                    slit,
-                    f_flat_model,
-                    s_flat_model,
-                    d_flat_model,
-                    dispaxis,
-                    exposure_type,
-                    slit_nt,
-                    output_model.meta.subarray,
-                    use_wavecorr=None,
-                )
-
-            # Append the SlitDataModel to the list of slits
-            flat_slits.append(slit_flat)
-
-        # Now let's apply the correction to science data and error arrays.  Rely
-        # on array broadcasting to handle the cubes.
-        # Also update the variances using BASELINE algorithm.
-        flat_data_squared = slit_flat.data * slit_flat.data
-        if not inverse:
-            slit.data /= slit_flat.data
-            slit.var_poisson /= flat_data_squared
-            slit.var_rnoise /= flat_data_squared
-            # NIRSpec flats have very small values: some variance values may overflow
-            with warnings.catch_warnings():
-                warnings.filterwarnings("ignore", "overflow encountered in square", RuntimeWarning)
-                slit.var_flat = (slit.data / slit_flat.data * slit_flat.err) ** 2
-            slit.err = np.sqrt(slit.var_poisson + slit.var_rnoise + slit.var_flat)
-        else:
-            slit.data *= slit_flat.data
-            slit.var_poisson *= flat_data_squared
-            slit.var_rnoise *= flat_data_squared
-            # Var_flat does not exist before flatfield step - set it to zero.
-            slit.var_flat = np.zeros_like(slit.data)
-            slit.err = np.sqrt(slit.var_poisson + slit.var_rnoise)
-
-        # Combine the science and flat DQ arrays
-        slit.dq |= slit_flat.dq
-
-        # Make sure all NaNs and flags match up in the output model
-        pipe_utils.match_nans_and_flags(slit)
-
-        any_updated = True
+    any_updated = len(slit_flats) > 0
 
     if any_updated:
         output_model.meta.cal_step.flat_field = "COMPLETE"
@@ -521,11 +632,155 @@ def nirspec_fs_msa(
     else:
         interpolated_flat = datamodels.MultiSlitModel()
         interpolated_flat.update(output_model, only="PRIMARY")
-        interpolated_flat.slits.extend(flat_slits)
+        interpolated_flat.slits.extend(slit_flats)
 
     return interpolated_flat
 
 
+def _flat_field_slit(
+    slit,
+    user_flat,
+    f_flat_model,
+    s_flat_model,
+    d_flat_model,
+    dispaxis,
+    exposure_type,
+    subarray,
+    inverse=False,
+    flat_cache=None,
+):
+    """
+    Flat field a single NIRSpec fixed slit or MSA slit, in-place.
+
+    Parameters
+    ----------
+    slit : SlitModel
+        The slit to flat field, modified in-place.
+    user_flat : SlitModel or None
+        If provided, the flat to apply, instead of computing it
+        from the reference files.
+    f_flat_model : NirspecFlatModel or None
+        Flat field for the fore optics.
+    s_flat_model : NirspecFlatModel or None
+        Flat field for the spectrograph.
+    d_flat_model : NirspecFlatModel or None
+        Flat field for the detector.
+    dispaxis : int
+        1 means horizontal dispersion, 2 means vertical dispersion.
+    exposure_type : str
+        The exposure type.
+    subarray : object
+        The subarray metadata of the exposure.
+    inverse : bool, optional
+        Invert the math operations used to apply the flat field.
+    flat_cache : FlatComponentCache or None, optional
+        Cache of the computed flat field components.  If None, the
+        components are always computed.
+
+    Returns
+    -------
+    slit_flat : SlitModel
+        The flat applied to the slit.
+    """
+    log.info("Working on slit %s", slit.name)
+    if exposure_type == "NRS_MSASPEC":
+        slit_nt = slit  # includes quadrant info
+    else:
+        slit_nt = None
+
+    if user_flat is not None:
+        slit_flat = user_flat
+    elif exposure_type == "NRS_FIXEDSLIT" and slit.source_type.upper() == "POINT":
+        # For fixed-slit exposures, if this contains a point source,
+        # compute the flat-field corrections for both uniform
+        # (without wavecorr) and point
+        # source (with wavecorr) modes, applying only the point
+        # source version to the data.
+
+        # First compute a flat appropriate for a uniform source,
+        # which means NOT using corrected wavelengths
+        slit_flat = flat_for_nirspec_slit(
+            slit,
+            f_flat_model,
+            s_flat_model,
+            d_flat_model,
+            dispaxis,
+            exposure_type,
+            slit_nt,
+            subarray,
+            use_wavecorr=False,
+            flat_cache=flat_cache,
+        )
+
+        # Store the result for uniform source
+        slit.flatfield_uniform = slit_flat.data
+
+        # Now compute a flat appropriate for a point source,
+        # which means using corrected wavelengths
+        slit_flat = flat_for_nirspec_slit(
+            slit,
+            f_flat_model,
+            s_flat_model,
+            d_flat_model,
+            dispaxis,
+            exposure_type,
+            slit_nt,
+            subarray,
+            use_wavecorr=True,
+            flat_cache=flat_cache,
+        )
+
+        # Store the result for point source; this will be
+        # the version actually applied to the data below.
+        slit.flatfield_point = slit_flat.data
+
+    else:
+        # Build the flat for this slit the normal way, without any
+        # specification for whether we want to use corrected wavelengths
+        slit_flat = flat_for_nirspec_slit(
+            slit,
+            f_flat_model,
+            s_flat_model,
+            d_flat_model,
+            dispaxis,
+            exposure_type,
+            slit_nt,
+            subarray,
+            use_wavecorr=None,
+            flat_cache=flat_cache,
+        )
+
+    # Now let's apply the correction to science data and error arrays.  Rely
+    # on array broadcasting to handle the cubes.
+    # Also update the variances using BASELINE algorithm.
+    flat_data_squared = slit_flat.data * slit_flat.data
+    if not inverse:
+        slit.data /= slit_flat.data
+        slit.var_poisson /= flat_data_squared
+        slit.var_rnoise /= flat_data_squared
+        # NIRSpec flats have very small values: some variance values may overflow.
+        # Use the thread-local numpy error state rather than the warnings filters,
+        # since slits may be processed in parallel threads.
+        with np.errstate(over="ignore"):
+            slit.var_flat = (slit.data / slit_flat.data * slit_flat.err) ** 2
+        slit.err = np.sqrt(slit.var_poisson + slit.var_rnoise + slit.var_flat)
+    else:
+        slit.data *= slit_flat.data
+        slit.var_poisson *= flat_data_squared
+        slit.var_rnoise *= flat_data_squared
+        # Var_flat does not exist before flatfield step - set it to zero.
+        slit.var_flat = np.zeros_like(slit.data)
+        slit.err = np.sqrt(slit.var_poisson + slit.var_rnoise)
+
+    # Combine the science and flat DQ arrays
+    slit.dq |= slit_flat.dq
+
+    # Make sure all NaNs and flags match up in the output model
+    pipe_utils.match_nans_and_flags(slit)
+
+    return slit_flat
+
+
 def nirspec_brightobj(
     output_model,
     f_flat_model,
@@ -534,6 +789,7 @@ def nirspec_brightobj(
     dispaxis,
     user_supplied_flat=None,
     inverse=False,
+    flat_cache=None,
 ):
     """
     Apply flat-fielding for NIRSpec BRIGHTOBJ data, in-place.
@@ -555,6 +811,9 @@ def nirspec_brightobj(
         all other inputs are ignored.
     inverse : bool, optional
         Invert the math operations used to apply the flat field.
+    flat_cache : FlatComponentCache or None, optional
+        Cache of the computed flat field components.  If None, the
+        components are always computed.
 
     Returns
     -------
@@ -566,7 +825,12 @@ def nirspec_brightobj(
         interpolated_flat = user_supplied_flat
     else:
         interpolated_flat = flat_for_nirspec_brightobj(
-            output_model, f_flat_model, s_flat_model, d_flat_model, dispaxis
+            output_model,
+            f_flat_model,
+            s_flat_model,
+            d_flat_model,
+            dispaxis,
+            flat_cache=flat_cache,
         )
 
     # Update the variances and uncertainty array using BASELINE algorithm
@@ -609,6 +873,7 @@ def nirspec_ifu(
     dispaxis,
     user_supplied_flat=None,
     inverse=False,
+    flat_cache=None,
 ):
     """
     Apply flat-fielding for NIRSpec IFU data, in-place.
@@ -630,6 +895,9 @@ def nirspec_ifu(
         all other inputs are ignored
     inverse : bool, optional
         Invert the math operations used to apply the flat field.
+    flat_cache : FlatComponentCache or None, optional
+        Cache of the computed flat field components.  If None, the
+        components are always computed.
 
     Returns
     -------
@@ -644,7 +912,12 @@ def nirspec_ifu(
         any_updated = True
     else:
         flat, flat_dq, flat_err, any_updated = flat_for_nirspec_ifu(
-            output_model, f_flat_model, s_flat_model, d_flat_model, dispaxis
+            output_model,
+            f_flat_model,
+            s_flat_model,
+            d_flat_model,
+            dispaxis,
+            flat_cache=flat_cache,
         )
 
     if any_updated:
@@ -698,6 +971,7 @@ def create_flat_field(
     dispaxis,
     slit_name,
     slit_nt=None,
+    flat_cache=None,
 ):
     """
     Extract and combine flat field components for NIRSpec.
@@ -726,6 +1000,9 @@ def create_flat_field(
         The name of the slit currently being processed.
     slit_nt : namedtuple or None, optional
         For MSA data only, info about the current slit.
+    flat_cache : FlatComponentCache or None, optional
+        Cache of the computed flat field components.  If None, the
+        components are always computed.
 
     Returns
     -------
@@ -738,16 +1015,57 @@ def create_flat_field(
     flat_err : ndarray of float
         The error array corresponding to flat_2d.
     """
-    f_flat, f_flat_dq, f_flat_err = fore_optics_flat(
-        wl, f_flat_model, exposure_type, dispaxis, slit_name, slit_nt
+    if slit_nt is None:
+        shutter = None
+    else:
+        shutter = (slit_nt.quadrant, slit_nt.xcen, slit_nt.ycen)
+    f_flat, f_flat_dq, f_flat_err = _cached_component(
+        flat_cache,
+        "fflat",
+        f_flat_model,
+        wl,
+        (exposure_type, dispaxis, slit_name, shutter),
+        partial(fore_optics_flat, wl, f_flat_model, exposure_type, dispaxis, slit_name, slit_nt),
     )
 
-    s_flat, s_flat_dq, s_flat_err = spectrograph_flat(
-        wl, s_flat_model, xstart, xstop, ystart, ystop, exposure_type, dispaxis, slit_name
+    s_flat, s_flat_dq, s_flat_err = _cached_component(
+        flat_cache,
+        "sflat",
+        s_flat_model,
+        wl,
+        (xstart, xstop, ystart, ystop, exposure_type, dispaxis, slit_name),
+        partial(
+            spectrograph_flat,
+            wl,
+            s_flat_model,
+            xstart,
+            xstop,
+            ystart,
+            ystop,
+            exposure_type,
+            dispaxis,
+            slit_name,
+        ),
     )
 
-    d_flat, d_flat_dq, d_flat_err = detector_flat(
-        wl, d_flat_model, xstart, xstop, ystart, ystop, exposure_type, dispaxis, slit_name
+    d_flat, d_flat_dq, d_flat_err = _cached_component(
+        flat_cache,
+        "dflat",
+        d_flat_model,
+        wl,
+        (xstart, xstop, ystart, ystop, exposure_type, dispaxis, slit_name),
+        partial(
+            detector_flat,
+            wl,
+            d_flat_model,
+            xstart,
+            xstop,
+            ystart,
+            ystop,
+            exposure_type,
+            dispaxis,
+            slit_name,
+        ),
     )
 
     flat_2d = f_flat * s_flat * d_flat
@@ -773,6 +1091,47 @@ def create_flat_field(
     return flat_2d, flat_dq, flat_err
 
 
+def _cached_component(flat_cache, component, flat_model, wl, params, compute):
+    """
+    Get a flat field component from the cache, or compute and cache it.
+
+    Parameters
+    ----------
+    flat_cache : FlatComponentCache or None
+        The cache of flat field components.  If None, the component is
+        always computed.
+    component : str
+        The name of the flat field component.
+    flat_model : NirspecFlatModel, NirspecQuadFlatModel, or None
+        The reference file model for the component.
+    wl : ndarray
+        Wavelength at each pixel of the 2-D slit array.
+    params : tuple
+        Any other values the component depends on.
+    compute : callable
+        Function with no arguments returning the flat, DQ and error arrays
+        for the component.
+
+    Returns
+    -------
+    tuple
+        The flat, DQ and error arrays for the component.
+    """
+    if flat_cache is None or flat_model is None:
+        return compute()
+    key = flat_cache.make_key(component, flat_model, wl, *params)
+    if key is None:
+        return compute()
+
+    cached = flat_cache.get(key)
+    if cached is not None:
+        log.debug("Using cached %s component.", component)
+        return cached
+    result = compute()
+    flat_cache.put(key, result)
+    return result
+
+
 def fore_optics_flat(wl, f_flat_model, exposure_type, dispaxis, slit_name, slit_nt):
     """
     Extract the flat for the fore optics part.
@@ -1395,9 +1754,6 @@ def combine_fast_slow(wl, flat_2d, flat_dq, flat_err, tab_wl, tab_flat, tab_flat
         dwl[0:-1, :] = wl_c[1:, :] - wl_c[0:-1, :]
         dwl[-1, :] = dwl[-2, :]
 
-    # Values averaged within tab_flat.
-    values = np.zeros_like(wl_c)
-
     # Abscissas and weights for 3-point Gaussian integration, but taking
     # the width of the interval to be 1, so the result will be the average
     # over the interval.
@@ -1405,11 +1761,14 @@ def combine_fast_slow(wl, flat_2d, flat_dq, flat_err, tab_wl, tab_flat, tab_flat
     dx = np.array([-d, 0.0, d])
     wgt = np.array([5.0, 8.0, 5.0]) / 18.0
 
-    # Interpolate tabular data over the range of wavelengths,
-    # weight, and sum at each of 3 specified points
-    for offset, weight in zip(dx, wgt, strict=True):
-        wavelengths = wl_c + dwl * offset
-        values += weight * np.interp(wavelengths, tab_wl, tab_flat, left=np.nan, right=np.nan)
+    # Interpolate tabular data at each of the 3 specified points for all
+    # pixels at once, then weight and sum to get the values averaged
+    # within tab_flat.
+    wavelengths = wl_c + dwl * dx.reshape((3,) + (1,) * wl_c.ndim)
+    values = np.interp(wavelengths, tab_wl, tab_flat, left=np.nan, right=np.nan)
+    values = (wgt.reshape((3,) + (1,) * wl_c.ndim) * values).sum(axis=0)
+    values = values.astype(wl_c.dtype, copy=False)
+    del wavelengths
 
     # Interpolate error values from reference file using a simple
     # linear interpolation as these don't have the required precision
@@ -1457,45 +1816,38 @@ def clean_wl(wl, dispaxis):
         the cross-dispersion direction.
     """
     wl_c = wl.copy()  # so we can replace zeros
+    if dispaxis not in (HORIZONTAL, VERTICAL):
+        return wl_c
     wl_c[wl_c <= 0.0] = np.nan
-    shape = wl_c.shape
 
+    # Arrange the wavelengths so that each row holds the pixels at one
+    # position along the dispersion direction, i.e. a column of wl_c
+    # for horizontal dispersion or a row of wl_c for vertical dispersion.
     if dispaxis == HORIZONTAL:
-        i0 = None
-        i1 = None
-        for i in range(shape[1]):
-            temp = wl_c[:, i]
-            if np.any(np.isfinite(temp)):
-                if i0 is None:
-                    i0 = i  # first i with some non-zero wl
-                i1 = i  # last i (so far) with some non-zero wl
-                replacement_value = np.nanmean(temp)
-                temp[np.isnan(temp)] = replacement_value
-        if i0 is not None and i0 > 0:
-            temp = wl_c[:, i0].reshape(shape[0], 1)
-            wl_c[:, 0:i0] = temp.copy()
-        if i1 is not None and i1 < shape[1] - 1:
-            temp = wl_c[:, i1].reshape(shape[0], 1)
-            wl_c[:, i1:] = temp.copy()
-    elif dispaxis == VERTICAL:
-        j0 = None
-        j1 = None
-        for j in range(shape[0]):
-            temp = wl_c[j, :]
-            if np.any(np.isfinite(temp)):
-                if j0 is None:
-                    j0 = j  # first j with some non-zero wl
-                j1 = j  # last j (so far) with some non-zero wl
-                replacement_value = np.nanmean(temp)
-                temp[np.isnan(temp)] = replacement_value
-        if j0 is not None and j0 > 0:
-            temp = wl_c[j0, :].reshape(1, shape[1])
-            wl_c[0:j0, :] = temp.copy()
-        if j1 is not None and j1 < shape[0] - 1:
-            temp = wl_c[j1, :].reshape(1, shape[1])
-            wl_c[j1:, :] = temp.copy()
+        lines = np.ascontiguousarray(wl_c.T)
     else:
-        wl_c = wl.copy()
+        lines = wl_c
+
+    # Replace NaNs with the mean wavelength in the cross-dispersion
+    # direction, for every line with some valid wavelength.
+    valid = np.logical_not(np.isnan(lines))
+    has_wl = np.any(np.isfinite(lines), axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_wl = np.where(valid, lines, 0.0).sum(axis=1) / valid.sum(axis=1)
+    replace = np.logical_and(np.logical_not(valid), has_wl[:, np.newaxis])
+    lines[replace] = np.broadcast_to(mean_wl[:, np.newaxis], lines.shape)[replace]
+
+    # Extend the first and last lines with some valid wavelength to the
+    # edges of the array.
+    with_wl = np.flatnonzero(has_wl)
+    if with_wl.size > 0:
+        i0 = with_wl[0]  # first line with some non-zero wl
+        i1 = with_wl[-1]  # last line with some non-zero wl
+        lines[0:i0] = lines[i0]
+        lines[i1:] = lines[i1]
+
+    if dispaxis == HORIZONTAL:
+        wl_c[...] = lines.T
 
     return wl_c
 
@@ -1552,33 +1904,19 @@ def interpolate_flat(image_flat, image_dq, image_err, image_wl, wl):
     ixpixel = grid[1]
     iypixel = grid[0]
 
-    # The initial value of -1 is a flag to indicate that elements have not
-    # been assigned valid values yet.
-    k = np.zeros(wl.shape, dtype=np.intp) - 1
-
-    # Truncate the index for wavelengths that are outside the range of
-    # image_wl.  The indices need to be assigned harmless values to avoid
-    # indexing out of bounds.
+    # Find the interval for linear interpolation, i.e. the last plane with
+    # a wavelength less than or equal to the pixel wavelength, for all
+    # pixels at once.  Truncate the index for wavelengths that are outside
+    # the range of image_wl, to avoid indexing out of bounds.
     #   Why do we set the upper limit of k to nz - 2?
     #   Because we interpolate using elements k and k + 1.
+    k = np.searchsorted(image_wl, wl, side="right") - 1
+    k = np.clip(k, 0, nz - 2)
 
-    # for wavelengths < lower limit (image_wl[0]) set k to 0
-    k[:, :] = np.where(wl <= image_wl[0], 0, k)
+    # NaN wavelengths do not fall within any interval; -1 flags elements
+    # that have not been assigned valid values.
+    k[np.isnan(wl)] = -1
 
-    # for wavelengths > upper limit (image_wl[nz-1]) set k to nz-2
-    k[:, :] = np.where(wl >= image_wl[nz - 1], nz - 2, k)
-
-    # Look for the correct interval for linear interpolation.
-    for k_test in range(nz - 1):
-        test1 = np.logical_and(wl >= image_wl[k_test], wl < image_wl[k_test + 1])
-
-        # If an element of k is not -1, it has already been assigned, and
-        # I don't want to clobber it.
-        test2 = np.logical_and(k == -1, test1)
-        k[:, :] = np.where(test2, k_test, k)
-
-        if np.all(k >= 0):
-            break
     # Use linear interpolation within the 3-D flat field to get a 2-D
     # flat field.
     denom = image_wl[k + 1] - image_wl[k]
@@ -1602,10 +1940,9 @@ def interpolate_flat(image_flat, image_dq, image_err, image_wl, wl):
     if len(image_dq.shape) == 2:
         flat_dq = image_dq.copy()
     else:
+        flat_dq = image_dq[k, iypixel, ixpixel]
         flat_dq = np.where(
-            p == 0.0,
-            image_dq[k, iypixel, ixpixel],
-            np.bitwise_or(image_dq[k, iypixel, ixpixel], image_dq[k + 1, iypixel, ixpixel]),
+            p == 0.0, flat_dq, np.bitwise_or(flat_dq, image_dq[k + 1, iypixel, ixpixel])
         )
 
         flat_bad = np.bitwise_and(flat_dq, dqflags.pixel["DO_NOT_USE"])
@@ -1629,7 +1966,9 @@ def interpolate_flat(image_flat, image_dq, image_err, image_wl, wl):
     return flat_2d.astype(image_flat.dtype), flat_dq, flat_err
 
 
-def flat_for_nirspec_ifu(output_model, f_flat_model, s_flat_model, d_flat_model, dispaxis):
+def flat_for_nirspec_ifu(
+    output_model, f_flat_model, s_flat_model, d_flat_model, dispaxis, flat_cache=None
+):
     """
     Create the interpolated flat for NIRSpec IFU.
 
@@ -1645,6 +1984,9 @@ def flat_for_nirspec_ifu(output_model, f_flat_model, s_flat_model, d_flat_model,
         Flat field for the detector.
     dispaxis : int
         1 means horizontal dispersion, 2 means vertical dispersion.
+    flat_cache : FlatComponentCache or None, optional
+        Cache of the computed flat field components.  If None, the
+        components are always computed.
 
     Returns
     -------
@@ -1743,6 +2085,7 @@ def flat_for_nirspec_ifu(output_model, f_flat_model, s_flat_model, d_flat_model,
             dispaxis,
             None,
             None,
+            flat_cache=flat_cache,
         )
         mask = flat_2d <= 0.0
         nbad = mask.sum(dtype=np.intp)
@@ -1775,7 +2118,9 @@ def flat_for_nirspec_ifu(output_model, f_flat_model, s_flat_model, d_flat_model,
     return flat, flat_dq, flat_err, any_updated
 
 
-def flat_for_nirspec_brightobj(output_model, f_flat_model, s_flat_model, d_flat_model, dispaxis):
+def flat_for_nirspec_brightobj(
+    output_model, f_flat_model, s_flat_model, d_flat_model, dispaxis, flat_cache=None
+):
     """
     Create the interpolated flat for NIRSpec IFU.
 
@@ -1791,6 +2136,9 @@ def flat_for_nirspec_brightobj(output_model, f_flat_model, s_flat_model, d_flat_
         Flat field for the detector.
     dispaxis : int
         1 means horizontal dispersion, 2 means vertical dispersion.
+    flat_cache : FlatComponentCache or None, optional
+        Cache of the computed flat field components.  If None, the
+        components are always computed.
 
     Returns
     -------
@@ -1878,6 +2226,7 @@ def flat_for_nirspec_brightobj(output_model, f_flat_model, s_flat_model, d_flat_
         dispaxis,
         slit_name,
         None,
+        flat_cache=flat_cache,
     )
     mask = flat_2d <= 0.0
     nbad = mask.sum(dtype=np.intp)
@@ -1907,6 +2256,7 @@ def flat_for_nirspec_slit(
     slit_nt,
     subarray,
     use_wavecorr,
+    flat_cache=None,
 ):
     """
     Create the interpolated flat for NIRSpec slit data.
@@ -1933,6 +2283,9 @@ def flat_for_nirspec_slit(
     use_wavecorr : bool or None
         Flag indicating whether or not to use the corrected wavelengths
         provided (upstream) by the wavecorr step.
+    flat_cache : FlatComponentCache or None, optional
+        Cache of the computed flat field components.  If None, the
+        components are always computed.
 
     Returns
     -------
@@ -2002,6 +2355,7 @@ def flat_for_nirspec_slit(
         dispaxis,
         slit.name,
         slit_nt,
+        flat_cache=flat_cache,
     )
 
     # Mask bad flatfield values
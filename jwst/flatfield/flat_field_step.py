@@ -53,6 +53,8 @@ class FlatFieldStep(Step):
         save_interpolated_flat = boolean(default=False) # Save interpolated NRS flat
         user_supplied_flat = string(default=None)  # User-supplied flat
         inverse = boolean(default=False)  # Invert the operation
+        maximum_cores = string(default='1')  # threads for NIRSpec slits. Can be an integer, 'half', 'quarter', or 'all'
+        flat_cache_size = float(default=0, min=0)  # Memory in MB for reusing NIRSpec flat components across exposures; 0 disables
     """  # noqa: E501
 
     reference_file_types = ["flat", "fflat", "sflat", "dflat"]
@@ -138,9 +140,23 @@ class FlatFieldStep(Step):
         else:
             reference_file_models = self._get_references(input_model, exposure_type)
 
+        # Keep the NIRSpec flat field components computed for this exposure,
+        # so that later exposures run through this step instance can reuse them.
+        flat_cache = None
+        if self.flat_cache_size > 0:
+            max_bytes = int(self.flat_cache_size * 2**20)
+            if getattr(self, "_flat_cache", None) is None:
+                self._flat_cache = flat_field.FlatComponentCache(max_bytes=max_bytes)
+            self._flat_cache.max_bytes = max_bytes
+            flat_cache = self._flat_cache
+
         # Do the flat-field correction
         output_model, flat_applied = flat_field.do_correction(
-            input_model, **reference_file_models, inverse=self.inverse
+            input_model,
+            **reference_file_models,
+            inverse=self.inverse,
+            maximum_cores=self.maximum_cores,
+            flat_cache=flat_cache,
         )
 
         # Close the input and reference files
@@ -7,7 +7,7 @@ from stdatamodels.jwst import datamodels
 
 from jwst.assign_wcs import AssignWcsStep
 from jwst.assign_wcs.tests.test_nirspec import create_nirspec_ifu_file
-from jwst.flatfield import FlatFieldStep
+from jwst.flatfield import FlatFieldStep, flat_field
 from jwst.flatfield.flat_field_step import NRS_IMAGING_MODES
 
 
@@ -309,11 +309,7 @@ def test_nirspec_fs_flat(srctype):
         flat.close()
 
 
-def test_nirspec_msa_flat():
-    """Test that the interface works for NIRSpec MSA data."""
-    shape = (20, 20)
-    w_shape = (10, 20, 20)
-
+def create_nirspec_msa_data(shape):
     data = datamodels.MultiSlitModel()
     data.meta.instrument.name = "NIRSPEC"
     data.meta.exposure.type = "NRS_MSASPEC"
@@ -341,6 +337,16 @@ def test_nirspec_msa_flat():
     data.slits[0].xsize = shape[1]
     data.slits[0].ysize = shape[0]
 
+    return data
+
+
+def test_nirspec_msa_flat():
+    """Test that the interface works for NIRSpec MSA data."""
+    shape = (20, 20)
+    w_shape = (10, 20, 20)
+
+    data = create_nirspec_msa_data(shape)
+
     flats = create_nirspec_flats(w_shape, msa=True)
     result = FlatFieldStep.call(
         data,
@@ -371,6 +377,50 @@ def test_nirspec_msa_flat():
         flat.close()
 
 
+def test_nirspec_msa_flat_cache(monkeypatch):
+    """Test that cached flat components are reused for a second exposure."""
+    shape = (20, 20)
+    w_shape = (10, 20, 20)
+
+    flats = create_nirspec_flats(w_shape, msa=True)
+    for flat, name in zip(flats, ["fflat", "sflat", "dflat"], strict=True):
+        flat.meta.filename = f"test_{name}.fits"
+
+    flat_cache = flat_field.FlatComponentCache()
+    data = create_nirspec_msa_data(shape)
+    result, flat_applied = flat_field.do_correction(
+        data, fflat=flats[0], sflat=flats[1], dflat=flats[2], flat_cache=flat_cache
+    )
+    assert len(flat_cache._components) == 3
+
+    # The components are not computed again for an exposure of the same slit
+    def fail(*args, **kwargs):
+        raise AssertionError("Flat component was not taken from the cache")
+
+    for name in ["fore_optics_flat", "spectrograph_flat", "detector_flat"]:
+        monkeypatch.setattr(flat_field, name, fail)
+
+    data = create_nirspec_msa_data(shape)
+    cached_result, cached_flat_applied = flat_field.do_correction(
+        data, fflat=flats[0], sflat=flats[1], dflat=flats[2], flat_cache=flat_cache
+    )
+    assert_allclose(cached_flat_applied.slits[0].data, flat_applied.slits[0].data)
+    assert_allclose(cached_flat_applied.slits[0].err, flat_applied.slits[0].err)
+    np.testing.assert_array_equal(cached_flat_applied.slits[0].dq, flat_applied.slits[0].dq)
+    assert_allclose(cached_result.slits[0].data, result.slits[0].data)
+
+    # Cached arrays are not modified by processing
+    cached_flat_applied.slits[0].data[:] = 0.0
+    data = create_nirspec_msa_data(shape)
+    cached_result, cached_flat_applied = flat_field.do_correction(
+        data, fflat=flats[0], sflat=flats[1], dflat=flats[2], flat_cache=flat_cache
+    )
+    assert_allclose(cached_flat_applied.slits[0].data, flat_applied.slits[0].data)
+
+    for flat in flats:
+        flat.close()
+
+
 def test_nirspec_ifu_flat():
     """
     Test that the interface works for NIRSpec IFU data.
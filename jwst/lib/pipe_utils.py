@@ -1,8 +1,11 @@
 """Pipeline utilities objects."""
 
 import logging
+import multiprocessing as mp
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
+from stcal.multiprocessing import compute_num_cores
 from stdatamodels.jwst.datamodels import JwstDataModel, dqflags
 from stdatamodels.properties import ObjectNode
 
@@ -10,7 +13,7 @@ from jwst.associations.lib.dms_base import TSO_EXP_TYPES
 
 log = logging.getLogger(__name__)
 
-__all__ = ["is_tso", "is_irs2", "match_nans_and_flags"]
+__all__ = ["is_tso", "is_irs2", "match_nans_and_flags", "map_slits", "map_integrations"]
 
 
 def is_tso(model):
@@ -153,3 +156,110 @@ def match_nans_and_flags(input_model):
     # Update the DQ extension
     if input_model.dq.shape == data_shape:
         input_model.dq[is_invalid] |= dqflags.pixel["DO_NOT_USE"]
+
+
+def map_slits(func, slits, *iterables, maximum_cores="1"):
+    """
+    Apply a function to each slit, optionally in parallel threads.
+
+    Slits are processed independently, so ``func`` may modify the slit
+    it is given in place, but must not modify shared state.
+
+    Parameters
+    ----------
+    func : callable
+        Function called with each slit as first argument, followed by
+        the corresponding items of ``iterables``, as for the built-in `map`.
+    slits : iterable
+        The slits to process, e.g. the ``slits`` attribute of a
+        `~jwst.datamodels.MultiSlitModel`.
+    *iterables : iterable
+        Additional arguments for ``func``, one item per slit.
+    maximum_cores : str, optional
+        Number of threads to use. Can be an integer, 'none', 'quarter',
+        'half', or 'all'.
+
+    Returns
+    -------
+    list
+        The values returned by ``func`` for each slit, in input order.
+    """
+    args = list(zip(slits, *iterables, strict=False))
+    nthreads = compute_num_cores(str(maximum_cores), len(args), mp.cpu_count())
+    if nthreads > 1:
+        log.info(f"Processing {len(args)} slits using {nthreads} threads")
+        with ThreadPoolExecutor(nthreads) as executor:
+            return list(executor.map(func, *zip(*args, strict=True)))
+    return [func(*arg) for arg in args]
+
+
+def map_integrations(func, *arrays, maximum_cores="1", **kwargs):
+    """
+    Apply a function to chunks of integrations, optionally in parallel processes.
+
+    The arrays are split into contiguous chunks along their first (integration)
+    axis, and ``func`` is called on each chunk with the corresponding chunk of
+    every array, followed by ``kwargs``.  ``func`` must process each integration
+    independently and return an array, or a tuple of arrays, with the chunk
+    integrations along the first axis.  The chunk results are concatenated, so
+    the result does not depend on the number of processes.
+
+    Parameters
+    ----------
+    func : callable
+        Module-level function, so that it can be sent to the worker processes.
+    *arrays : ndarray or None
+        Arrays with integrations along their first axis. None is passed as is.
+    maximum_cores : str, optional
+        Number of processes to use. Can be an integer, 'none', 'quarter',
+        'half', or 'all'.
+    **kwargs
+        Additional keyword arguments for ``func``, shared by all the chunks.
+
+    Returns
+    -------
+    ndarray or tuple
+        The value returned by ``func`` for all the integrations.
+    """
+    nints = next(array.shape[0] for array in arrays if array is not None)
+    nproc = compute_num_cores(str(maximum_cores), nints, mp.cpu_count())
+    if nproc <= 1:
+        return func(*arrays, **kwargs)
+
+    bounds = np.linspace(0, nints, nproc + 1).astype(int)
+    chunks = [
+        tuple(None if array is None else array[start:end] for array in arrays)
+        for start, end in zip(bounds[:-1], bounds[1:], strict=True)
+    ]
+    log.info(f"Processing {nints} integrations using {nproc} processes")
+    ctx = mp.get_context("spawn")
+    with ctx.Pool(processes=nproc) as pool:
+        results = pool.starmap(_call_with_kwargs, [(func, chunk, kwargs) for chunk in chunks])
+
+    if isinstance(results[0], tuple):
+        return tuple(
+            None if values[0] is None else np.concatenate(values)
+            for values in zip(*results, strict=True)
+        )
+    return np.concatenate(results)
+
+
+def _call_with_kwargs(func, args, kwargs):
+    """
+    Call a function in a worker process.
+
+    Parameters
+    ----------
+    func : callable
+        The function to call.
+    args : tuple
+        Positional arguments for ``func``.
+    kwargs : dict
+        Keyword arguments for ``func``.
+
+    Returns
+    -------
+    Any
+        The value returned by ``func``.
+    """
+    return func(*args, **kwargs)
@@ -212,3 +212,52 @@ def test_match_nans_and_flags_shape_mismatch():
 
     model.close()
     model_copy.close()
+
+
+@pytest.mark.parametrize("maximum_cores", ["1", "2", "all"])
+def test_map_slits(maximum_cores):
+    model = datamodels.MultiSlitModel()
+    for i in range(5):
+        model.slits.append(datamodels.SlitModel(np.full((3, 4), float(i))))
+
+    def double(slit):
+        slit.data *= 2
+        return slit.data[0, 0]
+
+    result = pipe_utils.map_slits(double, model.slits, maximum_cores=maximum_cores)
+
+    # results are returned in order and slits are updated in place
+    assert result == [0.0, 2.0, 4.0, 6.0, 8.0]
+    for i, slit in enumerate(model.slits):
+        assert np.all(slit.data == 2.0 * i)
+
+
+def test_map_slits_iterables():
+    result = pipe_utils.map_slits(
+        lambda slit, index: (slit, index), "abc", range(3), maximum_cores="2"
+    )
+    assert result == [("a", 0), ("b", 1), ("c", 2)]
+
+
+def test_map_slits_empty():
+    assert pipe_utils.map_slits(lambda slit: slit, [], maximum_cores="all") == []
+
+
+def scale_integrations(data, zframe, factor):
+    return data * factor, zframe
+
+
+@pytest.mark.parametrize("maximum_cores", ["1", "2", "all"])
+def test_map_integrations(maximum_cores):
+    data = np.arange(5 * 2 * 3 * 4, dtype=float).reshape((5, 2, 3, 4))
+    data_out, zframe_out = pipe_utils.map_integrations(
+        scale_integrations, data, None, maximum_cores=maximum_cores, factor=2.0
+    )
+    np.testing.assert_array_equal(data_out, data * 2.0)
+    assert zframe_out is None
+
+
+def test_map_integrations_single_result():
+    data = np.arange(3 * 4, dtype=float).reshape((3, 4))
+    result = pipe_utils.map_integrations(np.negative, data, maximum_cores="2")
+    np.testing.assert_array_equal(result, -data)
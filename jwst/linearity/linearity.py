@@ -1,17 +1,17 @@
 import logging
 
 import numpy as np
-from stcal.linearity.linearity import linearity_correction
+from stcal.linearity.linearity import linearity_correction, prepare_coefficients
 from stdatamodels.jwst.datamodels import dqflags
 
-from jwst.lib import reffile_utils
+from jwst.lib import pipe_utils, reffile_utils
 
 log = logging.getLogger(__name__)
 
 __all__ = ["do_correction"]
 
 
-def do_correction(output_model, lin_model):
+def do_correction(output_model, lin_model, maximum_cores="1"):
     """
     Apply the linearity correction to the data.
 
@@ -23,6 +23,10 @@ def do_correction(output_model, lin_model):
     lin_model : `~jwst.datamodels.LinearityModel`
         Linearity reference file model.
 
+    maximum_cores : str, optional
+        Number of processes used to correct the integrations. Can be an
+        integer, 'none', 'quarter', 'half', or 'all'.
+
     Returns
     -------
     output_model : `~jwst.datamodels.RampModel`
@@ -50,9 +54,20 @@ def do_correction(output_model, lin_model):
         lin_dq = sub_lin_model.dq.copy()
         sub_lin_model.close()
 
+    # The pixel DQ flags and the coefficients of pixels without a valid
+    # correction do not depend on the integration, so they are set once
+    lin_coeffs, new_pdq = prepare_coefficients(lin_coeffs, lin_dq, pdq, dqflags.pixel)
+
     # Call linearity correction function in stcal
-    new_data, new_pdq, new_zframe = linearity_correction(
-        output_model.data, gdq, pdq, lin_coeffs, lin_dq, dqflags.pixel, zframe=zframe
+    new_data, new_zframe = pipe_utils.map_integrations(
+        _correct_integrations,
+        output_model.data,
+        gdq,
+        zframe,
+        maximum_cores=maximum_cores,
+        lin_coeffs=lin_coeffs,
+        lin_dq=lin_dq,
+        pdq=new_pdq,
     )
 
     output_model.data = new_data
@@ -61,3 +76,35 @@ def do_correction(output_model, lin_model):
         output_model.zeroframe = new_zframe
 
     return output_model
+
+
+def _correct_integrations(data, gdq, zframe, lin_coeffs, lin_dq, pdq):
+    """
+    Apply the linearity correction to a range of integrations.
+
+    Parameters
+    ----------
+    data : ndarray
+        The 4D science data for the integrations.
+    gdq : ndarray
+        The 4D group DQ array for the integrations.
+    zframe : ndarray or None
+        The 3D zero frame for the integrations.
+    lin_coeffs : ndarray
+        The 3D linearity coefficients.
+    lin_dq : ndarray
+        The 2D DQ array from the linearity reference file.
+    pdq : ndarray
+        The 2D pixel DQ array.
+
+    Returns
+    -------
+    data : ndarray
+        The corrected science data.
+    zframe : ndarray or None
+        The corrected zero frame.
+    """
+    data, _, zframe = linearity_correction(
+        data, gdq, pdq, lin_coeffs, lin_dq, dqflags.pixel, zframe=zframe
+    )
+    return data, zframe
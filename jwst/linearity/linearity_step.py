@@ -16,6 +16,7 @@ class LinearityStep(Step):
     class_alias = "linearity"
 
     spec = """
+        maximum_cores = string(default='1') # cores for multiprocessing. Can be an integer, 'half', 'quarter', or 'all'
     """  # noqa: E501
 
     reference_file_types = ["linearity"]
@@ -54,7 +55,7 @@ class LinearityStep(Step):
             lin_model = datamodels.LinearityModel(self.lin_name)
 
             # Do the linearity correction
-            result = linearity.do_correction(result, lin_model)
+            result = linearity.do_correction(result, lin_model, maximum_cores=self.maximum_cores)
             result.meta.cal_step.linearity = "COMPLETE"
 
             # Cleanup
@@ -1,15 +1,18 @@
 """Submodule for performing outlier detection on imaging data."""
 
 import logging
+import tempfile
 
 from jwst.datamodels import ModelLibrary
 from jwst.outlier_detection.utils import (
+    compute_blot_pixmap,
     flag_model_crs,
     flag_resampled_model_crs,
     median_with_resampling,
     median_without_resampling,
 )
 from jwst.resample import resample
+from jwst.resample.resample_utils import PixmapCache
 from jwst.stpipe.utilities import record_step_status
 
 log = logging.getLogger(__name__)
@@ -35,6 +38,11 @@ def detect_outliers(
     fillval,
     in_memory,
     make_output_path,
+    tile_size=None,
+    pixmap_cache="none",
+    pixmap_cache_dir=None,
+    pixmap_cache_size=4096,
+    maximum_cores="1",
 ):
     """
     Flag outliers in imaging data.
@@ -78,6 +86,24 @@ def detect_outliers(
     make_output_path : function
         The functools.partial instance to pass to save_blot. Must be
         specified if save_blot is True.
+    tile_size : int, optional
+        If set, compute the median image in square tiles of this size (in pixels)
+        to limit memory use.
+    pixmap_cache : {"none", "memory", "disk"}, optional
+        If not "none", the pixel map computed for each input model while
+        resampling is cached, in memory or on disk, and reused when blotting
+        the median image back onto the same model.
+    pixmap_cache_dir : str, optional
+        Directory for the on-disk pixel map cache. If not set, a temporary
+        directory is used and removed when outlier detection is complete.
+    pixmap_cache_size : float, optional
+        Maximum size, in MB, of the in-memory pixel map cache. Once it is
+        full, the pixel maps of the remaining input models are not cached.
+    maximum_cores : str, optional
+        Number of processes used to resample groups in parallel when computing
+        the median image with ``resample_data`` set and ``tile_size`` unset.
+        Can be an integer, 'none', 'quarter', 'half', or 'all'. Pixel maps
+        computed in worker processes are only cached with the on-disk cache.
 
     Returns
     -------
@@ -93,6 +119,16 @@ def detect_outliers(
         record_step_status(input_models, "outlier_detection", False)
         return input_models
 
+    temp_dir = None
+    cache = None
+    if resample_data and pixmap_cache == "memory":
+        cache = PixmapCache(max_bytes=int(pixmap_cache_size * 1024**2))
+    elif resample_data and pixmap_cache == "disk":
+        if pixmap_cache_dir is None:
+            temp_dir = tempfile.TemporaryDirectory(prefix="pixmap_cache_")
+            pixmap_cache_dir = temp_dir.name
+        cache = PixmapCache(directory=pixmap_cache_dir)
+
     if resample_data:
         resamp = resample.ResampleImage(
             input_models,
@@ -105,6 +141,7 @@ def detect_outliers(
             enable_ctx=False,
             enable_var=False,
             compute_err=None,
+            pixmap_cache=cache,
         )
         median_data, median_wcs = median_with_resampling(
             input_models,
@@ -112,6 +149,8 @@ def detect_outliers(
             maskpt,
             save_intermediate_results=save_intermediate_results,
             make_output_path=make_output_path,
+            tile_size=tile_size,
+            maximum_cores=maximum_cores,
         )
     else:
         median_data, median_wcs = median_without_resampling(
@@ -121,6 +160,7 @@ def detect_outliers(
             good_bits,
             save_intermediate_results=save_intermediate_results,
             make_output_path=make_output_path,
+            tile_size=tile_size,
         )
 
     # Perform outlier detection using statistical comparisons between
@@ -128,6 +168,9 @@ def detect_outliers(
     with input_models:
         for image in input_models:
             if resample_data:
+                pixmap = compute_blot_pixmap(
+                    median_wcs, image.data.shape, image.meta.wcs, pixmap_cache=cache
+                )
                 flag_resampled_model_crs(
                     image,
                     median_data,
@@ -139,9 +182,13 @@ def detect_outliers(
                     backg,
                     save_blot=save_intermediate_results,
                     make_output_path=make_output_path,
+                    pixmap=pixmap,
                 )
             else:
                 flag_model_crs(image, median_data, snr1)
             input_models.shelve(image, modify=True)
 
+    if temp_dir is not None:
+        temp_dir.cleanup()
+
     return input_models
@@ -56,6 +56,11 @@ class OutlierDetectionStep(Step):
         good_bits = string(default="~DO_NOT_USE")  # DQ flags to allow
         search_output_file = boolean(default=False)
         in_memory = boolean(default=True) # in_memory flag ignored if run within the pipeline; set at pipeline level instead
+        tile_size = integer(default=None, min=1) # If set, compute the imaging median in square tiles of this size to limit memory use
+        pixmap_cache = option('none','memory','disk',default='none') # Cache imaging pixel maps between resampling and blotting
+        pixmap_cache_dir = string(default=None) # Directory for the on-disk pixel map cache; a temporary directory if not set
+        pixmap_cache_size = float(default=4096, min=0) # Maximum size (in MB) of the in-memory pixel map cache
+        maximum_cores = string(default='1') # threads for blotting slit-like spectra, processes for resampling image groups. Can be an integer, 'half', 'quarter', or 'all'
     """  # noqa: E501
 
     def process(self, input_data):
@@ -136,6 +141,11 @@ class OutlierDetectionStep(Step):
                 self.fillval,
                 self.in_memory,
                 self.make_output_path,
+                tile_size=self.tile_size,
+                pixmap_cache=self.pixmap_cache,
+                pixmap_cache_dir=self.pixmap_cache_dir,
+                pixmap_cache_size=self.pixmap_cache_size,
+                maximum_cores=self.maximum_cores,
             )
         elif mode == "spec":
             result_models = spec.detect_outliers(
@@ -154,6 +164,7 @@ class OutlierDetectionStep(Step):
                 self.kernel,
                 self.fillval,
                 self.make_output_path,
+                maximum_cores=self.maximum_cores,
             )
         elif mode == "ifu":
             result_models = ifu.detect_outliers(
@@ -34,6 +34,7 @@ def detect_outliers(
     kernel,
     fillval,
     make_output_path,
+    maximum_cores="1",
 ):
     """
     Flag outliers in slit-like spectroscopic data.
@@ -74,6 +75,9 @@ def detect_outliers(
     make_output_path : function
         The functools.partial instance to pass to save_blot. Must be
         specified if save_blot is True.
+    maximum_cores : str, optional
+        Number of threads to use for blotting the median and flagging outliers.
+        Can be an integer, 'none', 'quarter', 'half', or 'all'.
 
     Returns
     -------
@@ -143,6 +147,7 @@ def detect_outliers(
             median_err=median_err,
             save_blot=save_intermediate_results,
             make_output_path=make_output_path,
+            maximum_cores=maximum_cores,
         )
     else:
         flag_crs_in_models(input_models, median_data, snr1, median_err=median_err)
@@ -1,4 +1,8 @@
+import warnings
+
 import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
 
 from jwst.outlier_detection.tso import moving_median_over_zeroth_axis
 
@@ -13,3 +17,29 @@ def test_rolling_median():
     result = moving_median_over_zeroth_axis(arr, w)
     expected = expected_time_axis[:, np.newaxis, np.newaxis] * spatial_axis[np.newaxis, :, :]
     assert np.allclose(result, expected)
+
+
+@pytest.mark.parametrize("w", [4, 7])
+def test_rolling_median_nan(w):
+    rng = np.random.default_rng(0)
+    arr = rng.normal(size=(30, 3, 4))
+    arr[rng.random(arr.shape) < 0.3] = np.nan
+    arr[5:20, 0, 0] = np.nan
+
+    # Compare to the NaN median of the nearest full window, sorting
+    # a single window at a time
+    result = moving_median_over_zeroth_axis(arr, w, buffer_size=1)
+    for i in range(arr.shape[0]):
+        start = min(max(i - w // 2, 0), arr.shape[0] - w)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            expected = np.nanmedian(arr[start : start + w], axis=0)
+        assert_array_equal(result[i], expected)
+
+    # Windows with no valid data are NaN
+    assert np.isnan(result[12, 0, 0])
+
+
+def test_rolling_median_window_too_large():
+    with pytest.raises(ValueError, match="Window size must be less"):
+        moving_median_over_zeroth_axis(np.zeros((3, 2, 2)), 4)
@@ -74,6 +74,29 @@ def test_outlier_step_weak_cr_imaging(mirimage_three_sci, tmp_cwd):
     assert len(median_files) != 0
 
 
+@pytest.mark.parametrize("pixmap_cache", ["memory", "disk"])
+def test_outlier_step_pixmap_cache(mirimage_three_sci, pixmap_cache, tmp_cwd):
+    """Test that caching pixel maps does not change the flagged outliers"""
+    container = ModelContainer(list(mirimage_three_sci))
+    container[0].data[12, 12] += 1
+
+    expected = OutlierDetectionStep.call(ModelContainer([m.copy() for m in container]))
+    result = OutlierDetectionStep.call(
+        container, pixmap_cache=pixmap_cache, pixmap_cache_dir=str(tmp_cwd / "pixmaps")
+    )
+
+    with expected, result:
+        for i in range(len(result)):
+            r = result.borrow(i)
+            e = expected.borrow(i)
+            np.testing.assert_array_equal(r.dq, e.dq)
+            result.shelve(r, modify=False)
+            expected.shelve(e, modify=False)
+
+    if pixmap_cache == "disk":
+        assert len(glob(str(tmp_cwd / "pixmaps" / "*.npy"))) > 0
+
+
 def test_outlier_step_on_disk(three_sci_as_asn, tmp_cwd):
     """Test whole step with an outlier including saving intermediate and results files"""
     container = ModelLibrary(three_sci_as_asn, on_disk=True)
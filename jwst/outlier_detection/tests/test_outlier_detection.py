@@ -5,7 +5,7 @@ from numpy.testing import assert_allclose, assert_array_equal
 from stdatamodels.jwst import datamodels
 
 from jwst.datamodels import ModelContainer, ModelLibrary
-from jwst.outlier_detection import OutlierDetectionStep
+from jwst.outlier_detection import OutlierDetectionStep, utils
 from jwst.outlier_detection.tests import helpers
 from jwst.outlier_detection.utils import (
     _flag_resampled_model_crs,
@@ -107,6 +107,60 @@ def test_drizzle_and_median_with_resample(three_sci_as_asn, tmp_cwd):
         median_with_resampling(lib, resamp, 0.7, save_intermediate_results=True)
 
 
+@pytest.mark.parametrize("tile_size", [8, 100])
+def test_tiled_median_without_resampling(three_sci_as_asn, tile_size):
+    """Test that the tiled median matches the full-frame median."""
+    lib = ModelLibrary(three_sci_as_asn, on_disk=False)
+
+    median, _ = median_without_resampling(lib, 0.7, "ivm", "~DO_NOT_USE")
+    median_tiled, wcs = median_without_resampling(
+        lib, 0.7, "ivm", "~DO_NOT_USE", tile_size=tile_size
+    )
+
+    assert isinstance(wcs, WCS)
+    assert_array_equal(median_tiled, median)
+
+
+@pytest.mark.parametrize("tile_size", [8, 100])
+def test_tiled_median_with_resampling(three_sci_as_asn, tile_size):
+    """Test that the tiled, resampled median matches the full-frame median."""
+    lib = ModelLibrary(three_sci_as_asn, on_disk=False)
+
+    resamp = helpers.make_resamp(lib)
+    median, _ = median_with_resampling(lib, resamp, 0.7)
+    median_tiled, wcs = median_with_resampling(lib, resamp, 0.7, tile_size=tile_size)
+
+    assert isinstance(wcs, WCS)
+    assert median_tiled.shape == median.shape
+    assert_allclose(median_tiled, median, rtol=1e-6, equal_nan=True)
+
+
+def test_tiled_median_skips_uncovered_tiles(three_sci_as_asn, monkeypatch):
+    """Test that groups are not drizzled onto tiles outside their footprint."""
+    lib = ModelLibrary(three_sci_as_asn, on_disk=False)
+    with lib:
+        model = lib.borrow(0)
+        model.dq[:, 10:] = datamodels.dqflags.pixel["DO_NOT_USE"]
+        lib.shelve(model, 0)
+
+    median, _ = median_with_resampling(lib, helpers.make_resamp(lib), 0.7)
+
+    tile_groups = []
+    resample_group = utils._TileResample.resample_group
+
+    def counting_resample_group(self, input_models, indices):
+        tile_groups.append(indices)
+        return resample_group(self, input_models, indices)
+
+    monkeypatch.setattr(utils._TileResample, "resample_group", counting_resample_group)
+    median_tiled, _ = median_with_resampling(lib, helpers.make_resamp(lib), 0.7, tile_size=8)
+
+    assert_allclose(median_tiled, median, rtol=1e-6, equal_nan=True)
+
+    # the first group only covers part of the 5 x 5 tiles of the output frame
+    assert len(tile_groups) < len(lib.group_indices) * 25
+
+
 @pytest.mark.parametrize("mode", [None, "unknown"])
 def test_guess_mode_assigned(caplog, mode):
     input_model = datamodels.ImageModel()
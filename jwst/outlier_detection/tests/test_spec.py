@@ -7,7 +7,7 @@ from stdatamodels.jwst import datamodels
 
 from jwst.assign_wcs import AssignWcsStep
 from jwst.datamodels import ModelContainer
-from jwst.outlier_detection import OutlierDetectionStep
+from jwst.outlier_detection import OutlierDetectionStep, utils
 from jwst.outlier_detection.tests import helpers
 from jwst.resample.tests.test_resample_step import miri_rate_model
 
@@ -128,3 +128,49 @@ def test_skip_one_exposure_spec():
     # Input is not modified
     assert result[0] is not model
     assert model.meta.cal_step.outlier_detection is None
+
+
+def test_outlier_step_spec_threads(tmp_cwd):
+    """Test that flagging outliers in parallel threads matches the serial result."""
+    miri_cal = AssignWcsStep.call(miri_rate_model())
+    miri_cal.meta.exposure.type = "MIR_LRS-FIXEDSLIT"
+
+    container = ModelContainer([miri_cal.copy(), miri_cal.copy(), miri_cal.copy()])
+    for i, model in enumerate(container):
+        model.meta.filename = f"test_{i}_cal.fits"
+    container[0].data[209, 37] += 1
+    container[2].data[100, 30] += 1
+
+    # models from different detectors are blotted in separate batches
+    container[2].meta.instrument.detector = "MIRIFULONG"
+
+    serial = OutlierDetectionStep.call(container, maximum_cores="1")
+    parallel = OutlierDetectionStep.call(container, maximum_cores="2")
+
+    for serial_model, parallel_model in zip(serial, parallel, strict=True):
+        np.testing.assert_array_equal(parallel_model.dq, serial_model.dq)
+    assert parallel[0].dq[209, 37] == helpers.OUTLIER_DO_NOT_USE
+
+
+def test_outlier_step_spec_batches(tmp_cwd, monkeypatch):
+    """Test that models with identical WCS share one blot pixel map."""
+    miri_cal = AssignWcsStep.call(miri_rate_model())
+    miri_cal.meta.exposure.type = "MIR_LRS-FIXEDSLIT"
+
+    container = ModelContainer([miri_cal.copy(), miri_cal.copy(), miri_cal.copy()])
+    for i, model in enumerate(container):
+        model.meta.filename = f"test_{i}_cal.fits"
+    container[2].meta.instrument.detector = "MIRIFULONG"
+
+    blot_shapes = []
+    compute_blot_pixmap = utils.compute_blot_pixmap
+
+    def counting_blot_pixmap(median_wcs, blot_shape, blot_wcs, **kwargs):
+        blot_shapes.append(blot_shape)
+        return compute_blot_pixmap(median_wcs, blot_shape, blot_wcs, **kwargs)
+
+    monkeypatch.setattr(utils, "compute_blot_pixmap", counting_blot_pixmap)
+    OutlierDetectionStep.call(container, maximum_cores="2")
+
+    # the copies of the same WCS on the same detector make a single batch
+    assert len(blot_shapes) == 2
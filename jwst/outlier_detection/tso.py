@@ -151,23 +151,26 @@ def compute_rolling_median(
     sci[badmask] = np.nan
     del badmask
 
-    if w > sci.shape[0]:
-        raise ValueError("Window size must be less than the number of integrations.")
     meds = moving_median_over_zeroth_axis(sci, w)
 
     del sci
     return meds
 
 
-def moving_median_over_zeroth_axis(x: np.ndarray, w: int) -> np.ndarray:
+def moving_median_over_zeroth_axis(x: np.ndarray, w: int, buffer_size: int = 2**26) -> np.ndarray:
     """
     Calculate the median of a moving window over the zeroth axis of an N-d array.
 
-    Algorithm works by expanding the array into an additional dimension
-    where the new axis has the same length as the window size. Each entry in that
-    axis is a copy of the original array shifted by 1 with respect to the previous
-    entry, such that the rolling median is simply the median over the new axis.
-    modified from https://stackoverflow.com/a/71154394, see link for more details.
+    The median of each window of ``w`` consecutive entries is computed
+    ignoring NaNs, and assigned to the entry at the center of the window.
+    The first and last ``w // 2`` entries, for which the window would extend
+    past the ends of the array, are assigned the median of the first and last
+    full windows.
+
+    The array is streamed over the zeroth axis: the windows are sorted in
+    chunks of consecutive windows, so that at most ``buffer_size`` bytes of
+    windows are held in memory at a time, regardless of the length of the
+    zeroth axis.
 
     Parameters
     ----------
@@ -175,25 +178,44 @@ def moving_median_over_zeroth_axis(x: np.ndarray, w: int) -> np.ndarray:
         The input array.
     w : int
         The window size.
+    buffer_size : int, optional
+        The maximum size in bytes of the chunk of sorted windows. At least
+        one window is always sorted at a time.
 
     Returns
     -------
     ndarray
         The rolling median of the input array. Same dimensions as input.
+        Entries for which the window only contains NaNs are NaN.
     """
     if w <= 1:
         raise ValueError("Rolling median window size must be greater than 1.")
-    shifted = np.zeros((x.shape[0] + w - 1, w, *x.shape[1:])) * np.nan
-    for idx in range(w - 1):
-        shifted[idx : -w + idx + 1, idx] = x
-    shifted[idx + 1 :, idx + 1] = x
-    medians: np.ndarray = np.median(shifted, axis=1)
-    for idx in range(w - 1):
-        medians[idx] = np.median(shifted[idx, : idx + 1])
-        medians[-idx - 1] = np.median(shifted[-idx - 1, -idx - 1 :])
-    medians = medians[(w - 1) // 2 : -(w - 1) // 2]
-
-    # Fill in the edges with the nearest valid value
-    medians[: w // 2] = medians[w // 2]
-    medians[-w // 2 :] = medians[-w // 2]
+    n = x.shape[0]
+    if w > n:
+        raise ValueError("Window size must be less than the number of integrations.")
+
+    medians = np.empty(x.shape, dtype=np.float64)
+    nwindows = n - w + 1
+    chunk_size = max(1, min(nwindows, buffer_size // max(1, w * x[0].nbytes)))
+    for start in range(0, nwindows, chunk_size):
+        stop = min(start + chunk_size, nwindows)
+
+        # Sort each window, with NaNs at the end, and take the middle
+        # of its valid values.
+        windows = np.lib.stride_tricks.sliding_window_view(x[start : stop + w - 1], w, axis=0)
+        windows = np.sort(windows, axis=-1)
+        nvalid = w - np.count_nonzero(np.isnan(windows), axis=-1, keepdims=True)
+        low = np.take_along_axis(windows, (nvalid - 1) // 2, axis=-1)[..., 0]
+        high = np.take_along_axis(windows, nvalid // 2, axis=-1)[..., 0]
+        chunk_medians = (low.astype(np.float64) + high) / 2
+        del windows
+
+        # Assign each median to the center of its window
+        medians[start + w // 2 : stop + w // 2] = chunk_medians
+
+        # Fill in the edges with the nearest full window
+        if start == 0:
+            medians[: w // 2] = chunk_medians[0]
+        if stop == nwindows:
+            medians[nwindows + w // 2 :] = chunk_medians[-1]
     return medians
@@ -2,28 +2,38 @@
 
 import copy
 import logging
+import multiprocessing as mp
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 
 import numpy as np
+from astropy.modeling.models import Shift
+from drizzle.resample import blot_image
+from stcal.multiprocessing import compute_num_cores
 from stcal.outlier_detection.median import MedianComputer, nanmedian3D
 from stcal.outlier_detection.utils import (
     compute_weight_threshold,
     flag_crs,
     flag_resampled_crs,
-    gwcs_blot,
 )
-from stcal.resample.utils import build_driz_weight
+from stcal.resample import Resample
+from stcal.resample.utils import build_driz_weight, calc_pixmap, is_imaging_wcs
 from stdatamodels.jwst import datamodels
 
 from jwst.lib.pipe_utils import match_nans_and_flags
 from jwst.outlier_detection import _fileio
-from jwst.resample.resample import compute_image_pixel_area
+from jwst.resample.resample import input_jwst_model_to_dict
+from jwst.resample.resample_utils import wcs_digest
 
 log = logging.getLogger(__name__)
 
 DO_NOT_USE = datamodels.dqflags.pixel["DO_NOT_USE"]
 OUTLIER = datamodels.dqflags.pixel["OUTLIER"]
 
+# Margin (in pixels) added around each tile when drizzling a tiled median,
+# wide enough for all supported drizzle kernels
+_TILE_MARGIN = 4
+
 __all__ = [
     "create_cube_median",
     "median_without_resampling",
@@ -31,6 +41,7 @@ __all__ = [
     "flag_crs_in_models",
     "flag_resampled_model_crs",
     "flag_crs_in_models_with_resampling",
+    "compute_blot_pixmap",
     "flag_model_crs",
 ]
 
@@ -71,6 +82,7 @@ def median_without_resampling(
     make_output_path=None,
     buffer_size=None,
     return_error=False,
+    tile_size=None,
 ):
     """
     Compute a median image without resampling.
@@ -102,6 +114,10 @@ def median_without_resampling(
     return_error : bool, optional
         If True, an approximate median error is computed alongside the
         median science image.
+    tile_size : int, optional
+        If set, the median is computed separately for square tiles of
+        this size (in pixels), so that only one tile of each input model
+        is held in memory at a time. ``buffer_size`` is ignored in this case.
 
     Returns
     -------
@@ -118,6 +134,27 @@ def median_without_resampling(
     if save_intermediate_results:
         # create an empty image model for the median data
         median_model = datamodels.ImageModel(None)
+    else:
+        median_model = None
+
+    if tile_size is not None:
+        median_data, median_wcs, median_err = _tiled_median_without_resampling(
+            input_models,
+            maskpt,
+            weight_type,
+            good_bits,
+            tile_size,
+            return_error=return_error,
+            median_model=median_model,
+        )
+        return _finish_median_without_resampling(
+            median_data,
+            median_wcs,
+            median_err,
+            median_model,
+            make_output_path,
+            return_error,
+        )
 
     with input_models:
         for i in range(len(input_models)):
@@ -164,7 +201,43 @@ def median_without_resampling(
     else:
         median_err = None
 
-    if save_intermediate_results:
+    return _finish_median_without_resampling(
+        median_data,
+        median_wcs,
+        median_err,
+        median_model,
+        make_output_path,
+        return_error,
+    )
+
+
+def _finish_median_without_resampling(
+    median_data, median_wcs, median_err, median_model, make_output_path, return_error
+):
+    """
+    Save the median model if requested and build the return value.
+
+    Parameters
+    ----------
+    median_data : ndarray
+        The median data array.
+    median_wcs : gwcs.wcs.WCS
+        A WCS corresponding to the median data.
+    median_err : ndarray or None
+        The median error array.
+    median_model : `~stdatamodels.jwst.datamodels.ImageModel` or None
+        The model to save the median into, if intermediate results are saved.
+    make_output_path : function
+        The functools.partial instance to pass to save_median.
+    return_error : bool
+        If True, the median error is included in the returned values.
+
+    Returns
+    -------
+    tuple
+        The median data and WCS, and the median error if ``return_error`` is True.
+    """
+    if median_model is not None:
         # Save median model to fits
         median_model.data = median_data
         if return_error:
@@ -177,6 +250,104 @@ def median_without_resampling(
         return median_data, median_wcs
 
 
+def _tiled_median_without_resampling(
+    input_models,
+    maskpt,
+    weight_type,
+    good_bits,
+    tile_size,
+    return_error=False,
+    median_model=None,
+):
+    """
+    Compute a median image without resampling, one spatial tile at a time.
+
+    The weight image of each input model is computed once, in a first pass,
+    and thresholded over the full image, so the masking is identical to the
+    untiled computation. The resulting masks are kept as packed bits and reused
+    for every tile. The median is then computed over a stack of a single tile of
+    all input models, so memory use scales with the tile size rather than the
+    image size.
+
+    Parameters
+    ----------
+    input_models : ModelLibrary
+        The input datamodels.
+    maskpt : float
+        The weight threshold for masking out low weight pixels.
+    weight_type : str
+        The type of weighting to use when combining images.
+    good_bits : int
+        The bit values that are considered good.
+    tile_size : int
+        The size of the square tiles, in pixels.
+    return_error : bool, optional
+        If True, an approximate median error is computed alongside the
+        median science image.
+    median_model : `~stdatamodels.jwst.datamodels.ImageModel`, optional
+        If provided, its metadata is updated from the first input model.
+
+    Returns
+    -------
+    median_data : ndarray
+        The median data array.
+    median_wcs : gwcs.wcs.WCS
+        A WCS corresponding to the median data.
+    median_err : ndarray or None
+        The median error array, if ``return_error`` is True.
+    """
+    ngroups = len(input_models)
+    bad_masks = []
+    with input_models:
+        for i in range(ngroups):
+            model = input_models.borrow(i)
+            weight = build_driz_weight(
+                model,
+                weight_type=weight_type,
+                good_bits=good_bits,
+                flag_name_map=datamodels.dqflags.pixel,
+            )
+            bad = weight < compute_weight_threshold(weight, maskpt)
+            bad_masks.append(np.packbits(bad, axis=1))
+            if i == 0:
+                median_wcs = copy.deepcopy(model.meta.wcs)
+                shape = model.data.shape
+                dtype = model.data.dtype
+                if median_model is not None:
+                    median_model.update(model)
+                    median_model.meta.wcs = median_wcs
+            input_models.shelve(model, i, modify=False)
+            del model, weight, bad
+
+    median_data = np.empty(shape, dtype=dtype)
+    median_err = np.empty(shape, dtype=dtype) if return_error else None
+
+    for yslice, xslice in _tile_slices(shape, tile_size):
+        tile_shape = (ngroups, yslice.stop - yslice.start, xslice.stop - xslice.start)
+        computer = MedianComputer(tile_shape, True, dtype=dtype)
+        err_computer = MedianComputer(tile_shape, True, dtype=dtype) if return_error else None
+        with input_models:
+            for i in range(ngroups):
+                model = input_models.borrow(i)
+                bad = np.unpackbits(bad_masks[i][yslice], axis=1, count=shape[1])
+                bad = bad[:, xslice].astype(bool)
+                data = model.data[yslice, xslice].copy()
+                data[bad] = np.nan
+                computer.append(data, i)
+                if return_error:
+                    err = model.err[yslice, xslice].copy()
+                    err[bad] = np.nan
+                    err_computer.append(err, i)
+                input_models.shelve(model, i, modify=False)
+                del model
+
+        median_data[yslice, xslice] = computer.evaluate()
+        if return_error:
+            median_err[yslice, xslice] = err_computer.evaluate()
+
+    return median_data, median_wcs, median_err
+
+
 def median_with_resampling(
     input_models,
     resamp,
@@ -185,6 +356,8 @@ def median_with_resampling(
     make_output_path=None,
     buffer_size=None,
     return_error=False,
+    tile_size=None,
+    maximum_cores="1",
 ):
     """
     Compute a median image with resampling.
@@ -212,6 +385,19 @@ def median_with_resampling(
     return_error : bool, optional
         If True, an approximate median error is computed alongside the
         median science image.
+    tile_size : int, optional
+        If set, the output frame is split into square tiles of this size
+        (in pixels) and each tile is drizzled, stacked, and median-combined
+        on its own, so that peak memory scales with the tile size rather
+        than the mosaic size. Each group is drizzled once onto the full frame
+        to determine its weight threshold and footprint, and once more for
+        every tile it overlaps, so this trades runtime for memory. Only supported for imaging data;
+        ``buffer_size`` is ignored in this case.
+    maximum_cores : str, optional
+        Number of processes used to drizzle groups in parallel when
+        ``tile_size`` is not set. Can be an integer, 'none', 'quarter',
+        'half', or 'all'. See
+        `~jwst.resample.resample.ResampleImage.resample_groups`.
 
     Returns
     -------
@@ -225,8 +411,7 @@ def median_with_resampling(
         returned.
     """
     in_memory = not input_models.on_disk
-    indices_by_group = list(input_models.group_indices.values())
-    ngroups = len(indices_by_group)
+    ngroups = len(input_models.group_indices)
     median_err = None
 
     eval_med_err = False
@@ -244,39 +429,55 @@ def median_with_resampling(
         # create an empty image model for the median data
         median_model = datamodels.ImageModel(None)
 
-    for i, indices in enumerate(indices_by_group):
-        drizzled_model = resamp.resample_group(indices)
+    if tile_size is not None and not is_imaging_wcs(resamp.output_wcs):
+        log.warning("Tiled median computation is only supported for imaging data.")
+        tile_size = None
 
-        if save_intermediate_results:
-            # write the drizzled model to file
-            _fileio.save_drizzled(drizzled_model, make_output_path)
+    if tile_size is not None:
+        median_data, median_err = _tiled_median_with_resampling(
+            input_models,
+            resamp,
+            maskpt,
+            tile_size,
+            eval_med_err=eval_med_err,
+            save_intermediate_results=save_intermediate_results,
+            make_output_path=make_output_path,
+            median_model=median_model if save_intermediate_results else None,
+        )
+        median_wcs = resamp.output_wcs
+    else:
+        drizzled_models = resamp.resample_groups(maximum_cores=maximum_cores)
+        for i, drizzled_model in enumerate(drizzled_models):
+            if save_intermediate_results:
+                # write the drizzled model to file
+                _fileio.save_drizzled(drizzled_model, make_output_path)
 
-        if i == 0:
-            median_wcs = resamp.output_wcs
-            input_shape = (ngroups,) + drizzled_model.data.shape
-            dtype = drizzled_model.data.dtype
-            computer = MedianComputer(input_shape, in_memory, buffer_size, dtype)
+            if i == 0:
+                median_wcs = resamp.output_wcs
+                input_shape = (ngroups,) + drizzled_model.data.shape
+                dtype = drizzled_model.data.dtype
+                computer = MedianComputer(input_shape, in_memory, buffer_size, dtype)
+                if eval_med_err:
+                    err_computer = MedianComputer(input_shape, in_memory, buffer_size, dtype)
+                else:
+                    err_computer = None
+                if save_intermediate_results:
+                    # update median model's meta with meta from the first model:
+                    median_model.update(drizzled_model)
+                    median_model.meta.wcs = median_wcs
+
+            weight_threshold = compute_weight_threshold(drizzled_model.wht, maskpt)
+            drizzled_model.data[drizzled_model.wht < weight_threshold] = np.nan
+            computer.append(drizzled_model.data, i)
             if eval_med_err:
-                err_computer = MedianComputer(input_shape, in_memory, buffer_size, dtype)
-            else:
-                err_computer = None
-            if save_intermediate_results:
-                # update median model's meta with meta from the first model:
-                median_model.update(drizzled_model)
-                median_model.meta.wcs = median_wcs
+                drizzled_model.err[drizzled_model.wht < weight_threshold] = np.nan
+                err_computer.append(drizzled_model.err, i)
+            del drizzled_model
 
-        weight_threshold = compute_weight_threshold(drizzled_model.wht, maskpt)
-        drizzled_model.data[drizzled_model.wht < weight_threshold] = np.nan
-        computer.append(drizzled_model.data, i)
+        # Perform median combination on set of drizzled mosaics
+        median_data = computer.evaluate()
         if eval_med_err:
-            drizzled_model.err[drizzled_model.wht < weight_threshold] = np.nan
-            err_computer.append(drizzled_model.err, i)
-        del drizzled_model
-
-    # Perform median combination on set of drizzled mosaics
-    median_data = computer.evaluate()
-    if eval_med_err:
-        median_err = err_computer.evaluate()
+            median_err = err_computer.evaluate()
 
     if save_intermediate_results:
         # Save median model to fits
@@ -293,6 +494,310 @@ def median_with_resampling(
         return median_data, median_wcs
 
 
+def _tiled_median_with_resampling(
+    input_models,
+    resamp,
+    maskpt,
+    tile_size,
+    eval_med_err=False,
+    save_intermediate_results=False,
+    make_output_path=None,
+    median_model=None,
+):
+    """
+    Compute a median image with resampling, one spatial tile at a time.
+
+    Each group is first drizzled onto the full output frame, one group at a
+    time, to compute its weight threshold, so the masking is identical to the
+    untiled computation, and its footprint on the output frame. Then, for every
+    tile of the output frame, the groups whose footprint overlaps the tile are
+    drizzled onto the tile only and median-combined. Groups that do not overlap
+    a tile contribute their fill values without being drizzled again.
+
+    Parameters
+    ----------
+    input_models : ModelLibrary
+        The input datamodels.
+    resamp : resample.resample.ResampleImage object
+        The controlling object for the resampling process.
+    maskpt : float
+        The weight threshold for masking out low weight pixels.
+    tile_size : int
+        The size of the square tiles, in pixels.
+    eval_med_err : bool, optional
+        If True, the median of the drizzled error arrays is also computed.
+    save_intermediate_results : bool, optional
+        If True, save the drizzled models to fits.
+    make_output_path : function, optional
+        The functools.partial instance to pass to save_drizzled.
+    median_model : `~stdatamodels.jwst.datamodels.ImageModel`, optional
+        If provided, its metadata is updated from the first drizzled model.
+
+    Returns
+    -------
+    median_data : ndarray
+        The median data array.
+    median_err : ndarray or None
+        The median error array, if ``eval_med_err`` is True.
+    """
+    indices_by_group = list(input_models.group_indices.values())
+    ngroups = len(indices_by_group)
+
+    weight_thresholds = []
+    footprints = []
+    for i, indices in enumerate(indices_by_group):
+        drizzled_model = resamp.resample_group(indices)
+        if save_intermediate_results:
+            _fileio.save_drizzled(drizzled_model, make_output_path)
+        if i == 0:
+            dtype = drizzled_model.data.dtype
+            if median_model is not None:
+                median_model.update(drizzled_model)
+                median_model.meta.wcs = resamp.output_wcs
+        weight_thresholds.append(compute_weight_threshold(drizzled_model.wht, maskpt))
+        footprints.append(_group_footprint(drizzled_model, eval_med_err))
+        del drizzled_model
+
+    shape = tuple(resamp.output_array_shape)
+    median_data = np.empty(shape, dtype=dtype)
+    median_err = np.empty(shape, dtype=dtype) if eval_med_err else None
+
+    for yslice, xslice in _tile_slices(shape, tile_size):
+        # Drizzle onto the tile plus a margin, since drizzle drops partial
+        # contributions to pixels at the edges of its output frame
+        ypad = slice(max(yslice.start - _TILE_MARGIN, 0), min(yslice.stop + _TILE_MARGIN, shape[0]))
+        xpad = slice(max(xslice.start - _TILE_MARGIN, 0), min(xslice.stop + _TILE_MARGIN, shape[1]))
+        inner = (
+            slice(yslice.start - ypad.start, yslice.stop - ypad.start),
+            slice(xslice.start - xpad.start, xslice.stop - xpad.start),
+        )
+        tile_resamp = _TileResample(resamp, ypad, xpad)
+
+        tile_shape = (ngroups, yslice.stop - yslice.start, xslice.stop - xslice.start)
+        computer = MedianComputer(tile_shape, True, dtype=dtype)
+        err_computer = MedianComputer(tile_shape, True, dtype=dtype) if eval_med_err else None
+        for i, indices in enumerate(indices_by_group):
+            if footprints[i].overlaps(yslice, xslice):
+                tile = tile_resamp.resample_group(input_models, indices)
+            else:
+                tile = footprints[i].empty_tile(ypad, xpad)
+            bad = tile["wht"][inner] < weight_thresholds[i]
+            data = tile["data"][inner]
+            data[bad] = np.nan
+            computer.append(data, i)
+            if eval_med_err:
+                err = tile["err"][inner]
+                err[bad] = np.nan
+                err_computer.append(err, i)
+            del tile
+
+        median_data[yslice, xslice] = computer.evaluate()
+        if eval_med_err:
+            median_err[yslice, xslice] = err_computer.evaluate()
+
+    return median_data, median_err
+
+
+class _GroupFootprint:
+    """Bounding box of the pixels with non-zero weight in a drizzled group."""
+
+    def __init__(self, ybounds, xbounds, fill_data, fill_err):
+        """
+        Store the footprint of a drizzled group.
+
+        Parameters
+        ----------
+        ybounds, xbounds : tuple of int or None
+            The (start, stop) range of rows and columns with non-zero weight,
+            or `None` if the group has no weight anywhere.
+        fill_data, fill_err : float
+            The values of the drizzled data and error where the weight is zero.
+        """
+        self.ybounds = ybounds
+        self.xbounds = xbounds
+        self.fill_data = fill_data
+        self.fill_err = fill_err
+
+    def overlaps(self, yslice, xslice):
+        """
+        Check whether the footprint overlaps a region of the output frame.
+
+        Parameters
+        ----------
+        yslice, xslice : slice
+            The region of the output frame.
+
+        Returns
+        -------
+        bool
+            True if any pixel in the region has non-zero weight.
+        """
+        if self.ybounds is None:
+            return False
+        return (
+            self.ybounds[0] < yslice.stop
+            and yslice.start < self.ybounds[1]
+            and self.xbounds[0] < xslice.stop
+            and xslice.start < self.xbounds[1]
+        )
+
+    def empty_tile(self, yslice, xslice):
+        """
+        Build the drizzled arrays for a tile outside the footprint.
+
+        Parameters
+        ----------
+        yslice, xslice : slice
+            The region of the output frame covered by the tile.
+
+        Returns
+        -------
+        dict
+            The ``data``, ``wht`` and ``err`` arrays for the tile,
+            with zero weight everywhere.
+        """
+        shape = (yslice.stop - yslice.start, xslice.stop - xslice.start)
+        return {
+            "data": np.full(shape, self.fill_data, dtype=np.float32),
+            "wht": np.zeros(shape, dtype=np.float32),
+            "err": np.full(shape, self.fill_err, dtype=np.float32),
+        }
+
+
+def _group_footprint(drizzled_model, eval_med_err):
+    """
+    Find the footprint of a drizzled group on the output frame.
+
+    Parameters
+    ----------
+    drizzled_model : `~stdatamodels.jwst.datamodels.ImageModel`
+        The group drizzled onto the full output frame.
+    eval_med_err : bool
+        If True, the error array of ``drizzled_model`` is also used.
+
+    Returns
+    -------
+    _GroupFootprint
+        The footprint of the group.
+    """
+    covered = drizzled_model.wht > 0
+    uncovered = ~covered
+    if not np.any(uncovered):
+        fill_data = fill_err = np.nan
+    else:
+        fill_data = drizzled_model.data[uncovered][0]
+        fill_err = drizzled_model.err[uncovered][0] if eval_med_err else np.nan
+
+    rows = np.flatnonzero(np.any(covered, axis=1))
+    if rows.size == 0:
+        return _GroupFootprint(None, None, fill_data, fill_err)
+    cols = np.flatnonzero(np.any(covered, axis=0))
+    return _GroupFootprint((rows[0], rows[-1] + 1), (cols[0], cols[-1] + 1), fill_data, fill_err)
+
+
+def _tile_slices(shape, tile_size):
+    """
+    Split a 2D array shape into square tiles.
+
+    Parameters
+    ----------
+    shape : tuple of int
+        The (ny, nx) shape to split.
+    tile_size : int
+        The size of the tiles, in pixels. Tiles at the upper edges
+        may be smaller.
+
+    Yields
+    ------
+    yslice, xslice : slice
+        The slices of the full array covered by a tile.
+    """
+    ny, nx = shape
+    for y0 in range(0, ny, tile_size):
+        for x0 in range(0, nx, tile_size):
+            yield slice(y0, min(y0 + tile_size, ny)), slice(x0, min(x0 + tile_size, nx))
+
+
+class _TileResample(Resample):
+    """Resample input images onto a single tile of another resampler's output frame."""
+
+    dq_flag_name_map = datamodels.dqflags.pixel
+
+    def __init__(self, resamp, yslice, xslice):
+        """
+        Initialize the tile resampler from a full-frame resampler.
+
+        Parameters
+        ----------
+        resamp : resample.resample.ResampleImage object
+            The full-frame resampler, which must already have resampled
+            at least one group so that its pixel scale ratio is known.
+        yslice, xslice : slice
+            The part of the full output frame covered by the tile.
+        """
+        tile_wcs = copy.deepcopy(resamp.output_wcs)
+        tile_wcs.insert_transform(
+            tile_wcs.input_frame, Shift(xslice.start) & Shift(yslice.start), after=True
+        )
+        ny = yslice.stop - yslice.start
+        nx = xslice.stop - xslice.start
+        tile_wcs.bounding_box = ((-0.5, nx - 0.5), (-0.5, ny - 0.5))
+        tile_wcs.array_shape = (ny, nx)
+
+        super().__init__(
+            output_wcs={
+                "wcs": tile_wcs,
+                "pixel_scale": resamp.output_pixel_scale,
+                "pixel_scale_ratio": resamp.pixel_scale_ratio,
+            },
+            pixfrac=resamp.pixfrac,
+            kernel=resamp.kernel,
+            fillval=resamp.fillval,
+            weight_type=resamp.weight_type,
+            good_bits=resamp.good_bits,
+            enable_ctx=False,
+            enable_var=False,
+            compute_err=resamp.compute_err,
+        )
+
+    def resample_group(self, input_models, indices):
+        """
+        Resample the input images of a single group onto the tile.
+
+        Parameters
+        ----------
+        input_models : ModelLibrary
+            The input datamodels.
+        indices : list
+            Indices of the models in ``input_models`` belonging to the group.
+
+        Returns
+        -------
+        dict
+            The resampled output model dictionary, with ``data``, ``wht``
+            and (if computed) ``err`` arrays for the tile.
+        """
+        if self._n_res_models:
+            self.reset_arrays(n_input_models=len(indices))
+
+        with input_models:
+            for index in indices:
+                model = input_models.borrow(index)
+                self.add_model(
+                    input_jwst_model_to_dict(
+                        model,
+                        weight_type=self.weight_type,
+                        enable_var=False,
+                        compute_err=self._compute_err,
+                    )
+                )
+                input_models.shelve(model, index, modify=False)
+                del model
+
+        self.finalize()
+        return self.output_model
+
+
 def flag_crs_in_models(input_models, median_data, snr1, median_err=None):
     """
     Flag outliers in all input models without resampling.
@@ -326,6 +831,7 @@ def flag_resampled_model_crs(
     median_err=None,
     save_blot=False,
     make_output_path=None,
+    pixmap=None,
 ):
     """
     Flag outliers in a resampled model, updating DQ array in place.
@@ -358,33 +864,18 @@ def flag_resampled_model_crs(
     make_output_path : function
         The functools.partial instance to pass to save_blot. Must be
         specified if save_blot is True.
+    pixmap : ndarray, optional
+        The pixel map from the input model to the median frame, as returned by
+        `compute_blot_pixmap`. If not provided, it is computed from the
+        input model WCS.
     """
-    if "SPECTRAL" not in input_model.meta.wcs.output_frame.axes_type:
-        input_pixflux_area = input_model.meta.photometry.pixelarea_steradians
-        # Set array shape, needed to compute image pixel area
-        input_model.meta.wcs.array_shape = input_model.shape
-        input_pixel_area = compute_image_pixel_area(input_model.meta.wcs)
-        pix_ratio = np.sqrt(input_pixflux_area / input_pixel_area)
-    else:
-        pix_ratio = 1.0
+    if pixmap is None:
+        pixmap = compute_blot_pixmap(median_wcs, input_model.data.shape, input_model.meta.wcs)
 
-    blot = gwcs_blot(
-        median_data,
-        median_wcs,
-        input_model.data.shape,
-        input_model.meta.wcs,
-        pix_ratio,
-        fillval=np.nan,
-    )
+    # the same pixel map is used to blot both the median data and error
+    blot = _blot_with_pixmap(median_data, pixmap)
     if median_err is not None:
-        blot_err = gwcs_blot(
-            median_err,
-            median_wcs,
-            input_model.data.shape,
-            input_model.meta.wcs,
-            pix_ratio,
-            fillval=np.nan,
-        )
+        blot_err = _blot_with_pixmap(median_err, pixmap)
     else:
         blot_err = None
     if save_blot:
@@ -394,6 +885,80 @@ def flag_resampled_model_crs(
     _flag_resampled_model_crs(input_model, blot, blot_err, snr1, snr2, scale1, scale2, backg)
 
 
+def compute_blot_pixmap(median_wcs, blot_shape, blot_wcs, pixmap_cache=None):
+    """
+    Compute the pixel map used to blot a median image onto an input image.
+
+    Parameters
+    ----------
+    median_wcs : gwcs.wcs.WCS
+        A WCS corresponding to the median data.
+    blot_shape : tuple of int
+        The shape of the input image.
+    blot_wcs : gwcs.wcs.WCS
+        The WCS of the input image.
+    pixmap_cache : `~jwst.resample.resample_utils.PixmapCache`, optional
+        If provided, the pixel map is retrieved from this cache if it was
+        already computed, e.g. while drizzling the input image onto the
+        median frame, and stored in it otherwise.
+
+    Returns
+    -------
+    ndarray
+        The (ny, nx, 2) pixel map from the input image to the median frame,
+        with invalid values replaced as expected by the blotting code.
+    """
+    pixmap = None
+    if pixmap_cache is not None:
+        key = pixmap_cache.make_key(blot_wcs, median_wcs, blot_shape)
+        pixmap = pixmap_cache.get(key)
+        if pixmap is not None:
+            log.debug("Using cached pixel map")
+            pixmap = np.array(pixmap)
+    if pixmap is None:
+        pixmap = calc_pixmap(blot_wcs, median_wcs, blot_shape)
+        if pixmap_cache is not None:
+            pixmap_cache.put(key, pixmap)
+
+    # Currently tblot cannot handle nans in the pixmap, so give it the same
+    # replacement value that stcal.outlier_detection.utils.gwcs_blot uses
+    pixmap[np.isnan(pixmap)] = -1
+    return pixmap
+
+
+def _blot_with_pixmap(median_data, pixmap):
+    """
+    Blot median data onto an input image grid using a precomputed pixel map.
+
+    This is equivalent to `stcal.outlier_detection.utils.gwcs_blot`,
+    but avoids recomputing the pixel map.
+
+    Parameters
+    ----------
+    median_data : ndarray
+        The data to blot.
+    pixmap : ndarray
+        The pixel map returned by `compute_blot_pixmap`.
+
+    Returns
+    -------
+    ndarray
+        The blotted data, with NaN for pixels not covered by the median.
+    """
+    blot_shape = pixmap.shape[:2]
+    log.info(f"Blotting {blot_shape} <-- {median_data.shape}")
+    blot = np.full(blot_shape, np.nan, dtype=np.float32)
+    blot_image(
+        data=median_data,
+        pixmap=pixmap,
+        out_img=blot,
+        fillval=np.nan,
+        iscale=1.0,
+        interp="linear",
+    )
+    return blot
+
+
 def _flag_resampled_model_crs(
     input_model,
     blot,
@@ -464,10 +1029,18 @@ def flag_crs_in_models_with_resampling(
     median_err=None,
     save_blot=False,
     make_output_path=None,
+    maximum_cores="1",
 ):
     """
     Flag outliers in all input models, with resampling, modifying DQ array in place.
 
+    Models are batched by detector, data shape and WCS content, so that the
+    pixel map from each input frame to the median frame is computed only
+    once per batch and shared by all of its models, for both the median data
+    and error. Batches can be processed in parallel threads; each thread then
+    computes its pixel map from its own copies of the WCS objects, since
+    computing a pixel map temporarily modifies their bounding boxes.
+
     Parameters
     ----------
     input_models : `~jwst.datamodels.container.ModelContainer`
@@ -496,21 +1069,67 @@ def flag_crs_in_models_with_resampling(
     make_output_path : function
         The functools.partial instance to pass to save_blot. Must be
         specified if save_blot is True.
+    maximum_cores : str, optional
+        Number of threads to use for blotting and flagging batches of models.
+        Can be an integer, 'none', 'quarter', 'half', or 'all'.
     """
+    # batch models from the same detector with identical WCS and data shape
+    batches = {}
     for image in input_models:
-        flag_resampled_model_crs(
-            image,
-            median_data,
-            median_wcs,
-            snr1,
-            snr2,
-            scale1,
-            scale2,
-            backg,
-            median_err=median_err,
-            save_blot=save_blot,
-            make_output_path=make_output_path,
-        )
+        key = (image.meta.instrument.detector, image.data.shape, wcs_digest(image.meta.wcs))
+        batches.setdefault(key, []).append(image)
+
+    nthreads = compute_num_cores(str(maximum_cores), len(batches), mp.cpu_count())
+    flag_batch = partial(
+        _flag_resampled_batch_crs,
+        median_data=median_data,
+        median_wcs=median_wcs,
+        snr1=snr1,
+        snr2=snr2,
+        scale1=scale1,
+        scale2=scale2,
+        backg=backg,
+        median_err=median_err,
+        save_blot=save_blot,
+        make_output_path=make_output_path,
+        copy_wcs=nthreads > 1,
+    )
+
+    if nthreads > 1:
+        log.info(f"Flagging outliers in {len(batches)} batches using {nthreads} threads")
+        with ThreadPoolExecutor(nthreads) as executor:
+            # consume the results to propagate any exceptions
+            list(executor.map(flag_batch, batches.values()))
+    else:
+        for batch in batches.values():
+            flag_batch(batch)
+
+
+def _flag_resampled_batch_crs(images, median_data, median_wcs, copy_wcs=False, **kwargs):
+    """
+    Flag outliers in a batch of models sharing the same WCS and shape.
+
+    Parameters
+    ----------
+    images : list of `~stdatamodels.DataModel`
+        The input datamodels.
+    median_data : ndarray
+        The median data array.
+    median_wcs : gwcs.wcs.WCS
+        A WCS corresponding to the median data.
+    copy_wcs : bool, optional
+        If True, the pixel map is computed from copies of the median and
+        input WCS, so that batches can be processed in concurrent threads.
+    **kwargs : dict
+        Additional keyword arguments passed to `flag_resampled_model_crs`.
+    """
+    blot_wcs = images[0].meta.wcs
+    if copy_wcs:
+        median_wcs = copy.deepcopy(median_wcs)
+        blot_wcs = copy.deepcopy(blot_wcs)
+    pixmap = compute_blot_pixmap(median_wcs, images[0].data.shape, blot_wcs)
+    for image in images:
+        flag_resampled_model_crs(image, median_data, median_wcs, pixmap=pixmap, **kwargs)
 
 
 def flag_model_crs(image, blot, snr, median_err=None):
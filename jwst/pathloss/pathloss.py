@@ -2,13 +2,14 @@
 
 import logging
 import math
+from functools import partial
 
 import numpy as np
 import stdatamodels.jwst.datamodels as datamodels
 from gwcs import wcstools
 
 from jwst.assign_wcs import nirspec, util
-from jwst.lib.pipe_utils import match_nans_and_flags
+from jwst.lib.pipe_utils import map_slits, match_nans_and_flags
 from jwst.lib.wcs_utils import get_wavelengths
 
 log = logging.getLogger(__name__)
@@ -370,6 +371,7 @@ def do_correction(
     source_type=None,
     correction_pars=None,
     user_slit_loc=None,
+    maximum_cores="1",
 ):
     """
     Execute all tasks for Path Loss Correction.
@@ -395,6 +397,11 @@ def do_correction(
         User-provided slit location in units of arcsec, where (0,0)
         is the center and the edges are +/-0.255 arcsec.
 
+    maximum_cores : str
+        Number of threads to use for computing NIRSpec MOS slit
+        corrections in parallel. Can be an integer, 'none', 'quarter',
+        'half', or 'all'.
+
     Returns
     -------
     output_model, corrections : jwst.datamodels.JwstDataModel
@@ -412,7 +419,12 @@ def do_correction(
 
     if exp_type == "NRS_MSASPEC":
         corrections = do_correction_mos(
-            output_model, pathloss_model, inverse, source_type, correction_pars
+            output_model,
+            pathloss_model,
+            inverse,
+            source_type,
+            correction_pars,
+            maximum_cores=maximum_cores,
         )
     elif exp_type in ["NRS_FIXEDSLIT", "NRS_BRIGHTOBJ"]:
         corrections = do_correction_fixedslit(
@@ -541,7 +553,9 @@ def is_pointsource(srctype):
         return False
 
 
-def do_correction_mos(data, pathloss, inverse=False, source_type=None, correction_pars=None):
+def do_correction_mos(
+    data, pathloss, inverse=False, source_type=None, correction_pars=None, maximum_cores="1"
+):
     """
     Path loss correction for NIRSpec MOS.
 
@@ -564,6 +578,10 @@ def do_correction_mos(data, pathloss, inverse=False, source_type=None, correctio
     correction_pars : jwst.datamodels.MultiSlitModel or None
         The precomputed pathloss to apply instead of recalculation.
 
+    maximum_cores : str
+        Number of threads to use for computing the slit corrections
+        in parallel. Can be an integer, 'none', 'quarter', 'half', or 'all'.
+
     Returns
     -------
     corrections : jwst.datamodels.MultiSlitModel
@@ -571,15 +589,23 @@ def do_correction_mos(data, pathloss, inverse=False, source_type=None, correctio
     """
     exp_type = data.meta.exposure.type
 
+    # Compute the corrections for all MOS slitlets
+    if correction_pars:
+        slit_corrections = correction_pars.slits
+    else:
+        slit_corrections = map_slits(
+            partial(
+                _corrections_for_mos, pathloss=pathloss, exp_type=exp_type, source_type=source_type
+            ),
+            data.slits,
+            maximum_cores=maximum_cores,
+        )
+
     # Loop over all MOS slitlets
     corrections = datamodels.MultiSlitModel()
     for slit_number, slit in enumerate(data.slits):
         log.info(f"Working on slit {slit_number}")
-
-        if correction_pars:
-            correction = correction_pars.slits[slit_number]
-        else:
-            correction = _corrections_for_mos(slit, pathloss, exp_type, source_type)
+        correction = slit_corrections[slit_number]
         corrections.slits.append(correction)
 
         # Apply the correction
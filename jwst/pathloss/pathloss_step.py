@@ -24,6 +24,7 @@ class PathLossStep(Step):
         inverse = boolean(default=False)    # Invert the operation
         source_type = string(default=None)  # Process as specified source type
         user_slit_loc = float(default=None)   # User-provided correction to MIRI LRS source location
+        maximum_cores = string(default='1')  # threads for NIRSpec MOS slits. Can be an integer, 'half', 'quarter', or 'all'
     """  # noqa: E501
 
     reference_file_types = ["pathloss"]
@@ -76,6 +77,7 @@ class PathLossStep(Step):
                 source_type=self.source_type,
                 correction_pars=correction_pars,
                 user_slit_loc=self.user_slit_loc,
+                maximum_cores=self.maximum_cores,
             )
 
             if pathloss_model:
@@ -2,7 +2,6 @@
 #  Module for correcting for persistence
 
 import logging
-import math
 
 import numpy as np
 from stdatamodels.jwst import datamodels
@@ -15,7 +14,7 @@ SCALEFACTOR = 2.0
 from traps, compared with photon-generated charges.
 """
 
-__all__ = ["no_nan", "DataSet"]
+__all__ = ["no_nan", "per_family", "DataSet"]
 
 
 def no_nan(
@@ -67,6 +66,31 @@ def no_nan(
         return temp
 
 
+def per_family(param, ndim):
+    """
+    Reshape trap family parameters to broadcast against images.
+
+    Parameters
+    ----------
+    param : float or ndarray
+        A parameter for one trap family, or a 1-D array with one value
+        per trap family.
+
+    ndim : int
+        The number of dimensions of the images.
+
+    Returns
+    -------
+    float or ndarray
+        `param` unchanged if it is a scalar, otherwise `param` with `ndim`
+        axes of length one appended, so the first axis of the result of
+        an operation with an image is the trap family.
+    """
+    if np.ndim(param) == 0:
+        return param
+    return np.reshape(param, np.shape(param) + (1,) * ndim)
+
+
 class DataSet:
     """
     Input dataset to which persistence will be applied.
@@ -221,6 +245,10 @@ class DataSet:
         nfamilies = len(par[0])
         if nfamilies <= 0:
             log.error("The trappars reference table is empty!")
+        # All the trap families are computed at once, with one value of
+        # each parameter per family.
+        capture_params = tuple(par[0:3])
+        decay_params = par[3]
 
         # Note that this might be a subarray.
         persistence = np.zeros((shape[-2], shape[-1]), dtype=np.float64)
@@ -269,11 +297,9 @@ class DataSet:
             mjd_end = self.traps_filled.meta.exposure.end_time
             to_start = (mjd_start - mjd_end) * 86400.0
             log.debug("Decay time for previous traps-filled file = %g s", to_start)
-            for k in range(nfamilies):
-                decay_param_k = self.get_decay_param(par, k)
-                decay = self.compute_decay(self.traps_filled.data[k], decay_param_k, to_start)
-                self.traps_filled.data[k, :, :] -= decay
-                del decay
+            decay = self.compute_decay(self.traps_filled.data, decay_params, to_start)
+            self.traps_filled.data -= decay
+            del decay
 
         """
         These will be full-frame:
@@ -329,45 +355,45 @@ class DataSet:
         else:
             self.output_pers = None
 
-        # Buffer for accumulating the number of decayed traps from the
-        # start of an integration to the current group (in the loop below).
-        decayed = np.zeros((nfamilies, det_ny, det_nx), dtype=np.float64)
+        # Buffer for the decays during the current group, for all trap
+        # families.  The persistence is the number of traps that decayed
+        # from the start of an integration to the current group, summed over
+        # the trap families, so it is accumulated group by group (in the loop
+        # below) over the science pixels only.
+        decayed_in_group = np.zeros_like(self.traps_filled.data)
+        if is_subarray:
+            decayed_sci = decayed_in_group[:, save_slice[0], save_slice[1]]
+        else:
+            decayed_sci = decayed_in_group
 
         # self.traps_filled will be updated with each integration, to
         # account for charge capture and decay of traps.
         filled = -1  # just to ensure that it exists
         for integ in range(nints):
             self.get_group_info(integ)  # self.tgroup, etc.
-            decayed[:, :, :] = 0.0  # initialize
+            persistence[:, :] = 0.0  # initialize
             # slope has to be computed early in the loop over integrations,
             # before the data are modified by subtracting persistence.
             # The slope is needed for computing charge captures.
             (grp_slope, slope) = self.compute_slope(integ)
+            # Compute and subtract the decays during the reset.
+            # Decays during the reset at the beginning of the
+            # first integration have already been accounted for.
+            if integ > 0 and self.nresets > 0:
+                reset_time = self.tframe * self.nresets
+                decay_during_reset = self.compute_decay(
+                    self.traps_filled.data, decay_params, reset_time
+                )
+                self.traps_filled.data -= decay_during_reset
+                del decay_during_reset
             for group in range(ngroups):
-                persistence[:, :] = 0.0  # initialize
-                for k in range(nfamilies):
-                    decay_param_k = self.get_decay_param(par, k)
-                    # Compute and subtract the decays during the reset.
-                    # Decays during the reset at the beginning of the
-                    # first integration have already been accounted for.
-                    if integ > 0 and group == 0 and self.nresets > 0:
-                        reset_time = self.tframe * self.nresets
-                        decay_during_reset = self.compute_decay(
-                            self.traps_filled.data[k], decay_param_k, reset_time
-                        )
-                        self.traps_filled.data[k, :, :] -= decay_during_reset
-                    # Decays during current group, for current trap family.
-                    decayed_in_group = self.compute_decay(
-                        self.traps_filled.data[k], decay_param_k, t_group
-                    )
-                    # Cumulative decay to the end of the current group.
-                    decayed[k, :, :] += decayed_in_group
-                    self.traps_filled.data[k, :, :] -= decayed_in_group
-                    if is_subarray:
-                        persistence += decayed[k, save_slice[0], save_slice[1]]
-                    else:
-                        persistence += decayed[k, :, :]
-                    del decayed_in_group
+                # Decays during current group, for all trap families.
+                self.compute_decay(
+                    self.traps_filled.data, decay_params, t_group, out=decayed_in_group
+                )
+                self.traps_filled.data -= decayed_in_group
+                # Cumulative decay to the end of the current group.
+                persistence += decayed_sci.sum(axis=0, dtype=np.float64)
 
                 # Persistence was computed in DN.
                 self.output_obj.data[integ, group, :, :] -= persistence
@@ -379,18 +405,16 @@ class DataSet:
 
             # Update traps_filled with the number of traps that captured
             # a charge during the current integration.
-            for k in range(nfamilies):
-                capture_param_k = self.get_capture_param(par, k)
-                # This may be a subarray.
-                filled = self.predict_capture(
-                    capture_param_k, self.trap_density.data, integ, grp_slope, slope
-                )
-                if is_subarray:
-                    self.traps_filled.data[k, save_slice[0], save_slice[1]] += filled
-                else:
-                    self.traps_filled.data[k, :, :] += filled
+            # This may be a subarray.
+            filled = self.predict_capture(
+                capture_params, self.trap_density.data, integ, grp_slope, slope
+            )
+            if is_subarray:
+                self.traps_filled.data[:, save_slice[0], save_slice[1]] += filled
+            else:
+                self.traps_filled.data[:, :, :] += filled
 
-        del filled
+        del filled, decayed_in_group
 
         # Update the start and end times (and other stuff) in the
         # traps_filled image to the times for the current exposure.
@@ -754,6 +778,8 @@ class DataSet:
             three separate columns but just one row; the row corresponds
             to the current trap family.  (The _k in the variable name
             indicates that the values are for one trap family.)
+            These may also be three 1-D arrays, the whole columns, to
+            compute all the trap families at once.
 
         trap_density : ndarray, 2-D
             Image of the total number of traps per pixel.
@@ -775,8 +801,10 @@ class DataSet:
 
         Returns
         -------
-        ndarray, 2-D
-            The computed traps_filled at the end of the integration.
+        ndarray, 2-D or 3-D
+            The computed traps_filled at the end of the integration, with
+            the trap family along the first axis if `capture_param_k`
+            holds arrays.
         """
         data = self.output_obj.data[integ, :, :, :]
 
@@ -814,10 +842,10 @@ class DataSet:
         any_saturated = np.any(mask)
         if any_saturated:
             # Traps that were filled due to the saturated portion of the ramp.
-            filled[mask] = self.predict_saturation_capture(
+            filled[..., mask] = self.predict_saturation_capture(
                 capture_param_k,
                 trap_density[mask],
-                ramp_traps_filled[mask],
+                ramp_traps_filled[..., mask],
                 sattime[mask],
                 sat_count[mask],
                 ngroups,
@@ -845,6 +873,7 @@ class DataSet:
             three separate columns but just one row; the row corresponds
             to the current trap family.  (The _k in the variable name
             indicates that the values are for one trap family.)
+            These may also be 1-D arrays, with one value per trap family.
 
         trap_density : ndarray, 2-D
             Image of the total number of traps per pixel.
@@ -865,12 +894,14 @@ class DataSet:
         ndarray, 2-D
             The computed traps_filled at the end of the integration.
         """
-        (par0, par1, par2) = capture_param_k
-        if par1 == 0:
-            log.error("Capture parameter is zero; parameters are %g, %g, %g", par0, par1, par2)
-            tau = 1.0e10  # arbitrary "big" number
-        else:
-            tau = 1.0 / abs(par1)
+        (par0, par1, par2) = (per_family(par, np.ndim(trap_density)) for par in capture_param_k)
+        zero = par1 == 0
+        if np.any(zero):
+            for pars in zip(*(np.ravel(par) for par in (par0, par1, par2)), strict=True):
+                if pars[1] == 0:
+                    log.error("Capture parameter is zero; parameters are %g, %g, %g", *pars)
+        with np.errstate(divide="ignore"):
+            tau = np.where(zero, 1.0e10, 1.0 / abs(par1))  # arbitrary "big" number
 
         traps_filled = (
             trap_density
@@ -902,6 +933,9 @@ class DataSet:
         were all 2-D arrays in the calling function `predict_capture`, but
         these arrays have been masked to select only ramps with at least
         one saturated group, so in this function these arrays are 1-D.
+        If the capture parameters are arrays, with one value per trap
+        family, `incoming_filled_traps` has the trap family along an
+        additional first axis.
 
         Parameters
         ----------
@@ -933,13 +967,13 @@ class DataSet:
         ndarray, 2-D
             The computed traps_filled at the end of the integration.
         """
-        (par0, par1, par2) = capture_param_k
+        (par0, par1, par2) = (per_family(par, np.ndim(trap_density)) for par in capture_param_k)
         par1 = abs(par1)  # the minus sign will be specified explicitly
 
         # For each pixel that had no ramp before saturation, fill all the
         # instantaneous traps; otherwise, they were filled during the ramp.
         flag = sat_count == ngroups
-        incoming_filled_traps[flag] = trap_density[flag] * par2
+        incoming_filled_traps[..., flag] = trap_density[flag] * par2
 
         # Find out how many exponential traps have already been filled.
         exp_filled_traps = incoming_filled_traps - trap_density * par2
@@ -976,6 +1010,7 @@ class DataSet:
             three separate columns but just one row; the row corresponds
             to the current trap family.  (The _k in the variable name
             indicates that the values are for one trap family.)
+            These may also be 1-D arrays, with one value per trap family.
 
         trap_density : ndarray, 2-D
             Image of the total number of traps per pixel.
@@ -998,13 +1033,15 @@ class DataSet:
 
         Returns
         -------
-        ndarray, 2-D
-            The computed cr_filled at the end of the integration.
+        ndarray, 2-D or 3-D
+            The computed cr_filled at the end of the integration, with
+            the trap family along the first axis if `capture_param_k`
+            holds arrays.
         """
-        (par0, par1, par2) = capture_param_k
+        (par0, par1, par2) = (per_family(par, 1) for par in capture_param_k)
         # cr_filled will be incremented group-by-group, depending on
         # where cosmic rays were found in each group.
-        cr_filled = np.zeros_like(trap_density)
+        cr_filled = np.zeros(np.shape(capture_param_k[0]) + trap_density.shape, trap_density.dtype)
         data = self.output_obj.data[integ, :, :, :]
         gdq = self.output_obj.groupdq[integ, :, :, :]
         gdqflags = dqflags.group
@@ -1027,14 +1064,17 @@ class DataSet:
                     - grp_slope[cr_flag]
                 )
                 jump = np.where(jump < 0.0, 0.0, jump)
-                cr_filled[cr_flag] += (
-                    trap_density[cr_flag] * jump * (par0 * (1.0 - math.exp(par1 * delta_t)) + par2)
+                # The exponential is computed in double precision.
+                fraction = 1.0 - np.exp(par1 * delta_t, dtype=np.float64)
+                fraction = fraction.astype(np.result_type(par1, delta_t), copy=False)
+                cr_filled[..., cr_flag[0], cr_flag[1]] += (
+                    trap_density[cr_flag] * jump * (par0 * fraction + par2)
                 )
 
         cr_filled *= SCALEFACTOR
         return cr_filled
 
-    def compute_decay(self, traps_filled, decay_param, delta_t):
+    def compute_decay(self, traps_filled, decay_param, delta_t, out=None):
         """
         Compute the number of trap decays.
 
@@ -1042,29 +1082,38 @@ class DataSet:
 
         Parameters
         ----------
-        traps_filled : ndarray, 2-D
+        traps_filled : ndarray, 2-D or 3-D
             This is an image of the number of filled traps in each pixel
-            for the current trap family.
+            for the current trap family, or a stack of such images with
+            one plane for each trap family.
 
-        decay_param : float
+        decay_param : float or ndarray
             The decay parameter.  This is negative, but otherwise it's
             the reciprocal of the e-folding time for trap decay for the
-            current trap family.
+            current trap family.  This is a 1-D array, with one value per
+            trap family, if `traps_filled` is 3-D.
 
         delta_t : float
             The time interval (unit = second) over which the trap decay
             is to be computed.
 
+        out : ndarray, optional
+            Array in which to store the result, with the same shape as
+            `traps_filled`.
+
         Returns
         -------
-        decayed : ndarray, 2-D
+        decayed : ndarray, 2-D or 3-D
             Image of the computed number of trap decays for each pixel,
-            for the current trap family.
+            for the current trap family or for each trap family.
         """
-        if decay_param == 0.0:
-            decayed = traps_filled * 0.0
-        else:
+        decay_param = per_family(decay_param, 2)
+        zero = decay_param == 0.0
+        with np.errstate(divide="ignore"):
             tau = 1.0 / abs(decay_param)
-            decayed = traps_filled * (1.0 - math.exp(-delta_t / tau))
+            # The exponential is computed in double precision.
+            fraction = np.where(zero, 0.0, 1.0 - np.exp(-delta_t / tau, dtype=np.float64))
+        fraction = fraction.astype(np.result_type(traps_filled, 0.0), copy=False)
+        decayed = np.multiply(traps_filled, fraction, out=out)
 
         return decayed
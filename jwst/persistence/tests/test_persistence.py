@@ -214,3 +214,52 @@ def test_do_all(
     assert np.allclose(
         output_trapsfilled_model.data[0, 100, 100], 0.0010368865, rtol=1.0e-7, atol=1.0e-7
     )
+
+
+def test_compute_decay_families():
+    """Test that the decays of all trap families match those of each family."""
+    ds = persistence.DataSet(None, None, 40.0, False, None, None, None)
+    rng = np.random.default_rng(42)
+    traps_filled = rng.uniform(0.0, 100.0, (3, 5, 4)).astype(np.float32)
+    decay_params = np.array([-0.01, -0.001, 0.0])
+
+    decayed = ds.compute_decay(traps_filled, decay_params, 21.47354)
+
+    assert decayed.dtype == np.float32
+    for k in range(3):
+        np.testing.assert_array_equal(
+            decayed[k], ds.compute_decay(traps_filled[k], decay_params[k], 21.47354)
+        )
+    np.testing.assert_array_equal(decayed[2], 0.0)
+
+
+def test_predict_capture_families(create_sci_model, generate_trap_pars):
+    """Test that the traps filled for all trap families match those of each family."""
+    input_model = create_sci_model(1, 6, 10, 12, 1, 1)
+    rng = np.random.default_rng(42)
+    input_model.data = np.cumsum(rng.uniform(5.0, 10.0, input_model.data.shape), axis=1).astype(
+        np.float32
+    )
+    # pixels saturated in some or all groups, and a jump
+    input_model.data[0, 3:, 2, 3] = 100.0
+    input_model.data[0, :, 4, 5] = 100.0
+    input_model.data[0, 4:, 6, 7] += 20.0
+    input_model.groupdq[0, 4, 6, 7] = datamodels.dqflags.group["JUMP_DET"]
+    persistencesat_model = datamodels.PersistenceSatModel(
+        data=np.full((10, 12), 40.0, dtype=np.float32)
+    )
+    trap_density = rng.uniform(0.0, 0.01, (10, 12)).astype(np.float32)
+    ds = persistence.DataSet(input_model, None, 40.0, False, None, None, persistencesat_model)
+    ds.get_group_info(0)
+    grp_slope, slope = ds.compute_slope(0)
+    pars = generate_trap_pars
+
+    filled = ds.predict_capture(pars[0:3], trap_density, 0, grp_slope, slope)
+
+    assert filled.shape == (3, 10, 12)
+    for k in range(3):
+        np.testing.assert_allclose(
+            filled[k],
+            ds.predict_capture(ds.get_capture_param(pars, k), trap_density, 0, grp_slope, slope),
+            rtol=1e-12,
+        )
@@ -8,7 +8,7 @@ from stdatamodels.jwst import datamodels
 from stdatamodels.jwst.datamodels import dqflags
 
 from jwst.lib.dispaxis import get_dispersion_direction
-from jwst.lib.pipe_utils import match_nans_and_flags
+from jwst.lib.pipe_utils import map_slits, match_nans_and_flags
 from jwst.lib.wcs_utils import get_wavelengths
 from jwst.photom import time_dependence
 
@@ -102,6 +102,7 @@ class DataSet:
         source_type=None,
         apply_time_correction=True,
         correction_pars=None,
+        maximum_cores="1",
     ):
         """
         Instantiate a DataSet object.
@@ -118,6 +119,9 @@ class DataSet:
             Switch to apply/not apply a time correction, if available.
         correction_pars : dict
             Correction meta-data from a previous run.
+        maximum_cores : str
+            Number of threads to use for calibrating NIRSpec MOS slits
+            in parallel. Can be an integer, 'none', 'quarter', 'half', or 'all'.
         """
         # Set up attributes necessary for calculation.
         if correction_pars:
@@ -159,6 +163,7 @@ class DataSet:
         self.inverse = inverse
         self.source_type = None
         self.apply_time_correction = apply_time_correction
+        self.maximum_cores = maximum_cores
 
         # For MultiSlitModels, only set a generic source_type value for the
         # entire datamodel if the user has set the source_type parameter.
@@ -286,12 +291,19 @@ class DataSet:
 
             # MSA (MOS) data
             if isinstance(self.input, datamodels.MultiSlitModel) and self.exptype == "NRS_MSASPEC":
-                # Loop over the MSA slits, applying the same photom
-                # ref data to all slits
-                for slit in self.input.slits:
-                    log.info(f"Working on slit {slit.name}")
-                    self.slitnum += 1
-                    self.photom_io(ftab.phot_table[row], time_correction=correction_table[row])
+                # Apply the same photom ref data to all MSA slits
+                nslits = len(self.input.slits)
+                map_slits(
+                    functools.partial(
+                        self._photom_io_slit,
+                        tabdata=ftab.phot_table[row],
+                        time_correction=correction_table[row],
+                    ),
+                    self.input.slits,
+                    range(self.slitnum + 1, self.slitnum + 1 + nslits),
+                    maximum_cores=self.maximum_cores,
+                )
+                self.slitnum += nslits
 
             # IFU data
             else:
@@ -729,7 +741,25 @@ class DataSet:
 
         return wave2d, area2d, dqmap
 
-    def photom_io(self, tabdata, order=None, time_correction=None):
+    def _photom_io_slit(self, slit, slitnum, tabdata, time_correction=None):
+        """
+        Apply photometric conversion factors to a single slit.
+
+        Parameters
+        ----------
+        slit : `~jwst.datamodels.SlitModel`
+            The slit to calibrate.
+        slitnum : int
+            The index of the slit in the input model.
+        tabdata : FITS record
+            Single row of data from reference table.
+        time_correction : float or None
+            Multiplicative correction for time dependence.
+        """
+        log.info(f"Working on slit {slit.name}")
+        self.photom_io(tabdata, time_correction=time_correction, slitnum=slitnum)
+
+    def photom_io(self, tabdata, order=None, time_correction=None, slitnum=None):
         """
         Combine photometric conversion factors and apply to the science dataset.
 
@@ -745,7 +775,13 @@ class DataSet:
             recorded on the zero-day MJD (t0).  The scalar conversion factor
             will be divided by the correction value if provided, and if
             ``self.apply_time_correction`` is True.
+        slitnum : int or None
+            Index of the slit to calibrate, for MultiSlitModel inputs.
+            If None, ``self.slitnum`` is used.
         """
+        if slitnum is None:
+            slitnum = self.slitnum
+
         # First get the scalar conversion factor.
         # For most modes, the scalar conversion factor in the photom reference
         # file is in units of (MJy / sr) / (DN / s), and the output from
@@ -763,7 +799,7 @@ class DataSet:
         except KeyError:
             conversion = tabdata["photmj"]  # unit is MJy
             if isinstance(self.input, datamodels.MultiSlitModel):
-                slit = self.input.slits[self.slitnum]
+                slit = self.input.slits[slitnum]
                 if self.exptype in ["NRS_MSASPEC", "NRS_FIXEDSLIT"]:
                     srctype = self.source_type if self.source_type else slit.source_type
                 else:
@@ -804,8 +840,8 @@ class DataSet:
         # Store the conversion factor in the meta data
         log.info(f"PHOTMJSR value: {conversion:.6g}")
         if isinstance(self.input, datamodels.MultiSlitModel):
-            self.input.slits[self.slitnum].meta.photometry.conversion_megajanskys = conversion
-            self.input.slits[self.slitnum].meta.photometry.conversion_microjanskys = (
+            self.input.slits[slitnum].meta.photometry.conversion_megajanskys = conversion
+            self.input.slits[slitnum].meta.photometry.conversion_microjanskys = (
                 conversion * MJSR_TO_UJA2
             )
         elif isinstance(self.input, datamodels.TSOMultiSpecModel):
@@ -859,7 +895,7 @@ class DataSet:
 
             # Compute a 2-D grid of conversion factors, as a function of wavelength
             if isinstance(self.input, datamodels.MultiSlitModel):
-                slit = self.input.slits[self.slitnum]
+                slit = self.input.slits[slitnum]
                 # The NIRSpec fixed-slit primary slit needs special handling if
                 # it contains a point source
                 if self.exptype.upper() == "NRS_FIXEDSLIT" and slit.source_type.upper() == "POINT":
@@ -927,7 +963,7 @@ class DataSet:
                     )
         # Apply the conversion to the data and all uncertainty arrays
         if isinstance(self.input, datamodels.MultiSlitModel):
-            slit = self.input.slits[self.slitnum]
+            slit = self.input.slits[slitnum]
             conversion_squared = conversion * conversion
             if not self.inverse:
                 slit.data *= conversion
@@ -19,6 +19,7 @@ class PhotomStep(Step):
         inverse = boolean(default=False)    # Invert the operation
         source_type = string(default=None)  # Process as specified source type
         apply_time_correction = boolean(default=True) # Apply time dependent corrections if available
+        maximum_cores = string(default='1')  # threads for NIRSpec MOS slits. Can be an integer, 'half', 'quarter', or 'all'
     """  # noqa: E501
 
     reference_file_types = ["photom", "area"]
@@ -94,6 +95,7 @@ class PhotomStep(Step):
                     self.source_type,
                     self.apply_time_correction,
                     correction_pars,
+                    maximum_cores=self.maximum_cores,
                 )
                 result = phot.apply_photom(phot_filename, area_filename)
                 result.meta.cal_step.photom = "COMPLETE"
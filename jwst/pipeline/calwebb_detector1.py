@@ -1,7 +1,10 @@
 #!/usr/bin/env python
 import logging
 
+import numpy as np
+from stcal.ramp_fitting.likely_fit import LIKELY_MIN_NGROUPS
 from stdatamodels.jwst import datamodels
+from stdatamodels.jwst.datamodels import dqflags
 
 from jwst.charge_migration import charge_migration_step
 from jwst.clean_flicker_noise import clean_flicker_noise_step
@@ -47,6 +50,7 @@ class Detector1Pipeline(Pipeline):
 
     spec = """
         save_calibrated_ramp = boolean(default=False)
+        integration_chunk_size = integer(default=0, min=0) # Number of integrations processed at a time; 0 processes the full exposure
     """  # noqa: E501
 
     # Define aliases to steps
@@ -96,6 +100,68 @@ class Detector1Pipeline(Pipeline):
         self.dark_current.output_dir = self.output_dir
         self.ramp_fit.output_dir = self.output_dir
 
+        chunk_size = self.integration_chunk_size
+        if chunk_size and chunk_size < input_data.data.shape[0]:
+            if self.ramp_fit.skip:
+                log.warning("ramp_fit is skipped; processing the full exposure at once")
+                chunk_size = 0
+            elif (
+                self.ramp_fit.algorithm.upper() == "LIKELY"
+                and input_data.data.shape[1] >= LIKELY_MIN_NGROUPS
+            ):
+                # chunk rates are combined with the OLS weighting
+                log.warning(
+                    "Integration chunks are not supported with the LIKELY ramp fitting "
+                    "algorithm; processing the full exposure at once"
+                )
+                chunk_size = 0
+
+        if chunk_size and chunk_size < input_data.data.shape[0]:
+            input_data, ints_model = self.fit_integration_chunks(input_data, chunk_size)
+        else:
+            input_data = self.calibrate_ramp(input_data)
+
+            # save the corrected ramp data, if requested
+            if self.save_calibrated_ramp:
+                self.save_model(input_data, "ramp")
+
+            input_data, ints_model = self.fit_ramp(input_data)
+
+        # apply the gain_scale step to the exposure-level product
+        if input_data is not None:
+            self.gain_scale.suffix = "gain_scale"
+            input_data = self.gain_scale.run(input_data)
+        else:
+            log.info("NoneType returned from ramp_fit.  Gain Scale step skipped.")
+
+        # apply the gain scale step to the multi-integration product,
+        # if it exists, and then save it
+        if ints_model is not None:
+            self.gain_scale.suffix = "gain_scaleints"
+            ints_model = self.gain_scale.run(ints_model)
+            self.save_model(ints_model, "rateints")
+
+        # setup output_file for saving
+        self.setup_output(input_data)
+
+        log.info("... ending calwebb_detector1")
+
+        return input_data
+
+    def calibrate_ramp(self, input_data):
+        """
+        Run the steps preceding ramp fitting on the ramp data.
+
+        Parameters
+        ----------
+        input_data : `~stdatamodels.jwst.datamodels.RampModel`
+            The raw ramp data.
+
+        Returns
+        -------
+        `~stdatamodels.jwst.datamodels.RampModel`
+            The corrected ramp data.
+        """
         instrument = input_data.meta.instrument.name
         if instrument == "MIRI":
             # process MIRI exposures;
@@ -145,41 +211,93 @@ class Detector1Pipeline(Pipeline):
         # apply the clean_flicker_noise step
         input_data = self.clean_flicker_noise.run(input_data)
 
-        # save the corrected ramp data, if requested
-        if self.save_calibrated_ramp:
-            self.save_model(input_data, "ramp")
+        return input_data
+
+    def fit_ramp(self, input_data):
+        """
+        Run the ramp_fit step on the corrected ramp data.
+
+        Parameters
+        ----------
+        input_data : `~stdatamodels.jwst.datamodels.RampModel`
+            The corrected ramp data.
 
-        # apply the ramp_fit step
+        Returns
+        -------
+        input_data : `~stdatamodels.jwst.datamodels.JwstDataModel` or None
+            The exposure-level rate product, or the input ramp if ramp_fit is skipped.
+        ints_model : `~stdatamodels.jwst.datamodels.CubeModel` or None
+            The integration-level rate product.
+        """
         # This explicit test on self.ramp_fit.skip is a temporary workaround
         # to fix the problem that the ramp_fit step ordinarily returns two
         # objects, but when the step is skipped due to `skip = True`,
         # only the input is returned when the step is invoked.
         if self.ramp_fit.skip:
-            input_data = self.ramp_fit.run(input_data)
-            ints_model = None
-        else:
-            input_data, ints_model = self.ramp_fit.run(input_data)
+            return self.ramp_fit.run(input_data), None
+        return self.ramp_fit.run(input_data)
 
-        # apply the gain_scale step to the exposure-level product
-        if input_data is not None:
-            self.gain_scale.suffix = "gain_scale"
-            input_data = self.gain_scale.run(input_data)
-        else:
-            log.info("NoneType returned from ramp_fit.  Gain Scale step skipped.")
-
-        # apply the gain scale step to the multi-integration product,
-        # if it exists, and then save it
-        if ints_model is not None:
-            self.gain_scale.suffix = "gain_scaleints"
-            ints_model = self.gain_scale.run(ints_model)
-            self.save_model(ints_model, "rateints")
+    def fit_integration_chunks(self, input_data, chunk_size):
+        """
+        Calibrate and fit the ramps in chunks of integrations.
 
-        # setup output_file for saving
-        self.setup_output(input_data)
+        Each chunk is processed through all the steps up to ramp_fit as an
+        exposure segment holding those integrations, and its integration-level
+        rates are copied into the output as soon as it is done, so only one
+        chunk of corrected ramps is held in memory at a time.  The exposure-level
+        rate is combined from the chunk rates with the same read noise weighting
+        the OLS ramp fit uses to combine integrations.  Integrations of chunks
+        that cannot be fit are set to NaN and flagged DO_NOT_USE.
 
-        log.info("... ending calwebb_detector1")
+        Parameters
+        ----------
+        input_data : `~stdatamodels.jwst.datamodels.RampModel`
+            The raw ramp data.
+        chunk_size : int
+            The number of integrations in each chunk.
 
-        return input_data
+        Returns
+        -------
+        rate_model : `~stdatamodels.jwst.datamodels.JwstDataModel` or None
+            The exposure-level rate product.
+        ints_model : `~stdatamodels.jwst.datamodels.CubeModel` or None
+            The integration-level rate product.
+        """
+        nints = input_data.data.shape[0]
+        rates = []
+        ints_model = None
+        for idx, start in enumerate(range(0, nints, chunk_size)):
+            end = min(start + chunk_size, nints)
+            log.info("Processing integrations %d to %d of %d", start + 1, end, nints)
+
+            chunk = self.calibrate_ramp(integration_chunk(input_data, start, end))
+            if self.save_calibrated_ramp:
+                self.save_model(chunk, "ramp", idx=idx)
+
+            rate, chunk_ints = self.fit_ramp(chunk)
+            del chunk
+            if rate is None:
+                log.warning("Integrations %d to %d could not be fit", start + 1, end)
+                continue
+            rates.append(rate)
+
+            if ints_model is None:
+                ints_model = _allocate_ints_model(chunk_ints, input_data)
+            for name in _RATEINTS_ARRAYS:
+                getattr(ints_model, name)[start:end] = getattr(chunk_ints, name)
+            chunk_ints.close()
+
+        if not rates:
+            return None, None
+
+        rate_model = rates[0]
+        combine_chunk_rates(rates, rate_model)
+        for rate in rates[1:]:
+            rate.close()
+        for model in (rate_model, ints_model):
+            model.meta.exposure.integration_start = input_data.meta.exposure.integration_start
+            model.meta.exposure.integration_end = input_data.meta.exposure.integration_end
+        return rate_model, ints_model
 
     def setup_output(self, input_data):
         """
@@ -197,3 +315,123 @@ class Detector1Pipeline(Pipeline):
             self.suffix = "rate"
         else:
             self.suffix = "ramp"
+
+
+# Arrays of the integration-level rate product
+_RATEINTS_ARRAYS = ["data", "dq", "err", "var_poisson", "var_rnoise"]
+
+
+def integration_chunk(input_data, start, end):
+    """
+    Copy a range of integrations of a ramp into a new exposure segment.
+
+    Parameters
+    ----------
+    input_data : `~stdatamodels.jwst.datamodels.RampModel`
+        The full ramp data.
+    start, end : int
+        The range of integrations to copy, as zero-based indices into the data.
+
+    Returns
+    -------
+    `~stdatamodels.jwst.datamodels.RampModel`
+        The ramp data for the integrations, with the segment integration range
+        set in ``meta.exposure`` so that the steps treat it as a segmented exposure.
+    """
+    chunk = datamodels.RampModel(
+        data=input_data.data[start:end].copy(),
+        pixeldq=input_data.pixeldq.copy(),
+        groupdq=input_data.groupdq[start:end].copy(),
+    )
+    chunk.update(input_data)
+    for name in ("zeroframe", "refout"):
+        if input_data.hasattr(name):
+            setattr(chunk, name, getattr(input_data, name)[start:end].copy())
+    if input_data.hasattr("group"):
+        chunk.group = input_data.group
+
+    int_start = input_data.meta.exposure.integration_start or 1
+    chunk.meta.exposure.integration_start = int_start + start
+    chunk.meta.exposure.integration_end = int_start + end - 1
+    if input_data.hasattr("int_times") and len(input_data.int_times) > 0:
+        int_num = input_data.int_times["integration_number"]
+        in_chunk = (int_num >= int_start + start) & (int_num < int_start + end)
+        chunk.int_times = input_data.int_times[in_chunk]
+    return chunk
+
+
+def combine_chunk_rates(rates, output):
+    """
+    Combine the exposure-level rates of integration chunks.
+
+    The slopes are weighted by their inverse read noise variance and the
+    variances are combined in inverse, as the OLS ramp fit combines the
+    integrations of an exposure.  The DQ flags are combined, except
+    DO_NOT_USE, which is only set where it is set for all the chunks.
+
+    Parameters
+    ----------
+    rates : list of `~stdatamodels.jwst.datamodels.ImageModel`
+        The exposure-level rates of the chunks.
+    output : `~stdatamodels.jwst.datamodels.ImageModel`
+        The model updated in place with the combined rate.
+    """
+    shape = rates[0].data.shape
+    slope_sum = np.zeros(shape)
+    invvar_r = np.zeros(shape)
+    invvar_p = np.zeros(shape)
+    dq = np.zeros(shape, dtype=np.uint32)
+    do_not_use = np.full(shape, dqflags.pixel["DO_NOT_USE"], dtype=np.uint32)
+    for rate in rates:
+        valid = np.isfinite(rate.data) & (rate.var_rnoise > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weight = np.where(valid, 1.0 / rate.var_rnoise, 0.0)
+            invvar_p += np.where(valid & (rate.var_poisson > 0), 1.0 / rate.var_poisson, 0.0)
+        slope_sum += np.where(valid, rate.data * weight, 0.0)
+        invvar_r += weight
+        dq |= rate.dq
+        do_not_use &= rate.dq
+
+    dq &= ~np.uint32(dqflags.pixel["DO_NOT_USE"])
+    dq |= do_not_use
+    good = invvar_r > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        var_rnoise = np.where(good, 1.0 / invvar_r, 0.0)
+        var_poisson = np.where(good & (invvar_p > 0), 1.0 / invvar_p, 0.0)
+        slope = np.where(good, slope_sum * var_rnoise, np.nan)
+
+    output.data = slope.astype(np.float32)
+    output.dq = dq
+    output.var_poisson = var_poisson.astype(np.float32)
+    output.var_rnoise = var_rnoise.astype(np.float32)
+    output.err = np.sqrt(var_poisson + var_rnoise).astype(np.float32)
+
+
+def _allocate_ints_model(chunk_ints, input_data):
+    """
+    Create the integration-level rate product for all the integrations.
+
+    Parameters
+    ----------
+    chunk_ints : `~stdatamodels.jwst.datamodels.CubeModel`
+        The integration-level rate product of the first chunk.
+    input_data : `~stdatamodels.jwst.datamodels.RampModel`
+        The full ramp data.
+
+    Returns
+    -------
+    `~stdatamodels.jwst.datamodels.CubeModel`
+        The integration-level rate product, with all integrations set to NaN
+        and flagged DO_NOT_USE until the rates of their chunk are copied in.
+    """
+    nints = input_data.data.shape[0]
+    arrays = {}
+    for name in _RATEINTS_ARRAYS:
+        chunk_array = getattr(chunk_ints, name)
+        fill_value = dqflags.pixel["DO_NOT_USE"] if name == "dq" else np.nan
+        arrays[name] = np.full((nints, *chunk_array.shape[1:]), fill_value, dtype=chunk_array.dtype)
+    ints_model = datamodels.CubeModel(**arrays)
+    ints_model.update(chunk_ints)
+    if input_data.hasattr("int_times"):
+        ints_model.int_times = input_data.int_times
+    return ints_model
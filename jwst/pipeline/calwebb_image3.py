@@ -1,4 +1,5 @@
 import logging
+import tempfile
 from collections.abc import Sequence
 
 from stdatamodels.jwst import datamodels
@@ -63,6 +64,14 @@ class Image3Pipeline(Pipeline):
 
         self.source_catalog.save_results = self.save_results
 
+        # Let resample reuse the pixel maps cached on disk by outlier detection
+        temp_dir = None
+        if self.outlier_detection.pixmap_cache == "disk" and self.resample.pixmap_cache_dir is None:
+            if self.outlier_detection.pixmap_cache_dir is None:
+                temp_dir = tempfile.TemporaryDirectory(prefix="pixmap_cache_")
+                self.outlier_detection.pixmap_cache_dir = temp_dir.name
+            self.resample.pixmap_cache_dir = self.outlier_detection.pixmap_cache_dir
+
         # Only load science members from input ASN;
         # background and target-acq members are not needed.
         input_models = self._load_input_as_library(input_data)
@@ -96,6 +105,8 @@ class Image3Pipeline(Pipeline):
 
         result = self.resample.run(input_models)
         del input_models
+        if temp_dir is not None:
+            temp_dir.cleanup()
         if (
             isinstance(result, datamodels.ImageModel)
             and result.meta.cal_step.resample == "COMPLETE"
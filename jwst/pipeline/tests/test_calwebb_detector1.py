@@ -0,0 +1,199 @@
+import numpy as np
+import pytest
+from stdatamodels.jwst import datamodels
+from stdatamodels.jwst.datamodels import dqflags
+
+from jwst.lib.tests.test_reffile_utils import generate_test_refmodel_metadata
+from jwst.pipeline.calwebb_detector1 import (
+    Detector1Pipeline,
+    combine_chunk_rates,
+    integration_chunk,
+)
+
+
+def make_ramp(nints=5, ngroups=4, ny=6, nx=7):
+    ramp = datamodels.RampModel((nints, ngroups, ny, nx))
+    ramp.data = np.arange(ramp.data.size, dtype=np.float32).reshape(ramp.data.shape)
+    ramp.meta.exposure.nints = nints
+    ramp.meta.exposure.ngroups = ngroups
+    int_times = np.zeros(nints, dtype=ramp.int_times.dtype)
+    int_times["integration_number"] = np.arange(nints) + 1
+    ramp.int_times = int_times
+    return ramp
+
+
+def make_miri_ramp(nints=5, ngroups=6, ny=8, nx=9):
+    rng = np.random.default_rng(42)
+    ramp = make_ramp(nints=nints, ngroups=ngroups, ny=ny, nx=nx)
+    ramp.meta.filename = "test_uncal.fits"
+    slopes = rng.uniform(10.0, 100.0, size=(nints, 1, ny, nx))
+    groups = np.arange(1, ngroups + 1)[:, np.newaxis, np.newaxis]
+    noise = rng.normal(0.0, 5.0, size=ramp.data.shape)
+    ramp.data = (slopes * groups + noise).astype(np.float32)
+    ramp.meta.instrument.name = "MIRI"
+    ramp.meta.instrument.detector = "MIRIMAGE"
+    ramp.meta.exposure.type = "MIR_IMAGE"
+    ramp.meta.exposure.readpatt = "FASTR1"
+    ramp.meta.exposure.nframes = 1
+    ramp.meta.exposure.groupgap = 0
+    ramp.meta.exposure.frame_time = 2.0
+    ramp.meta.exposure.group_time = 2.0
+    ramp.meta.subarray.name = "FULL"
+    ramp.meta.subarray.xstart = 1
+    ramp.meta.subarray.ystart = 1
+    ramp.meta.subarray.xsize = nx
+    ramp.meta.subarray.ysize = ny
+    return ramp
+
+
+def make_ramp_fit_reffiles(ramp, output_dir):
+    shape = ramp.data.shape[-2:]
+    reffiles = []
+    for model_class, value, name in [
+        (datamodels.GainModel, 5.5, "gain.fits"),
+        (datamodels.ReadnoiseModel, 7.0, "readnoise.fits"),
+    ]:
+        model = model_class(data=np.full(shape, value, dtype=np.float32))
+        model.meta.instrument.name = "MIRI"
+        model.meta.subarray.name = "FULL"
+        model.meta.subarray.xstart = 1
+        model.meta.subarray.ystart = 1
+        model.meta.subarray.xsize = shape[1]
+        model.meta.subarray.ysize = shape[0]
+        generate_test_refmodel_metadata(model)
+        model.save(output_dir / name)
+        reffiles.append(str(output_dir / name))
+    return reffiles
+
+
+def run_detector1(ramp, output_dir, ramp_fit_pars=None, **kwargs):
+    output_dir.mkdir()
+    gain, readnoise = make_ramp_fit_reffiles(ramp, output_dir)
+    steps = {name: {"skip": True} for name in Detector1Pipeline.step_defs}
+    steps["ramp_fit"] = {"override_gain": gain, "override_readnoise": readnoise}
+    steps["ramp_fit"].update(ramp_fit_pars or {})
+
+    pipeline = Detector1Pipeline(steps=steps, output_dir=str(output_dir), **kwargs)
+    pipeline.save_results = True
+    pipeline.run(ramp.copy())
+    rate = datamodels.ImageModel(output_dir / "test_rate.fits")
+    ints = datamodels.CubeModel(output_dir / "test_rateints.fits")
+    return rate, ints
+
+
+@pytest.mark.parametrize("integration_start", [None, 11])
+def test_integration_chunk(integration_start):
+    ramp = make_ramp()
+    ramp.meta.exposure.integration_start = integration_start
+    if integration_start is not None:
+        ramp.int_times["integration_number"] += integration_start - 1
+    first = integration_start or 1
+
+    chunk = integration_chunk(ramp, 2, 4)
+
+    np.testing.assert_array_equal(chunk.data, ramp.data[2:4])
+    assert chunk.meta.exposure.nints == 5
+    assert chunk.meta.exposure.integration_start == first + 2
+    assert chunk.meta.exposure.integration_end == first + 3
+    np.testing.assert_array_equal(chunk.int_times["integration_number"], [first + 2, first + 3])
+
+    # the chunk does not share memory with the input
+    chunk.data[:] = -1
+    chunk.pixeldq[:] = 1
+    assert np.all(ramp.data[2:4] >= 0)
+    assert np.all(ramp.pixeldq == 0)
+
+
+def test_combine_chunk_rates():
+    shape = (3, 4)
+    rates = []
+    for slope, var_rnoise, dq in [(1.0, 1.0, 0), (4.0, 0.5, dqflags.pixel["JUMP_DET"])]:
+        rate = datamodels.ImageModel(shape)
+        rate.data[:] = slope
+        rate.var_rnoise = np.full(shape, var_rnoise, dtype=np.float32)
+        rate.var_poisson = np.full(shape, 2.0, dtype=np.float32)
+        rate.dq[:] = dq
+        rates.append(rate)
+
+    # one chunk has no valid data in the first pixel
+    rates[1].data[0, 0] = np.nan
+    rates[1].var_rnoise[0, 0] = 0.0
+    rates[1].dq[0, 0] = dqflags.pixel["DO_NOT_USE"]
+    # neither chunk has valid data in the last pixel
+    for rate in rates:
+        rate.data[-1, -1] = np.nan
+        rate.dq[-1, -1] = dqflags.pixel["DO_NOT_USE"]
+
+    output = datamodels.ImageModel(shape)
+    combine_chunk_rates(rates, output)
+
+    assert output.data[1, 1] == pytest.approx((1.0 / 1.0 + 4.0 / 0.5) / (1.0 + 2.0))
+    assert output.var_rnoise[1, 1] == pytest.approx(1.0 / 3.0)
+    assert output.var_poisson[1, 1] == pytest.approx(1.0)
+    assert output.err[1, 1] == pytest.approx(np.sqrt(1.0 + 1.0 / 3.0))
+    assert output.dq[1, 1] == dqflags.pixel["JUMP_DET"]
+
+    assert output.data[0, 0] == 1.0
+    assert output.var_rnoise[0, 0] == 1.0
+    assert output.dq[0, 0] == 0
+
+    assert np.isnan(output.data[-1, -1])
+    assert output.err[-1, -1] == 0
+    assert output.dq[-1, -1] & dqflags.pixel["DO_NOT_USE"]
+
+
+@pytest.mark.parametrize("chunk_size", [2, 4])
+def test_integration_chunks_match_full_exposure(tmp_path, chunk_size):
+    ramp = make_miri_ramp()
+    expected, expected_ints = run_detector1(ramp, tmp_path / "full")
+    rate, ints = run_detector1(ramp, tmp_path / "chunks", integration_chunk_size=chunk_size)
+
+    assert rate.meta.cal_step.ramp_fit == "COMPLETE"
+    assert ints.data.shape == expected_ints.data.shape
+    for name in ["data", "dq", "var_rnoise"]:
+        np.testing.assert_allclose(getattr(ints, name), getattr(expected_ints, name), rtol=1e-6)
+        np.testing.assert_allclose(getattr(rate, name), getattr(expected, name), rtol=1e-6)
+
+    # the Poisson variance is estimated from the rates of each chunk,
+    # as for an exposure split into segments
+    segment = integration_chunk(ramp, 0, chunk_size)
+    _, segment_ints = run_detector1(segment, tmp_path / "segment")
+    np.testing.assert_allclose(ints.var_poisson[:chunk_size], segment_ints.var_poisson, rtol=1e-6)
+
+
+def test_integration_chunk_fit_fails(tmp_path):
+    ramp = make_miri_ramp()
+    # all groups of the second chunk are saturated, so it cannot be fit
+    ramp.groupdq[2:4] = dqflags.group["SATURATED"]
+    ramp_ok = make_miri_ramp(nints=3)
+    ramp_ok.data = ramp.data[[0, 1, 4]]
+    ramp_ok.groupdq = ramp.groupdq[[0, 1, 4]]
+    expected, expected_ints = run_detector1(ramp_ok, tmp_path / "full")
+    rate, ints = run_detector1(ramp, tmp_path / "chunks", integration_chunk_size=2)
+
+    # the integrations of the failed chunk are flagged
+    assert np.all(np.isnan(ints.data[2:4]))
+    assert np.all(np.isnan(ints.err[2:4]))
+    assert np.all(ints.dq[2:4] & dqflags.pixel["DO_NOT_USE"])
+
+    # the other integrations are used as usual
+    np.testing.assert_allclose(ints.data[[0, 1, 4]], expected_ints.data, rtol=1e-6)
+    np.testing.assert_allclose(rate.data, expected.data, rtol=1e-5)
+
+
+def test_integration_chunks_likely(tmp_path, caplog):
+    ramp = make_miri_ramp()
+    expected, expected_ints = run_detector1(
+        ramp, tmp_path / "full", ramp_fit_pars={"algorithm": "LIKELY"}
+    )
+    rate, ints = run_detector1(
+        ramp,
+        tmp_path / "chunks",
+        ramp_fit_pars={"algorithm": "LIKELY"},
+        integration_chunk_size=2,
+    )
+
+    # the full exposure is fit at once
+    assert "not supported with the LIKELY" in caplog.text
+    np.testing.assert_array_equal(rate.data, expected.data)
+    np.testing.assert_array_equal(ints.data, expected_ints.data)
@@ -1,8 +1,11 @@
 import logging
+import multiprocessing as mp
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 from astropy.stats import sigma_clipped_stats
 from scipy.ndimage import convolve1d
+from stcal.multiprocessing import compute_num_cores
 from stdatamodels.jwst.datamodels import dqflags
 
 log = logging.getLogger(__name__)
@@ -17,6 +20,8 @@ __all__ = [
     "replace_refpix",
     "flag_bad_refpix",
     "subtract_reference",
+    "subtract_sector_correction",
+    "half_spectrum",
     "fft_interp_norm",
     "ols_line",
     "remove_slopes",
@@ -26,7 +31,13 @@ __all__ = [
 
 
 def correct_model(
-    output_model, irs2_model, scipix_n_default=16, refpix_r_default=4, pad=8, preserve_refpix=False
+    output_model,
+    irs2_model,
+    scipix_n_default=16,
+    refpix_r_default=4,
+    pad=8,
+    preserve_refpix=False,
+    maximum_cores="1",
 ):
     """
     Correct an input NIRSpec IRS2 datamodel using reference pixels.
@@ -57,6 +68,11 @@ def correct_model(
         This is not used in the science pipeline, but is necessary to
         create new bias files for IRS2 mode.
 
+    maximum_cores : str
+        Number of threads used to correct the four sectors (amplifiers)
+        of each integration.  Can be an integer, 'none', 'quarter', 'half',
+        or 'all'.
+
     Returns
     -------
     output_model : ramp model
@@ -181,7 +197,15 @@ def correct_model(
         # below.  The last axis of output_model.data should be 2048.
         data0 = data[integ, :, :, :]
         data0 = subtract_reference(
-            data0, alpha, beta, irs2_mask, scipix_n, refpix_r, pad, preserve_refpix=preserve_refpix
+            data0,
+            alpha,
+            beta,
+            irs2_mask,
+            scipix_n,
+            refpix_r,
+            pad,
+            preserve_refpix=preserve_refpix,
+            maximum_cores=maximum_cores,
         )
         if not preserve_refpix:
             data[integ, :, :, nx - ny :] = data0
@@ -694,7 +718,7 @@ def flag_bad_refpix(datamodel, n_sigma=3.0, flag_only=False, replace_only=False)
 
 
 def subtract_reference(
-    data0, alpha, beta, irs2_mask, scipix_n, refpix_r, pad, preserve_refpix=False
+    data0, alpha, beta, irs2_mask, scipix_n, refpix_r, pad, preserve_refpix=False, maximum_cores="1"
 ):
     """
     Subtract reference output and pixels for the current integration.
@@ -733,6 +757,9 @@ def subtract_reference(
         If True, reference pixels will be preserved in the output.
         This is not used in the science pipeline, but is necessary to
         create new bias files for IRS2 mode.
+    maximum_cores : str
+        Number of threads used to correct the four sectors.  Can be an
+        integer, 'none', 'quarter', 'half', or 'all'.
 
     Returns
     -------
@@ -874,89 +901,34 @@ def subtract_reference(
         temp_hs = temp_hs[:, ::-1]
         hs = temp_hs.flatten()
 
-    # Construct the reference data: this is done in a big loop over the
+    # Construct the reference data: this is done separately for each of the
     # four "sectors" of data in the image, corresponding to the amp regions.
     # Data from each sector is operated on independently and ultimately
-    # the corrections are subtracted from each sector independently.
+    # the corrections are subtracted from each sector independently, so the
+    # sectors can be processed in parallel threads.
     shape_d = data0.shape
-    for k in range(1, 5):
-        log.debug(f"processing sector {k}")
-
-        # At this point in the processing data0 has shape (5, ngroups, 2048, 712),
-        # assuming normal IRS2 readout settings. r0k contains a subset of the
-        # data from 1 sector of data0, with shape (ngroups, 2048, 256)
-        r0k = np.zeros((shape_d[1], shape_d[2], shape_d[3]), dtype=np.float32)
-        temp = data0[k, :, :, hs].copy()
-        temp = np.transpose(temp, (1, 2, 0))
-        r0k[:, :, ht] = temp
-        del temp
-
-        # data0 has shape (5, ngroups, ny, row).  See the section above where
-        # d0 was created, then copied (moved) to data0.
-        # sd[1] = shape_d[3]   row (712)
-        # sd[2] = shape_d[2]   ny (2048)
-        # sd[3] = shape_d[1]   ngroups
-        # sd[4] = shape_d[0]   5
-        # s is used below, so for convenience, here are the values again:
-        # s[1] = shape[2] = nx
-        # s[2] = shape[1] = ny
-        # s[3] = shape[0] = ngroups
-
-        # IDL and numpy differ in where they apply the normalization for the
-        # FFT.  This really shouldn't matter.
-        normalization = float(shape_d[2] * shape_d[3])
-
-        # Set up refout if alpha was provided
-        refout0 = None
-        if alpha is not None:
-            # IDL:  refout0 = reform(data0[*,*,*,0], sd[1] * sd[2], sd[3])
-            refout0 = data0[0, :, :, :].reshape((shape_d[1], shape_d[2] * shape_d[3]))
-
-            # IDL:  refout0 = fft(refout0, dim=1, /over)
-            # Divide by the length of the axis to be consistent with IDL.
-            refout0 = np.fft.fft(refout0, axis=1) / normalization
-
-        # IDL:  r0 = reform(r0, sd[1] * sd[2], sd[3], 5, /over)
-        r0k = r0k.reshape((shape_d[1], shape_d[2] * shape_d[3]))
-        r0k = r0k.astype(np.complex64)
-        r0k_fft = np.fft.fft(r0k, axis=1) / normalization
-
-        # Note that where the IDL code uses alpha, we use beta, and vice versa.
-        # IDL:  for k=0,3 do oBridge[k]->Execute,
-        #           "for i=0, s3-1 do r0[*,i] *= alpha"
-        r0k_fft *= beta[k - 1]
-
-        # IDL:  for k=0,3 do oBridge[k]->Execute,
-        #           "for i=0, s3-1 do r0[*,i] += beta * refout0[*,i]"
-        if alpha is not None:
-            r0k_fft += alpha[k - 1] * refout0
+    if not preserve_refpix:
+        columns = hnorm1
+    else:
+        columns = unpad
+
+    # The data are real, so only the non-negative frequencies are computed,
+    # with the coefficients folded onto them (see `half_spectrum`).  The
+    # transform of the reference output is the same for all sectors.
+    refout_fft = None
+    if alpha is not None:
+        # IDL:  refout0 = reform(data0[*,*,*,0], sd[1] * sd[2], sd[3])
+        # IDL:  refout0 = fft(refout0, dim=1, /over)
+        refout0 = data0[0, :, :, :].reshape((shape_d[1], shape_d[2] * shape_d[3]))
+        refout_fft = np.fft.rfft(refout0, axis=1)
         del refout0
+        alpha = half_spectrum(alpha)
+    beta = half_spectrum(beta)
 
-        # IDL:  for k=0,3 do oBridge[k]->Execute,
-        #           "r0 = fft(r0, 1, dim=1, /overwrite)", /nowait
-        r0k = np.fft.ifft(r0k_fft, axis=1) * normalization
-        del r0k_fft
-
-        # sd[1] = shape_d[3]   row (712)
-        # sd[2] = shape_d[2]   ny (2048)
-        # sd[3] = shape_d[1]   ngroups
-        # sd[4] = shape_d[0]   5
-        # IDL:  r0 = reform(r0, sd[1], sd[2], sd[3], 5, /over)
-        r0k = r0k.reshape(shape_d[1], shape_d[2], shape_d[3])
-        r0k = r0k.real
-        if not preserve_refpix:
-            r0k = r0k[:, :, hnorm1]
-        else:
-            r0k = r0k[:, :, unpad]
-
-        # Subtract the correction from the data in this sector
-        if not preserve_refpix:
-            data0[k, :, :, hnorm1] -= np.transpose(r0k, (2, 0, 1))
-        else:
-            data0[k, :, :, unpad] -= np.transpose(r0k, (2, 0, 1))
-        del r0k
-
-    # End of loop over 4 sectors
+    subtract_sector_corrections(
+        data0, hs, ht, columns, refout_fft, alpha, beta, maximum_cores=maximum_cores
+    )
+    del refout_fft
 
     # Original data0 array has shape (5, ngroups, 2048, 712). Now that
     # correction has been applied, remove the interleaved reference pixels.
@@ -1008,10 +980,160 @@ def subtract_reference(
     return data0
 
 
+def subtract_sector_corrections(data0, hs, ht, columns, refout_fft, alpha, beta, maximum_cores="1"):
+    """
+    Compute and subtract the reference corrections of all four sectors in place.
+
+    Parameters
+    ----------
+    data0 : ndarray
+        Time-ordered data, with shape (5, ngroups, ny, row).  Sectors 1
+        to 4 are corrected in place.
+    hs : ndarray
+        Column indices of the reference pixels of a sector, in the order
+        they are copied to `ht`.
+    ht : ndarray
+        Column indices of the reference pixels, extended over the gaps.
+    columns : ndarray
+        Column indices of the pixels to correct.
+    refout_fft : ndarray or None
+        Real FFT of the reference output along the time axis, or None if
+        there is no `alpha`.
+    alpha : ndarray or None
+        Coefficients of the reference output for each sector, folded onto
+        the non-negative frequencies by `half_spectrum`.
+    beta : ndarray
+        Coefficients of the reference pixels for each sector, folded onto
+        the non-negative frequencies by `half_spectrum`.
+    maximum_cores : str, optional
+        Number of threads used to correct the four sectors.  Can be an
+        integer, 'none', 'quarter', 'half', or 'all'.
+    """
+
+    def correct_sector(k):
+        log.debug(f"processing sector {k}")
+        subtract_sector_correction(
+            data0,
+            k,
+            hs,
+            ht,
+            columns,
+            refout_fft,
+            None if alpha is None else alpha[k - 1],
+            beta[k - 1],
+        )
+
+    nthreads = compute_num_cores(str(maximum_cores), 4, mp.cpu_count())
+    if nthreads > 1:
+        with ThreadPoolExecutor(max_workers=nthreads) as executor:
+            list(executor.map(correct_sector, range(1, 5)))
+    else:
+        for k in range(1, 5):
+            correct_sector(k)
+
+
+def subtract_sector_correction(data0, k, hs, ht, columns, refout_fft, alpha_k, beta_k):
+    """
+    Compute and subtract the reference correction of one sector in place.
+
+    Parameters
+    ----------
+    data0 : ndarray
+        Time-ordered data, with shape (5, ngroups, ny, row).  Sector `k`
+        is corrected in place; the other sectors are not modified.
+    k : int
+        Sector (amplifier) number, from 1 to 4.
+    hs : ndarray
+        Column indices of the reference pixels of the sector, in the order
+        they are copied to `ht`.
+    ht : ndarray
+        Column indices of the reference pixels, extended over the gaps.
+    columns : ndarray
+        Column indices of the pixels to correct.
+    refout_fft : ndarray or None
+        Real FFT of the reference output along the time axis, with shape
+        (ngroups, ny * row // 2 + 1), or None if there is no `alpha`.
+    alpha_k : ndarray or None
+        Coefficients of the reference output, folded onto the non-negative
+        frequencies by `half_spectrum`.
+    beta_k : ndarray
+        Coefficients of the reference pixels, folded onto the non-negative
+        frequencies by `half_spectrum`.
+    """
+    shape_d = data0.shape
+    npix = shape_d[2] * shape_d[3]
+
+    # At this point in the processing data0 has shape (5, ngroups, 2048, 712),
+    # assuming normal IRS2 readout settings. r0k contains a subset of the
+    # data from 1 sector of data0, with shape (ngroups, 2048, 256)
+    r0k = np.zeros((shape_d[1], shape_d[2], shape_d[3]), dtype=np.float32)
+    temp = data0[k, :, :, hs].copy()
+    temp = np.transpose(temp, (1, 2, 0))
+    r0k[:, :, ht] = temp
+    del temp
+
+    # IDL:  r0 = reform(r0, sd[1] * sd[2], sd[3], 5, /over)
+    r0k = r0k.reshape((shape_d[1], npix))
+    r0k_fft = np.fft.rfft(r0k, axis=1)
+
+    # Note that where the IDL code uses alpha, we use beta, and vice versa.
+    # IDL:  for k=0,3 do oBridge[k]->Execute,
+    #           "for i=0, s3-1 do r0[*,i] *= alpha"
+    r0k_fft *= beta_k
+
+    # IDL:  for k=0,3 do oBridge[k]->Execute,
+    #           "for i=0, s3-1 do r0[*,i] += beta * refout0[*,i]"
+    if refout_fft is not None:
+        r0k_fft += alpha_k * refout_fft
+
+    # IDL:  for k=0,3 do oBridge[k]->Execute,
+    #           "r0 = fft(r0, 1, dim=1, /overwrite)", /nowait
+    # Only the real part of the inverse transform is used.
+    r0k = np.fft.irfft(r0k_fft, n=npix, axis=1)
+    del r0k_fft
+
+    # IDL:  r0 = reform(r0, sd[1], sd[2], sd[3], 5, /over)
+    r0k = r0k.reshape(shape_d[1], shape_d[2], shape_d[3])
+
+    # Subtract the correction from the data in this sector
+    data0[k, :, :, columns] -= np.transpose(r0k[:, :, columns], (2, 0, 1))
+
+
+def half_spectrum(coeffs):
+    """
+    Fold FFT coefficients onto the non-negative frequencies.
+
+    For a real array ``x`` of length ``n``, the real part of
+    ``ifft(coeffs * fft(x))`` is equal to ``irfft(half * rfft(x), n)``,
+    where ``half`` is the array returned, so the transforms of real data
+    only need half of the frequencies.
+
+    Parameters
+    ----------
+    coeffs : ndarray
+        Coefficients for all the frequencies of a full FFT, along the last
+        axis.
+
+    Returns
+    -------
+    half : ndarray
+        The Hermitian part of the coefficients, for the ``n // 2 + 1``
+        non-negative frequencies of a real FFT.
+    """
+    n = coeffs.shape[-1]
+    freq = np.arange(n // 2 + 1)
+    mirrored = coeffs[..., -freq % n]
+    if np.iscomplexobj(coeffs):
+        mirrored = np.conj(mirrored)
+    return (coeffs[..., : n // 2 + 1] + mirrored) / 2
+
+
 def fft_interp_norm(dd0, mask0, row, hnorm, hnorm1, ny, ngroups, aa, n_iter_norm):
     """
     Filter iteratively in FFT space of the normal pixels in each group.
 
+    All groups are filtered at once, with real FFTs along the time axis.
+
     Parameters
     ----------
     dd0 : ndarray
@@ -1037,16 +1159,17 @@ def fft_interp_norm(dd0, mask0, row, hnorm, hnorm1, ny, ngroups, aa, n_iter_norm
     """
     mm = np.zeros((ny, row), dtype=np.int8)
     mm[:, hnorm1] = mask0[:, hnorm]
-    hm = mm != 0  # 2-D boolean mask
-    for j in range(ngroups):
-        dd = dd0[j, :, :].copy()  # make a copy, not a view
-        p = dd.flatten()
-        for _it in range(n_iter_norm):
-            pp = np.fft.fft(p)
-            pp *= aa
-            p[:] = np.fft.ifft(pp).real
-            p[hm.ravel()] = dd[hm]
-        dd0[j, :, :] = p.reshape((ny, row))
+    hm = (mm != 0).ravel()  # 1-D boolean mask
+    npix = ny * row
+    dd = dd0.reshape((ngroups, npix)).copy()  # make a copy, not a view
+    p = dd.copy()
+    half_aa = half_spectrum(aa)
+    for _it in range(n_iter_norm):
+        pp = np.fft.rfft(p, axis=1)
+        pp *= half_aa
+        p = np.fft.irfft(pp, n=npix, axis=1).astype(dd.dtype, copy=False)
+        p[:, hm] = dd[:, hm]
+    dd0[:, :, :] = p.reshape((ngroups, ny, row))
 
 
 def ols_line(x, y):
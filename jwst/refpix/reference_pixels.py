@@ -45,6 +45,7 @@ import logging
 from copy import deepcopy
 
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from scipy import stats
 from stdatamodels.jwst.datamodels import dqflags
 
@@ -336,13 +337,61 @@ class Dataset:
         # If there are no good pixels, return None
         if len(goodpixels[0]) == 0:
             return None
+        return self.clipped_mean(data[goodpixels], low, high)
+
+    def sigma_clip_groups(self, data, dq, low=3.0, high=3.0):
+        """
+        Compute the clipped mean of the same pixels in a stack of groups.
+
+        Parameters
+        ----------
+        data : NDArray
+            3-d array of pixels to be sigma-clipped, groups along the first axis
+        dq : NDArray
+            2-d DQ array for the pixels, shared by all the groups
+        low : float, optional
+            Lower clipping boundary, in standard deviations from the mean (default=3.0)
+        high : float, optional
+            Upper clipping boundary, in standard deviations from the mean (default=3.0)
+
+        Returns
+        -------
+        means : list of float or None
+            Clipped mean of each group, as returned by `sigma_clip`
+        """
+        goodpixels = np.bitwise_and(dq, dqflags.pixel["DO_NOT_USE"]) == 0
+        if not np.any(goodpixels):
+            return [None] * len(data)
+        # The good pixels of all groups are gathered at once, in the same
+        # order as for a single group
+        good_data = data[:, goodpixels]
+        return [self.clipped_mean(values, low, high) for values in good_data]
+
+    def clipped_mean(self, values, low=3.0, high=3.0):
+        """
+        Compute the clipped mean of an array of good pixels.
+
+        Parameters
+        ----------
+        values : NDArray
+            1-d array of good pixels
+        low : float, optional
+            Lower clipping boundary, in standard deviations from the mean (default=3.0)
+        high : float, optional
+            Upper clipping boundary, in standard deviations from the mean (default=3.0)
+
+        Returns
+        -------
+        mean : float
+            Clipped mean of the values
+        """
         #
         # scipy routine fails if the pixels all have exactly the same value
-        if np.std(data[goodpixels], dtype=np.float64) != 0.0:
-            clipped_ref, lowlim, uplim = stats.sigmaclip(data[goodpixels], low, high)
+        if np.std(values, dtype=np.float64) != 0.0:
+            clipped_ref, lowlim, uplim = stats.sigmaclip(values, low, high)
             mean = clipped_ref.mean()
         else:
-            mean = data[goodpixels].mean(dtype=np.float64)
+            mean = values.mean(dtype=np.float64)
 
         return mean
 
@@ -733,7 +782,8 @@ class NIRDataset(Dataset):
         Parameters
         ----------
         group : NDArray
-            The group that is being processed
+            The group that is being processed, or a stack of groups along
+            the first axis
 
         amplifier : {'A', 'B', 'C', 'D'}
             String corresponding to the amplifier being processed
@@ -745,7 +795,7 @@ class NIRDataset(Dataset):
         Returns
         -------
         oddref : NDArray
-            Array containing all the odd reference pixels
+            Array containing all the odd reference pixels of each group
 
         odddq : NDArray
             Array containing all the odd dq values for those reference pixels
@@ -755,10 +805,10 @@ class NIRDataset(Dataset):
         # handle interleaved pixels if needed
         if self.is_irs2:
             odd_mask = self.irs2_odd_mask[colstart:colstop]
-            oddref = group[rowstart:rowstop, colstart:colstop][:, odd_mask]
+            oddref = group[..., rowstart:rowstop, colstart:colstop][..., odd_mask]
             odddq = self.pixeldq[rowstart:rowstop, colstart:colstop][:, odd_mask]
         else:
-            oddref = group[rowstart:rowstop, colstart:colstop:2]
+            oddref = group[..., rowstart:rowstop, colstart:colstop:2]
             odddq = self.pixeldq[rowstart:rowstop, colstart:colstop:2]
 
         return oddref, odddq
@@ -777,7 +827,8 @@ class NIRDataset(Dataset):
         Parameters
         ----------
         group : NDArray
-            The group that is being processed
+            The group that is being processed, or a stack of groups along
+            the first axis
         amplifier : {'A', 'B', 'C', 'D'}
             String corresponding to the amplifier being processed
         top_or_bottom : {'top', 'bottom'}
@@ -787,7 +838,7 @@ class NIRDataset(Dataset):
         Returns
         -------
         evenref : NDArray
-            Array containing all the even reference pixels
+            Array containing all the even reference pixels of each group
         evendq : NDArray
             Array containing all the even dq values for those reference pixels
         """
@@ -796,12 +847,12 @@ class NIRDataset(Dataset):
         # handle interleaved pixels if needed
         if self.is_irs2:
             even_mask = ~self.irs2_odd_mask[colstart:colstop]
-            evenref = group[rowstart:rowstop, colstart:colstop][:, even_mask]
+            evenref = group[..., rowstart:rowstop, colstart:colstop][..., even_mask]
             evendq = self.pixeldq[rowstart:rowstop, colstart:colstop][:, even_mask]
         else:
             # Even columns start on the second column
             colstart = colstart + 1
-            evenref = group[rowstart:rowstop, colstart:colstop:2]
+            evenref = group[..., rowstart:rowstop, colstart:colstop:2]
             evendq = self.pixeldq[rowstart:rowstop, colstart:colstop:2]
 
         return evenref, evendq
@@ -925,6 +976,54 @@ class NIRDataset(Dataset):
                     refpix[amplifier][top_bottom] = refvalues
         return refpix
 
+    def get_refvalues_groups(self, groups):
+        """
+        Get the reference pixel values for a stack of groups.
+
+        The reference pixels of each amplifier, parity and edge are collected
+        for all groups at once.
+
+        Parameters
+        ----------
+        groups : NDArray
+            Stack of groups being processed, groups along the first axis
+
+        Returns
+        -------
+        refpix : list of dict
+            The reference pixel values of each group, as returned by `get_refvalues`.
+        """
+        refpix = []
+        for _ in range(len(groups)):
+            refpix.append({amplifier: {"odd": {}, "even": {}} for amplifier in self.amplifiers})
+        for amplifier in self.amplifiers:
+            for top_bottom in ("top", "bottom"):
+                if self.odd_even_columns:
+                    odd = self.sigma_clip_groups(
+                        *self.collect_odd_refpixels(groups, amplifier, top_bottom)
+                    )
+                    even = self.sigma_clip_groups(
+                        *self.collect_even_refpixels(groups, amplifier, top_bottom)
+                    )
+                    if None in odd or None in even:
+                        self.bad_reference_pixels = True
+                    for group_refpix, odd_value, even_value in zip(refpix, odd, even, strict=True):
+                        group_refpix[amplifier]["odd"][top_bottom] = odd_value
+                        group_refpix[amplifier]["even"][top_bottom] = even_value
+                else:
+                    rowstart, rowstop, colstart, colstop = self.reference_sections[amplifier][
+                        top_bottom
+                    ]
+                    means = self.sigma_clip_groups(
+                        groups[:, rowstart:rowstop, colstart:colstop],
+                        self.pixeldq[rowstart:rowstop, colstart:colstop],
+                    )
+                    if None in means:
+                        self.bad_reference_pixels = True
+                    for group_refpix, mean in zip(refpix, means, strict=True):
+                        group_refpix[amplifier][top_bottom] = mean
+        return refpix
+
     def do_top_bottom_correction(self, group, refvalues):
         """
         Do the top/bottom correction.
@@ -1027,7 +1126,7 @@ class NIRDataset(Dataset):
         Parameters
         ----------
         data : NDArray
-            Input data array
+            Input data array; rows are along the second to last axis
         smoothing_length : int
             Smoothing length; should be odd, will be converted if not.
             Amount by which the input array is extended is
@@ -1040,16 +1139,16 @@ class NIRDataset(Dataset):
             Array that has been extended at the top and bottom by reflecting the
             first and last few rows
         """
-        nrows, ncols = data.shape
+        nrows, ncols = data.shape[-2:]
         if smoothing_length % 2 == 0:
             log.info("Smoothing length must be odd, adding 1")
             smoothing_length = smoothing_length + 1
         newheight = nrows + smoothing_length - 1
-        reflected = np.zeros((newheight, ncols), dtype=data.dtype)
+        reflected = np.zeros((*data.shape[:-2], newheight, ncols), dtype=data.dtype)
         bufsize = smoothing_length // 2
-        reflected[bufsize : bufsize + nrows] = data[:]
-        reflected[:bufsize] = data[bufsize:0:-1]
-        reflected[-(bufsize):] = data[-2 : -(bufsize + 2) : -1]
+        reflected[..., bufsize : bufsize + nrows, :] = data
+        reflected[..., :bufsize, :] = data[..., bufsize:0:-1, :]
+        reflected[..., -(bufsize):, :] = data[..., -2 : -(bufsize + 2) : -1, :]
         return reflected
 
     def median_filter(self, data, dq, smoothing_length):
@@ -1062,7 +1161,7 @@ class NIRDataset(Dataset):
         Parameters
         ----------
         data : NDArray
-            Input 2-d science array
+            Input 2-d science array, or a stack of them along the first axis
         dq : NDArray
             Input 2-d dq array
         smoothing_length : int
@@ -1071,23 +1170,33 @@ class NIRDataset(Dataset):
         Returns
         -------
         result : NDArray
-            1-d array that is a median filtered version of the input data
+            1-d array that is a median filtered version of the input data, or
+            one such array per input array
         """
         augmented_data = self.create_reflected(data, smoothing_length)
         augmented_dq = self.create_reflected(dq, smoothing_length)
-        nrows, ncols = data.shape
-        result = np.zeros(nrows)
-        for i in range(nrows):
-            rowstart = i
-            rowstop = rowstart + smoothing_length
-            goodpixels = np.where(
-                np.bitwise_and(augmented_dq[rowstart:rowstop], dqflags.pixel["DO_NOT_USE"]) == 0
-            )
-            if len(goodpixels[0]) == 0:
-                result[i] = np.nan
-            else:
-                window = augmented_data[rowstart:rowstop][goodpixels]
-                result[i] = np.median(window)
+        nrows = data.shape[-2]
+
+        # Boxes starting at each row, flattened along the last axis
+        windows = sliding_window_view(augmented_data, smoothing_length, axis=-2)[..., :nrows, :, :]
+        windows = windows.reshape((*windows.shape[:-2], -1))
+        good = sliding_window_view(augmented_dq, smoothing_length, axis=-2)[:nrows]
+        good = np.bitwise_and(good, dqflags.pixel["DO_NOT_USE"]) == 0
+        good = good.reshape((nrows, -1))
+        ngood = good.sum(axis=-1)
+
+        # Sort the good pixels of each box first and pick the middle ones,
+        # averaging the two middle values for an even number of good pixels
+        sorted_windows = np.sort(np.where(good, windows, np.inf), axis=-1)
+        middle = ngood.reshape((1,) * (windows.ndim - 2) + (nrows, 1))
+        low = np.take_along_axis(sorted_windows, (middle - 1) // 2, axis=-1)[..., 0]
+        high = np.take_along_axis(sorted_windows, middle // 2, axis=-1)[..., 0]
+        with np.errstate(invalid="ignore", over="ignore"):
+            median = np.where(ngood % 2 == 1, low, (low + high) / 2)
+
+        # As for np.median, boxes with NaN good pixels have a NaN median
+        has_nan = np.any(np.isnan(windows) & good, axis=-1)
+        result = np.where((ngood == 0) | has_nan, np.nan, median).astype(np.float64)
         return result
 
     def calculate_side_ref_signal(self, group, colstart, colstop):
@@ -1100,7 +1209,7 @@ class NIRDataset(Dataset):
         Parameters
         ----------
         group : NDArray
-            Group that is being processed
+            Group that is being processed, or a stack of groups along the first axis
         colstart : int
             Starting column
         colstop : int
@@ -1112,7 +1221,7 @@ class NIRDataset(Dataset):
             Median filtered version of the side reference pixels
         """
         smoothing_length = self.side_smoothing_length
-        data = group[:, colstart : colstop + 1]
+        data = group[..., colstart : colstop + 1]
         dq = self.pixeldq[:, colstart : colstop + 1]
         return self.median_filter(data, dq, smoothing_length)
 
@@ -1132,13 +1241,11 @@ class NIRDataset(Dataset):
         Returns
         -------
         sidegroup : NDArray
-            2-d array of average reference pixel vector replicated horizontally
+            2-d array of average reference pixel vector replicated horizontally;
+            this is a read-only view of the combined vector
         """
         combined = self.combine_with_nans(left, right)
-        sidegroup = np.zeros((2048, 2048))
-        for column in range(2048):
-            sidegroup[:, column] = combined
-        return sidegroup
+        return np.broadcast_to(combined[:, np.newaxis], (2048, 2048))
 
     def combine_with_nans(self, a, b):
         """
@@ -1162,7 +1269,7 @@ class NIRDataset(Dataset):
         result : ndarray
             Combined array
         """
-        result = np.zeros(len(a), dtype=a.dtype)
+        result = np.zeros(a.shape, dtype=a.dtype)
 
         bothnan = np.where(np.isnan(a) & np.isnan(b))
         result[bothnan] = 0.0
@@ -1211,23 +1318,10 @@ class NIRDataset(Dataset):
         corrected_group : NDArray
             Corrected group
         """
-        continue_apply_conv_kernel = False
-        # Check if convolution kernels for this detector are in the reference file
-        # and if not, proceed with side-pixel correction as usual
-        if self.refpix_algorithm == "sirs" and self.sirs_kernel_model is not None:
-            kernels = make_kernels(
-                self.sirs_kernel_model,
-                self.input_model.meta.instrument.detector,
-                self.gaussmooth,
-                self.halfwidth,
-            )
-            if kernels is None:
-                log.info("The REFPIX step will use the running median")
-            else:
-                continue_apply_conv_kernel = True
+        kernels = self.get_conv_kernels()
         #
         # Apply optimized convolution kernel
-        if continue_apply_conv_kernel:
+        if kernels is not None:
             corrected_group = apply_conv_kernel(group, kernels, sigreject=self.sigreject)
         else:
             # use running median
@@ -1237,6 +1331,60 @@ class NIRDataset(Dataset):
             corrected_group = self.apply_side_correction(group, sidegroup)
         return corrected_group
 
+    def get_conv_kernels(self):
+        """
+        Get the SIRS convolution kernels for this detector.
+
+        The kernels are made from the reference file the first time they are
+        needed, and reused for all the groups.
+
+        Returns
+        -------
+        kernels : list or None
+            The left and right kernels, or None if the running median is used
+            for the side reference pixels.
+        """
+        # Check if convolution kernels for this detector are in the reference file
+        # and if not, proceed with side-pixel correction as usual
+        if self.refpix_algorithm != "sirs" or self.sirs_kernel_model is None:
+            return None
+        if not hasattr(self, "_conv_kernels"):
+            self._conv_kernels = make_kernels(
+                self.sirs_kernel_model,
+                self.input_model.meta.instrument.detector,
+                self.gaussmooth,
+                self.halfwidth,
+            )
+            if self._conv_kernels is None:
+                log.info("The REFPIX step will use the running median")
+        return self._conv_kernels
+
+    def do_side_correction_groups(self, groups):
+        """
+        Do the side reference pixel correction for a stack of groups in place.
+
+        The running medians of the side reference pixels are computed for all
+        groups at once.
+
+        Parameters
+        ----------
+        groups : NDArray
+            Stack of groups being processed, groups along the first axis
+        """
+        kernels = self.get_conv_kernels()
+        if kernels is not None:
+            for group in range(len(groups)):
+                groups[group] = apply_conv_kernel(groups[group], kernels, sigreject=self.sigreject)
+            return
+
+        left = self.calculate_side_ref_signal(groups, 0, 3)
+        right = self.calculate_side_ref_signal(groups, 2044, 2047)
+        combined = self.combine_with_nans(left, right)
+        for group in range(len(groups)):
+            groups[group] = self.apply_side_correction(
+                groups[group], combined[group][:, np.newaxis]
+            )
+
     def do_corrections(self):
         """Do reference pixel correction for NIR data."""
         if self.is_subarray:
@@ -1260,6 +1408,22 @@ class NIRDataset(Dataset):
         #  First transform pixeldq array to detector coordinates
         self.dms_to_detector_dq()
 
+        if not self.is_subarray:
+            # All the groups of an integration are corrected at once, in place,
+            # through a detector frame view of the data
+            for integration in range(self.nints):
+                groups = reffile_utils.science_detector_frame_transform(
+                    self.input_model.data[integration], self.fastaxis, self.slowaxis
+                )
+                refvalues = self.get_refvalues_groups(groups)
+                for group in range(self.ngroups):
+                    self.do_top_bottom_correction(groups[group], refvalues[group])
+                if self.use_side_ref_pixels:
+                    self.do_side_correction_groups(groups)
+            return
+
+        # Subarrays read out with 4 amplifiers are embedded in a full frame
+        # one group at a time
         for integration in range(self.nints):
             for group in range(self.ngroups):
                 #
@@ -29,6 +29,7 @@ class RefPixStep(Step):
         sigreject = float(default=4.0) # Number of sigmas to reject as outliers
         gaussmooth = float(default=1.0) # Width of Gaussian smoothing kernel to use as a low-pass filter
         halfwidth = integer(default=30) # Half-width of convolution kernel to build
+        maximum_cores = string(default='1') # cores for multithreading the IRS2 sectors. Can be an integer, 'half', 'quarter', or 'all'
     """  # noqa: E501
 
     reference_file_types = ["refpix", "sirskernel"]
@@ -101,7 +102,10 @@ class RefPixStep(Step):
 
                 # Apply the IRS2 correction scheme
                 result = irs2_subtract_reference.correct_model(
-                    result, irs2_model, preserve_refpix=self.preserve_irs2_refpix
+                    result,
+                    irs2_model,
+                    preserve_refpix=self.preserve_irs2_refpix,
+                    maximum_cores=self.maximum_cores,
                 )
 
                 if result.meta.cal_step.refpix != "SKIPPED":
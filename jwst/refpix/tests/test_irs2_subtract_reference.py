@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from jwst.refpix.irs2_subtract_reference import fft_interp_norm, half_spectrum
+
+
+@pytest.mark.parametrize("n", [16, 17])
+def test_half_spectrum(n):
+    rng = np.random.default_rng(42)
+    x = rng.normal(size=(3, n))
+    coeffs = rng.normal(size=n) + 1j * rng.normal(size=n)
+
+    expected = np.fft.ifft(coeffs * np.fft.fft(x), axis=1).real
+    result = np.fft.irfft(half_spectrum(coeffs) * np.fft.rfft(x), n=n, axis=1)
+
+    np.testing.assert_allclose(result, expected, atol=1e-12)
+
+
+def test_fft_interp_norm():
+    """Check the filtering of all groups at once against one group at a time."""
+    rng = np.random.default_rng(42)
+    ngroups, ny, row = 3, 8, 24
+    hnorm = np.arange(16)
+    hnorm1 = hnorm + 4 * (hnorm // 8)
+    mask0 = rng.integers(0, 2, (ny, 16))
+    aa = np.exp(-np.minimum(np.arange(ny * row), ny * row - np.arange(ny * row)) / 20.0)
+    dd0 = rng.normal(size=(ngroups, ny, row))
+
+    expected = dd0.copy()
+    hm = np.zeros((ny, row), dtype=bool)
+    hm[:, hnorm1] = mask0[:, hnorm] != 0
+    for group in range(ngroups):
+        p = expected[group].ravel()
+        for _ in range(3):
+            p[:] = np.fft.ifft(np.fft.fft(p) * aa).real
+            p[hm.ravel()] = dd0[group][hm]
+
+    fft_interp_norm(dd0, mask0, row, hnorm, hnorm1, ny, ngroups, aa, 3)
+
+    np.testing.assert_allclose(dd0, expected, atol=1e-12)
@@ -864,6 +864,51 @@ def test_do_top_bottom_correction_no_even_odd(setup_cube):
         )
 
 
+@pytest.mark.parametrize("odd_even_columns", [True, False])
+def test_get_refvalues_groups(setup_cube, odd_even_columns):
+    """Test that the reference values of a stack of groups match those of each group."""
+    ngroups = 3
+    input_model = setup_cube("NIRCAM", "NRCALONG", ngroups, 2048, 2048)
+    rng = np.random.default_rng(42)
+    input_model.data[:] = rng.normal(100.0, 5.0, input_model.data.shape)
+    input_model.pixeldq[:4, :100:3] = dqflags.pixel["DO_NOT_USE"]
+    init_dataset = NIRDataset(input_model, odd_even_columns, True, 11, 1.0, conv_kernel_params)
+
+    refvalues = init_dataset.get_refvalues_groups(input_model.data[0])
+
+    assert len(refvalues) == ngroups
+    for group in range(ngroups):
+        assert refvalues[group] == init_dataset.get_refvalues(input_model.data[0, group])
+
+
+def test_median_filter(setup_cube):
+    """Test the running median of a stack of groups against a median in each box."""
+    input_model = setup_cube("NIRCAM", "NRCALONG", 1, 2048, 2048)
+    init_dataset = NIRDataset(input_model, True, True, 11, 1.0, conv_kernel_params)
+
+    rng = np.random.default_rng(42)
+    data = rng.normal(100.0, 5.0, (2, 50, 4)).astype(np.float32)
+    data[1, 20, 2] = np.nan
+    dq = np.zeros((50, 4), dtype=np.uint32)
+    dq[rng.integers(0, 50, 40), rng.integers(0, 4, 40)] = dqflags.pixel["DO_NOT_USE"]
+    dq[:12] = dqflags.pixel["DO_NOT_USE"]
+    dq[20, 2] = 0
+
+    result = init_dataset.median_filter(data, dq, 11)
+
+    augmented_data = init_dataset.create_reflected(data, 11)
+    augmented_dq = init_dataset.create_reflected(dq, 11)
+    expected = np.full((2, 50), np.nan)
+    for row in range(50):
+        good = (augmented_dq[row : row + 11] & dqflags.pixel["DO_NOT_USE"]) == 0
+        if np.any(good):
+            expected[:, row] = np.median(augmented_data[:, row : row + 11][:, good], axis=1)
+    assert np.isnan(result[0, 0])
+    assert np.isnan(result[1, 20])
+    np.testing.assert_array_equal(result, expected)
+    np.testing.assert_array_equal(result[1], init_dataset.median_filter(data[1], dq, 11))
+
+
 def make_rampmodel(ngroups, ysize, xsize, instrument="MIRI", fill_value=None):
     """
     Make MIRI, NIRSpec, or NIRCam ramp model for testing.
@@ -1,13 +1,18 @@
 import json
 import logging
+import multiprocessing as mp
 import re
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 
 import numpy as np
 from spherical_geometry.polygon import SphericalPolygon
 from stcal.alignment import combine_sregions
+from stcal.multiprocessing import compute_num_cores
 from stcal.resample import Resample
-from stcal.resample.utils import is_imaging_wcs
+from stcal.resample import resample as stcal_resample
+from stcal.resample.utils import calc_pixmap, is_imaging_wcs
 from stdatamodels.jwst import datamodels
 from stdatamodels.jwst.datamodels.dqflags import pixel
 
@@ -56,6 +61,7 @@ class ResampleImage(Resample):
         report_var=True,
         compute_err=None,
         asn_id=None,
+        pixmap_cache=None,
     ):
         """
         Initialize the ResampleImage object.
@@ -267,8 +273,16 @@ class ResampleImage(Resample):
         asn_id : str, None, optional
             The association id. The id is what appears in
             the :ref:`asn-jwst-naming`.
+
+        pixmap_cache : `~jwst.resample.resample_utils.PixmapCache`, None, optional
+            If provided, the pixel map of each input model is taken from
+            this cache if present, and stored in it otherwise, so that it
+            can be reused, e.g., to blot the resampled image back onto the
+            input model, or by a later resampling onto the same output frame.
         """
         self.input_models = input_models
+        self.pixmap_cache = pixmap_cache
+        self._pixmap_key = None
         self.output_jwst_model = None
         self._report_var = report_var
 
@@ -329,6 +343,26 @@ class ResampleImage(Resample):
                     "Custom WCS objects must have the 'array_shape' attribute set (defined)."
                 )
 
+        # parameters needed to rebuild this resampler in a worker process
+        self._worker_kwargs = {
+            "pixfrac": pixfrac,
+            "kernel": kernel,
+            "fillval": fillval,
+            "weight_type": weight_type,
+            "good_bits": good_bits,
+            "blendheaders": blendheaders,
+            "output_wcs": dict(output_wcs),
+            "output": output,
+            "enable_ctx": enable_ctx,
+            "enable_var": enable_var,
+            "report_var": report_var,
+            "compute_err": compute_err,
+            "asn_id": asn_id,
+        }
+        # an on-disk cache can be filled by worker processes
+        if pixmap_cache is not None and pixmap_cache.directory is not None:
+            self._worker_kwargs["pixmap_cache"] = pixmap_cache
+
         super().__init__(
             n_input_models=len(input_models),
             pixfrac=pixfrac,
@@ -442,19 +476,66 @@ class ResampleImage(Resample):
         model : ImageModel
             A JWST data model to be resampled.
         """
-        super().add_model(
-            self.input_model_to_dict(
-                model,
-                weight_type=self.weight_type,
-                enable_var=self._enable_var,
-                compute_err=self._compute_err,
-            )
+        model_dict = self.input_model_to_dict(
+            model,
+            weight_type=self.weight_type,
+            enable_var=self._enable_var,
+            compute_err=self._compute_err,
         )
+
+        # interpolated pixel maps are not equal to the exact ones and are not cached
+        pixmap = None
+        self._pixmap_key = None
+        if self.pixmap_cache is not None and self.pixmap_stepsize == 1:
+            self._pixmap_key = self.pixmap_cache.make_key(
+                model_dict["wcs"], self.output_wcs, model_dict["data"].shape
+            )
+            pixmap = self.pixmap_cache.get(self._pixmap_key)
+
+        if pixmap is None:
+            super().add_model(model_dict)
+        else:
+            log.debug("Using cached pixel map")
+            with _reuse_pixmap(pixmap):
+                super().add_model(model_dict)
+
         if self.output_jwst_model is None:
             self.output_jwst_model = self.create_output_jwst_model(ref_input_model=model)
         if self.blendheaders:
             self._blender.accumulate(model)
 
+    def add_model_hook(
+        self, model, pixmap, pixel_scale_ratio, iscale, weight_map, xmin, xmax, ymin, ymax
+    ):
+        """
+        Store the pixel map of a resampled model in the pixel map cache.
+
+        Called by :py:meth:`~stcal.resample.Resample.add_model` after the
+        model data have been resampled.
+
+        Parameters
+        ----------
+        model : dict
+            A dictionary containing data arrays and other meta attributes
+            and values of actual models used by pipelines.
+        pixmap : np.ndarray
+            The ``(Ny, Nx, 2)`` mapping from input image coordinates to
+            output image coordinates.
+        pixel_scale_ratio : float
+            Pixel scale ratio of the output to the input.
+        iscale : float
+            The intensity scale applied to the data.
+        weight_map : np.ndarray
+            The weight map of the input data.
+        xmin, xmax, ymin, ymax : float
+            The range of input pixels that were resampled.
+        """
+        super().add_model_hook(
+            model, pixmap, pixel_scale_ratio, iscale, weight_map, xmin, xmax, ymin, ymax
+        )
+        if self._pixmap_key is not None:
+            self.pixmap_cache.put(self._pixmap_key, pixmap)
+
     def finalize(self):
         """Perform final computations and set output model values and metadata."""
         if self.blendheaders:
@@ -568,7 +649,63 @@ class ResampleImage(Resample):
         self.output_jwst_model.meta.filename = output_model_filename
         return self.output_jwst_model
 
-    def resample_many_to_many(self, in_memory=True):
+    def resample_groups(self, in_memory=True, maximum_cores="1"):
+        """
+        Resample each group of input models onto the common output frame.
+
+        Parameters
+        ----------
+        in_memory : bool, optional
+            If `False`, each resampled model is saved to disk and its
+            filename is yielded instead of the model.
+
+        maximum_cores : str, optional
+            Number of processes to use for resampling groups in parallel.
+            Can be an integer, 'none', 'quarter', 'half', or 'all'. Each
+            process receives only the models of the group it resamples, as
+            a `~jwst.datamodels.library.ModelLibrary` referencing their files,
+            or holding their arrays in shared memory if the input models are
+            in memory, together with the output WCS. Groups are dispatched
+            one batch of ``maximum_cores`` groups at a time, so that at most
+            that many groups are held in shared memory. Only supported for
+            imaging data; spectral resamplers always use a single process.
+
+        Yields
+        ------
+        `~stdatamodels.jwst.datamodels.ImageModel` or str
+            The resampled model for each group, or the name of the file it
+            was saved to, in group order. The results are identical to
+            those computed serially.
+        """
+        indices_by_group = list(self.input_models.group_indices.values())
+        ncores = compute_num_cores(str(maximum_cores), len(indices_by_group), mp.cpu_count())
+        if ncores > 1 and type(self) is not ResampleImage:
+            log.warning("Resampling groups in parallel is only supported for imaging data.")
+            ncores = 1
+
+        if ncores == 1:
+            for indices in indices_by_group:
+                yield _resample_and_save_group(self, indices, in_memory)
+            return
+
+        log.info(f"Resampling {len(indices_by_group)} groups using {ncores} processes")
+        ctx = mp.get_context("spawn")
+        with ctx.Pool(ncores) as pool:
+            for start in range(0, len(indices_by_group), ncores):
+                libraries = [
+                    self.input_models.subset(indices)
+                    for indices in indices_by_group[start : start + ncores]
+                ]
+                results = pool.starmap(
+                    _resample_group_worker,
+                    [(library, self._worker_kwargs, in_memory) for library in libraries],
+                )
+                for library in libraries:
+                    library.release_shared_memory()
+                del libraries
+                yield from results
+
+    def resample_many_to_many(self, in_memory=True, maximum_cores="1"):
         """
         Resample many inputs to many outputs where outputs have a common frame.
 
@@ -589,26 +726,16 @@ class ResampleImage(Resample):
             info. See :ref:`stpipe:library_on_disk`
             for more details.
 
+        maximum_cores : str, optional
+            Number of processes to use for resampling groups in parallel.
+            See `resample_groups` for details.
+
         Returns
         -------
         `~jwst.datamodels.library.ModelLibrary`
             A library of resampled models.
         """
-        output_models = []
-
-        for _group_id, indices in self.input_models.group_indices.items():
-            output_model = self.resample_group(indices)
-
-            if not in_memory:
-                # Write out model to disk, then return filename
-                output_name = output_model.meta.filename
-                if self.output_dir is not None:
-                    output_name = str(Path(self.output_dir) / output_name)
-                output_model.save(output_name)
-                log.info(f"Saved model in {output_name}")
-                output_models.append(output_name)
-            else:
-                output_models.append(output_model)
+        output_models = list(self.resample_groups(in_memory, maximum_cores))
 
         if in_memory:
             # build ModelLibrary as a list of in-memory models
@@ -714,6 +841,114 @@ class ResampleImage(Resample):
         return output_sregion
 
 
+# Pixel map returned by stcal's calc_pixmap in the current thread, set by _reuse_pixmap
+_reused_pixmap = threading.local()
+
+
+def _calc_pixmap(*args, **kwargs):
+    """
+    Return the pixel map set by `_reuse_pixmap`, or compute it with stcal.
+
+    Parameters
+    ----------
+    *args, **kwargs
+        Arguments passed to `stcal.resample.utils.calc_pixmap`.
+
+    Returns
+    -------
+    np.ndarray
+        The pixel map.
+    """
+    pixmap = getattr(_reused_pixmap, "pixmap", None)
+    if pixmap is None:
+        return calc_pixmap(*args, **kwargs)
+    return pixmap
+
+
+@contextmanager
+def _reuse_pixmap(pixmap):
+    """
+    Make stcal use a precomputed pixel map when resampling in this thread.
+
+    :py:meth:`~stcal.resample.Resample.add_model` computes the pixel map of
+    each model itself and has no argument to pass one in, so the
+    ``calc_pixmap`` function it calls is replaced by a wrapper returning
+    ``pixmap`` while the context is active.
+
+    Parameters
+    ----------
+    pixmap : np.ndarray
+        The pixel map to use.
+
+    Yields
+    ------
+    None
+        The pixel map is used while the context is active.
+    """
+    stcal_resample.calc_pixmap = _calc_pixmap
+    _reused_pixmap.pixmap = pixmap
+    try:
+        yield
+    finally:
+        _reused_pixmap.pixmap = None
+
+
+def _resample_and_save_group(resamp, indices, in_memory):
+    """
+    Resample a single group and optionally write the result to disk.
+
+    Parameters
+    ----------
+    resamp : ResampleImage
+        The resampler.
+    indices : list
+        Indices of the models in the resampler's input library belonging to the group.
+    in_memory : bool
+        If `False`, the resampled model is saved and its filename
+        is returned instead of the model.
+
+    Returns
+    -------
+    `~stdatamodels.jwst.datamodels.ImageModel` or str
+        The resampled model, or the name of the file it was saved to.
+    """
+    output_model = resamp.resample_group(indices)
+    if in_memory:
+        return output_model
+
+    # Write out model to disk, then return filename
+    output_name = output_model.meta.filename
+    if resamp.output_dir is not None:
+        output_name = str(Path(resamp.output_dir) / output_name)
+    output_model.save(output_name)
+    log.info(f"Saved model in {output_name}")
+    return output_name
+
+
+def _resample_group_worker(library, resamp_kwargs, in_memory):
+    """
+    Resample a single group in a worker process.
+
+    Parameters
+    ----------
+    library : `~jwst.datamodels.library.ModelLibrary`
+        A library holding only the models of the group.
+    resamp_kwargs : dict
+        Keyword arguments used to build the resampler, including
+        the output WCS.
+    in_memory : bool
+        If `False`, the resampled model is saved to disk and its filename
+        is returned instead of the model.
+
+    Returns
+    -------
+    `~stdatamodels.jwst.datamodels.ImageModel` or str
+        The resampled model, or the name of the file it was saved to.
+    """
+    resamp = ResampleImage(library, **resamp_kwargs)
+    return _resample_and_save_group(resamp, list(range(len(library))), in_memory)
+
+
 def input_jwst_model_to_dict(model, weight_type, enable_var, compute_err):
     """
     Convert a data model to a dictionary of keywords and values expected by `stcal.resample`.
@@ -6,7 +6,7 @@ from stdatamodels.jwst import datamodels as dm
 from jwst.datamodels import ImageModel, ModelLibrary  # type: ignore[attr-defined]
 from jwst.lib.pipe_utils import match_nans_and_flags
 from jwst.resample import resample
-from jwst.resample.resample_utils import load_custom_wcs
+from jwst.resample.resample_utils import PixmapCache, load_custom_wcs
 from jwst.stpipe import Step
 
 log = logging.getLogger(__name__)
@@ -41,6 +41,8 @@ class ResampleStep(Step):
         enable_ctx = boolean(default=True)  # Compute and report the context array
         enable_err = boolean(default=True)  # Compute and report the err array
         report_var = boolean(default=True)  # Report the variance array
+        maximum_cores = string(default='1')  # cores for resampling groups when single=True. Can be an integer, 'half', 'quarter', or 'all'
+        pixmap_cache_dir = string(default=None)  # Directory of an on-disk pixel map cache to reuse and add to
     """  # noqa: E501
 
     reference_file_types: list = []
@@ -111,13 +113,17 @@ class ResampleStep(Step):
 
         # Setup drizzle-related parameters
         kwargs = self.get_drizpars()
+        if self.pixmap_cache_dir is not None:
+            kwargs["pixmap_cache"] = PixmapCache(directory=self.pixmap_cache_dir)
 
         # Call the resampling routine
         if self.single:
             resamp = resample.ResampleImage(
                 input_models, output=output, enable_var=False, compute_err="driz_err", **kwargs
             )
-            result = resamp.resample_many_to_many(in_memory=self.in_memory)
+            result = resamp.resample_many_to_many(
+                in_memory=self.in_memory, maximum_cores=self.maximum_cores
+            )
 
         else:
             if self.enable_err:
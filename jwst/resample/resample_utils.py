@@ -1,6 +1,10 @@
+import hashlib
+import io
 import logging
 import math
+import threading
 from copy import deepcopy
+from pathlib import Path
 
 import asdf
 import numpy as np
@@ -17,7 +21,7 @@ from stcal.resample.utils import build_mask as _stcal_build_mask
 from stcal.resample.utils import compute_mean_pixel_area
 from stdatamodels.jwst.datamodels.dqflags import pixel
 
-__all__ = ["build_mask", "resampled_wcs_from_models"]
+__all__ = ["build_mask", "resampled_wcs_from_models", "PixmapCache"]
 
 log = logging.getLogger(__name__)
 
@@ -327,3 +331,154 @@ def find_miri_lrs_sregion(sregion_model1, wcs):
     footprint = np.array(footprint)
     s_region = compute_s_region_keyword(footprint)
     return s_region
+
+
+def wcs_digest(wcs):
+    """
+    Compute a hash of the serialized content of a WCS.
+
+    Two WCS objects with the same digest describe the same transforms,
+    even if they are distinct objects.
+
+    Parameters
+    ----------
+    wcs : `~gwcs.wcs.WCS`
+        The WCS to hash.
+
+    Returns
+    -------
+    str
+        A hexadecimal digest of the ASDF serialization of ``wcs``.
+    """
+    buffer = io.BytesIO()
+    asdf.AsdfFile({"wcs": wcs}).write_to(buffer)
+    return hashlib.sha256(buffer.getvalue()).hexdigest()
+
+
+class PixmapCache:
+    """
+    Content-addressed cache of pixel maps between two WCSs.
+
+    Pixel maps are keyed by a hash of the serialized "from" and "to" WCS
+    objects and the shape of the "from" pixel grid, so a map computed for
+    one model can be reused for any other model with an identical WCS,
+    e.g. when the same exposure is resampled and then blotted back onto
+    the same output frame. Maps are kept in memory, up to ``max_bytes``, or
+    saved as ``.npy`` files in ``directory`` if one is provided.
+
+    Once the in-memory cache is full, new maps are not stored, rather than
+    evicting older ones: maps are typically all computed before any of them
+    is reused, in the same order, so evicting the oldest maps would discard
+    each map before its reuse.
+
+    Cached maps are read-only; copy them before modifying.
+    """
+
+    def __init__(self, max_bytes=2**32, directory=None):
+        """
+        Initialize the cache.
+
+        Parameters
+        ----------
+        max_bytes : int or None, optional
+            Maximum total size of the pixel maps kept in memory.
+            If `None`, the size is not limited.
+            Ignored if ``directory`` is provided.
+        directory : str or Path, optional
+            If provided, pixel maps are stored as ``.npy`` files in this
+            directory instead of in memory. The directory is created if needed.
+        """
+        self.max_bytes = max_bytes
+        self.directory = None if directory is None else Path(directory)
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self._maps = {}
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(wcs_from, wcs_to, shape):
+        """
+        Compute the cache key for a pixel map.
+
+        Parameters
+        ----------
+        wcs_from : `~gwcs.wcs.WCS`
+            The WCS of the pixel grid the map is computed for.
+        wcs_to : `~gwcs.wcs.WCS`
+            The WCS of the frame the map points to.
+        shape : tuple of int
+            The shape of the pixel grid of ``wcs_from``.
+
+        Returns
+        -------
+        str
+            A hexadecimal digest identifying the pixel map.
+        """
+        digest = hashlib.sha256()
+        for wcs in (wcs_from, wcs_to):
+            digest.update(wcs_digest(wcs).encode())
+        digest.update(repr(tuple(int(n) for n in shape)).encode())
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        Retrieve a pixel map.
+
+        Parameters
+        ----------
+        key : str
+            The key returned by `make_key`.
+
+        Returns
+        -------
+        ndarray or None
+            The read-only pixel map, or `None` if it is not in the cache.
+        """
+        if self.directory is not None:
+            filename = self.directory / f"{key}.npy"
+            if filename.exists():
+                return np.load(filename, mmap_mode="r")
+            return None
+
+        with self._lock:
+            return self._maps.get(key)
+
+    def put(self, key, pixmap):
+        """
+        Store a pixel map.
+
+        Parameters
+        ----------
+        key : str
+            The key returned by `make_key`.
+        pixmap : ndarray
+            The pixel map to store. A copy is stored, so the input
+            array may be modified afterwards. Maps already in the cache
+            are not replaced.
+        """
+        if self.directory is not None:
+            filename = self.directory / f"{key}.npy"
+            if not filename.exists():
+                np.save(filename, pixmap)
+            return
+
+        with self._lock:
+            if key in self._maps:
+                return
+            if self.max_bytes is not None and self._nbytes + pixmap.nbytes > self.max_bytes:
+                log.debug("Pixel map cache is full; not caching new pixel maps")
+                return
+            pixmap = pixmap.copy()
+            pixmap.flags.writeable = False
+            self._maps[key] = pixmap
+            self._nbytes += pixmap.nbytes
@@ -19,7 +19,7 @@ from jwst.resample import ResampleSpecStep, ResampleStep
 from jwst.resample.resample import input_jwst_model_to_dict
 from jwst.resample.resample_spec import ResampleSpec, compute_spectral_pixel_scale
 from jwst.resample.resample_step import GOOD_BITS
-from jwst.resample.resample_utils import load_custom_wcs
+from jwst.resample.resample_utils import PixmapCache, load_custom_wcs
 from jwst.tests.helpers import _help_pytest_warns
 
 _FLT32_EPS = np.finfo(np.float32).eps
@@ -753,6 +753,51 @@ def test_weight_type(nircam_rate, tmp_cwd):
     result3.close()
 
 
+@pytest.mark.parametrize("in_memory", [True, False])
+def test_single_parallel_groups(nircam_rate, tmp_cwd, in_memory):
+    """Check that resampling groups in parallel matches the serial result."""
+    im1 = AssignWcsStep.call(nircam_rate, sip_approx=False)
+    _set_photom_kwd(im1)
+    im1.meta.filename = "foo1_cal.fits"
+    im2 = im1.copy()
+    im3 = im1.copy()
+    im2.data += 5
+    im3.data += 10
+    im2.meta.observation.sequence_id = "2"
+    im2.meta.filename = "foo2_cal.fits"
+    im3.meta.observation.sequence_id = "3"
+    im3.meta.filename = "foo3_cal.fits"
+
+    def _resample(maximum_cores):
+        library = ModelLibrary([im1.copy(), im2.copy(), im3.copy()])
+        result = ResampleStep.call(
+            library,
+            single=True,
+            blendheaders=False,
+            in_memory=in_memory,
+            maximum_cores=maximum_cores,
+        )
+        outputs = []
+        with result:
+            for i, model in enumerate(result):
+                outputs.append((model.meta.filename, model.data.copy(), model.wht.copy()))
+                result.shelve(model, i, modify=False)
+        return outputs
+
+    serial = _resample("1")
+    parallel = _resample("2")
+
+    assert len(parallel) == len(serial) == 3
+    for (name, data, wht), (pname, pdata, pwht) in zip(serial, parallel, strict=True):
+        assert pname == name
+        np.testing.assert_array_equal(pdata, data)
+        np.testing.assert_array_equal(pwht, wht)
+
+    im1.close()
+    im2.close()
+    im3.close()
+
+
 def test_sip_coeffs_do_not_propagate(nircam_rate):
     im = AssignWcsStep.call(nircam_rate, sip_degree=2)
     _set_photom_kwd(im)
@@ -1642,3 +1687,32 @@ def test_spec_skip_cube():
     # Input is not modified
     assert result is not model
     assert model.meta.cal_step.resample is None
+
+
+def test_pixmap_cache_dir(nircam_rate, tmp_cwd, monkeypatch):
+    """Check that cached pixel maps are reused without changing the result."""
+    im = AssignWcsStep.call(nircam_rate, sip_approx=False)
+    _set_photom_kwd(im)
+    cache_dir = str(tmp_cwd / "pixmaps")
+
+    expected = ResampleStep.call(im.copy(), blendheaders=False)
+    ResampleStep.call(im.copy(), blendheaders=False, pixmap_cache_dir=cache_dir)
+
+    hits = []
+    get = PixmapCache.get
+
+    def _get(self, key):
+        pixmap = get(self, key)
+        hits.append(pixmap is not None)
+        return pixmap
+
+    monkeypatch.setattr(PixmapCache, "get", _get)
+    result = ResampleStep.call(im.copy(), blendheaders=False, pixmap_cache_dir=cache_dir)
+
+    assert hits == [True]
+    np.testing.assert_array_equal(result.data, expected.data)
+    np.testing.assert_array_equal(result.wht, expected.wht)
+
+    im.close()
+    expected.close()
+    result.close()
@@ -1,5 +1,7 @@
 """Test various utility functions"""
 
+import copy
+
 import numpy as np
 import pytest
 from astropy import coordinates as coord
@@ -10,6 +12,7 @@ from gwcs.wcstools import wcs_from_fiducial
 from stdatamodels.jwst.datamodels import SlitModel, dqflags
 
 from jwst.resample.resample_spec import find_dispersion_axis
+from jwst.resample.resample_utils import PixmapCache
 
 DO_NOT_USE = dqflags.pixel["DO_NOT_USE"]
 GOOD = dqflags.pixel["GOOD"]
@@ -90,3 +93,42 @@ def test_find_dispersion_axis():
 
     dm.meta.wcsinfo.dispersion_direction = 2  # vertical
     assert find_dispersion_axis(dm) == 1  # Y axis for wcs functions
+
+
+@pytest.mark.parametrize("on_disk", [False, True])
+def test_pixmap_cache(wcs_gwcs, tmp_path, on_disk):
+    cache = PixmapCache(directory=tmp_path if on_disk else None)
+    key = cache.make_key(wcs_gwcs, wcs_gwcs, (10, 20))
+
+    # keys depend on the content of the WCS and on the shape
+    assert key == PixmapCache.make_key(wcs_gwcs, copy.deepcopy(wcs_gwcs), (10, 20))
+    assert key != cache.make_key(wcs_gwcs, wcs_gwcs, (20, 10))
+
+    assert cache.get(key) is None
+    pixmap = np.arange(400, dtype=float).reshape(10, 20, 2)
+    cache.put(key, pixmap)
+    pixmap[0, 0] = -1
+
+    cached = cache.get(key)
+    assert cached[0, 0, 0] == 0
+    assert not cached.flags.writeable
+
+
+def test_pixmap_cache_full():
+    pixmap = np.zeros((10, 10, 2))
+    cache = PixmapCache(max_bytes=2 * pixmap.nbytes)
+    for key in ["a", "b", "c"]:
+        cache.put(key, pixmap)
+
+    # maps stored before the cache is full are kept
+    assert cache.get("a") is not None
+    assert cache.get("b") is not None
+    assert cache.get("c") is None
+
+
+def test_pixmap_cache_unlimited():
+    pixmap = np.zeros((10, 10, 2))
+    cache = PixmapCache(max_bytes=None)
+    for key in ["a", "b", "c"]:
+        cache.put(key, pixmap)
+    assert all(cache.get(key) is not None for key in ["a", "b", "c"])
@@ -3,6 +3,7 @@ import math
 import astropy.units as u
 import numpy as np
 import pytest
+from photutils.aperture import ApertureStats, CircularAnnulus, CircularAperture
 from stdatamodels.jwst import datamodels
 
 from jwst.lib import reffile_utils
@@ -423,6 +424,34 @@ def test_tso_phot_multiple_center_values():
     assert np.allclose(catalog["psf_flux"].value, 3.0)
 
 
+@pytest.mark.parametrize(
+    "aperture",
+    [
+        CircularAperture((XCENTER + 0.3, YCENTER - 0.2), r=RADIUS),
+        CircularAnnulus((XCENTER + 0.3, YCENTER - 0.2), r_in=RADIUS_INNER, r_out=RADIUS_OUTER),
+        CircularAperture((1.5, 2.5), r=RADIUS),
+        CircularAperture((-50.0, -50.0), r=RADIUS),
+    ],
+)
+def test_aperture_sums(aperture):
+    rng = np.random.default_rng(42)
+    shape = (5, 100, 150)
+    data = rng.normal(BACKGROUND, 0.1, shape).astype(np.float32)
+    err = rng.uniform(0.1, 0.2, shape).astype(np.float32)
+    data[rng.random(shape) < 0.05] = np.nan
+    data[2] = np.nan
+
+    images = np.array([0, 2, 3])
+    aperture_sum, aperture_sum_err = tp._aperture_sums(data, err, images, aperture)
+
+    # Sums match the photutils aperture statistics for each integration
+    for i, image in enumerate(images):
+        stats = ApertureStats(data[image], aperture, error=err[image])
+        np.testing.assert_allclose(aperture_sum[i], stats.sum, rtol=1e-12)
+        np.testing.assert_allclose(aperture_sum_err[i], stats.sum_err, rtol=1e-12)
+    assert np.isnan(aperture_sum[1])
+
+
 @pytest.mark.parametrize("fit_psf", [True, False])
 def test_fit_source_fail(monkeypatch, fit_psf):
     datamodel = mock_nircam_image()
@@ -6,7 +6,7 @@ import numpy as np
 from astropy.stats import gaussian_fwhm_to_sigma
 from astropy.table import QTable
 from astropy.time import Time, TimeDelta
-from photutils.aperture import ApertureStats, CircularAnnulus, CircularAperture
+from photutils.aperture import CircularAnnulus, CircularAperture
 from photutils.centroids import centroid_sources
 from photutils.psf import GaussianPRF, PSFPhotometry
 from photutils.utils import CutoutImage
@@ -119,20 +119,14 @@ def tso_aperture_photometry(
     xcenter = np.full(nimg, xcenter) if np.isscalar(xcenter) else xcenter
     ycenter = np.full(nimg, ycenter) if np.isscalar(ycenter) else ycenter
 
-    aperture_sum = []
-    aperture_sum_err = []
-    annulus_sum = []
-    annulus_sum_err = []
-
     if sub64p_wlp8:
         info = (
             "Photometry measured as the sum of all values in the "
             "subarray.  No background subtraction was performed."
         )
 
-        for i in np.arange(nimg):
-            aperture_sum.append(np.nansum(datamodel.data[i, :, :]))
-            aperture_sum_err.append(np.sqrt(np.nansum(datamodel.err[i, :, :] ** 2)))
+        aperture_sum = np.nansum(datamodel.data, axis=(1, 2))
+        aperture_sum_err = np.sqrt(np.nansum(datamodel.err**2, axis=(1, 2)))
     else:
         info = (
             f"Photometry measured in a circular aperture of r={radius} "
@@ -141,30 +135,28 @@ def tso_aperture_photometry(
             f"r_outer={radius_outer} pixels."
         )
 
-        for i in np.arange(nimg):
-            phot_aper = CircularAperture((xcenter[i], ycenter[i]), r=radius)
-            bkg_aper = CircularAnnulus(
-                (xcenter[i], ycenter[i]), r_in=radius_inner, r_out=radius_outer
+        aperture_sum = np.full(nimg, np.nan)
+        aperture_sum_err = np.full(nimg, np.nan)
+        annulus_sum = np.full(nimg, np.nan)
+        annulus_sum_err = np.full(nimg, np.nan)
+
+        # The aperture weights are computed once for each distinct center
+        # and applied to all the integrations sharing it.
+        centers = np.column_stack([xcenter, ycenter])
+        centers, center_index = np.unique(centers, axis=0, return_inverse=True)
+        center_index = center_index.ravel()
+        for i, center in enumerate(centers):
+            images = np.flatnonzero(center_index == i)
+            phot_aper = CircularAperture(center, r=radius)
+            bkg_aper = CircularAnnulus(center, r_in=radius_inner, r_out=radius_outer)
+
+            aperture_sum[images], aperture_sum_err[images] = _aperture_sums(
+                datamodel.data, datamodel.err, images, phot_aper
             )
-
-            aperstats = ApertureStats(
-                datamodel.data[i, :, :], phot_aper, error=datamodel.err[i, :, :]
+            annulus_sum[images], annulus_sum_err[images] = _aperture_sums(
+                datamodel.data, datamodel.err, images, bkg_aper
             )
 
-            annstats = ApertureStats(
-                datamodel.data[i, :, :], bkg_aper, error=datamodel.err[i, :, :]
-            )
-
-            aperture_sum.append(aperstats.sum)
-            aperture_sum_err.append(aperstats.sum_err)
-            annulus_sum.append(annstats.sum)
-            annulus_sum_err.append(annstats.sum_err)
-
-    aperture_sum = np.array(aperture_sum)
-    aperture_sum_err = np.array(aperture_sum_err)
-    annulus_sum = np.array(annulus_sum)
-    annulus_sum_err = np.array(annulus_sum_err)
-
     # construct metadata for output table
     meta = OrderedDict()
     meta["instrument"] = datamodel.meta.instrument.name
@@ -289,6 +281,55 @@ def tso_aperture_photometry(
     return tbl
 
 
+def _aperture_sums(data, err, images, aperture):
+    """
+    Sum the data and errors within an aperture for a set of integrations.
+
+    The sums match those of `~photutils.aperture.ApertureStats` with the
+    "exact" sum method: pixels are weighted by their exact overlap with
+    the aperture, and non-finite data values are excluded.
+
+    Parameters
+    ----------
+    data : ndarray of float
+        3D data cube (nimage, ny, nx).
+    err : ndarray of float
+        3D error cube matching the data.
+    images : ndarray of int
+        Indices of the integrations to sum.
+    aperture : `~photutils.aperture.PixelAperture`
+        The aperture.
+
+    Returns
+    -------
+    aperture_sum : ndarray of float
+        The sum of the data in the aperture, one per integration.  NaN
+        if no valid data overlaps the aperture.
+    aperture_sum_err : ndarray of float
+        The error on the sum, propagated from the input errors.
+    """
+    aperture_sum = np.full(len(images), np.nan)
+    aperture_sum_err = np.full(len(images), np.nan)
+
+    aperture_mask = aperture.to_mask(method="exact")
+    slc_large, slc_small = aperture_mask.get_overlap_slices(data.shape[1:])
+    if slc_large is None:
+        # No overlap with the data
+        return aperture_sum, aperture_sum_err
+    weights = aperture_mask.data[slc_small]
+
+    cutout = data[:, slc_large[0], slc_large[1]][images].astype(float)
+    variance = err[:, slc_large[0], slc_large[1]][images] ** 2
+    valid = np.isfinite(cutout) & (weights > 0)
+    has_data = np.any(valid, axis=(1, 2))
+
+    aperture_sum[has_data] = np.einsum("ijk,jk->i", np.where(valid, cutout, 0.0)[has_data], weights)
+    aperture_sum_err[has_data] = np.sqrt(
+        np.einsum("ijk,jk->i", np.where(valid, variance, 0.0)[has_data], weights)
+    )
+    return aperture_sum, aperture_sum_err
+
+
 def _fit_source(data, mask, source_mask, xcenter, ycenter, box_size, fit_psf=False):
     """
     Fit the source in all integrations.